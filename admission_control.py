@@ -0,0 +1,291 @@
+"""İstek kabul kontrolü: kullanıcı/IP başına hız sınırı ve eşzamanlı istek sınırı
+
+Sync gunicorn worker'ları aynı anda tek istek işler. Bir bot veya takılı
+kalmış bir tarayıcı ``POST /`` ya da ``/login``'e art arda istek gönderirse
+tüm worker'ları meşgul eder ve diğer kullanıcılar gunicorn kuyruğunda
+zaman aşımına uğrar. Bu modül iki sınır uygular:
+
+* Hız sınırı: her rota sınıfı için kullanıcı (giriş yapılmamışsa IP) başına
+  token bucket. Kova ``burst`` token ile dolar ve saniyede ``rate`` token
+  yenilenir; token kalmadıysa istek hemen ``429`` ve ``Retry-After`` alır.
+* Eşzamanlı istek sınırı: bir rota sınıfını aynı anda işleyen worker sayısı
+  sınırlıdır. Sınır doluysa istek kuyrukta beklemek yerine hemen ``503``
+  alır; böylece diğer sınıflar için her zaman boş worker kalır.
+
+Sayaçlar tüm worker'ların paylaştığı mmap dosyasındadır (varsayılan olarak
+/dev/shm altında). Yazmalar ``slot_occupancy`` ile aynı şekilde süreçler
+arası ``lockf`` ve süreç içi thread kilidi altında yapılır. Kovalar sabit
+boyutlu bir tabloda anahtarın özetine göre iki aday hücreden birine
+yerleşir; yer yoksa en uzun süredir kullanılmayan kova devralınır (yeterince
+uzun boşta kalan kova zaten dolmuştur, devralmak sınırı gevşetmez).
+Eşzamanlı istek kayıtları süreç ID'si tutar; çöken worker'ın kaydı süreç
+yaşamıyorsa veya ``ADMISSION_STALE_SECONDS`` aşıldıysa geri alınır.
+"""
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_STALE_SECONDS = float(os.getenv('ADMISSION_STALE_SECONDS', 120))
+
+MAGIC = b'RZAC'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHII')  # magic, sürüm, ayrılmış, kova sayısı, sınıf başına kayıt
+BUCKET = struct.Struct('<Qdd')     # anahtar özeti, token, son güncelleme
+SLOT = struct.Struct('<Id')        # süreç ID'si (0 = boş), başlangıç zamanı
+
+DEFAULT_BUCKETS = 4096
+MAX_INFLIGHT = 32
+
+
+def default_admission_path():
+    """Paylaşımlı bellek dizini varsa orayı, yoksa geçici dizini kullan"""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'rezervasyon_admission')
+
+
+def parse_rate(spec):
+    """``"10/60"`` (60 saniyede 10 istek) biçimini (burst, saniyedeki token) çiftine çevir
+
+    Boş değer veya ``0`` sınırsız demektir ve None döner.
+    """
+    spec = (spec or '').strip()
+    if not spec or spec == '0':
+        return None
+    count, _, seconds = spec.partition('/')
+    count, seconds = float(count), float(seconds or 1)
+    if count <= 0 or seconds <= 0:
+        return None
+    return count, count / seconds
+
+
+class RouteClass:
+    """Aynı sınırları paylaşan rotalar (ör. giriş, rezervasyon yazma, export)"""
+
+    __slots__ = ('name', 'index', 'rate', 'inflight')
+
+    def __init__(self, name, index, rate=None, inflight=0):
+        self.name = name
+        self.index = index
+        self.rate = parse_rate(rate) if isinstance(rate, str) else rate
+        self.inflight = min(int(inflight or 0), MAX_INFLIGHT)
+
+
+class AdmissionControl:
+    """Paylaşılan mmap üzerinde token bucket'lar ve eşzamanlı istek kayıtları"""
+
+    def __init__(self, path, classes, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            path: Paylaşılan dosyanın yolu
+            classes: {sınıf adı: (hız tanımı, eşzamanlı sınır)}; ör. {'login': ('10/60', 2)}
+        """
+        self.classes = {name: RouteClass(name, i, rate, inflight)
+                        for i, (name, (rate, inflight)) in enumerate(sorted(classes.items()))}
+        self.buckets = buckets
+        self._thread_lock = threading.Lock()
+        self._slots_offset = HEADER.size + BUCKET.size * buckets
+        self._size = self._slots_offset + SLOT.size * MAX_INFLIGHT * len(self.classes)
+
+        self.path = f"{path}-{buckets}-{len(self.classes)}"
+        self._file = os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600), 'r+b')
+        with self._file_lock():
+            if not self._header_valid():
+                self._file.truncate(0)
+                self._file.truncate(self._size)
+                self._file.seek(0)
+                self._file.write(HEADER.pack(MAGIC, VERSION, 0, buckets, MAX_INFLIGHT))
+                self._file.flush()
+        self._mmap = mmap.mmap(self._file.fileno(), self._size)
+
+    @contextmanager
+    def _file_lock(self):
+        with self._thread_lock:
+            fcntl.lockf(self._file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._file, fcntl.LOCK_UN)
+
+    def _header_valid(self):
+        self._file.seek(0)
+        raw = self._file.read(HEADER.size)
+        if len(raw) < HEADER.size or os.fstat(self._file.fileno()).st_size != self._size:
+            return False
+        magic, version, _, buckets, slots = HEADER.unpack(raw)
+        return magic == MAGIC and version == VERSION and buckets == self.buckets and slots == MAX_INFLIGHT
+
+    def _bucket_offset(self, index):
+        return HEADER.size + BUCKET.size * index
+
+    def take_token(self, class_name, key, now=None):
+        """Anahtarın kovasından bir token al
+
+        Returns:
+            float: 0 ise istek kabul edildi, değilse saniye cinsinden bekleme süresi
+        """
+        route_class = self.classes.get(class_name)
+        if route_class is None or route_class.rate is None:
+            return 0
+        burst, rate = route_class.rate
+        now = time.time() if now is None else now
+        digest = int.from_bytes(hashlib.blake2b(f"{class_name}\x1f{key}".encode('utf-8'),
+                                                digest_size=8).digest(), 'little') or 1
+        candidates = (digest % self.buckets, (digest >> 32) % self.buckets)
+
+        with self._file_lock():
+            offset = None
+            oldest = None
+            for index in candidates:
+                candidate = self._bucket_offset(index)
+                stored, tokens, updated = BUCKET.unpack_from(self._mmap, candidate)
+                if stored == digest:
+                    offset = candidate
+                    break
+                if oldest is None or updated < oldest[1]:
+                    oldest = (candidate, updated)
+            if offset is None:
+                # Yeni anahtar: boş veya en uzun süredir kullanılmayan kova dolu başlar
+                offset, tokens, updated = oldest[0], burst, now
+
+            tokens = min(burst, tokens + max(now - updated, 0) * rate)
+            if tokens >= 1:
+                BUCKET.pack_into(self._mmap, offset, digest, tokens - 1, now)
+                return 0
+            BUCKET.pack_into(self._mmap, offset, digest, tokens, now)
+        return (1 - tokens) / rate
+
+    def _slot_offset(self, route_class, index):
+        return self._slots_offset + SLOT.size * (route_class.index * MAX_INFLIGHT + index)
+
+    def acquire(self, class_name, now=None):
+        """Sınıf için eşzamanlı istek kaydı al
+
+        Returns:
+            int: Kayıt numarası; sınır yoksa -1, sınır doluysa None
+        """
+        route_class = self.classes.get(class_name)
+        if route_class is None or not route_class.inflight:
+            return -1
+        now = time.time() if now is None else now
+        pid = os.getpid()
+        with self._file_lock():
+            for index in range(route_class.inflight):
+                offset = self._slot_offset(route_class, index)
+                owner, started = SLOT.unpack_from(self._mmap, offset)
+                if owner and now - started < ADMISSION_STALE_SECONDS and _process_alive(owner):
+                    continue
+                SLOT.pack_into(self._mmap, offset, pid, now)
+                return index
+        return None
+
+    def release(self, class_name, index):
+        """``acquire`` ile alınan kaydı bırak"""
+        route_class = self.classes.get(class_name)
+        if route_class is None or index is None or index < 0:
+            return
+        offset = self._slot_offset(route_class, index)
+        with self._file_lock():
+            if SLOT.unpack_from(self._mmap, offset)[0] == os.getpid():
+                SLOT.pack_into(self._mmap, offset, 0, 0.0)
+
+    def in_flight(self, class_name):
+        """Sınıfı şu anda işleyen istek sayısı (izleme için)"""
+        route_class = self.classes.get(class_name)
+        if route_class is None:
+            return 0
+        now = time.time()
+        count = 0
+        for index in range(route_class.inflight):
+            owner, started = SLOT.unpack_from(self._mmap, self._slot_offset(route_class, index))
+            if owner and now - started < ADMISSION_STALE_SECONDS and _process_alive(owner):
+                count += 1
+        return count
+
+
+def open_admission_control(path, classes):
+    """Paylaşılan sayaç dosyasını aç; yol boşsa veya açılamazsa None (sınır yok)"""
+    if not path:
+        return None
+    try:
+        return AdmissionControl(path, classes)
+    except OSError as e:
+        logger.error(f"Kabul kontrolü dosyası açılamadı: {e}")
+        return None
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def client_address(request):
+    """İstemci IP'si; aynı makinedeki nginx'ten gelen isteklerde X-Real-IP"""
+    remote = request.remote_addr or ''
+    if remote in ('127.0.0.1', '::1'):
+        return request.headers.get('X-Real-IP', remote)
+    return remote
+
+
+def register_admission_control(app, control, routes, identity=None):
+    """Flask uygulamasına kabul kontrolü kancalarını ekle
+
+    Args:
+        control: ``AdmissionControl`` (None ise kancalar bir şey yapmaz)
+        routes: {(HTTP metodu, endpoint): sınıf adı}
+        identity: Giriş yapmış kullanıcının kimliğini döndüren fonksiyon (yoksa IP kullanılır)
+    """
+    from flask import g, jsonify, make_response, request
+
+    def reject(status, retry_after, message):
+        if request.path.startswith('/api/') or request.accept_mimetypes.best == 'application/json':
+            response = jsonify({'error': message})
+            response.status_code = status
+        else:
+            response = make_response(message, status)
+            response.headers['Content-Type'] = 'text/plain; charset=utf-8'
+        response.headers['Retry-After'] = str(max(int(retry_after + 0.999), 1))
+        return response
+
+    @app.before_request
+    def _admit_request():
+        if control is None:
+            return None
+        class_name = routes.get((request.method, request.endpoint))
+        if class_name is None:
+            return None
+
+        key = (identity() if identity else None) or client_address(request)
+        wait = control.take_token(class_name, key)
+        if wait:
+            logger.warning(f"Hız sınırı aşıldı: {class_name} {key}")
+            return reject(429, wait, 'Çok fazla istek gönderildi. Lütfen biraz sonra tekrar deneyin.')
+
+        slot = control.acquire(class_name)
+        if slot is None:
+            logger.warning(f"Eşzamanlı istek sınırı dolu: {class_name}")
+            return reject(503, 1, 'Sunucu şu anda yoğun. Lütfen birkaç saniye sonra tekrar deneyin.')
+        g._admission = (class_name, slot)
+        return None
+
+    @app.teardown_request
+    def _release_request(exc):
+        admission = g.pop('_admission', None)
+        if admission is not None and control is not None:
+            control.release(*admission)
+
+    return app
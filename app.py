@@ -1,16 +1,52 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, make_response, session
+import time
+_startup_started = time.perf_counter()
+
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, make_response, session, jsonify, send_file, stream_with_context
 import secrets
-from datetime import datetime
+from datetime import date as date_type, datetime, timedelta
 import io
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
 from functools import wraps
 import mysql.connector
 from mysql.connector import pooling
+import sqlite3
 import logging
 import os
+import sys
+import threading
+import click
+import hmac
 from dotenv import load_dotenv
+from query_profiler import profile_connection, register_request_profiler, get_query_stats
+from read_replica import ReadRouter, remember_write, replica_config, write_marker
+from admission_control import default_admission_path, open_admission_control, register_admission_control
+from reservation_snapshot import read_snapshot, write_snapshot
+from reservation_columns import create_columns
+from reservation_record import Reservation
+from static_assets import AssetError, build_assets, register_static_assets
+from slot_occupancy import SlotOccupancy, PENDING, default_occupancy_path
+from sqlite_backend import SQLiteConnectionPool, init_schema as init_sqlite_schema
+from config import Config
+from partitioning import (MYSQL_ARCHIVE_TABLE, ArchiveError, archive_year, ensure_year_partitions,
+                          get_year_partitions, initial_partition_clause, partition_existing_table)
+from change_feed import ChangeFeed, EventFilter, create_mysql_change_log, stream_events
+from dataset_version import create_mysql_version, get_dataset_version
+from reference_data import (CenterLocks, RegistryCache, booking_hours, create_mysql_reference_data,
+                            default_center_lock_path, insert_default_reference_data, register_reference_data)
+from calendar_feed import CALENDAR_FEED_TOKEN, MIMETYPE as CALENDAR_MIMETYPE, CalendarFeeds
+from booking_intervals import (ACTIVE_STATUSES, BookingConflict, IntervalIndex, any_overlap, combine_time_range, format_time_range, overlaps,
+                               parse_time_range)
+from excel_export import XLSX_MIMETYPE, create_excel_file
+from export_cache import ExportCache, cache_key
+from hot_window import HOT_WINDOW_DAYS_AHEAD, HOT_WINDOW_DAYS_BACK, current_window
+from search_index import SEARCH_PAGE_SIZE, SearchIndex, searchable
+from slot_alternatives import (ALTERNATIVE_DAYS, ALTERNATIVE_LIMIT, ALTERNATIVE_OTHER_CENTERS, candidate_days,
+                               candidate_places, format_alternative, rank_alternatives)
+from streaming_export import (CSV_MIMETYPE, NDJSON_MIMETYPE, build_export_query, filter_date_range,
+                              generate_csv, generate_ndjson, iter_row_chunks)
+from export_jobs import (EXPORT_SYNC_MAX_ROWS, DONE as EXPORT_DONE, ERROR as EXPORT_ERROR,
+                         get_job as get_export_job, job_file_path as export_job_file_path, submit_export)
+import statements
+from utilization import create_mysql_rollup, ensure_rollup_populated, get_utilization, rebuild_rollup
 
 # Environment variables yükle
 load_dotenv()
@@ -24,8 +60,67 @@ app.secret_key = os.getenv('FLASK_SECRET_KEY', secrets.token_hex(16))
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Kullanıcı/IP başına hız sınırı ("istek/saniye") ve rota sınıfı başına eşzamanlı istek sınırı.
+# Sayaçlar worker'lar arasında paylaşılır; boş ADMISSION_PATH sınırları kapatır.
+ADMISSION_PATH = os.getenv('ADMISSION_PATH', default_admission_path())
+ADMISSION_CLASSES = {
+    'login': (os.getenv('RATE_LIMIT_LOGIN', '10/60'), int(os.getenv('INFLIGHT_LIMIT_LOGIN', 2))),
+    'booking': (os.getenv('RATE_LIMIT_BOOKING', '30/60'), int(os.getenv('INFLIGHT_LIMIT_BOOKING', 2))),
+    'export': (os.getenv('RATE_LIMIT_EXPORT', '20/60'), int(os.getenv('INFLIGHT_LIMIT_EXPORT', 2))),
+}
+ADMISSION_ROUTES = {
+    ('POST', 'login'): 'login',
+    ('POST', 'index'): 'booking',
+    ('POST', 'update_reservation'): 'booking',
+    ('POST', 'approve_reservation'): 'booking',
+    ('POST', 'pending_reservation'): 'booking',
+    ('POST', 'cancel_reservation'): 'booking',
+    ('POST', 'delete_reservation'): 'booking',
+    ('POST', 'reservation_status_api'): 'booking',
+    ('POST', 'reservation_delete_api'): 'booking',
+    ('GET', 'export_excel'): 'export',
+    ('GET', 'export_stream'): 'export',
+}
+# Diğer kancalardan önce kaydedilir: reddedilecek istek hiçbir iş yapmadan döner
+admission_control = open_admission_control(ADMISSION_PATH, ADMISSION_CLASSES)
+register_admission_control(app, admission_control, ADMISSION_ROUTES, lambda: session.get('user_id'))
+
+# Şablonlar CSS/JS paketlerini asset_urls() ile alır (bkz. `flask --app app build-assets`)
+register_static_assets(app)
+
 # Memory-based rezervasyonlar (geçici - MySQL'e aktarılacak)
 reservations = []
+# Filtreler ve sayımlar için sütunlu kopya (numpy yoksa None, liste kullanılır)
+reservation_columns = None
+
+# Ad soyad ve açıklama araması için trigram indeksi (memory'deki kayıtlar)
+search_index = SearchIndex()
+# (merkez, salon, gün) başına aktif rezervasyon aralıkları (çakışma kontrolü için)
+booking_index = IntervalIndex()
+# Merkez/salon başına hazır takvim (.ics) etkinlikleri; yazmalarda sadece değişen kayıt yenilenir
+calendar_feeds = CalendarFeeds()
+# Takvim akışlarının en son eşitlendiği merkez sürümleri (başka worker'ların yazmalarını fark etmek için)
+calendar_feed_versions = {}
+
+# Merkez, etkinlik yeri ve saat dilimi tanımları (veritabanından yüklenir, sürüm değişince yenilenir)
+reference_cache = RegistryCache()
+CENTERS, VENUES, TIME_SLOTS = reference_cache.registry[1:]
+# Rezervasyon yazmaları merkez başına kilitlenir; farklı merkezler birbirini beklemez.
+# Kilit dosyası worker'lar arasında paylaşılır - boş CENTER_LOCK_PATH kilidi süreç içiyle sınırlar.
+center_lock = CenterLocks(os.getenv('CENTER_LOCK_PATH', default_center_lock_path()))
+
+# Worker'lar arası paylaşılan doluluk tablosu - boş OCCUPANCY_PATH tabloyu kapatır
+OCCUPANCY_PATH = os.getenv('OCCUPANCY_PATH', default_occupancy_path())
+OCCUPANCY_DAYS_BACK = int(os.getenv('OCCUPANCY_DAYS_BACK', 60))
+OCCUPANCY_DAYS_AHEAD = int(os.getenv('OCCUPANCY_DAYS_AHEAD', 800))
+slot_occupancy = None
+
+# Oluşturulan export dosyaları için sürümlü disk önbelleği
+EXPORT_CACHE_ENABLED = os.getenv('EXPORT_CACHE_ENABLED', 'True').lower() == 'true'
+export_cache = ExportCache()
+
+# Değişiklik akışı (SSE) uzun süren bağlantılar açar; sync worker'da servis edilmez
+EVENTS_REQUIRE_THREADED = os.getenv('EVENTS_REQUIRE_THREADED', 'True').lower() == 'true'
 
 # MySQL Bağlantı Ayarları - Environment Variables'dan
 DB_CONFIG = {
@@ -39,35 +134,127 @@ DB_CONFIG = {
     'autocommit': True,
     'pool_name': 'mypool',
     'pool_size': 5,
-    'pool_reset_session': True
+    # Oturum sıfırlama prepared statement'ları düşürür; uygulama oturum durumu kullanmıyor
+    'pool_reset_session': False
 }
 
+# Her iki depolama katmanının hata tipleri
+DB_ERRORS = (mysql.connector.Error, sqlite3.Error)
+
+# Gunicorn preload master'ı havuz açmaz (gunicorn.conf.py); havuzlar fork sonrası her worker'da açılır
+DB_POOL_AFTER_FORK = os.getenv('DB_POOL_AFTER_FORK', 'False').lower() == 'true'
+
+class UnpooledConnections:
+    """Havuz yerine her istekte yeni bağlantı açan, havuzla aynı arayüzlü fabrika
+
+    Master süreç veriyi yüklerken kullanır: ``close()`` bağlantıyı gerçekten
+    kapattığından fork anında worker'lara geçecek açık bağlantı kalmaz.
+    """
+
+    def __init__(self, config):
+        self.config = {key: value for key, value in config.items() if not key.startswith('pool_')}
+
+    def get_connection(self):
+        return mysql.connector.connect(**self.config)
+
+def create_connection_pool(pooled=not DB_POOL_AFTER_FORK):
+    """MySQL bağlantı havuzu, USE_SQLITE açıksa SQLite (WAL) havuzu oluştur
+
+    ``pooled=False`` MySQL için havuz yerine ``UnpooledConnections`` döndürür.
+    """
+    if Config.USE_SQLITE:
+        try:
+            pool = SQLiteConnectionPool(Config.SQLITE_DB)
+            logger.info(f"SQLite veritabanı kullanılıyor: {Config.SQLITE_DB}")
+            return pool
+        except (sqlite3.Error, OSError) as err:
+            logger.error(f"SQLite bağlantı hatası: {err}")
+            return None
+    
+    try:
+        if not pooled:
+            # Bağlantı ayarları başlangıçta denenir; hata varsa havuzla aynı şekilde None döner
+            connections = UnpooledConnections(DB_CONFIG)
+            connections.get_connection().close()
+            logger.info("MySQL bağlantıları havuzsuz açılıyor (havuz fork sonrası açılacak)")
+            return connections
+        pool = mysql.connector.pooling.MySQLConnectionPool(**DB_CONFIG)
+        logger.info("MySQL bağlantı havuzu oluşturuldu")
+        return pool
+    except DB_ERRORS as err:
+        logger.error(f"MySQL bağlantı hatası: {err}")
+        return None
+
+def create_read_router(pooled=not DB_POOL_AFTER_FORK):
+    """Okuma kopyası tanımlıysa (DB_REPLICA_HOST, SQLite'ta SQLITE_REPLICA_DB) okuma yönlendiricisi"""
+    try:
+        if Config.USE_SQLITE:
+            # Test ortamı için ikinci SQLite dosyası kopya yerine geçer
+            replica_db = os.getenv('SQLITE_REPLICA_DB')
+            if not replica_db:
+                return None
+            replica_pool = SQLiteConnectionPool(replica_db)
+        else:
+            config = replica_config(DB_CONFIG)
+            if config is None:
+                return None
+            replica_pool = (mysql.connector.pooling.MySQLConnectionPool(**config) if pooled
+                            else UnpooledConnections(config))
+        logger.info("Okuma kopyası havuzu oluşturuldu")
+        return ReadRouter(replica_pool)
+    except (OSError, *DB_ERRORS) as err:
+        # Kopya açılamazsa tüm okumalar birincil sunucuya gider
+        logger.error(f"Okuma kopyası bağlantı hatası: {err}")
+        return None
+
 # Bağlantı havuzu oluştur
-try:
-    connection_pool = mysql.connector.pooling.MySQLConnectionPool(**DB_CONFIG)
-    logger.info("MySQL bağlantı havuzu oluşturuldu")
-except mysql.connector.Error as err:
-    logger.error(f"MySQL bağlantı hatası: {err}")
-    connection_pool = None
-
-def get_db_connection():
-    """Veritabanı bağlantısı al"""
+connection_pool = create_connection_pool()
+read_router = create_read_router()
+
+# Memory'deki rezervasyonların hangi veritabanı zamanına kadar güncel olduğu
+reservations_watermark = None
+
+# Rezervasyonlar belleğe yüklensin mi; sadece değişiklik akışını sunan süreç
+# (gunicorn_events.conf.py) kayıtları ve indeksleri tutmaz
+LOAD_RESERVATIONS = os.getenv('LOAD_RESERVATIONS', 'True').lower() == 'true'
+
+# Memory'de tutulan tarih penceresi (None = tüm rezervasyonlar) ve pencere dışındaki aylar
+hot_window = None
+outside_months = set()
+_hot_window_lock = threading.Lock()
+
+# Disk snapshot ayarları - boş SNAPSHOT_PATH snapshot'ı kapatır
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', 'snapshots/reservations.snap')
+SNAPSHOT_INTERVAL = int(os.getenv('SNAPSHOT_INTERVAL', 300))
+_snapshot_writer_pid = None
+
+def get_db_connection(read=False, marker=None):
+    """Veritabanı bağlantısı al
+    
+    ``read=True`` okumalar okuma kopyası varsa ona gider. Kopya ``marker``
+    yazmasına (verilmezse oturumdaki son yazmaya) ulaşmadıysa birincil sunucu kullanılır.
+    """
     try:
         if connection_pool:
-            return connection_pool.get_connection()
+            if read and read_router:
+                return profile_connection(read_router.connection(connection_pool.get_connection, marker))
+            return profile_connection(connection_pool.get_connection())
         return None
-    except mysql.connector.Error as err:
+    except DB_ERRORS as err:
         logger.error(f"Bağlantı alma hatası: {err}")
         return None
 
 def init_database():
-    """Veritabanı ve tabloları oluştur"""
+    """Veritabanı ve tabloları oluştur - `flask --app app init-db` ile çalıştırılır"""
+    if Config.USE_SQLITE:
+        return init_sqlite_database()
+    
     try:
         # İlk olarak veritabanını oluştur
         temp_config = DB_CONFIG.copy()
         temp_config.pop('database', None)  # Database ismini kaldır
         
-        temp_conn = mysql.connector.connect(**temp_config)
+        temp_conn = profile_connection(mysql.connector.connect(**temp_config))
         cursor = temp_conn.cursor()
         
         # Veritabanını oluştur
@@ -82,10 +269,10 @@ def init_database():
             
         cursor = conn.cursor()
         
-        # Rezervasyonlar tablosu
-        reservations_table = """
+        # Rezervasyonlar tablosu - yıllara göre bölümlü, bu yüzden birincil anahtar (id, date)
+        reservations_table = f"""
         CREATE TABLE IF NOT EXISTS reservations (
-            id INT AUTO_INCREMENT PRIMARY KEY,
+            id INT AUTO_INCREMENT,
             name_surname VARCHAR(255) NOT NULL,
             center VARCHAR(255) NOT NULL,
             venue VARCHAR(100) DEFAULT 'Tiyatro Salonu',
@@ -98,8 +285,11 @@ def init_database():
             created_by VARCHAR(100),
             INDEX idx_center_date (center, date),
             INDEX idx_status (status),
-            INDEX idx_created_at (created_at)
+            INDEX idx_created_at (created_at),
+            INDEX idx_updated_at (updated_at),
+            PRIMARY KEY (id, date)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        {initial_partition_clause()}
         """
         
         # Kullanıcılar tablosu
@@ -118,22 +308,62 @@ def init_database():
         
         cursor.execute(reservations_table)
         cursor.execute(users_table)
+        cursor.execute(MYSQL_ARCHIVE_TABLE)
+        
+        # Bölümlü tabloda önümüzdeki yıllar için partition aç; eski kurulumlar ayrıca dönüştürülür
+        if get_year_partitions(cursor) is None:
+            logger.warning("Rezervasyon tablosu bölümlenmemiş. `flask --app app partition-reservations` ile dönüştürün.")
+        else:
+            ensure_year_partitions(cursor)
         
-        # Varsayılan kullanıcıları ekle
-        insert_default_users(cursor)
+        # Kullanım özeti tablosu ve onu güncel tutan trigger'lar
+        create_mysql_rollup(cursor)
+        # Export önbelleği anahtarları için veri sürümü sayacı
+        create_mysql_version(cursor)
+        # Olay akışı (SSE) için değişiklik günlüğü
+        create_mysql_change_log(cursor)
+        # Merkez, salon ve saat dilimi tanımları
+        create_mysql_reference_data(cursor)
         
-        conn.commit()
         cursor.close()
+        
+        # Varsayılan kullanıcıları ve tanımları ekle
+        insert_default_users(conn)
+        insert_default_reference_data(conn)
+        
+        conn.commit()
+        ensure_rollup_populated(conn)
         conn.close()
         
         logger.info("Veritabanı tabloları başarıyla oluşturuldu")
         return True
         
-    except mysql.connector.Error as err:
+    except DB_ERRORS as err:
         logger.error(f"Veritabanı oluşturma hatası: {err}")
         return False
 
-def insert_default_users(cursor):
+def init_sqlite_database():
+    """SQLite şemasını (aynı tablolar ve indeksler) ve varsayılan kullanıcıları oluştur"""
+    try:
+        conn = get_db_connection()
+        if not conn:
+            return False
+        
+        init_sqlite_schema(conn)
+        insert_default_users(conn)
+        insert_default_reference_data(conn)
+        conn.commit()
+        ensure_rollup_populated(conn)
+        conn.close()
+        
+        logger.info("SQLite tabloları başarıyla oluşturuldu")
+        return True
+        
+    except sqlite3.Error as err:
+        logger.error(f"SQLite veritabanı oluşturma hatası: {err}")
+        return False
+
+def insert_default_users(conn):
     """Varsayılan kullanıcıları ekle"""
     default_users = [
         ('admin', 'admin123', 'admin', '["view_reservations", "edit_reservations", "view_availability", "manage_users"]'),
@@ -145,11 +375,8 @@ def insert_default_users(cursor):
     
     for username, password, role, permissions in default_users:
         try:
-            cursor.execute("""
-                INSERT IGNORE INTO users (username, password, role, permissions)
-                VALUES (%s, %s, %s, %s)
-            """, (username, password, role, permissions))
-        except mysql.connector.Error as err:
+            statements.execute(conn, 'user_insert_default', (username, password, role, permissions))
+        except DB_ERRORS as err:
             logger.error(f"Kullanıcı ekleme hatası ({username}): {err}")
 
 def load_users_from_db():
@@ -159,9 +386,7 @@ def load_users_from_db():
         if not conn:
             return {}
             
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT username, password, role, permissions FROM users")
-        db_users = cursor.fetchall()
+        db_users = statements.fetch_all(conn, 'users_all')
         
         users_dict = {}
         for user in db_users:
@@ -173,54 +398,256 @@ def load_users_from_db():
                 'permissions': permissions
             }
         
-        cursor.close()
         conn.close()
         return users_dict
         
-    except mysql.connector.Error as err:
+    except DB_ERRORS as err:
         logger.error(f"Kullanıcı yükleme hatası: {err}")
         return {}
 
-def load_reservations_from_db():
-    """Rezervasyonları veritabanından yükle"""
+def reservation_from_row(res):
+    """Veritabanı satırını memory formatına çevir (biçimleme okunurken yapılır)"""
+    return Reservation(
+        id=res['id'],
+        name_surname=res['name_surname'],
+        center=res['center'],
+        venue=res['venue'],
+        date=res['date'],
+        time=res['time'],
+        description=res['description'],
+        status=res['status'],
+        created_at=res['created_at'],
+        updated_at=res['updated_at'],
+        created_by=res['created_by']
+    )
+
+def get_db_now():
+    """Veritabanı sunucusunun şu anki zamanını getir"""
+    try:
+        conn = get_db_connection()
+        if not conn:
+            return None
+        db_now = statements.fetch_one(conn, 'db_now')[0]
+        if isinstance(db_now, str):
+            # SQLite zamanı metin olarak döndürür
+            db_now = datetime.fromisoformat(db_now)
+        conn.close()
+        return db_now
+    except DB_ERRORS as err:
+        logger.error(f"Veritabanı zamanı alınamadı: {err}")
+        return None
+
+def get_sync_position():
+    """Bellek senkronizasyonu için birincil sunucunun zamanı ve yazma işareti
+    
+    Senkronizasyon okumaları kopyadan ancak kopya bu işarete ulaştıysa yapılır;
+    böylece watermark'tan önceki hiçbir değişiklik atlanmaz.
+    """
+    if not read_router:
+        return get_db_now(), None
+    try:
+        conn = get_db_connection()
+        if not conn:
+            return None, None
+        db_now = statements.fetch_one(conn, 'db_now')[0]
+        if isinstance(db_now, str):
+            db_now = datetime.fromisoformat(db_now)
+        marker = write_marker(conn)
+        conn.close()
+        return db_now, marker
+    except DB_ERRORS as err:
+        logger.error(f"Veritabanı konumu alınamadı: {err}")
+        # Konum bilinmiyor: okumalar birincil sunucuda kalsın
+        return None, {'at': time.time()}
+
+def get_current_dataset_version(center=None):
+    """Veritabanındaki rezervasyon verisinin (``center`` verilirse o merkezin) sürümü; bağlantı yoksa None"""
+    try:
+        conn = get_db_connection(read=True)
+        if not conn:
+            return None
+        version = get_dataset_version(conn, center)
+        conn.close()
+        return version
+    except DB_ERRORS as err:
+        logger.error(f"Veri sürümü alınamadı: {err}")
+        return None
+
+def fetch_change_log(after_id, limit):
+    """Değişiklik günlüğünde ``after_id``'den sonraki olaylar (hata olursa None)"""
+    try:
+        conn = get_db_connection(read=True)
+        if not conn:
+            return None
+        rows = statements.fetch_all(conn, 'change_log_after', (after_id, limit))
+        conn.close()
+        return rows
+    except DB_ERRORS as err:
+        logger.error(f"Değişiklik günlüğü okunamadı: {err}")
+        return None
+
+def latest_change_id():
+    """Değişiklik günlüğündeki son olayın ID'si (hata olursa None)"""
+    try:
+        conn = get_db_connection(read=True)
+        if not conn:
+            return None
+        row = statements.fetch_one(conn, 'change_log_latest')
+        conn.close()
+        return int(row[0]) if row else 0
+    except DB_ERRORS as err:
+        logger.error(f"Değişiklik günlüğü okunamadı: {err}")
+        return None
+
+def prune_change_log(before):
+    """Belirli zamandan eski olayları günlükten sil"""
     try:
         conn = get_db_connection()
+        if not conn:
+            return 0
+        result = statements.execute(conn, 'change_log_prune', (before,))
+        conn.commit()
+        conn.close()
+        return result.rowcount
+    except DB_ERRORS as err:
+        logger.error(f"Değişiklik günlüğü temizlenemedi: {err}")
+        return 0
+
+# Süreç başına tek okuyucu: tüm akış bağlantıları aynı günlük sorgusunu paylaşır
+change_feed = ChangeFeed(fetch_change_log, latest_change_id, prune_change_log)
+
+def load_reservation_changes(since, marker=None):
+    """Belirli zamandan sonra değişen rezervasyonları ve mevcut tüm ID'leri getir
+    
+    Bellek penceresi açıksa ID'ler sadece pencere içindekilerdir.
+    """
+    try:
+        conn = get_db_connection(read=True, marker=marker)
+        if not conn:
+            return None, None
+            
+        rows = statements.fetch_all(conn, 'reservations_changed_since', (since,))
+        changed = [reservation_from_row(res) for res in rows]
+        
+        # Silinen kayıtları tespit etmek için sadece ID'ler (index-only tarama)
+        if hot_window:
+            id_rows = statements.fetch_all(conn, 'reservation_ids_in_range', hot_window.params)
+        else:
+            id_rows = statements.fetch_all(conn, 'reservation_ids')
+        existing_ids = {row['id'] for row in id_rows}
+        
+        conn.close()
+        return changed, existing_ids
+        
+    except DB_ERRORS as err:
+        logger.error(f"Rezervasyon değişiklik yükleme hatası: {err}")
+        return None, None
+
+def load_reservations_from_db(marker=None):
+    """Rezervasyonları veritabanından yükle"""
+    try:
+        conn = get_db_connection(read=True, marker=marker)
         if not conn:
             return []
             
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT id, name_surname, center, venue, date, time, description, 
-                   status, created_at, updated_at, created_by
-            FROM reservations 
-            ORDER BY created_at DESC
-        """)
-        db_reservations = cursor.fetchall()
+        if hot_window:
+            db_reservations = statements.fetch_all(conn, 'reservations_in_range', hot_window.params)
+        else:
+            db_reservations = statements.fetch_all(conn, 'reservations_all')
         
-        reservations_list = []
-        for res in db_reservations:
-            reservations_list.append({
-                'id': res['id'],
-                'name_surname': res['name_surname'],
-                'center': res['center'],
-                'venue': res['venue'] or 'Tiyatro Salonu',
-                'date': res['date'].strftime('%Y-%m-%d'),
-                'time': res['time'],
-                'description': res['description'] or '',
-                'status': res['status'],
-                'created_at': res['created_at'].strftime('%Y-%m-%d %H:%M:%S'),
-                'updated_at': res['updated_at'].strftime('%Y-%m-%d %H:%M:%S') if res['updated_at'] else None,
-                'created_by': res['created_by']
-            })
+        reservations_list = [reservation_from_row(res) for res in db_reservations]
         
-        cursor.close()
         conn.close()
         return reservations_list
         
-    except mysql.connector.Error as err:
+    except DB_ERRORS as err:
+        logger.error(f"Rezervasyon yükleme hatası: {err}")
+        return []
+
+def load_reservations_by_ids_from_db(reservation_ids, chunk_size=500, marker=None):
+    """Verilen ID'lerdeki rezervasyonları getir (pencereye yeni giren kayıtlar)"""
+    reservation_ids = list(reservation_ids)
+    if not reservation_ids:
+        return []
+    try:
+        conn = get_db_connection(read=True, marker=marker)
+        if not conn:
+            return None
+        
+        loaded = []
+        cursor = conn.cursor(dictionary=True)
+        try:
+            for i in range(0, len(reservation_ids), chunk_size):
+                chunk = reservation_ids[i:i + chunk_size]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f"SELECT {statements.RESERVATION_COLUMNS} FROM reservations WHERE id IN ({placeholders})",
+                    tuple(chunk)
+                )
+                loaded.extend(reservation_from_row(res) for res in cursor.fetchall())
+        finally:
+            cursor.close()
+        
+        conn.close()
+        return loaded
+    
+    except DB_ERRORS as err:
         logger.error(f"Rezervasyon yükleme hatası: {err}")
+        return None
+
+def load_reservations_outside_window(center_filter, status_filter, month_filter, year_filter, venue_filter,
+                                     archive=False):
+    """Filtrelerin bellek penceresi dışında kalan kısmını veritabanından getir
+
+    ``archive`` True ise arşivlenmiş yıllar da (``reservations_archive``) okunur.
+    """
+    date_range = filter_date_range(month_filter, year_filter)
+    if not hot_window or date_range is None:
+        return []
+    
+    parts = hot_window.outside(*date_range)
+    if not parts:
+        return []
+    try:
+        conn = get_db_connection(read=True)
+        if not conn:
+            return []
+        
+        loaded = []
+        cursor = conn.cursor(dictionary=True)
+        try:
+            for date_from, date_to in parts:
+                for table_archive in ((False, True) if archive else (False,)):
+                    sql, params = build_export_query(center_filter, status_filter, month_filter, year_filter,
+                                                     venue_filter, archive=table_archive,
+                                                     date_from=date_from, date_to=date_to)
+                    cursor.execute(sql, params)
+                    loaded.extend(reservation_from_row(res) for res in cursor.fetchall())
+        finally:
+            cursor.close()
+        
+        conn.close()
+        return loaded
+    
+    except DB_ERRORS as err:
+        logger.error(f"Pencere dışı rezervasyon sorgusu hatası: {err}")
         return []
 
+def load_outside_months():
+    """Bellek penceresi dışında rezervasyon olan aylar (kullanım özetinden)"""
+    if not hot_window:
+        return set()
+    try:
+        conn = get_db_connection(read=True)
+        if not conn:
+            return set()
+        rows = statements.fetch_all(conn, 'rollup_months_outside', hot_window.params)
+        conn.close()
+        return {row['month'] for row in rows}
+    except DB_ERRORS as err:
+        logger.error(f"Pencere dışı ay listesi alınamadı: {err}")
+        return set()
+
 def save_reservation_to_db(reservation_data):
     """Rezervasyonu veritabanına kaydet"""
     try:
@@ -228,11 +655,7 @@ def save_reservation_to_db(reservation_data):
         if not conn:
             return None
             
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO reservations (name_surname, center, venue, date, time, description, status, created_by)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
+        result = statements.execute(conn, 'reservation_insert', (
             reservation_data['name_surname'],
             reservation_data['center'],
             reservation_data['venue'],
@@ -243,15 +666,15 @@ def save_reservation_to_db(reservation_data):
             reservation_data['created_by']
         ))
         
-        reservation_id = cursor.lastrowid
+        reservation_id = result.lastrowid
         conn.commit()
-        cursor.close()
+        remember_write(conn, read_router is not None)
         conn.close()
         
         logger.info(f"Rezervasyon kaydedildi: ID {reservation_id}")
         return reservation_id
         
-    except mysql.connector.Error as err:
+    except DB_ERRORS as err:
         logger.error(f"Rezervasyon kaydetme hatası: {err}")
         return None
 
@@ -262,12 +685,7 @@ def update_reservation_in_db(reservation_id, reservation_data):
         if not conn:
             return False
             
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE reservations 
-            SET name_surname=%s, center=%s, venue=%s, date=%s, time=%s, description=%s
-            WHERE id=%s
-        """, (
+        statements.execute(conn, 'reservation_update', (
             reservation_data['name_surname'],
             reservation_data['center'],
             reservation_data['venue'],
@@ -278,13 +696,13 @@ def update_reservation_in_db(reservation_id, reservation_data):
         ))
         
         conn.commit()
-        cursor.close()
+        remember_write(conn, read_router is not None)
         conn.close()
         
         logger.info(f"Rezervasyon güncellendi: ID {reservation_id}")
         return True
         
-    except mysql.connector.Error as err:
+    except DB_ERRORS as err:
         logger.error(f"Rezervasyon güncelleme hatası: {err}")
         return False
 
@@ -295,17 +713,16 @@ def update_reservation_status_in_db(reservation_id, status):
         if not conn:
             return False
             
-        cursor = conn.cursor()
-        cursor.execute("UPDATE reservations SET status=%s WHERE id=%s", (status, reservation_id))
+        statements.execute(conn, 'reservation_status_update', (status, reservation_id))
         
         conn.commit()
-        cursor.close()
+        remember_write(conn, read_router is not None)
         conn.close()
         
         logger.info(f"Rezervasyon durumu güncellendi: ID {reservation_id}, Durum: {status}")
         return True
         
-    except mysql.connector.Error as err:
+    except DB_ERRORS as err:
         logger.error(f"Rezervasyon durum güncelleme hatası: {err}")
         return False
 
@@ -316,12 +733,9 @@ def delete_reservation_from_db(reservation_id):
         if not conn:
             return False
             
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM reservations WHERE id=%s", (reservation_id,))
-        
-        affected_rows = cursor.rowcount
+        affected_rows = statements.execute(conn, 'reservation_delete', (reservation_id,)).rowcount
         conn.commit()
-        cursor.close()
+        remember_write(conn, read_router is not None)
         conn.close()
         
         if affected_rows > 0:
@@ -329,16 +743,236 @@ def delete_reservation_from_db(reservation_id):
             return True
         return False
         
-    except mysql.connector.Error as err:
+    except DB_ERRORS as err:
         logger.error(f"Rezervasyon silme hatası: {err}")
         return False
 
+def load_reservation_by_id_from_db(reservation_id):
+    """Tek bir rezervasyonu veritabanından getir"""
+    try:
+        conn = get_db_connection(read=True)
+        if not conn:
+            return None
+            
+        row = statements.fetch_one(conn, 'reservation_by_id', (reservation_id,), dictionary=True)
+        
+        conn.close()
+        return reservation_from_row(row) if row else None
+        
+    except DB_ERRORS as err:
+        logger.error(f"Rezervasyon getirme hatası: {err}")
+        return None
+
+def reindex_reservations():
+    """Sütunlu indeksi memory'deki rezervasyon listesinden yeniden oluştur"""
+    global reservation_columns
+    if reservation_columns is not None:
+        reservation_columns.rebuild(reservations)
+    else:
+        reservation_columns = create_columns(reservations, CENTERS, VENUES, ('onay', 'bekle', 'iptal'), TIME_SLOTS)
+    search_index.rebuild(reservations)
+    booking_index.rebuild(reservations)
+    calendar_feeds.sync(reservations)
+
+def apply_reference_data(registry):
+    """Yeni merkez/salon/saat tanımlarını uygula ve bunlara bağlı indeksleri yeniden kur"""
+    global CENTERS, VENUES, TIME_SLOTS, reservation_columns, slot_occupancy
+    CENTERS, VENUES, TIME_SLOTS = registry.centers, registry.venues, registry.time_slots
+    if reservation_columns is not None:
+        # Sütunlu indeksin kategori kodları tanımlardan gelir; yeniden oluşturulmalı
+        reservation_columns = None
+        reindex_reservations()
+    if slot_occupancy is not None:
+        # İsim listesi değişince doluluk tablosu ayrı dosyada yeniden kurulur
+        slot_occupancy = open_slot_occupancy()
+
+def index_reservation(reservation):
+    """Eklenen veya değişen tek rezervasyonu sütunlu indekse, arama, aralık indeksine ve takvime yansıt"""
+    if not in_hot_window(reservation):
+        return
+    if reservation_columns is not None:
+        reservation_columns.upsert(reservation)
+    search_index.upsert(reservation)
+    booking_index.upsert(reservation)
+    calendar_feeds.upsert(reservation)
+
+def find_reservation(reservation_id):
+    """Rezervasyonu memory'de, yoksa veritabanında bul (başka worker'ın kaydı olabilir)"""
+    if reservation_columns is not None:
+        reservation = reservation_columns.get(reservation_id)
+        if reservation is not None:
+            return reservation
+    else:
+        for reservation in reservations:
+            if reservation['id'] == reservation_id:
+                return reservation
+    if connection_pool:
+        reservation = load_reservation_by_id_from_db(reservation_id)
+        if reservation:
+            remember_reservation(reservation)
+        return reservation
+    return None
+
+def is_reservation_in_memory(reservation_id):
+    if reservation_columns is not None:
+        return reservation_columns.get(reservation_id) is not None
+    return any(r['id'] == reservation_id for r in reservations)
+
+def in_hot_window(reservation):
+    """Rezervasyon memory'de tutulacak tarih penceresinde mi"""
+    return hot_window is None or hot_window.contains(reservation.date_value)
+
+def remember_reservation(reservation):
+    """Rezervasyonu memory'ye ekle (pencere dışındaysa sadece ayını kaydet)"""
+    if in_hot_window(reservation):
+        reservations.append(reservation)
+        index_reservation(reservation)
+    elif reservation.date_value:
+        outside_months.add(reservation.date_value.strftime('%Y-%m'))
+
+def forget_reservation(reservation_id):
+    """Rezervasyonu memory'den, sütunlu indeksten, arama, aralık indeksinden ve takvimden çıkar"""
+    global reservations
+    reservations = [r for r in reservations if r['id'] != reservation_id]
+    if reservation_columns is not None:
+        reservation_columns.remove(reservation_id)
+    search_index.remove(reservation_id)
+    booking_index.remove(reservation_id)
+    calendar_feeds.remove(reservation_id)
+
+def slide_hot_window():
+    """Gün değiştiyse pencereyi kaydır: çıkan kayıtları bırak, girenleri yükle"""
+    global hot_window, outside_months
+    new_window = current_window()
+    if new_window is None or new_window == hot_window or not connection_pool:
+        return False
+    with _hot_window_lock:
+        if new_window == hot_window:
+            return False
+        old_window, hot_window = hot_window, new_window
+        # Fark yüklemesi pencere ID'lerine göre çalışır: pencereden çıkanlar düşer, girenler yüklenir
+        if not refresh_reservations_from_db():
+            hot_window = old_window
+            return False
+        outside_months = load_outside_months()
+    logger.info(f"Bellek penceresi kaydırıldı: {hot_window}, {len(reservations)} kayıt")
+    return True
+
+def open_slot_occupancy():
+    """Paylaşılan doluluk tablosunu aç; bu gunicorn oturumunda ilk açan doldurur"""
+    if not OCCUPANCY_PATH:
+        return None
+    try:
+        # Tablo memory'deki kayıtlardan doldurulur; bellek penceresini aşmamalı
+        days_back, days_ahead = OCCUPANCY_DAYS_BACK, OCCUPANCY_DAYS_AHEAD
+        if hot_window:
+            days_back = min(days_back, HOT_WINDOW_DAYS_BACK)
+            days_ahead = min(days_ahead, HOT_WINDOW_DAYS_AHEAD)
+        base_date = datetime.now().date() - timedelta(days=days_back)
+        table = SlotOccupancy(OCCUPANCY_PATH, CENTERS, VENUES, booking_hours(TIME_SLOTS), base_date,
+                              days_back + days_ahead)
+        build_key = os.getenv('OCCUPANCY_BUILD_KEY', f'pid-{os.getpid()}').encode()
+        table.ensure_built(reservations, build_key, base_date)
+        return table
+    except OSError as e:
+        logger.error(f"Doluluk tablosu açılamadı: {e}")
+        return None
+
+def occupancy_key(reservation):
+    return (reservation['center'], reservation.get('venue', 'Tiyatro Salonu'),
+            reservation['date'], reservation['time'])
+
+def update_slot_occupancy(reservation, active=None):
+    """Rezervasyonun aralığını paylaşılan doluluk tablosunda al veya boşalt
+
+    Alırken sadece boş veya zaten bu rezervasyona ait hücreler alınır.
+
+    Returns:
+        Aralık başka bir rezervasyondaysa False (hiçbir hücre değişmez)
+    """
+    if not slot_occupancy or not reservation:
+        return None
+    if active is None:
+        active = reservation['status'] in ACTIVE_STATUSES
+    if active:
+        return slot_occupancy.claim(*occupancy_key(reservation), reservation['id'])
+    slot_occupancy.release(*occupancy_key(reservation), reservation['id'])
+    return None
+
+# Durum -> (flash mesajı, kategori)
+STATUS_MESSAGES = {
+    'onay': ('onaylandı!', 'success'),
+    'bekle': ('beklemeye alındı!', 'warning'),
+    'iptal': ('iptal edildi!', 'warning'),
+}
+
+def change_reservation_status(reservation_id, status):
+    """Durumu veritabanında, bellekte ve doluluk tablosunda güncelle
+
+    İptal edilmiş bir rezervasyon yeniden onaylanır veya beklemeye alınırsa
+    aralığı yazmadan önce alınır; bu sırada aynı aralığa başka bir kayıt
+    yapılmışsa durum değişmez.
+
+    Returns:
+        Güncellenen rezervasyon; bulunamazsa veya güncellenemezse None
+
+    Raises:
+        BookingConflict: Aralık başka bir aktif rezervasyonda
+    """
+    reservation = find_reservation(reservation_id)
+    if reservation is None:
+        return None
+    with center_lock(reservation['center']):
+        activating = status in ACTIVE_STATUSES and reservation['status'] not in ACTIVE_STATUSES
+        if activating:
+            # Doluluk tablosu kapalıysa veya günü kapsamıyorsa çakışma veritabanı/aralık indeksinden bulunur
+            if check_reservation_conflict(reservation['center'], reservation['date'], reservation['time'],
+                                          reservation.get('venue'), exclude_id=reservation_id):
+                raise BookingConflict(status_conflict_message(reservation))
+            if update_slot_occupancy(reservation, active=True) is False:
+                raise BookingConflict(status_conflict_message(reservation))
+        if connection_pool and not update_reservation_status_in_db(reservation_id, status):
+            if activating:
+                update_slot_occupancy(reservation, active=False)
+            return None
+        reservation['status'] = status
+        index_reservation(reservation)
+        if status not in ACTIVE_STATUSES:
+            update_slot_occupancy(reservation, active=False)
+    return reservation
+
+def status_conflict_message(reservation):
+    return (f"#{reservation['id']} numaralı rezervasyon etkinleştirilemedi: "
+            f"{reservation['center']} - {reservation.get('venue') or 'Tiyatro Salonu'} için "
+            f"{reservation['date']} tarihinde {reservation['time']} aralığında başka bir rezervasyon var!")
+
+def remove_reservation(reservation_id):
+    """Rezervasyonu veritabanından, bellekten ve doluluk tablosundan sil
+
+    Returns:
+        bool: Silindiyse True
+    """
+    reservation = find_reservation(reservation_id)
+    if reservation is None:
+        return False
+    with center_lock(reservation['center']):
+        if connection_pool and not delete_reservation_from_db(reservation_id):
+            return False
+        forget_reservation(reservation_id)
+        update_slot_occupancy(reservation, active=False)
+    return True
+
 def sync_reservations_to_memory():
     """Veritabanından rezervasyonları memory'ye yükle"""
-    global reservations
+    global reservations, reservations_watermark, hot_window, outside_months
     try:
         if connection_pool:
-            reservations = load_reservations_from_db()
+            hot_window = current_window()
+            # Yüklemeden önce alınan zaman: sonraki değişiklikler bu zamandan sonra olur
+            reservations_watermark, marker = get_sync_position()
+            reservations = load_reservations_from_db(marker)
+            outside_months = load_outside_months()
+            reindex_reservations()
             logger.info(f"Rezervasyonlar senkronize edildi: {len(reservations)} kayıt")
             return True
         return False
@@ -346,11 +980,215 @@ def sync_reservations_to_memory():
         logger.error(f"Rezervasyon senkronizasyon hatası: {e}")
         return False
 
-# Uygulama başlatıldığında veritabanını ve kullanıcıları yükle
+def refresh_reservations_from_db():
+    """Memory'deki rezervasyonlara sadece watermark sonrası değişiklikleri uygula"""
+    global reservations, reservations_watermark
+    if not connection_pool or not LOAD_RESERVATIONS:
+        return False
+    if reservations_watermark is None:
+        return sync_reservations_to_memory()
+    
+    new_watermark, marker = get_sync_position()
+    changed, existing_ids = load_reservation_changes(reservations_watermark, marker)
+    if changed is None:
+        return False
+    
+    by_id = {r['id']: r for r in reservations if r['id'] in existing_ids}
+    for reservation in changed:
+        if in_hot_window(reservation):
+            by_id[reservation['id']] = reservation
+        else:
+            by_id.pop(reservation['id'], None)
+    
+    # Değişmeden pencereye giren kayıtlar (pencere kaydı veya eski snapshot)
+    entered = existing_ids.difference(by_id)
+    if entered:
+        loaded = load_reservations_by_ids_from_db(entered, marker=marker)
+        if loaded is None:
+            return False
+        by_id.update((r['id'], r) for r in loaded if in_hot_window(r))
+    
+    reservations = sorted(by_id.values(), key=lambda r: r.created_at_value or datetime.min, reverse=True)
+    reservations_watermark = new_watermark
+    reindex_reservations()
+    logger.info(f"Rezervasyon farkı uygulandı: {len(changed)} değişiklik, {len(reservations)} kayıt")
+    return True
+
+def save_reservation_snapshot():
+    """Memory'deki rezervasyonları watermark ile birlikte diske yaz"""
+    if not SNAPSHOT_PATH or reservations_watermark is None:
+        return False
+    try:
+        # Liste kopyası: yazma sırasında istekler listeye ekleme yapabilir
+        return write_snapshot(SNAPSHOT_PATH, list(reservations), reservations_watermark)
+    except Exception as e:
+        logger.error(f"Snapshot yazma hatası: {e}")
+        return False
+
+def warm_start_reservations():
+    """Snapshot varsa ondan başla ve sadece farkı uygula, yoksa tam yükle"""
+    global reservations, reservations_watermark, hot_window, outside_months
+    if not connection_pool:
+        return False
+    
+    hot_window = current_window()
+    snapshot = read_snapshot(SNAPSHOT_PATH) if SNAPSHOT_PATH else None
+    if snapshot and snapshot[1] is not None:
+        reservations, reservations_watermark = snapshot
+        logger.info(f"Snapshot yüklendi: {len(reservations)} kayıt, watermark {reservations_watermark}")
+        if refresh_reservations_from_db():
+            outside_months = load_outside_months()
+            return True
+        logger.warning("Snapshot farkı uygulanamadı, tam yükleme yapılıyor")
+    
+    if sync_reservations_to_memory():
+        save_reservation_snapshot()
+        return True
+    return False
+
+def _snapshot_writer_loop():
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL)
+        try:
+            # Başka bir worker kısa süre önce yazdıysa tekrar yazma
+            if time.time() - os.path.getmtime(SNAPSHOT_PATH) < SNAPSHOT_INTERVAL / 2:
+                continue
+        except OSError:
+            pass
+        save_reservation_snapshot()
+
+@app.before_request
+def advance_hot_window():
+    """Gün değiştiğinde bellek penceresini ilerlet (her worker kendi belleği için)"""
+    if hot_window is not None and hot_window != current_window():
+        slide_hot_window()
+
+@app.before_request
+def start_snapshot_writer():
+    """Her worker sürecinde periyodik snapshot yazıcısını bir kez başlat"""
+    global _snapshot_writer_pid
+    if _snapshot_writer_pid == os.getpid() or not SNAPSHOT_PATH or not connection_pool:
+        return
+    _snapshot_writer_pid = os.getpid()
+    threading.Thread(target=_snapshot_writer_loop, name='snapshot-writer', daemon=True).start()
+
+def reinit_after_fork():
+    """Gunicorn preload_app ile fork edilen worker'ı hazırla
+    
+    Master'ın bağlantıları worker'lar arasında paylaşılamaz; her worker kendi
+    havuzunu açar ve master'da yüklenen veriye sadece aradaki farkı uygular.
+    """
+    global connection_pool, read_router
+    started = time.perf_counter()
+    connection_pool = create_connection_pool(pooled=True)
+    read_router = create_read_router(pooled=True)
+    refresh_reservations_from_db()
+    logger.info(f"Worker hazır (pid {os.getpid()}): {(time.perf_counter() - started) * 1000:.1f} ms")
+
+def release_connection_pool():
+    """Master süreçteki bağlantıları fork öncesi kapat
+
+    SQLite havuzları thread bağlantılarını kapatır. MySQL'de master
+    ``DB_POOL_AFTER_FORK`` ile havuz açmadığından açık bağlantı kalmaz;
+    havuzla yüklendiyse (gunicorn.conf.py dışından) uyarı verilir.
+    """
+    pools = [connection_pool, read_router.replica_pool if read_router else None]
+    for pool in pools:
+        if isinstance(pool, SQLiteConnectionPool):
+            pool.close_all()
+        elif pool and not isinstance(pool, UnpooledConnections):
+            logger.warning("Master'da MySQL havuzu açık; worker'lar fork sonrası kendi havuzlarını açar, "
+                           "master bağlantıları için DB_POOL_AFTER_FORK=True kullanın")
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Veritabanı şemasını ve varsayılan kullanıcıları oluştur"""
+    if init_database():
+        print("Veritabanı hazır.")
+    else:
+        print("Veritabanı oluşturulamadı, logları kontrol edin.")
+        sys.exit(1)
+
+@app.cli.command('build-assets')
+@click.option('--no-download', is_flag=True, help='Eksik vendor dosyalarını indirme')
+def build_assets_command(no_download):
+    """Parmak izli CSS/JS paketlerini static/dist altına derle"""
+    try:
+        manifest = build_assets(app.static_folder, download=not no_download)
+    except AssetError as e:
+        print(f"Statik paketler derlenemedi: {e}")
+        sys.exit(1)
+    for bundle, paths in manifest.items():
+        print(f"{bundle}: {', '.join(paths)}")
+
+@app.cli.command('rebuild-rollup')
+def rebuild_rollup_command():
+    """Kullanım özetini rezervasyon tablosundan yeniden hesapla"""
+    conn = get_db_connection()
+    if not conn:
+        print("Veritabanı bağlantısı kurulamadı.")
+        sys.exit(1)
+    try:
+        print(f"Kullanım özeti yeniden oluşturuldu: {rebuild_rollup(conn)} satır")
+    finally:
+        conn.close()
+
+@app.cli.command('partition-reservations')
+def partition_reservations_command():
+    """Mevcut rezervasyon tablosunu yıllara göre bölümle (tablo yeniden yazılır)"""
+    if Config.USE_SQLITE:
+        print("Bölümleme sadece MySQL'de desteklenir.")
+        sys.exit(1)
+    conn = get_db_connection()
+    if not conn:
+        print("Veritabanı bağlantısı kurulamadı.")
+        sys.exit(1)
+    cursor = conn.cursor()
+    try:
+        if partition_existing_table(cursor):
+            print("Rezervasyon tablosu yıllara göre bölümlendi.")
+        else:
+            added = ensure_year_partitions(cursor)
+            print(f"Tablo zaten bölümlü. Eklenen yıllar: {added or 'yok'}")
+        print(f"Partition'lar: {get_year_partitions(cursor)}")
+    finally:
+        cursor.close()
+        conn.close()
+
+@app.cli.command('archive-year')
+@click.argument('year', type=int)
+def archive_year_command(year):
+    """Kapanmış bir yılın rezervasyonlarını arşiv tablosuna taşı"""
+    if Config.USE_SQLITE:
+        print("Arşivleme sadece MySQL'de (bölümlü tabloda) desteklenir.")
+        sys.exit(1)
+    conn = get_db_connection()
+    if not conn:
+        print("Veritabanı bağlantısı kurulamadı.")
+        sys.exit(1)
+    try:
+        moved = archive_year(conn, year)
+        print(f"{year} yılı arşivlendi: {moved} satır taşındı.")
+    except ArchiveError as e:
+        print(f"Arşivleme yapılmadı: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+# Uygulama başlatıldığında kullanıcıları ve rezervasyonları yükle.
+# Şema kurulumu import sırasında yapılmaz: `flask --app app init-db` ile ayrıca çalıştırılır.
 if connection_pool:
-    init_database()
+    # Tanımlar indekslerden önce yüklenir (sütun kodları ve doluluk tablosu bunlara göre kurulur)
+    if reference_cache.refresh(get_db_connection, force=True):
+        apply_reference_data(reference_cache.registry)
     users = load_users_from_db()
-    sync_reservations_to_memory()  # Yeni senkronizasyon
+    if LOAD_RESERVATIONS:
+        warm_start_reservations()  # Snapshot + fark, yoksa tam senkronizasyon
+        slot_occupancy = open_slot_occupancy()
+        if reservation_columns is None:
+            reindex_reservations()
+    if not users:
+        logger.warning("Kullanıcı bulunamadı. Şema kurulmadıysa `flask --app app init-db` çalıştırın.")
     logger.info(f"Sistem başlatıldı. Kullanıcı sayısı: {len(users)}, Rezervasyon sayısı: {len(reservations)}")
 else:
     # MySQL bağlantısı yoksa eski sistem
@@ -382,6 +1220,7 @@ else:
         }
     }
     logger.warning("MySQL bağlantısı yok, memory-based sistem kullanılıyor")
+    reindex_reservations()
 
 def require_permission(permission):
     """Decorator: Belirli yetki gerektirir"""
@@ -439,48 +1278,166 @@ def is_logged_in():
     """Kullanıcının giriş yapıp yapmadığını kontrol et"""
     return 'user_id' in session
 
-def check_reservation_conflict(center, date, time, venue=None):
-    """Rezervasyon çakışmasını kontrol et - Etkinlik yeri dahil"""
-    for reservation in reservations:
-        if (reservation['center'] == center and 
-            reservation['date'] == date and 
-            reservation['time'] == time and
-            reservation.get('venue', 'Tiyatro Salonu') == venue and  # Varsayılan değer eski veriler için
-            reservation['status'] in ['onay', 'bekle']):  # Sadece aktif rezervasyonlar
-            return True
-    return False
+# Adminler X-Profile header'ı veya ?_profile=1 ile tek bir isteği profilleyebilir
+register_request_profiler(app, is_admin)
 
-def get_alternative_times(center, date, selected_time, venue=None):
-    """Alternatif saat dilimlerini öner - Etkinlik yeri dahil"""
-    time_slots = [
-        "09:00-10:00", "10:00-11:00", "11:00-12:00", "12:00-13:00",
-        "13:00-14:00", "14:00-15:00", "15:00-16:00", "16:00-17:00",
-        "17:00-18:00", "18:00-19:00", "19:00-20:00", "20:00-21:00", "21:00-22:00"
-    ]
-    
+# Tanımlar istek başında (en fazla REFERENCE_CHECK_SECONDS aralıkla) kontrol edilir; şablonlara aktarılır
+register_reference_data(app, reference_cache, lambda: get_db_connection(read=True),
+                        on_change=apply_reference_data)
+
+def load_day_intervals_from_db(center, date, venue, exclude_id=None, read=True):
+    """Günün aktif aralıkları [(başlangıç, bitiş, id)] (bağlantı yoksa None)"""
     try:
-        current_index = time_slots.index(selected_time)
-    except ValueError:
-        return []
-    
-    alternatives = []
-    
-    # Bir saat öncesi
-    if current_index > 0:
-        prev_time = time_slots[current_index - 1]
-        if not check_reservation_conflict(center, date, prev_time, venue):
-            alternatives.append(prev_time)
+        conn = get_db_connection(read=read)
+        if not conn:
+            return None
+        rows = statements.fetch_all(conn, 'reservation_day_active_times',
+                                    (center, date, venue or 'Tiyatro Salonu', exclude_id or 0))
+        conn.close()
+    except DB_ERRORS as err:
+        logger.error(f"Müsaitlik sorgusu hatası: {err}")
+        return None
+    intervals = []
+    for row in rows:
+        parsed = parse_time_range(row['time'])
+        if parsed:
+            intervals.append((parsed[0], parsed[1], row['id']))
+    return sorted(intervals)
+
+def count_conflicts_in_db(center, date, time, venue, exclude_id=None):
+    """Aralıkla çakışan aktif rezervasyon sayısı (bağlantı yoksa None)"""
+    # Çakışma kontrolü birincil sunucuda yapılır; kopya gerideyse yeni kayıt görülmeyebilir
+    intervals = load_day_intervals_from_db(center, date, venue, exclude_id, read=False)
+    if intervals is None:
+        return None
+    requested = parse_time_range(time)
+    return sum(1 for interval in intervals if requested and overlaps(interval, requested))
+
+def get_day_intervals(center, date, venue, exclude_id=None):
+    """Günün dolu aralıkları [(başlangıç, bitiş, id)]
+
+    Önce paylaşılan doluluk tablosu, bellek penceresi dışındaki günler için
+    veritabanı, diğerleri için aralık indeksi kullanılır.
+    """
+    intervals = slot_occupancy.day_intervals(center, venue, date, exclude_id) if slot_occupancy else None
+    if intervals is not None:
+        return intervals
+    if hot_window and not hot_window.contains(date):
+        intervals = load_day_intervals_from_db(center, date, venue, exclude_id)
+        if intervals is not None:
+            return intervals
+    return booking_index.day_intervals(center, venue, date, exclude_id)
+
+def check_reservation_conflict(center, date, time, venue=None, exclude_id=None):
+    """Aralık aynı merkez ve etkinlik yerindeki aktif bir rezervasyonla çakışıyor mu"""
+    # Paylaşılan doluluk tablosu tüm worker'ların kayıtlarını görür
+    if slot_occupancy:
+        occupied = slot_occupancy.is_occupied(center, venue, date, time, exclude_id)
+        if occupied is not None:
+            return occupied
     
-    # Bir saat sonrası
-    if current_index < len(time_slots) - 1:
-        next_time = time_slots[current_index + 1]
-        if not check_reservation_conflict(center, date, next_time, venue):
-            alternatives.append(next_time)
+    # Bellek penceresi dışındaki tarihler veritabanında kontrol edilir
+    if hot_window and not hot_window.contains(date):
+        count = count_conflicts_in_db(center, date, time, venue, exclude_id)
+        if count is not None:
+            return count > 0
     
-    return alternatives
+    # Aralık indeksinde ikili arama (tüm liste taranmaz)
+    return bool(booking_index.conflicts(center, venue, date, time, exclude_id))
+
+def load_active_slots_in_db(start, end, exclude_id=None):
+    """[start, end) aralığındaki aktif aralıklar: {(merkez, salon, gün): [(başlangıç, bitiş)]} (bağlantı yoksa None)"""
+    try:
+        conn = get_db_connection(read=True)
+        if not conn:
+            return None
+        rows = statements.fetch_all(conn, 'reservation_active_slots_range', (start, end, exclude_id or 0))
+        conn.close()
+    except DB_ERRORS as err:
+        logger.error(f"Dilim aralığı sorgusu hatası: {err}")
+        return None
+    taken = {}
+    for row in rows:
+        parsed = parse_time_range(row['time'])
+        if parsed is None:
+            continue
+        day = row['date'] if isinstance(row['date'], date_type) else date_type.fromisoformat(str(row['date'])[:10])
+        taken.setdefault((row['center'], row['venue'], day), []).append(parsed)
+    return taken
+
+def get_occupied_slots(places, days, exclude_id=None):
+    """(merkez, salon, gün) başına dolu aralıklar - tek geçişte
+
+    Önce paylaşılan doluluk tablosu okunur (gün başına tek okuma). Tablonun
+    kapsamadığı günler aralık indeksinden, bellek penceresi dışındakiler tek
+    bir aralık sorgusuyla tamamlanır.
+    """
+    occupied = {}
+    missing = []
+    for center, venue in places:
+        for day in days:
+            intervals = slot_occupancy.day_intervals(center, venue, day, exclude_id) if slot_occupancy else None
+            if intervals is None:
+                missing.append((center, venue, day))
+            else:
+                occupied[(center, venue, day)] = intervals
+    if not missing:
+        return occupied
+
+    outside_days = {day for _, _, day in missing if hot_window and not hot_window.contains(day)}
+    taken = {}
+    if outside_days:
+        loaded = load_active_slots_in_db(min(outside_days), max(outside_days) + timedelta(days=1), exclude_id)
+        if loaded is None:
+            # Doluluğu bilinmeyen günler önerilmez
+            hours = booking_hours(TIME_SLOTS)
+            loaded = {key: [(hours.opens, hours.closes)] for key in missing if key[2] in outside_days}
+        taken.update(loaded)
+    for key in missing:
+        center, venue, day = key
+        occupied[key] = taken.get(key, []) if day in outside_days \
+            else booking_index.day_intervals(center, venue, day, exclude_id)
+    return occupied
+
+def find_alternative_slots(center, date, time, venue=None, exclude_id=None, days=ALTERNATIVE_DAYS,
+                           limit=ALTERNATIVE_LIMIT, other_centers=ALTERNATIVE_OTHER_CENTERS):
+    """Dolu aralık için aynı uzunlukta en yakın boş aralıklar (sonraki günler, diğer salon, istenirse diğer merkezler)"""
+    try:
+        day = date_type.fromisoformat(date)
+    except (TypeError, ValueError):
+        return []
+    venue = venue or 'Tiyatro Salonu'
+    places = candidate_places(center, venue, CENTERS, VENUES, other_centers)
+    candidate_dates = candidate_days(day, days)
+    occupied = get_occupied_slots(places, candidate_dates, exclude_id)
+    return rank_alternatives(center, venue, day, time, booking_hours(TIME_SLOTS), places, candidate_dates,
+                             occupied, limit)
+
+def conflict_message(center, date, time, venue, alternatives):
+    """Çakışma uyarısı - önerilen boş dilimlerle birlikte"""
+    message = f'Bu saat aralığında ({time}) {center} - {venue}\'nde {date} tarihinde zaten rezervasyon var'
+    if not alternatives:
+        return message + ' ve yakın tarihlerde aynı uzunlukta boş aralık bulunamadı!'
+    alt_text = ", ".join(format_alternative(alt, center, venue, date) for alt in alternatives)
+    return f'{message}! En yakın boş dilimler: {alt_text}'
 
 def get_filtered_reservations(center_filter=None, status_filter=None, month_filter=None, year_filter=None, venue_filter=None):
-    """Rezervasyonları filtreleme - Etkinlik yeri dahil"""
+    """Rezervasyonları filtreleme - Etkinlik yeri dahil
+    
+    Bellek penceresi açıksa filtrelerin pencere dışında kalan kısmı
+    veritabanından getirilip sonuca eklenir.
+    """
+    filtered = filter_memory_reservations(center_filter, status_filter, month_filter, year_filter, venue_filter)
+    outside = load_reservations_outside_window(center_filter, status_filter, month_filter, year_filter, venue_filter)
+    if outside:
+        filtered = sorted(filtered + outside, key=lambda r: r.created_at_value or datetime.min, reverse=True)
+    return filtered
+
+def filter_memory_reservations(center_filter, status_filter, month_filter, year_filter, venue_filter):
+    """Filtreleri memory'deki rezervasyonlara uygula"""
+    if reservation_columns is not None:
+        return filter_reservation_columns(center_filter, status_filter, month_filter, year_filter, venue_filter)
+    
     filtered = reservations.copy()
     
     if center_filter and center_filter != 'all':
@@ -492,26 +1449,100 @@ def get_filtered_reservations(center_filter=None, status_filter=None, month_filt
     if month_filter and month_filter != 'all':
         try:
             year, month = month_filter.split('-')
-            filtered = [r for r in filtered if r['date'].startswith(f"{year}-{month}")]
+            year, month = int(year), int(month)
+            filtered = [r for r in filtered
+                        if r.date_value and r.date_value.year == year and r.date_value.month == month]
         except ValueError:
             pass
     
     if year_filter and year_filter != 'all':
-        filtered = [r for r in filtered if r['date'].startswith(f"{year_filter}-")]
+        try:
+            year = int(year_filter)
+            filtered = [r for r in filtered if r.date_value and r.date_value.year == year]
+        except ValueError:
+            filtered = []
     
     if venue_filter and venue_filter != 'all':
         filtered = [r for r in filtered if r.get('venue', 'Tiyatro Salonu') == venue_filter]
     
     return filtered
 
+def filter_reservation_columns(center_filter, status_filter, month_filter, year_filter, venue_filter):
+    """Filtreleri sütunlu indeks üzerinde vektörel maskelerle uygula"""
+    filters = {'center': center_filter, 'status': status_filter, 'venue': venue_filter}
+    try:
+        if month_filter and month_filter != 'all':
+            year, month = month_filter.split('-')
+            filters['year'], filters['month'] = int(year), int(month)
+    except ValueError:
+        pass
+    if year_filter and year_filter != 'all':
+        try:
+            year = int(year_filter)
+        except ValueError:
+            return []
+        if filters.get('year', year) != year:
+            # Ay ve yıl filtreleri farklı yılları gösteriyor
+            return []
+        filters['year'] = year
+    return reservation_columns.select(**filters)
+
+def search_filter(center_filter, status_filter, month_filter, year_filter, venue_filter):
+    """Liste filtrelerini arama sonuçlarına uygulanacak tek kayıt kontrolüne çevir"""
+    date_range = filter_date_range(month_filter, year_filter)
+    if date_range is None:
+        return lambda reservation: False
+    start, end = date_range
+
+    def matches(reservation):
+        if center_filter and center_filter != 'all' and reservation['center'] != center_filter:
+            return False
+        if status_filter and status_filter != 'all' and reservation['status'] != status_filter:
+            return False
+        if venue_filter and venue_filter != 'all' and reservation.get('venue', 'Tiyatro Salonu') != venue_filter:
+            return False
+        day = reservation.date_value
+        if start is not None and not (day and day >= start):
+            return False
+        if end is not None and not (day and day < end):
+            return False
+        return True
+    return matches
+
+def search_reservations(query, page, center_filter=None, status_filter=None, month_filter=None, year_filter=None, venue_filter=None):
+    """Ad soyad ve açıklamada sıralı, sayfalı arama (filtrelerle birlikte)
+
+    İndeks bellek penceresini kapsar. Ay veya yıl filtresi pencere dışına
+    taşıyorsa o aralık (arşiv dahil) veritabanından okunup aynı sıralamaya
+    katılır. Tarih filtresi yoksa geçmişin tamamı taranmaz; sonuç pencereyle
+    sınırlıdır ve ``window`` bunu (başlangıç, bitiş) olarak bildirir.
+
+    Returns:
+        dict: q, page, pages, total, sayfadaki rezervasyonlar (results) ve
+        sonuç pencereyle sınırlıysa window, değilse None
+    """
+    predicate = search_filter(center_filter, status_filter, month_filter, year_filter, venue_filter)
+    date_range = filter_date_range(month_filter, year_filter)
+    outside = bool(hot_window and date_range and hot_window.outside(*date_range))
+    bounded = date_range is not None and None not in date_range
+    extra, window = [], None
+    if outside and bounded and searchable(query):
+        extra = load_reservations_outside_window(center_filter, status_filter, month_filter, year_filter,
+                                                 venue_filter, archive=True)
+    elif outside and not bounded:
+        window = (hot_window.start.isoformat(), (hot_window.end - timedelta(days=1)).isoformat())
+    results, total = search_index.search(query, page, SEARCH_PAGE_SIZE, predicate, extra=extra)
+    pages = max((total + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE, 1)
+    return {'q': query, 'page': page, 'pages': pages, 'total': total, 'results': results, 'window': window}
+
 def get_available_months():
     """Mevcut rezervasyonların aylarını getir"""
-    months = set()
-    for reservation in reservations:
-        date_parts = reservation['date'].split('-')
-        if len(date_parts) >= 2:
-            months.add(f"{date_parts[0]}-{date_parts[1]}")
-    return sorted(list(months))
+    if reservation_columns is not None:
+        months = {f"{year:04d}-{month:02d}" for year, month in reservation_columns.months()}
+    else:
+        months = {r.date_value.strftime('%Y-%m') for r in reservations if r.date_value}
+    # Bellek penceresi dışındaki aylar
+    return sorted(months | outside_months)
 
 def get_available_years():
     """Mevcut rezervasyonların yıllarını getir + gelecek 5 yıl"""
@@ -519,14 +1550,11 @@ def get_available_years():
     current_year = datetime.now().year
     
     # Mevcut rezervasyonlardan yılları al
-    for reservation in reservations:
-        date_parts = reservation['date'].split('-')
-        if len(date_parts) >= 1:
-            try:
-                year = int(date_parts[0])
-                years.add(year)
-            except ValueError:
-                pass
+    if reservation_columns is not None:
+        years.update(reservation_columns.years())
+    else:
+        years.update(r.date_value.year for r in reservations if r.date_value)
+    years.update(int(month[:4]) for month in outside_months)
     
     # Mevcut yıl ve gelecek 5 yılı ekle
     for i in range(6):  # 2025, 2026, 2027, 2028, 2029, 2030
@@ -534,164 +1562,6 @@ def get_available_years():
     
     return sorted(list(years))
 
-def create_excel_file(reservations_data, filters):
-    """Excel dosyası oluştur - Güvenli hata yönetimi ile"""
-    try:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Rezervasyonlar"
-        
-        # Başlık stilleri
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        
-        # Kenarlık stili
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        # Başlık bilgileri
-        ws.merge_cells('A1:I1')
-        ws['A1'] = "REZERVASYON LİSTESİ"
-        ws['A1'].font = Font(bold=True, size=16)
-        ws['A1'].alignment = Alignment(horizontal="center")
-        
-        # Filtre bilgileri - Güvenli erişim
-        filter_info = []
-        if filters.get('center', 'all') != 'all':
-            filter_info.append(f"Merkez: {filters.get('center', '')}")
-        if filters.get('venue', 'all') != 'all':
-            filter_info.append(f"Etkinlik Yeri: {filters.get('venue', '')}")
-        if filters.get('status', 'all') != 'all':
-            status_names = {'onay': 'Onaylı', 'bekle': 'Beklemede', 'iptal': 'İptal'}
-            status_value = filters.get('status', '')
-            filter_info.append(f"Durum: {status_names.get(status_value, status_value)}")
-        if filters.get('month', 'all') != 'all':
-            month_names = {
-                '01': 'Ocak', '02': 'Şubat', '03': 'Mart', '04': 'Nisan',
-                '05': 'Mayıs', '06': 'Haziran', '07': 'Temmuz', '08': 'Ağustos',
-                '09': 'Eylül', '10': 'Ekim', '11': 'Kasım', '12': 'Aralık'
-            }
-            month_value = filters.get('month', '')
-            if month_value and '-' in month_value:
-                try:
-                    year, month_num = month_value.split('-')
-                    filter_info.append(f"Ay: {month_names.get(month_num, month_num)} {year}")
-                except ValueError:
-                    filter_info.append(f"Ay: {month_value}")
-        if filters.get('year', 'all') != 'all':
-            filter_info.append(f"Yıl: {filters.get('year', '')}")
-        
-        if filter_info:
-            ws.merge_cells('A2:I2')
-            ws['A2'] = f"Filtreler: {' | '.join(filter_info)}"
-            ws['A2'].font = Font(italic=True)
-            ws['A2'].alignment = Alignment(horizontal="center")
-            start_row = 4
-        else:
-            start_row = 3
-        
-        # Tarih bilgisi
-        ws.merge_cells(f'A{start_row-1}:I{start_row-1}')
-        ws[f'A{start_row-1}'] = f"Oluşturulma Tarihi: {datetime.now().strftime('%d.%m.%Y %H:%M')}"
-        ws[f'A{start_row-1}'].font = Font(size=10)
-        ws[f'A{start_row-1}'].alignment = Alignment(horizontal="right")
-        
-        # Tablo başlıkları
-        headers = ['#', 'Ad Soyad', 'Merkez', 'Etkinlik Yeri', 'Tarih', 'Saat', 'Durum', 'Açıklama', 'Oluşturulma']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=start_row, column=col)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            cell.border = thin_border
-        
-        # Veri satırları
-        status_colors = {
-            'onay': PatternFill(start_color="D4F4DD", end_color="D4F4DD", fill_type="solid"),
-            'bekle': PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid"),
-            'iptal': PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
-        }
-        
-        status_names = {'onay': 'Onaylı', 'bekle': 'Beklemede', 'iptal': 'İptal'}
-        
-        for row_idx, reservation in enumerate(reservations_data, start_row + 1):
-            # Güvenli veri erişimi
-            try:
-                # Tarih formatını düzenle
-                date_value = reservation.get('date', '')
-                try:
-                    if isinstance(date_value, str):
-                        date_obj = datetime.strptime(date_value, '%Y-%m-%d')
-                        formatted_date = date_obj.strftime('%d.%m.%Y')
-                    else:
-                        formatted_date = str(date_value)
-                except:
-                    formatted_date = str(date_value)
-                
-                # Oluşturulma tarihini formatla
-                created_value = reservation.get('created_at', '')
-                try:
-                    if isinstance(created_value, str) and created_value:
-                        created_obj = datetime.strptime(created_value, '%Y-%m-%d %H:%M:%S')
-                        formatted_created = created_obj.strftime('%d.%m.%Y %H:%M')
-                    else:
-                        formatted_created = str(created_value) if created_value else '-'
-                except:
-                    formatted_created = str(created_value) if created_value else '-'
-                
-                data = [
-                    reservation.get('id', ''),
-                    reservation.get('name_surname', ''),
-                    reservation.get('center', ''),
-                    reservation.get('venue', 'Tiyatro Salonu'),
-                    formatted_date,
-                    reservation.get('time', ''),
-                    status_names.get(reservation.get('status', ''), reservation.get('status', '')),
-                    reservation.get('description', '') or '-',
-                    formatted_created
-                ]
-                
-                for col, value in enumerate(data, 1):
-                    cell = ws.cell(row=row_idx, column=col)
-                    cell.value = str(value) if value is not None else ''
-                    cell.border = thin_border
-                    cell.alignment = Alignment(vertical="center")
-                    
-                    # Durum sütunu için renk
-                    if col == 7:  # Durum sütunu
-                        reservation_status = reservation.get('status', '')
-                        if reservation_status in status_colors:
-                            cell.fill = status_colors[reservation_status]
-                            
-            except Exception as e:
-                logger.error(f"Excel satır hatası: {e}")
-                continue
-        
-        # Sütun genişliklerini ayarla
-        column_widths = [5, 20, 25, 15, 12, 15, 12, 30, 18]
-        for col, width in enumerate(column_widths, 1):
-            ws.column_dimensions[get_column_letter(col)].width = width
-        
-        # Satır yüksekliklerini ayarla
-        for row in range(1, ws.max_row + 1):
-            ws.row_dimensions[row].height = 20
-        
-        return wb
-        
-    except Exception as e:
-        logger.error(f"Excel dosyası oluşturma hatası: {e}")
-        # Hata durumunda basit bir Excel dosyası oluştur
-        wb = Workbook()
-        ws = wb.active
-        ws['A1'] = "Hata: Excel dosyası oluşturulamadı"
-        return wb
-
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     """Kullanıcı giriş sayfası"""
@@ -736,7 +1606,8 @@ def index():
         center = request.form.get('center', '')
         venue = request.form.get('venue', '')
         date = request.form.get('date', '')
-        time = request.form.get('time', '')
+        # Başlangıç/bitiş alanları (eski istemciler için tek 'time' alanı da kabul edilir)
+        time = combine_time_range(request.form)
         description = request.form.get('description', '').strip()
 
         # Temel validasyon
@@ -751,16 +1622,11 @@ def index():
                 'description': description
             })
 
-        # Çakışma kontrolü - Etkinlik yeri dahil
-        if check_reservation_conflict(center, date, time, venue):
-            alternatives = get_alternative_times(center, date, time, venue)
-            
-            if alternatives:
-                alt_text = ", ".join(alternatives)
-                flash(f'Bu saat dilimi ({time}) için {center} - {venue}\'nde {date} tarihinde zaten rezervasyon var! Alternatif saatler: {alt_text}', 'error')
-            else:
-                flash(f'Bu saat dilimi ({time}) için {center} - {venue}\'nde {date} tarihinde zaten rezervasyon var ve alternatif saat bulunamadı!', 'error')
-            
+        # Saat aralığı açılış-kapanış içinde ve adımlara hizalı olmalı
+        try:
+            time = booking_hours(TIME_SLOTS).normalize(time)
+        except ValueError as e:
+            flash(str(e), 'error')
             return render_template('index.html', form_data={
                 'name_surname': name_surname,
                 'center': center,
@@ -782,28 +1648,52 @@ def index():
             'created_by': session.get('user_id')
         }
 
-        # MySQL'e kaydet
-        if connection_pool:
-            reservation_id = save_reservation_to_db(reservation_data)
-            if reservation_id:
-                # Memory'ye de ekle (anlık sync için)
-                reservation_data.update({
-                    'id': reservation_id,
-                    'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
-                reservations.append(reservation_data)
-                flash('Rezervasyon başarıyla oluşturuldu! Durum: Beklemede', 'success')
+        # Aynı merkezdeki yazmalar bu worker'da sıraya girer; diğer merkezler beklemez.
+        # Çakışma kontrolü kilit altında yapılır: doluluk tablosu kapalıysa veya gün tablonun
+        # dışındaysa kontrol ile kayıt arasında aynı aralığı başka bir istek alamaz
+        with center_lock(center):
+            if check_reservation_conflict(center, date, time, venue):
+                alternatives = find_alternative_slots(center, date, time, venue)
+                flash(conflict_message(center, date, time, venue, alternatives), 'error')
+                return render_template('index.html', alternatives=alternatives, form_data=reservation_data)
+
+            # MySQL'e kaydet
+            if connection_pool:
+                # Dilimi INSERT öncesi atomik olarak ayır: iki worker aynı dilimi alamaz
+                slot_key = occupancy_key(reservation_data)
+                if slot_occupancy and slot_occupancy.claim(*slot_key) is False:
+                    alternatives = find_alternative_slots(center, date, time, venue)
+                    flash(conflict_message(center, date, time, venue, alternatives), 'error')
+                    return render_template('index.html', alternatives=alternatives, form_data=reservation_data)
+                
+                reservation_id = save_reservation_to_db(reservation_data)
+                if reservation_id:
+                    # Memory'ye de ekle (anlık sync için)
+                    new_reservation = Reservation.from_dict(dict(
+                        reservation_data,
+                        id=reservation_id,
+                        created_at=datetime.now()
+                    ))
+                    remember_reservation(new_reservation)
+                    if slot_occupancy:
+                        # Ayrılan hücreler PENDING; sadece onlar kaydın ID'sine devredilir
+                        slot_occupancy.transfer(*slot_key, PENDING, reservation_id)
+                    flash('Rezervasyon başarıyla oluşturuldu! Durum: Beklemede', 'success')
+                else:
+                    if slot_occupancy:
+                        slot_occupancy.release(*slot_key, PENDING)
+                    flash('Rezervasyon kaydedilirken hata oluştu!', 'error')
+                    return render_template('index.html', form_data=reservation_data)
             else:
-                flash('Rezervasyon kaydedilirken hata oluştu!', 'error')
-                return render_template('index.html', form_data=reservation_data)
-        else:
-            # MySQL yoksa eski sistem
-            reservation_data.update({
-                'id': len(reservations) + 1,
-                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            })
-            reservations.append(reservation_data)
-            flash('Rezervasyon başarıyla oluşturuldu! Durum: Beklemede', 'success')
+                # MySQL yoksa eski sistem
+                new_reservation = Reservation.from_dict(dict(
+                    reservation_data,
+                    id=len(reservations) + 1,
+                    created_at=datetime.now()
+                ))
+                reservations.append(new_reservation)
+                index_reservation(new_reservation)
+                flash('Rezervasyon başarıyla oluşturuldu! Durum: Beklemede', 'success')
         
         # Yönlendirme
         if is_admin():
@@ -826,13 +1716,20 @@ def reservations_list():
     month_filter = request.args.get('month', 'all')
     year_filter = request.args.get('year', str(datetime.now().year))
     venue_filter = request.args.get('venue', 'all')  # Yeni filtre
+    query = request.args.get('q', '').strip()
     
-    # Filtrelenmiş rezervasyonları getir
-    filtered_reservations = get_filtered_reservations(center_filter, status_filter, month_filter, year_filter, venue_filter)
+    # Arama varsa indeksten sıralı sayfa, yoksa filtrelenmiş rezervasyonları getir
+    search = None
+    if query:
+        search = search_reservations(query, request.args.get('page', 1, type=int),
+                                     center_filter, status_filter, month_filter, year_filter, venue_filter)
+        filtered_reservations = search['results']
+    else:
+        filtered_reservations = get_filtered_reservations(center_filter, status_filter, month_filter, year_filter, venue_filter)
     
     # Filtre seçenekleri için veriler
-    centers = ['Sefaköy Kültür Merkezi', 'Cennet Kültür Merkezi', 'Atakent Kültür Merkezi', 'Kemalpaşa Semt Konağı']
-    venues = ['Tiyatro Salonu', 'Seminer Salonu']  # Yeni seçenekler
+    centers = CENTERS
+    venues = VENUES
     statuses = [
         {'value': 'onay', 'label': 'Onaylı'},
         {'value': 'bekle', 'label': 'Beklemede'},
@@ -848,12 +1745,14 @@ def reservations_list():
                          statuses=statuses,
                          available_months=available_months,
                          available_years=available_years,
+                         search=search,
                          current_filters={
                              'center': center_filter,
                              'status': status_filter,
                              'month': month_filter,
                              'year': year_filter,
-                             'venue': venue_filter
+                             'venue': venue_filter,
+                             'q': query
                          })
 
 @app.route('/export/excel')
@@ -871,41 +1770,73 @@ def export_excel():
     year_filter = request.args.get('year', 'all')
     venue_filter = request.args.get('venue', 'all')  # Yeni filtre
     
+    # Excel dosyası oluştur - Güvenli filtre objesi
+    filters = {
+        'center': center_filter if center_filter else 'all',
+        'status': status_filter if status_filter else 'all',
+        'month': month_filter if month_filter else 'all',
+        'year': year_filter if year_filter else 'all',
+        'venue': venue_filter if venue_filter else 'all'
+    }
+    
+    # Dosya adını oluştur
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"rezervasyonlar_{timestamp}.xlsx"
+    
+    # Aynı filtreler ve aynı veri sürümü için oluşturulmuş dosya varsa diskten gönder
+    # Tek merkezli export sadece o merkezin sürümüne bağlıdır; diğer merkezlerin yazmaları dosyayı geçersiz kılmaz
+    export_center = filters['center'] if filters['center'] != 'all' else None
+    version = get_current_dataset_version(export_center) if EXPORT_CACHE_ENABLED else None
+    key = cache_key(filters, {'center': export_center, 'version': version}) if version is not None else None
+    if key:
+        cached_path = export_cache.get(key)
+        if cached_path:
+            logger.info(f"Export önbellekten gönderildi: {filters}, sürüm {version}")
+            return send_file(cached_path, mimetype=XLSX_MIMETYPE, as_attachment=True, download_name=filename)
+        # Önbelleğe yazılacak dosya en az bu sürümdeki veriyi içermeli
+        refresh_reservations_from_db()
+    
     # Filtrelenmiş rezervasyonları getir
     try:
         filtered_reservations = get_filtered_reservations(center_filter, status_filter, month_filter, year_filter, venue_filter)
     except Exception as e:
         logger.error(f"Filtreleme hatası: {e}")
         filtered_reservations = reservations  # Hata durumunda tüm rezervasyonları al
+        key = None
     
     if not filtered_reservations:
         flash('Export edilecek rezervasyon bulunamadı!', 'warning')
         return redirect(url_for('reservations_list'))
     
-    # Excel dosyası oluştur - Güvenli filtre objesi
-    filters = {
-        'center': center_filter if center_filter else 'all',
-        'status': status_filter if status_filter else 'all',
-        'month': month_filter if month_filter else 'all',
-        'year': year_filter if year_filter else 'all',
-        'venue': venue_filter if venue_filter else 'all'
-    }
+    # Büyük export'lar arka planda hazırlanır, tarayıcı durumu yoklar
+    if len(filtered_reservations) > EXPORT_SYNC_MAX_ROWS:
+        on_complete = (lambda path: export_cache.put_file(key, path)) if key else None
+        try:
+            job_id = submit_export(filtered_reservations, filters, session.get('user_id'), filename,
+                                   on_complete=on_complete)
+        except Exception as e:
+            logger.error(f"Export işi başlatılamadı: {e}")
+            flash('Excel dosyası oluşturulurken hata oluştu!', 'error')
+            return redirect(url_for('reservations_list'))
+        return render_template('export_status.html', job_id=job_id,
+                               rows=len(filtered_reservations), filename=filename)
     
     try:
         wb = create_excel_file(filtered_reservations, filters)
         
+        if key:
+            path = export_cache.put(key, wb)
+            flash(f'{len(filtered_reservations)} rezervasyon Excel dosyası olarak indirildi!', 'success')
+            return send_file(path, mimetype=XLSX_MIMETYPE, as_attachment=True, download_name=filename)
+        
         # Dosyayı memory'de oluştur
         output = io.BytesIO()
         wb.save(output)
         output.seek(0)
         
-        # Dosya adını oluştur
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"rezervasyonlar_{timestamp}.xlsx"
-        
         # Response oluştur
         response = make_response(output.read())
-        response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        response.headers['Content-Type'] = XLSX_MIMETYPE
         response.headers['Content-Disposition'] = f'attachment; filename={filename}'
         
         flash(f'{len(filtered_reservations)} rezervasyon Excel dosyası olarak indirildi!', 'success')
@@ -917,106 +1848,193 @@ def export_excel():
         flash('Excel dosyası oluşturulurken hata oluştu!', 'error')
         return redirect(url_for('reservations_list'))
 
-@app.route('/reservation/approve/<int:reservation_id>')
+def get_owned_export_job(job_id):
+    """Oturumdaki kullanıcıya ait export işi (yoksa None)"""
+    job = get_export_job(job_id)
+    if not job or job.get('owner') != session.get('user_id'):
+        return None
+    return job
+
+@app.route('/export/jobs/<job_id>')
+def export_job_status(job_id):
+    """Arka plan export işinin durumu (JSON)"""
+    if not has_permission('view_reservations'):
+        return jsonify({'error': 'Yetkiniz bulunmamaktadır'}), 403
+    job = get_owned_export_job(job_id)
+    if not job:
+        return jsonify({'error': 'Export işi bulunamadı veya süresi doldu'}), 404
+    
+    result = {'status': job['status'], 'rows': job['rows'], 'filename': job['filename']}
+    if job['status'] == EXPORT_DONE:
+        result['download_url'] = url_for('export_job_download', job_id=job_id)
+    elif job['status'] == EXPORT_ERROR:
+        result['error'] = 'Excel dosyası oluşturulurken hata oluştu'
+    return jsonify(result)
+
+@app.route('/export/jobs/<job_id>/download')
+def export_job_download(job_id):
+    """Tamamlanan export dosyasını indir"""
+    if not has_permission('view_reservations'):
+        flash('Bu işlem için gerekli yetkiniz bulunmamaktadır.', 'error')
+        return redirect(url_for('index'))
+    job = get_owned_export_job(job_id)
+    if not job or job['status'] != EXPORT_DONE:
+        flash('Export dosyası bulunamadı veya süresi doldu!', 'warning')
+        return redirect(url_for('reservations_list'))
+    
+    return send_file(export_job_file_path(job_id),
+                     mimetype=XLSX_MIMETYPE,
+                     as_attachment=True, download_name=job['filename'])
+
+STREAM_FORMATS = {
+    'csv': (generate_csv, CSV_MIMETYPE),
+    'ndjson': (generate_ndjson, NDJSON_MIMETYPE),
+}
+
+@app.route('/export/<any(csv, ndjson):export_format>')
+@require_permission('view_reservations')
+def export_stream(export_format):
+    """CSV / NDJSON export - satırlar veritabanından parça parça akıtılır"""
+    sql, params = build_export_query(
+        request.args.get('center', 'all'),
+        request.args.get('status', 'all'),
+        request.args.get('month', 'all'),
+        request.args.get('year', 'all'),
+        request.args.get('venue', 'all'),
+        archive=request.args.get('archive') == '1'
+    )
+    
+    # Bağlantı akış bitene kadar bu yanıta ayrılır (buffersız cursor)
+    conn = get_db_connection(read=True)
+    if not conn:
+        return jsonify({'error': 'Veritabanı bağlantısı yok'}), 503
+    
+    generate, mimetype = STREAM_FORMATS[export_format]
+    
+    def stream():
+        try:
+            for block in generate(iter_row_chunks(conn, sql, params)):
+                yield block
+        except DB_ERRORS as err:
+            # Başlıklar gönderildi; hata sadece loglanabilir, yanıt yarıda kesilir
+            logger.error(f"{export_format.upper()} export akış hatası: {err}")
+        finally:
+            conn.close()
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    response = Response(stream_with_context(stream()), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=rezervasyonlar_{timestamp}.{export_format}'
+    # Nginx yanıtı tamponlamasın, ilk bayt hemen istemciye gitsin
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/reservation/approve/<int:reservation_id>', methods=['POST'])
 @require_permission('edit_reservations')
 def approve_reservation(reservation_id):
     """Rezervasyonu onayla"""
-    # MySQL'de güncelle
-    if connection_pool and update_reservation_status_in_db(reservation_id, 'onay'):
-        # Memory'de de güncelle
-        for reservation in reservations:
-            if reservation['id'] == reservation_id:
-                reservation['status'] = 'onay'
-                break
-        flash(f"#{reservation_id} numaralı rezervasyon onaylandı!", 'success')
+    try:
+        changed = change_reservation_status(reservation_id, 'onay')
+    except BookingConflict as e:
+        flash(str(e), 'error')
+        return redirect(url_for('reservations_list'))
+    if changed:
+        message, category = STATUS_MESSAGES['onay']
+        flash(f"#{reservation_id} numaralı rezervasyon {message}", category)
     else:
-        # MySQL yoksa sadece memory
-        for reservation in reservations:
-            if reservation['id'] == reservation_id:
-                reservation['status'] = 'onay'
-                flash(f"#{reservation_id} numaralı rezervasyon onaylandı!", 'success')
-                break
-        else:
-            flash('Rezervasyon bulunamadı!', 'error')
+        flash('Rezervasyon bulunamadı!', 'error')
     return redirect(url_for('reservations_list'))
 
-@app.route('/reservation/pending/<int:reservation_id>')
+@app.route('/reservation/pending/<int:reservation_id>', methods=['POST'])
 @require_permission('edit_reservations')
 def pending_reservation(reservation_id):
     """Rezervasyonu beklemeye al"""
-    # MySQL'de güncelle
-    if connection_pool and update_reservation_status_in_db(reservation_id, 'bekle'):
-        # Memory'de de güncelle
-        for reservation in reservations:
-            if reservation['id'] == reservation_id:
-                reservation['status'] = 'bekle'
-                break
-        flash(f"#{reservation_id} numaralı rezervasyon beklemeye alındı!", 'warning')
+    try:
+        changed = change_reservation_status(reservation_id, 'bekle')
+    except BookingConflict as e:
+        flash(str(e), 'error')
+        return redirect(url_for('reservations_list'))
+    if changed:
+        message, category = STATUS_MESSAGES['bekle']
+        flash(f"#{reservation_id} numaralı rezervasyon {message}", category)
     else:
-        # MySQL yoksa sadece memory
-        for reservation in reservations:
-            if reservation['id'] == reservation_id:
-                reservation['status'] = 'bekle'
-                flash(f"#{reservation_id} numaralı rezervasyon beklemeye alındı!", 'warning')
-                break
-        else:
-            flash('Rezervasyon bulunamadı!', 'error')
+        flash('Rezervasyon bulunamadı!', 'error')
     return redirect(url_for('reservations_list'))
 
-@app.route('/reservation/cancel/<int:reservation_id>')
+@app.route('/reservation/cancel/<int:reservation_id>', methods=['POST'])
 @require_permission('edit_reservations')
 def cancel_reservation(reservation_id):
     """Rezervasyonu iptal et"""
-    # MySQL'de güncelle
-    if connection_pool and update_reservation_status_in_db(reservation_id, 'iptal'):
-        # Memory'de de güncelle
-        for reservation in reservations:
-            if reservation['id'] == reservation_id:
-                reservation['status'] = 'iptal'
-                break
-        flash(f"#{reservation_id} numaralı rezervasyon iptal edildi!", 'warning')
+    if change_reservation_status(reservation_id, 'iptal'):
+        message, category = STATUS_MESSAGES['iptal']
+        flash(f"#{reservation_id} numaralı rezervasyon {message}", category)
     else:
-        # MySQL yoksa sadece memory
-        for reservation in reservations:
-            if reservation['id'] == reservation_id:
-                reservation['status'] = 'iptal'
-                flash(f"#{reservation_id} numaralı rezervasyon iptal edildi!", 'warning')
-                break
-        else:
-            flash('Rezervasyon bulunamadı!', 'error')
+        flash('Rezervasyon bulunamadı!', 'error')
     return redirect(url_for('reservations_list'))
 
-@app.route('/reservation/delete/<int:reservation_id>')
+@app.route('/reservation/delete/<int:reservation_id>', methods=['POST'])
 @require_permission('edit_reservations')
 def delete_reservation(reservation_id):
     """Rezervasyonu sil"""
-    global reservations
-    
-    # MySQL'den sil
-    if connection_pool and delete_reservation_from_db(reservation_id):
-        # Memory'den de sil
-        initial_length = len(reservations)
-        reservations = [r for r in reservations if r['id'] != reservation_id]
+    if remove_reservation(reservation_id):
         flash(f"#{reservation_id} numaralı rezervasyon silindi!", 'success')
     else:
-        # MySQL yoksa sadece memory
-        initial_length = len(reservations)
-        reservations = [r for r in reservations if r['id'] != reservation_id]
-        
-        if len(reservations) < initial_length:
-            flash(f"#{reservation_id} numaralı rezervasyon silindi!", 'success')
-        else:
-            flash('Rezervasyon bulunamadı!', 'error')
-    
+        flash('Rezervasyon bulunamadı!', 'error')
     return redirect(url_for('reservations_list'))
 
+def api_permission_error(permission):
+    """JSON uç noktaları için yetki kontrolü: yetki yoksa (yanıt, durum kodu), varsa None"""
+    if not is_logged_in():
+        return jsonify({'error': 'Giriş yapmanız gerekiyor'}), 401
+    if not has_permission(permission):
+        return jsonify({'error': 'Bu işlem için gerekli yetkiniz bulunmamaktadır.'}), 403
+    return None
+
+@app.route('/api/reservations/<int:reservation_id>/status', methods=['POST'])
+def reservation_status_api(reservation_id):
+    """Durumu değiştir; listeyi yeniden çizmek yerine güncel tablo satırını döndür"""
+    error = api_permission_error('edit_reservations')
+    if error:
+        return error
+    status = request.form.get('status') or (request.get_json(silent=True) or {}).get('status')
+    if status not in STATUS_MESSAGES:
+        return jsonify({'error': 'Geçersiz durum'}), 400
+    try:
+        reservation = change_reservation_status(reservation_id, status)
+    except BookingConflict as e:
+        return jsonify({'error': str(e)}), 409
+    if reservation is None:
+        return jsonify({'error': 'Rezervasyon bulunamadı!'}), 404
+    message, category = STATUS_MESSAGES[status]
+    return jsonify({
+        'id': reservation_id,
+        'status': status,
+        'message': f"#{reservation_id} numaralı rezervasyon {message}",
+        'category': category,
+        'row': render_template('_reservation_row.html', reservation=reservation),
+    })
+
+@app.route('/api/reservations/<int:reservation_id>/delete', methods=['POST'])
+def reservation_delete_api(reservation_id):
+    """Rezervasyonu sil (JSON); istemci satırı tablodan kaldırır"""
+    error = api_permission_error('edit_reservations')
+    if error:
+        return error
+    if not remove_reservation(reservation_id):
+        return jsonify({'error': 'Rezervasyon bulunamadı!'}), 404
+    return jsonify({
+        'id': reservation_id,
+        'deleted': True,
+        'message': f"#{reservation_id} numaralı rezervasyon silindi!",
+        'category': 'success',
+    })
+
 @app.route('/reservation/edit/<int:reservation_id>')
 @require_permission('edit_reservations')
 def edit_reservation(reservation_id):
     """Rezervasyonu düzenleme sayfası"""
-    for reservation in reservations:
-        if reservation['id'] == reservation_id:
-            return render_template('edit_reservation.html', reservation=reservation)
+    reservation = find_reservation(reservation_id)
+    if reservation:
+        return render_template('edit_reservation.html', reservation=reservation)
     
     flash('Rezervasyon bulunamadı!', 'error')
     return redirect(url_for('reservations_list'))
@@ -1030,15 +2048,11 @@ def update_reservation(reservation_id):
     center = request.form.get('center', '')
     venue = request.form.get('venue', '')
     date = request.form.get('date', '')
-    time = request.form.get('time', '')
+    time = combine_time_range(request.form)
     description = request.form.get('description', '').strip()
 
     # Rezervasyonu bul
-    target_reservation = None
-    for reservation in reservations:
-        if reservation['id'] == reservation_id:
-            target_reservation = reservation
-            break
+    target_reservation = find_reservation(reservation_id)
     
     if not target_reservation:
         flash('Rezervasyon bulunamadı!', 'error')
@@ -1058,83 +2072,107 @@ def update_reservation(reservation_id):
                                  'description': description
                              })
 
-    # Çakışma kontrolü (kendisi hariç)
-    conflict_found = False
-    for reservation in reservations:
-        if (reservation['id'] != reservation_id and
-            reservation['center'] == center and 
-            reservation['date'] == date and 
-            reservation['time'] == time and
-            reservation.get('venue', 'Tiyatro Salonu') == venue and
-            reservation['status'] in ['onay', 'bekle']):
-            conflict_found = True
-            break
-
-    if conflict_found:
-        alternatives = get_alternative_times(center, date, time, venue)
-        if alternatives:
-            alt_text = ", ".join(alternatives)
-            flash(f'Bu saat dilimi ({time}) için {center} - {venue}\'nde {date} tarihinde zaten rezervasyon var! Alternatif saatler: {alt_text}', 'error')
-        else:
-            flash(f'Bu saat dilimi ({time}) için {center} - {venue}\'nde {date} tarihinde zaten rezervasyon var ve alternatif saat bulunamadı!', 'error')
+    # Saat aralığı açılış-kapanış içinde ve adımlara hizalı olmalı (değişmeyen eski değer kabul edilir)
+    if time != target_reservation['time']:
+        try:
+            time = booking_hours(TIME_SLOTS).normalize(time)
+        except ValueError as e:
+            flash(str(e), 'error')
+            return render_template('edit_reservation.html', 
+                                 reservation=target_reservation,
+                                 form_data={
+                                     'name_surname': name_surname,
+                                     'center': center,
+                                     'venue': venue,
+                                     'date': date,
+                                     'time': time,
+                                     'description': description
+                                 })
+
+    # Eski ve yeni merkezin yazmaları kontrol ile güncelleme arasında beklesin
+    with center_lock(target_reservation['center'], center):
+        # Çakışma kontrolü (kendisi hariç)
+        conflict_found = check_reservation_conflict(center, date, time, venue, exclude_id=reservation_id)
         
-        return render_template('edit_reservation.html', 
-                             reservation=target_reservation,
-                             form_data={
-                                 'name_surname': name_surname,
-                                 'center': center,
-                                 'venue': venue,
-                                 'date': date,
-                                 'time': time,
-                                 'description': description
-                             })
+        # Aktif rezervasyonun yeni aralığını atomik olarak ayır (eski aralıkla örtüşen hücreler zaten onun)
+        old_slot_key = occupancy_key(target_reservation)
+        new_slot_key = (center, venue, date, time)
+        is_active = target_reservation['status'] in ['onay', 'bekle']
+        if not conflict_found and slot_occupancy and is_active and new_slot_key != old_slot_key:
+            conflict_found = slot_occupancy.claim(*new_slot_key, reservation_id) is False
 
-    # Güncelleme verilerini hazırla
-    update_data = {
-        'name_surname': name_surname,
-        'center': center,
-        'venue': venue,
-        'date': date,
-        'time': time,
-        'description': description
-    }
+        if conflict_found:
+            alternatives = find_alternative_slots(center, date, time, venue, exclude_id=reservation_id)
+            flash(conflict_message(center, date, time, venue, alternatives), 'error')
+            
+            return render_template('edit_reservation.html', 
+                                 reservation=target_reservation,
+                                 alternatives=alternatives,
+                                 form_data={
+                                     'name_surname': name_surname,
+                                     'center': center,
+                                     'venue': venue,
+                                     'date': date,
+                                     'time': time,
+                                     'description': description
+                                 })
 
-    # MySQL'de güncelle
-    if connection_pool and update_reservation_in_db(reservation_id, update_data):
-        # Memory'de de güncelle
-        target_reservation.update(update_data)
-        target_reservation['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        flash(f'#{reservation_id} numaralı rezervasyon başarıyla güncellendi!', 'success')
-    else:
-        # MySQL yoksa sadece memory
-        target_reservation.update(update_data)
-        target_reservation['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        flash(f'#{reservation_id} numaralı rezervasyon başarıyla güncellendi!', 'success')
+        # Güncelleme verilerini hazırla
+        update_data = {
+            'name_surname': name_surname,
+            'center': center,
+            'venue': venue,
+            'date': date,
+            'time': time,
+            'description': description
+        }
+
+        # MySQL'de güncelle
+        if connection_pool and update_reservation_in_db(reservation_id, update_data):
+            # Memory'de de güncelle; yeni tarih pencere dışındaysa memory'den çıkar
+            target_reservation.update(update_data)
+            target_reservation['updated_at'] = datetime.now()
+            if not is_reservation_in_memory(reservation_id):
+                remember_reservation(target_reservation)
+            elif in_hot_window(target_reservation):
+                index_reservation(target_reservation)
+            else:
+                forget_reservation(reservation_id)
+                remember_reservation(target_reservation)
+            if slot_occupancy and is_active and new_slot_key != old_slot_key:
+                slot_occupancy.release(*old_slot_key, reservation_id, keep=new_slot_key)
+            flash(f'#{reservation_id} numaralı rezervasyon başarıyla güncellendi!', 'success')
+        elif connection_pool:
+            # Veritabanı güncellenemedi: ayrılan yeni aralığı geri bırak (eskisiyle örtüşen kısım kalır)
+            if slot_occupancy and is_active and new_slot_key != old_slot_key:
+                slot_occupancy.release(*new_slot_key, reservation_id, keep=old_slot_key)
+            flash('Rezervasyon güncellenirken hata oluştu!', 'error')
+        else:
+            # MySQL yoksa sadece memory
+            target_reservation.update(update_data)
+            target_reservation['updated_at'] = datetime.now()
+            index_reservation(target_reservation)
+            flash(f'#{reservation_id} numaralı rezervasyon başarıyla güncellendi!', 'success')
 
     return redirect(url_for('reservations_list'))
 
-def get_time_availability(center, date, venue=None):
-    """Belirli bir merkez, tarih ve etkinlik yeri için saat durumlarını getir"""
-    time_slots = [
-        "09:00-10:00", "10:00-11:00", "11:00-12:00", "12:00-13:00",
-        "13:00-14:00", "14:00-15:00", "15:00-16:00", "16:00-17:00",
-        "17:00-18:00", "18:00-19:00", "19:00-20:00", "20:00-21:00", "21:00-22:00"
-    ]
-    
-    availability = {}
-    for slot in time_slots:
-        is_occupied = False
-        for reservation in reservations:
-            if (reservation['center'] == center and 
-                reservation['date'] == date and 
-                reservation['time'] == slot and
-                reservation.get('venue', 'Tiyatro Salonu') == venue and
-                reservation['status'] in ['onay', 'bekle']):
-                is_occupied = True
-                break
-        availability[slot] = 'dolu' if is_occupied else 'bos'
-    
-    return availability
+def get_time_availability(center, date, venue=None, intervals=None):
+    """Belirli bir merkez, tarih ve etkinlik yeri için saat durumlarını getir
+
+    Tanımlı her saat dilimi, herhangi bir aktif rezervasyon aralığıyla kısmen
+    bile örtüşüyorsa doludur.
+    """
+    if intervals is None:
+        intervals = get_day_intervals(center, date, venue)
+    return {slot: 'dolu' if any_overlap(intervals, slot) else 'bos' for slot in TIME_SLOTS}
+
+def get_slot_owners(intervals):
+    """Her saat dilimiyle örtüşen rezervasyon ID'leri (canlı güncellemede dilimi kimin tuttuğu)"""
+    owners = {}
+    for slot in TIME_SLOTS:
+        parsed = parse_time_range(slot)
+        owners[slot] = [interval[2] for interval in intervals if parsed and overlaps(interval, parsed)]
+    return owners
 
 @app.route('/availability')
 def availability_view():
@@ -1147,12 +2185,18 @@ def availability_view():
     selected_date = request.args.get('date', '')
     selected_venue = request.args.get('venue', 'Tiyatro Salonu')  # Yeni parametre
     
-    centers = ['Sefaköy Kültür Merkezi', 'Cennet Kültür Merkezi', 'Atakent Kültür Merkezi', 'Kemalpaşa Semt Konağı']
-    venues = ['Tiyatro Salonu', 'Seminer Salonu']  # Yeni seçenekler
+    centers = CENTERS
+    venues = VENUES
     availability_data = {}
+    slot_owners = {}
+    day_bookings = []
     
     if selected_center and selected_date and selected_venue:
-        availability_data = get_time_availability(selected_center, selected_date, selected_venue)
+        intervals = get_day_intervals(selected_center, selected_date, selected_venue)
+        availability_data = get_time_availability(selected_center, selected_date, selected_venue, intervals)
+        slot_owners = get_slot_owners(intervals)
+        # Günün dolu aralıkları (dilimden uzun veya kısa rezervasyonlar dahil)
+        day_bookings = [format_time_range(start, end) for start, end, _ in intervals]
     
     return render_template('availability.html', 
                          centers=centers,
@@ -1160,7 +2204,41 @@ def availability_view():
                          selected_center=selected_center,
                          selected_date=selected_date,
                          selected_venue=selected_venue,
-                         availability_data=availability_data)
+                         availability_data=availability_data,
+                         slot_owners=slot_owners,
+                         day_bookings=day_bookings)
+
+@app.route('/api/alternatives')
+def alternatives_api():
+    """Dolu aralık için aynı uzunlukta en yakın boş aralıklar (JSON)"""
+    if not is_logged_in():
+        return jsonify({'error': 'Giriş yapmanız gerekiyor'}), 401
+    center = request.args.get('center', '')
+    venue = request.args.get('venue', 'Tiyatro Salonu')
+    date = request.args.get('date', '')
+    time = combine_time_range(request.args)
+    if center not in CENTERS or venue not in VENUES:
+        return jsonify({'error': 'Geçersiz merkez veya etkinlik yeri'}), 400
+    try:
+        time = booking_hours(TIME_SLOTS).normalize(time)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        date_type.fromisoformat(date)
+    except ValueError:
+        return jsonify({'error': 'Geçersiz tarih'}), 400
+    alternatives = find_alternative_slots(
+        center, date, time, venue,
+        exclude_id=request.args.get('exclude_id', type=int),
+        days=max(0, min(request.args.get('days', ALTERNATIVE_DAYS, type=int), 60)),
+        limit=max(1, min(request.args.get('limit', ALTERNATIVE_LIMIT, type=int), 50)),
+        other_centers=request.args.get('other_centers', str(ALTERNATIVE_OTHER_CENTERS)).lower() in ('1', 'true'),
+    )
+    return jsonify({
+        'requested': {'center': center, 'venue': venue, 'date': date, 'time': time},
+        'available': not check_reservation_conflict(center, date, time, venue, request.args.get('exclude_id', type=int)),
+        'alternatives': alternatives,
+    })
 
 @app.route('/admin/users')
 @require_permission('manage_users')
@@ -1168,6 +2246,158 @@ def admin_users():
     """Kullanıcı yönetimi sayfası"""
     return render_template('admin_users.html', users=users)
 
+def load_utilization(year, center=None, venue=None):
+    """Özet tablosundan yıllık kullanım verisini getir (veritabanı yoksa None)"""
+    try:
+        conn = get_db_connection(read=True)
+        if not conn:
+            return None
+        try:
+            return get_utilization(conn, year, CENTERS, VENUES, booking_hours(TIME_SLOTS),
+                                   center or None, venue or None)
+        finally:
+            conn.close()
+    except DB_ERRORS as err:
+        logger.error(f"Kullanım özeti okunamadı: {err}")
+        return None
+
+def utilization_filters():
+    """Pano ve API için ortak filtre parametreleri"""
+    year = request.args.get('year', datetime.now().year, type=int)
+    center = request.args.get('center', '')
+    venue = request.args.get('venue', '')
+    return year, ('' if center == 'all' else center), ('' if venue == 'all' else venue)
+
+@app.route('/dashboard')
+@require_permission('view_reservations')
+def utilization_dashboard():
+    """Doluluk ve onay/iptal oranları panosu"""
+    year, center, venue = utilization_filters()
+    data = load_utilization(year, center, venue)
+    if data is None:
+        flash('Kullanım özeti için veritabanı bağlantısı gerekli!', 'error')
+        return redirect(url_for('reservations_list'))
+    return render_template('dashboard.html',
+                           data=data,
+                           centers=CENTERS,
+                           venues=VENUES,
+                           available_years=get_available_years(),
+                           current_filters={'year': year, 'center': center, 'venue': venue})
+
+@app.route('/api/utilization')
+@require_permission('view_reservations')
+def utilization_api():
+    """Kullanım özeti (JSON)"""
+    year, center, venue = utilization_filters()
+    data = load_utilization(year, center, venue)
+    if data is None:
+        return jsonify({'error': 'Veritabanı bağlantısı yok'}), 503
+    return jsonify(data)
+
+@app.route('/api/search')
+@require_permission('view_reservations')
+def search_api():
+    """Ad soyad ve açıklamada arama (JSON, sayfalı)"""
+    search = search_reservations(
+        request.args.get('q', '').strip(),
+        request.args.get('page', 1, type=int),
+        request.args.get('center', 'all'),
+        request.args.get('status', 'all'),
+        request.args.get('month', 'all'),
+        request.args.get('year', 'all'),
+        request.args.get('venue', 'all'),
+    )
+    search['results'] = [r.to_dict() for r in search['results']]
+    return jsonify(search)
+
+@app.route('/api/reservations/<int:reservation_id>/row')
+def reservation_row_api(reservation_id):
+    """Rezervasyonun güncel tablo satırı (liste sayfası değişiklikleri yerinde uygular)"""
+    error = api_permission_error('view_reservations')
+    if error:
+        return error
+    reservation = find_reservation(reservation_id)
+    if reservation is None:
+        return jsonify({'error': 'Rezervasyon bulunamadı!'}), 404
+    return jsonify({
+        'id': reservation_id,
+        'status': reservation['status'],
+        'row': render_template('_reservation_row.html', reservation=reservation),
+    })
+
+@app.route('/events/reservations')
+def reservation_events():
+    """Rezervasyon değişiklikleri (Server-Sent Events); center/venue/date ile filtrelenir"""
+    if not (has_permission('view_reservations') or has_permission('view_availability')):
+        return jsonify({'error': 'Giriş yapmanız gerekiyor'}), 401 if not is_logged_in() else 403
+    if not connection_pool:
+        return jsonify({'error': 'Değişiklik akışı veritabanı gerektirir'}), 503
+    if EVENTS_REQUIRE_THREADED and not request.environ.get('wsgi.multithread'):
+        # Sync worker'ı dakikalarca meşgul etmemek için akış sadece thread'li worker'da açılır
+        response = jsonify({'error': 'Değişiklik akışı bu sunucuda kapalı'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '60'
+        return response
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or -1)
+    except ValueError:
+        last_event_id = -1
+    subscription = change_feed.subscribe(
+        EventFilter(request.args.get('center'), request.args.get('venue'), request.args.get('date')),
+        last_event_id if last_event_id >= 0 else None,
+    )
+    if subscription is None:
+        return jsonify({'error': 'Değişiklik günlüğü okunamadı'}), 503
+    response = Response(stream_events(subscription), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Nginx olayları tamponlamasın, hemen istemciye gitsin
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def refresh_calendar_feeds(center):
+    """Merkezin sürümü değiştiyse (başka worker veya uygulama yazdıysa) bellekteki kayıtlara farkı uygula
+
+    Sürüm değişmediyse merkezin tek satırlık sürüm sorgusundan başka iş yapılmaz.
+    """
+    if not connection_pool:
+        return
+    version = get_current_dataset_version(center)
+    if version is None or version == calendar_feed_versions.get(center):
+        return
+    if refresh_reservations_from_db():
+        calendar_feed_versions[center] = version
+
+@app.route('/calendar/<center>.ics')
+@app.route('/calendar/<center>/<venue>.ics')
+def calendar_feed(center, venue=None):
+    """Merkez veya salon takvimi (iCalendar); ?pending=1 bekleyenleri de ekler
+
+    Takvim istemcileri oturum açamadığı için ``?token=`` ile ``CALENDAR_FEED_TOKEN`` da kabul edilir.
+    """
+    token = request.args.get('token', '')
+    if not (CALENDAR_FEED_TOKEN and hmac.compare_digest(token, CALENDAR_FEED_TOKEN)) \
+            and not (has_permission('view_reservations') or has_permission('view_availability')):
+        return jsonify({'error': 'Giriş yapmanız gerekiyor'}), 401 if not is_logged_in() else 403
+    if center not in CENTERS or (venue is not None and venue not in VENUES):
+        return jsonify({'error': 'Merkez veya salon bulunamadı'}), 404
+    
+    refresh_calendar_feeds(center)
+    pending = request.args.get('pending', '').lower() in ('1', 'true', 'yes')
+    feed = calendar_feeds.feed(center, venue, pending)
+    response = Response(feed.body, mimetype=CALENDAR_MIMETYPE)
+    response.set_etag(feed.etag)
+    response.last_modified = feed.last_modified
+    # İstemci her yoklamada doğrulasın; içerik değişmediyse 304 döner
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+@app.route('/admin/query-stats')
+@require_permission('manage_users')
+def admin_query_stats():
+    """SQL sorgu istatistikleri (toplam süreye göre)"""
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify(get_query_stats(limit))
+
 @app.route('/admin/users/<username>/permissions', methods=['POST'])
 @require_permission('manage_users')
 def update_user_permissions(username):
@@ -1250,7 +2480,13 @@ def reset_user_password(username):
     flash(f'{username} kullanıcısının şifresi varsayılan şifreye sıfırlandı! (Yeni şifre: {default_password})', 'success')
     return redirect(url_for('admin_users'))
 
+STARTUP_TIME_MS = (time.perf_counter() - _startup_started) * 1000
+logger.info(f"Uygulama başlatma süresi: {STARTUP_TIME_MS:.1f} ms")
+
 if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'init-db':
+        sys.exit(0 if init_database() else 1)
+    
     # Environment variables'dan Flask ayarları
     debug_mode = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
     host = os.getenv('FLASK_HOST', '0.0.0.0')
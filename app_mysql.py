@@ -1,16 +1,29 @@
 from flask import Flask, render_template, request, redirect, url_for, flash, make_response
 import secrets
-from datetime import datetime
+from datetime import date as date_type, datetime, timedelta
 import io
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+from query_cache import QueryCache, remember_session_write, session_wrote_recently
+from query_profiler import profile_connection, register_request_profiler
+from read_replica import ReadRouter, remember_write, replica_config
+from reference_data import (RegistryCache, booking_hours, create_mysql_reference_data, insert_default_reference_data,
+                            register_reference_data)
+import statements
+from booking_intervals import any_overlap, combine_time_range, intervals_from_times, parse_time_range
+from slot_alternatives import candidate_days, format_alternative, rank_alternatives
+from static_assets import register_static_assets
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
+# Oturum sistemi olmadığından profilleme yalnızca PROFILE_TOKEN header'ı ile açılır
+register_request_profiler(app)
+register_static_assets(app)
+
 # MySQL Veritabanı Yapılandırması
 DB_CONFIG = {
     'host': 'localhost',
@@ -21,24 +34,76 @@ DB_CONFIG = {
     'charset': 'utf8mb4'
 }
 
-def get_db_connection():
-    """MySQL veritabanı bağlantısı oluştur"""
+# Prepared statement'lar bağlantıya ait olduğundan bağlantılar havuzda tutulur.
+# Oturum sıfırlama prepared statement'ları düşüreceği için kapalıdır.
+POOL_CONFIG = {
+    'pool_name': 'rezervasyon_legacy_pool',
+    'pool_size': 5,
+    'pool_reset_session': False
+}
+
+connection_pool = None
+
+# Okuma kopyası (DB_REPLICA_HOST); okumalar kullanıcının son yazmasına ulaşmışsa kopyaya gider
+REPLICA_CONFIG = replica_config(dict(POOL_CONFIG, **DB_CONFIG))
+read_router = None
+
+def get_db_connection(read=False):
+    """Havuzdan MySQL veritabanı bağlantısı al (``read=True`` ise mümkünse okuma kopyasından)"""
+    global connection_pool, read_router
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        return connection
+        # Veritabanı init_database ile oluşturulabileceği için havuz ilk kullanımda açılır
+        if connection_pool is None:
+            connection_pool = pooling.MySQLConnectionPool(**POOL_CONFIG, **DB_CONFIG)
+        if read and REPLICA_CONFIG:
+            if read_router is None:
+                read_router = ReadRouter(pooling.MySQLConnectionPool(**REPLICA_CONFIG))
+            return profile_connection(read_router.connection(connection_pool.get_connection))
+        return profile_connection(connection_pool.get_connection())
     except Error as e:
         print(f"MySQL bağlantı hatası: {e}")
         return None
 
+# Liste, ay ve yıl sorgularının sonuçları kısa süre tutulur; bu worker'daki yazmalar temizler
+query_cache = QueryCache()
+
+def record_write(connection):
+    """Yazmadan sonra: okumalar bu yazmayı görsün, önbellekteki sonuçlar atılsın"""
+    remember_write(connection, bool(REPLICA_CONFIG))
+    remember_session_write(query_cache.ttl)
+    query_cache.invalidate()
+
+def cached_fetch_all(name, params=(), dictionary=True, transform=None):
+    """İsimli okuma sorgusunu sonuç önbelleği üzerinden çalıştır
+
+    Aynı sorgu ve parametreler için eşzamanlı istekler tek sorguyu paylaşır.
+    Bağlantı veya sorgu hatası ``Error`` olarak çağırana iletilir, önbelleğe yazılmaz.
+    """
+    def load():
+        connection = get_db_connection(read=True)
+        if not connection:
+            raise Error(msg='Veritabanı bağlantısı kurulamadı')
+        try:
+            rows = statements.fetch_all(connection, name, params, dictionary=dictionary)
+        finally:
+            connection.close()
+        return transform(rows) if transform else rows
+    
+    return query_cache.get_or_load((name, tuple(params), dictionary), load, bypass=session_wrote_recently())
+
+# Merkez ve saat dilimi tanımları veritabanından okunur; sürüm değişince yenilenir
+reference_cache = RegistryCache()
+register_reference_data(app, reference_cache, lambda: get_db_connection(read=True))
+
 def init_database():
     """Veritabanı ve tabloları oluştur"""
     try:
-        connection = mysql.connector.connect(
+        connection = profile_connection(mysql.connector.connect(
             host=DB_CONFIG['host'],
             user=DB_CONFIG['user'],
             password=DB_CONFIG['password'],
             port=DB_CONFIG['port']
-        )
+        ))
         cursor = connection.cursor()
         
         # Veritabanını oluştur
@@ -64,6 +129,10 @@ def init_database():
         """
         cursor.execute(create_table_query)
         
+        # Merkez, salon ve saat dilimi tanımları
+        create_mysql_reference_data(cursor)
+        insert_default_reference_data(connection)
+        
         connection.commit()
         print("Veritabanı ve tablolar başarıyla oluşturuldu!")
         
@@ -81,162 +150,123 @@ def check_reservation_conflict(center, date, time, exclude_id=None):
         return False
     
     try:
-        cursor = connection.cursor()
-        if exclude_id:
-            query = """
-            SELECT COUNT(*) FROM reservations 
-            WHERE center = %s AND date = %s AND time = %s 
-            AND status IN ('onay', 'bekle') AND id != %s
-            """
-            cursor.execute(query, (center, date, time, exclude_id))
-        else:
-            query = """
-            SELECT COUNT(*) FROM reservations 
-            WHERE center = %s AND date = %s AND time = %s 
-            AND status IN ('onay', 'bekle')
-            """
-            cursor.execute(query, (center, date, time))
-        
-        result = cursor.fetchone()
-        return result[0] > 0
+        # Günün aktif aralıkları okunur, çakışma Python'da bulunur (farklı uzunluklar aynı sorguyla)
+        rows = statements.fetch_all(connection, 'legacy_day_active_times',
+                                    (center, date, exclude_id or 0), dictionary=False)
+        return any_overlap(intervals_from_times(row[0] for row in rows), time)
         
     except Error as e:
         print(f"Çakışma kontrolü hatası: {e}")
         return False
     finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
+        connection.close()
 
-def get_alternative_times(center, date, selected_time):
-    """Alternatif saat dilimlerini öner"""
-    time_slots = [
-        "09:00-10:00", "10:00-11:00", "11:00-12:00", "12:00-13:00",
-        "13:00-14:00", "14:00-15:00", "15:00-16:00", "16:00-17:00",
-        "17:00-18:00", "18:00-19:00", "19:00-20:00", "20:00-21:00", "21:00-22:00"
-    ]
+def get_alternative_times(center, date, selected_time, exclude_id=None):
+    """Aynı merkezde aynı uzunluktaki en yakın boş aralıkları öner (tek sorguyla, sonraki günler dahil)"""
+    time_slots = reference_cache.registry.time_slots
     
     try:
-        current_index = time_slots.index(selected_time)
+        day = date_type.fromisoformat(date)
     except ValueError:
         return []
+    days = candidate_days(day)
+    if not days:
+        return []
     
-    alternatives = []
-    
-    # Bir saat öncesi
-    if current_index > 0:
-        prev_time = time_slots[current_index - 1]
-        if not check_reservation_conflict(center, date, prev_time):
-            alternatives.append(prev_time)
-    
-    # Bir saat sonrası
-    if current_index < len(time_slots) - 1:
-        next_time = time_slots[current_index + 1]
-        if not check_reservation_conflict(center, date, next_time):
-            alternatives.append(next_time)
+    connection = get_db_connection(read=True)
+    if not connection:
+        return []
     
-    return alternatives
+    try:
+        rows = statements.fetch_all(connection, 'legacy_active_times_range',
+                                    (center, days[0], days[-1] + timedelta(days=1), exclude_id or 0))
+    except Error as e:
+        print(f"Alternatif dilim sorgusu hatası: {e}")
+        return []
+    finally:
+        connection.close()
+    
+    # Bu uygulamada salon yok; doluluk (merkez, None, gün) anahtarıyla tutulur
+    occupied = {}
+    for row in rows:
+        parsed = parse_time_range(row['time'])
+        if parsed:
+            occupied.setdefault((center, None, row['date']), []).append(parsed)
+    alternatives = rank_alternatives(center, None, day, selected_time, booking_hours(time_slots),
+                                     [(center, None)], days, occupied)
+    return [format_alternative(alt, center, None, date) for alt in alternatives]
+
+def format_reservation_rows(reservations):
+    """Tarih alanlarını string'e çevir"""
+    for reservation in reservations:
+        if reservation['date']:
+            reservation['date'] = reservation['date'].strftime('%Y-%m-%d')
+        if reservation['created_at']:
+            reservation['created_at'] = reservation['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+        if reservation['updated_at']:
+            reservation['updated_at'] = reservation['updated_at'].strftime('%Y-%m-%d %H:%M:%S')
+    return reservations
 
 def get_filtered_reservations(center_filter=None, status_filter=None, month_filter=None, year_filter=None):
-    """Rezervasyonları filtreleme"""
-    connection = get_db_connection()
-    if not connection:
-        return []
+    """Rezervasyonları filtreleme (sonuç kısa süre önbellekte tutulur)"""
+    query = "SELECT * FROM reservations WHERE 1=1"
+    params = []
+    used_filters = []
+    
+    if center_filter and center_filter != 'all':
+        query += " AND center = %s"
+        params.append(center_filter)
+        used_filters.append('center')
+    
+    if status_filter and status_filter != 'all':
+        query += " AND status = %s"
+        params.append(status_filter)
+        used_filters.append('status')
+    
+    if month_filter and month_filter != 'all':
+        try:
+            year, month = month_filter.split('-')
+            query += " AND YEAR(date) = %s AND MONTH(date) = %s"
+            params.extend([year, month])
+            used_filters.append('month')
+        except ValueError:
+            pass
+    
+    if year_filter and year_filter != 'all':
+        query += " AND YEAR(date) = %s"
+        params.append(year_filter)
+        used_filters.append('year')
+    
+    query += " ORDER BY date DESC, time ASC"
     
     try:
-        cursor = connection.cursor(dictionary=True)
-        
-        query = "SELECT * FROM reservations WHERE 1=1"
-        params = []
-        
-        if center_filter and center_filter != 'all':
-            query += " AND center = %s"
-            params.append(center_filter)
-        
-        if status_filter and status_filter != 'all':
-            query += " AND status = %s"
-            params.append(status_filter)
-        
-        if month_filter and month_filter != 'all':
-            try:
-                year, month = month_filter.split('-')
-                query += " AND YEAR(date) = %s AND MONTH(date) = %s"
-                params.extend([year, month])
-            except ValueError:
-                pass
-        
-        if year_filter and year_filter != 'all':
-            query += " AND YEAR(date) = %s"
-            params.append(year_filter)
-        
-        query += " ORDER BY date DESC, time ASC"
-        
-        cursor.execute(query, params)
-        reservations = cursor.fetchall()
-        
-        # Tarih formatını string'e çevir
-        for reservation in reservations:
-            if reservation['date']:
-                reservation['date'] = reservation['date'].strftime('%Y-%m-%d')
-            if reservation['created_at']:
-                reservation['created_at'] = reservation['created_at'].strftime('%Y-%m-%d %H:%M:%S')
-            if reservation['updated_at']:
-                reservation['updated_at'] = reservation['updated_at'].strftime('%Y-%m-%d %H:%M:%S')
-        
-        return reservations
+        # Her filtre kombinasyonu (en fazla 16) ayrı bir isimli ifade olarak hazırlanır
+        name = statements.register('legacy_filtered:' + ','.join(used_filters), query)
+        return cached_fetch_all(name, params, transform=format_reservation_rows)
         
     except Error as e:
         print(f"Rezervasyon listeleme hatası: {e}")
         return []
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
 
 def get_available_months():
     """Mevcut rezervasyonların aylarını getir"""
-    connection = get_db_connection()
-    if not connection:
-        return []
-    
     try:
-        cursor = connection.cursor()
-        query = """
-        SELECT DISTINCT DATE_FORMAT(date, '%Y-%m') as month_year 
-        FROM reservations 
-        ORDER BY month_year DESC
-        """
-        cursor.execute(query)
-        months = [row[0] for row in cursor.fetchall()]
-        return months
+        return cached_fetch_all('legacy_months', dictionary=False,
+                                transform=lambda rows: [row[0] for row in rows])
         
     except Error as e:
         print(f"Ay listeleme hatası: {e}")
         return []
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
 
 def get_available_years():
     """Mevcut rezervasyonların yıllarını getir + gelecek 5 yıl"""
-    connection = get_db_connection()
     years = set()
     current_year = datetime.now().year
     
-    if connection:
-        try:
-            cursor = connection.cursor()
-            query = "SELECT DISTINCT YEAR(date) as year FROM reservations"
-            cursor.execute(query)
-            db_years = [row[0] for row in cursor.fetchall()]
-            years.update(db_years)
-        except Error as e:
-            print(f"Yıl listeleme hatası: {e}")
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+    try:
+        years.update(row[0] for row in cached_fetch_all('legacy_years', dictionary=False))
+    except Error as e:
+        print(f"Yıl listeleme hatası: {e}")
     
     # Mevcut yıl ve gelecek 5 yılı ekle
     for i in range(6):
@@ -376,7 +406,7 @@ def index():
         name_surname = request.form.get('name_surname', '').strip()
         center = request.form.get('center', '')
         date = request.form.get('date', '')
-        time = request.form.get('time', '')
+        time = combine_time_range(request.form)
         description = request.form.get('description', '').strip()
 
         # Temel validasyon
@@ -390,15 +420,27 @@ def index():
                 'description': description
             })
 
+        try:
+            time = booking_hours(reference_cache.registry.time_slots).normalize(time)
+        except ValueError as e:
+            flash(str(e), 'error')
+            return render_template('index.html', form_data={
+                'name_surname': name_surname,
+                'center': center,
+                'date': date,
+                'time': time,
+                'description': description
+            })
+
         # Çakışma kontrolü
         if check_reservation_conflict(center, date, time):
             alternatives = get_alternative_times(center, date, time)
             
             if alternatives:
                 alt_text = ", ".join(alternatives)
-                flash(f'Bu saat dilimi ({time}) için {center} merkezinde {date} tarihinde zaten rezervasyon var! Alternatif saatler: {alt_text}', 'error')
+                flash(f'Bu saat aralığı ({time}) için {center} merkezinde {date} tarihinde zaten rezervasyon var! Aynı uzunlukta en yakın boş aralıklar: {alt_text}', 'error')
             else:
-                flash(f'Bu saat dilimi ({time}) için {center} merkezinde {date} tarihinde zaten rezervasyon var ve alternatif saat bulunamadı!', 'error')
+                flash(f'Bu saat aralığı ({time}) için {center} merkezinde {date} tarihinde zaten rezervasyon var ve alternatif saat bulunamadı!', 'error')
             
             return render_template('index.html', form_data={
                 'name_surname': name_surname,
@@ -412,13 +454,10 @@ def index():
         connection = get_db_connection()
         if connection:
             try:
-                cursor = connection.cursor()
-                query = """
-                INSERT INTO reservations (name_surname, center, date, time, description, status)
-                VALUES (%s, %s, %s, %s, %s, 'bekle')
-                """
-                cursor.execute(query, (name_surname, center, date, time, description))
+                statements.execute(connection, 'legacy_reservation_insert',
+                                   (name_surname, center, date, time, description))
                 connection.commit()
+                record_write(connection)
                 
                 flash('Rezervasyon başarıyla oluşturuldu! Durum: Beklemede', 'success')
                 return redirect(url_for('reservations_list'))
@@ -433,9 +472,7 @@ def index():
                     'description': description
                 })
             finally:
-                if connection.is_connected():
-                    cursor.close()
-                    connection.close()
+                connection.close()
         else:
             flash('Veritabanı bağlantısı kurulamadı!', 'error')
 
@@ -453,7 +490,7 @@ def reservations_list():
     filtered_reservations = get_filtered_reservations(center_filter, status_filter, month_filter, year_filter)
     
     # Filtre seçenekleri için veriler
-    centers = ['Sefaköy Kültür Merkezi', 'Cennet Kültür Merkezi', 'Atakent Kültür Merkezi', 'Kemalpaşa Semt Konağı']
+    centers = reference_cache.registry.centers
     statuses = [
         {'value': 'onay', 'label': 'Onaylı'},
         {'value': 'bekle', 'label': 'Beklemede'},
@@ -475,18 +512,17 @@ def reservations_list():
                              'year': year_filter
                          })
 
-@app.route('/reservation/approve/<int:reservation_id>')
+@app.route('/reservation/approve/<int:reservation_id>', methods=['POST'])
 def approve_reservation(reservation_id):
     """Rezervasyonu onayla"""
     connection = get_db_connection()
     if connection:
         try:
-            cursor = connection.cursor()
-            query = "UPDATE reservations SET status = 'onay' WHERE id = %s"
-            cursor.execute(query, (reservation_id,))
+            result = statements.execute(connection, 'reservation_status_update', ('onay', reservation_id))
             connection.commit()
+            record_write(connection)
             
-            if cursor.rowcount > 0:
+            if result.rowcount > 0:
                 flash(f"#{reservation_id} numaralı rezervasyon onaylandı!", 'success')
             else:
                 flash('Rezervasyon bulunamadı!', 'error')
@@ -494,26 +530,23 @@ def approve_reservation(reservation_id):
         except Error as e:
             flash(f'Rezervasyon onaylanırken hata oluştu: {e}', 'error')
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            connection.close()
     else:
         flash('Veritabanı bağlantısı kurulamadı!', 'error')
     
     return redirect(url_for('reservations_list'))
 
-@app.route('/reservation/pending/<int:reservation_id>')
+@app.route('/reservation/pending/<int:reservation_id>', methods=['POST'])
 def pending_reservation(reservation_id):
     """Rezervasyonu beklemeye al"""
     connection = get_db_connection()
     if connection:
         try:
-            cursor = connection.cursor()
-            query = "UPDATE reservations SET status = 'bekle' WHERE id = %s"
-            cursor.execute(query, (reservation_id,))
+            result = statements.execute(connection, 'reservation_status_update', ('bekle', reservation_id))
             connection.commit()
+            record_write(connection)
             
-            if cursor.rowcount > 0:
+            if result.rowcount > 0:
                 flash(f"#{reservation_id} numaralı rezervasyon beklemeye alındı!", 'warning')
             else:
                 flash('Rezervasyon bulunamadı!', 'error')
@@ -521,26 +554,23 @@ def pending_reservation(reservation_id):
         except Error as e:
             flash(f'Rezervasyon güncellenirken hata oluştu: {e}', 'error')
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            connection.close()
     else:
         flash('Veritabanı bağlantısı kurulamadı!', 'error')
     
     return redirect(url_for('reservations_list'))
 
-@app.route('/reservation/cancel/<int:reservation_id>')
+@app.route('/reservation/cancel/<int:reservation_id>', methods=['POST'])
 def cancel_reservation(reservation_id):
     """Rezervasyonu iptal et"""
     connection = get_db_connection()
     if connection:
         try:
-            cursor = connection.cursor()
-            query = "UPDATE reservations SET status = 'iptal' WHERE id = %s"
-            cursor.execute(query, (reservation_id,))
+            result = statements.execute(connection, 'reservation_status_update', ('iptal', reservation_id))
             connection.commit()
+            record_write(connection)
             
-            if cursor.rowcount > 0:
+            if result.rowcount > 0:
                 flash(f"#{reservation_id} numaralı rezervasyon iptal edildi!", 'warning')
             else:
                 flash('Rezervasyon bulunamadı!', 'error')
@@ -548,26 +578,23 @@ def cancel_reservation(reservation_id):
         except Error as e:
             flash(f'Rezervasyon iptal edilirken hata oluştu: {e}', 'error')
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            connection.close()
     else:
         flash('Veritabanı bağlantısı kurulamadı!', 'error')
     
     return redirect(url_for('reservations_list'))
 
-@app.route('/reservation/delete/<int:reservation_id>')
+@app.route('/reservation/delete/<int:reservation_id>', methods=['POST'])
 def delete_reservation(reservation_id):
     """Rezervasyonu sil"""
     connection = get_db_connection()
     if connection:
         try:
-            cursor = connection.cursor()
-            query = "DELETE FROM reservations WHERE id = %s"
-            cursor.execute(query, (reservation_id,))
+            result = statements.execute(connection, 'reservation_delete', (reservation_id,))
             connection.commit()
+            record_write(connection)
             
-            if cursor.rowcount > 0:
+            if result.rowcount > 0:
                 flash(f"#{reservation_id} numaralı rezervasyon silindi!", 'success')
             else:
                 flash('Rezervasyon bulunamadı!', 'error')
@@ -575,9 +602,7 @@ def delete_reservation(reservation_id):
         except Error as e:
             flash(f'Rezervasyon silinirken hata oluştu: {e}', 'error')
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            connection.close()
     else:
         flash('Veritabanı bağlantısı kurulamadı!', 'error')
     
@@ -630,13 +655,11 @@ def export_excel():
 @app.route('/reservation/edit/<int:reservation_id>')
 def edit_reservation(reservation_id):
     """Rezervasyonu düzenleme sayfası"""
-    connection = get_db_connection()
+    connection = get_db_connection(read=True)
     if connection:
         try:
-            cursor = connection.cursor(dictionary=True)
-            query = "SELECT * FROM reservations WHERE id = %s"
-            cursor.execute(query, (reservation_id,))
-            reservation = cursor.fetchone()
+            reservation = statements.fetch_one(connection, 'legacy_reservation_by_id',
+                                               (reservation_id,), dictionary=True)
             
             if reservation:
                 # Tarih formatını string'e çevir
@@ -654,9 +677,7 @@ def edit_reservation(reservation_id):
         except Error as e:
             flash(f'Rezervasyon getirilirken hata oluştu: {e}', 'error')
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            connection.close()
     else:
         flash('Veritabanı bağlantısı kurulamadı!', 'error')
     
@@ -669,7 +690,7 @@ def update_reservation(reservation_id):
     name_surname = request.form.get('name_surname', '').strip()
     center = request.form.get('center', '')
     date = request.form.get('date', '')
-    time = request.form.get('time', '')
+    time = combine_time_range(request.form)
     description = request.form.get('description', '').strip()
 
     # Temel validasyon
@@ -677,14 +698,20 @@ def update_reservation(reservation_id):
         flash('Lütfen tüm zorunlu alanları doldurunuz!', 'error')
         return redirect(url_for('edit_reservation', reservation_id=reservation_id))
 
+    try:
+        time = booking_hours(reference_cache.registry.time_slots).normalize(time)
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('edit_reservation', reservation_id=reservation_id))
+
     # Çakışma kontrolü (kendisi hariç)
     if check_reservation_conflict(center, date, time, reservation_id):
-        alternatives = get_alternative_times(center, date, time)
+        alternatives = get_alternative_times(center, date, time, reservation_id)
         if alternatives:
             alt_text = ", ".join(alternatives)
-            flash(f'Bu saat dilimi ({time}) için {center} merkezinde {date} tarihinde zaten rezervasyon var! Alternatif saatler: {alt_text}', 'error')
+            flash(f'Bu saat aralığı ({time}) için {center} merkezinde {date} tarihinde zaten rezervasyon var! Aynı uzunlukta en yakın boş aralıklar: {alt_text}', 'error')
         else:
-            flash(f'Bu saat dilimi ({time}) için {center} merkezinde {date} tarihinde zaten rezervasyon var ve alternatif saat bulunamadı!', 'error')
+            flash(f'Bu saat aralığı ({time}) için {center} merkezinde {date} tarihinde zaten rezervasyon var ve alternatif saat bulunamadı!', 'error')
         
         return redirect(url_for('edit_reservation', reservation_id=reservation_id))
 
@@ -692,16 +719,12 @@ def update_reservation(reservation_id):
     connection = get_db_connection()
     if connection:
         try:
-            cursor = connection.cursor()
-            query = """
-            UPDATE reservations 
-            SET name_surname = %s, center = %s, date = %s, time = %s, description = %s
-            WHERE id = %s
-            """
-            cursor.execute(query, (name_surname, center, date, time, description, reservation_id))
+            result = statements.execute(connection, 'legacy_reservation_update',
+                                        (name_surname, center, date, time, description, reservation_id))
             connection.commit()
+            record_write(connection)
             
-            if cursor.rowcount > 0:
+            if result.rowcount > 0:
                 flash(f'#{reservation_id} numaralı rezervasyon başarıyla güncellendi!', 'success')
             else:
                 flash('Rezervasyon bulunamadı!', 'error')
@@ -709,9 +732,7 @@ def update_reservation(reservation_id):
         except Error as e:
             flash(f'Rezervasyon güncellenirken hata oluştu: {e}', 'error')
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            connection.close()
     else:
         flash('Veritabanı bağlantısı kurulamadı!', 'error')
 
@@ -719,28 +740,20 @@ def update_reservation(reservation_id):
 
 def get_time_availability(center, date):
     """Belirli bir merkez ve tarih için saat durumlarını getir"""
-    time_slots = [
-        "09:00-10:00", "10:00-11:00", "11:00-12:00", "12:00-13:00",
-        "13:00-14:00", "14:00-15:00", "15:00-16:00", "16:00-17:00",
-        "17:00-18:00", "18:00-19:00", "19:00-20:00", "20:00-21:00", "21:00-22:00"
-    ]
+    time_slots = reference_cache.registry.time_slots
     
-    connection = get_db_connection()
+    connection = get_db_connection(read=True)
     if not connection:
         return {slot: 'bos' for slot in time_slots}
     
     try:
-        cursor = connection.cursor()
-        query = """
-        SELECT time FROM reservations 
-        WHERE center = %s AND date = %s AND status IN ('onay', 'bekle')
-        """
-        cursor.execute(query, (center, date))
-        occupied_times = [row[0] for row in cursor.fetchall()]
+        occupied = intervals_from_times(row[0] for row in statements.fetch_all(connection, 'legacy_occupied_times',
+                                                                               (center, date), dictionary=False))
         
+        # Dilimle kısmen çakışan (ör. 09:30-11:00) rezervasyon da dilimi doldurur
         availability = {}
         for slot in time_slots:
-            availability[slot] = 'dolu' if slot in occupied_times else 'bos'
+            availability[slot] = 'dolu' if any_overlap(occupied, slot) else 'bos'
         
         return availability
         
@@ -748,9 +761,7 @@ def get_time_availability(center, date):
         print(f"Saat durumu kontrolü hatası: {e}")
         return {slot: 'bos' for slot in time_slots}
     finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
+        connection.close()
 
 @app.route('/availability')
 def availability_view():
@@ -758,7 +769,7 @@ def availability_view():
     selected_center = request.args.get('center', '')
     selected_date = request.args.get('date', '')
     
-    centers = ['Sefaköy Kültür Merkezi', 'Cennet Kültür Merkezi', 'Atakent Kültür Merkezi', 'Kemalpaşa Semt Konağı']
+    centers = reference_cache.registry.centers
     availability_data = {}
     
     if selected_center and selected_date:
@@ -770,6 +781,11 @@ def availability_view():
                          selected_date=selected_date,
                          availability_data=availability_data)
 
+@app.cli.command('init-db')
+def init_db_command():
+    """Veritabanı şemasını oluştur"""
+    init_database()
+
 if __name__ == '__main__':
     # Uygulama başlatılırken veritabanını hazırla
     init_database()
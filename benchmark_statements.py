@@ -0,0 +1,89 @@
+"""Metin SQL ile prepared statement karşılaştırması
+
+Kullanım:
+    python benchmark_statements.py [tekrar_sayisi]
+
+.env içindeki DB_* ayarlarıyla bağlanır ve sık çalışan isimli ifadeleri
+(çakışma COUNT'u, ID ile SELECT, durum UPDATE'i, filtreli liste) önce metin
+protokolüyle, sonra aynı bağlantı üzerinde prepared cursor'larla çalıştırır.
+Durum UPDATE'i kaydın mevcut durumunu tekrar yazar; veri değişmez.
+"""
+import os
+import sys
+import time
+
+import mysql.connector
+from dotenv import load_dotenv
+
+import statements
+
+load_dotenv()
+
+BENCHMARKS = [
+    ('reservation_by_id', lambda r: (r['id'],)),
+    ('legacy_day_active_times', lambda r: (r['center'], r['date'], 0)),
+    ('legacy_occupied_times', lambda r: (r['center'], r['date'])),
+    ('reservation_status_update', lambda r: (r['status'], r['id'])),
+]
+
+
+def run(conn, name, params, iterations):
+    """İfadeyi iterations kez çalıştır, çağrı başına ortalama süreyi (ms) döndür"""
+    is_select = statements.STATEMENTS[name].strip().upper().startswith('SELECT')
+    # İlk çağrı prepare maliyetini içerir; ölçüme dahil edilmez
+    if is_select:
+        statements.fetch_all(conn, name, params, dictionary=False)
+    else:
+        statements.execute(conn, name, params)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if is_select:
+            statements.fetch_all(conn, name, params, dictionary=False)
+        else:
+            statements.execute(conn, name, params)
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    conn = mysql.connector.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 3306)),
+        database=os.getenv('DB_DATABASE', 'rezervasyon_sistemi'),
+        user=os.getenv('DB_USER', 'root'),
+        password=os.getenv('DB_PASSWORD', ''),
+        charset='utf8mb4',
+        autocommit=True
+    )
+
+    sample = statements.fetch_one(conn, 'reservation_by_id', (1,), dictionary=True)
+    if sample is None:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM reservations LIMIT 1")
+        sample = cursor.fetchone()
+        cursor.close()
+    if sample is None:
+        print("Ölçüm için en az bir rezervasyon kaydı gerekli")
+        return 1
+
+    print(f"{'ifade':32} {'metin ms':>10} {'prepared ms':>12} {'kazanç':>8}")
+    for name, make_params in BENCHMARKS:
+        params = make_params(sample)
+
+        statements.USE_PREPARED_STATEMENTS = False
+        text_ms = run(conn, name, params, iterations)
+
+        statements.USE_PREPARED_STATEMENTS = True
+        prepared_ms = run(conn, name, params, iterations)
+
+        gain = (1 - prepared_ms / text_ms) * 100 if text_ms else 0
+        print(f"{name:32} {text_ms:10.3f} {prepared_ms:12.3f} {gain:7.1f}%")
+
+    statements.clear_statement_cache(conn)
+    conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,333 @@
+"""Değişken uzunluklu rezervasyon saatleri ve aralık çakışma indeksi
+
+Rezervasyonun ``time`` alanı ``"HH:MM-HH:MM"`` biçiminde başlangıç ve bitiş
+saatidir; uzunluğu sabit değildir (ör. üç saatlik prova ``"09:00-12:00"``).
+Eski sabit dilimler (``"09:00-10:00"``) aynı biçimde olduğundan veri
+dönüştürmeden aralık olarak okunur.
+
+Saatler açılış ve kapanış arasında, ``BOOKING_STEP_MINUTES`` dakikalık
+adımlara hizalı olmalıdır. Açılış/kapanış ve adım tanımlı saat dilimlerinden
+türetilir (``BookingHours``); dilimler formda hazır seçenek olarak kalır.
+
+İki aralık ``[başlangıç, bitiş)`` yarı açık kabul edilir: ``09:00-10:00`` ile
+``10:00-11:00`` çakışmaz.
+
+``IntervalIndex`` her (merkez, salon, gün) için başlangıca göre sıralı aralık
+listesi tutar. Listedeki her konum için o konuma kadarki en büyük bitiş
+(``max_end``) saklanır; yeni aralığın çakışıp çakışmadığı ikili aramayla
+bulunur: başlangıcı yeni bitişten küçük aralıkların en büyük bitişi yeni
+başlangıçtan büyükse çakışma vardır (O(log n)). Çakışan kayıtlar
+listelenirken sadece ``max_end`` yeni başlangıcı geçen konumlara bakılır.
+
+Ekleme ve silme O(n)'dir: liste ortasına yazılır ve ``max_end`` o konumdan
+sonrası için yeniden hesaplanır. n bir salonun tek günlük kayıt sayısıdır
+(genelde onun altında); bu boyutta dengeli ağaç gerekmez.
+"""
+import os
+import re
+import threading
+from bisect import bisect_left
+from math import gcd
+
+BOOKING_STEP_MINUTES = int(os.getenv('BOOKING_STEP_MINUTES', 15))
+
+ACTIVE_STATUSES = ('onay', 'bekle')
+
+_TIME_RANGE = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$')
+
+
+def parse_time_range(value):
+    """``"HH:MM-HH:MM"`` metnini (başlangıç, bitiş) dakikalarına çevir; geçersizse None"""
+    match = _TIME_RANGE.match(value or '') if isinstance(value, str) else None
+    if not match:
+        return None
+    start_hour, start_minute, end_hour, end_minute = map(int, match.groups())
+    if start_minute > 59 or end_minute > 59:
+        return None
+    start, end = start_hour * 60 + start_minute, end_hour * 60 + end_minute
+    if not 0 <= start < end <= 24 * 60:
+        return None
+    return start, end
+
+
+def format_time(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_time_range(start, end):
+    return f"{format_time(start)}-{format_time(end)}"
+
+
+def overlaps(first, second):
+    """İki (başlangıç, bitiş) aralığı çakışıyor mu"""
+    return first[0] < second[1] and second[0] < first[1]
+
+
+class BookingHours:
+    """Açılış/kapanış saati ve rezervasyon adımı (saat dilimlerinden türetilir)"""
+
+    def __init__(self, time_slots, step=BOOKING_STEP_MINUTES):
+        ranges = [r for r in map(parse_time_range, time_slots) if r]
+        if not ranges:
+            raise ValueError("Geçerli saat dilimi tanımı yok")
+        self.slots = tuple(format_time_range(*r) for r in ranges)
+        self.opens = min(start for start, _ in ranges)
+        self.closes = max(end for _, end in ranges)
+        # Dilim sınırları da adıma hizalı olmalı (ör. 09:10 başlayan dilim varsa adım 5 dk'ya iner)
+        for start, end in ranges:
+            step = gcd(gcd(step, start - self.opens), end - self.opens)
+        self.step = max(step, 1)
+        self.cells = tuple(format_time_range(m, m + self.step)
+                           for m in range(self.opens, self.closes, self.step))
+
+    def __eq__(self, other):
+        return isinstance(other, BookingHours) and (self.slots, self.step) == (other.slots, other.step)
+
+    def __hash__(self):
+        return hash((self.slots, self.step))
+
+    def start_options(self):
+        """Formdaki başlangıç saati seçenekleri"""
+        return [format_time(m) for m in range(self.opens, self.closes, self.step)]
+
+    def end_options(self):
+        """Formdaki bitiş saati seçenekleri"""
+        return [format_time(m) for m in range(self.opens + self.step, self.closes + 1, self.step)]
+
+    def validate(self, value):
+        """Saat aralığını doğrula
+
+        Returns:
+            (başlangıç, bitiş) dakika çifti
+
+        Raises:
+            ValueError: Kullanıcıya gösterilecek mesajla
+        """
+        parsed = parse_time_range(value)
+        if parsed is None:
+            raise ValueError('Geçersiz saat aralığı. Başlangıç bitişten önce olmalıdır (ör. 09:00-12:00).')
+        start, end = parsed
+        if start < self.opens or end > self.closes:
+            raise ValueError(f'Rezervasyon {format_time(self.opens)}-{format_time(self.closes)} '
+                             f'saatleri arasında olmalıdır.')
+        if (start - self.opens) % self.step or (end - self.opens) % self.step:
+            raise ValueError(f'Başlangıç ve bitiş saatleri {self.step} dakikalık adımlarla seçilmelidir.')
+        return parsed
+
+    def normalize(self, value):
+        """Geçerli aralığı ``"HH:MM-HH:MM"`` biçiminde döndür (``ValueError`` fırlatabilir)"""
+        return format_time_range(*self.validate(value))
+
+    def cell_span(self, value):
+        """Aralığın kapladığı adım hücreleri: (ilk hücre, hücre sayısı); hizalı değilse None"""
+        parsed = parse_time_range(value)
+        if parsed is None:
+            return None
+        start, end = parsed
+        if start < self.opens or end > self.closes \
+                or (start - self.opens) % self.step or (end - self.opens) % self.step:
+            return None
+        return (start - self.opens) // self.step, (end - start) // self.step
+
+    def cell_range(self, index):
+        start = self.opens + index * self.step
+        return start, start + self.step
+
+
+def combine_time_range(form, field='time'):
+    """Formdaki başlangıç/bitiş alanlarını ``"HH:MM-HH:MM"`` metnine birleştir
+
+    ``start_time`` ve ``end_time`` gönderilmediyse eski tek ``time`` alanı kullanılır.
+    """
+    start, end = form.get('start_time', '').strip(), form.get('end_time', '').strip()
+    if start or end:
+        return f"{start}-{end}" if start and end else ''
+    return form.get(field, '').strip()
+
+
+class BookingConflict(Exception):
+    """Aralık aynı yerde başka bir aktif rezervasyonla çakışıyor (mesaj kullanıcıya gösterilir)"""
+
+
+class _DayIntervals:
+    """Tek (merkez, salon, gün) için başlangıca göre sıralı aralıklar"""
+
+    __slots__ = ('items', 'max_end')
+
+    def __init__(self):
+        self.items = []    # (başlangıç, bitiş, id)
+        self.max_end = []  # max_end[i] = max(items[0..i] bitişleri)
+
+    def _refresh_from(self, position):
+        running = self.max_end[position - 1] if position else -1
+        del self.max_end[position:]
+        for _, end, _ in self.items[position:]:
+            running = max(running, end)
+            self.max_end.append(running)
+
+    def add(self, start, end, reservation_id):
+        item = (start, end, reservation_id)
+        position = bisect_left(self.items, item)
+        self.items.insert(position, item)
+        self._refresh_from(position)
+
+    def remove(self, start, end, reservation_id):
+        position = bisect_left(self.items, (start, end, reservation_id))
+        if position < len(self.items) and self.items[position] == (start, end, reservation_id):
+            del self.items[position]
+            self._refresh_from(position)
+
+    def overlapping(self, start, end, exclude_id=None):
+        """[start, end) ile çakışan kayıtların ID'leri (en geç başlayandan geriye)"""
+        position = bisect_left(self.items, (end,)) - 1
+        found = []
+        while position >= 0 and self.max_end[position] > start:
+            item_start, item_end, item_id = self.items[position]
+            if item_end > start and item_id != exclude_id:
+                found.append(item_id)
+            position -= 1
+        return found
+
+    def conflicts(self, start, end, exclude_id=None):
+        position = bisect_left(self.items, (end,)) - 1
+        if position < 0 or self.max_end[position] <= start:
+            return False
+        return bool(self.overlapping(start, end, exclude_id))
+
+
+class _CenterIntervals:
+    """Tek merkezin günleri, kayıt konumları ve kilidi"""
+
+    __slots__ = ('lock', 'days', 'entries')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.days = {}     # (salon, gün) -> _DayIntervals
+        # id -> (anahtar, başlangıç, bitiş): güncelleme ve silmede eski konumu bulmak için
+        self.entries = {}
+
+    def remove(self, reservation_id):
+        entry = self.entries.pop(reservation_id, None)
+        if entry is None:
+            return
+        key, start, end = entry
+        day = self.days[key]
+        day.remove(start, end, reservation_id)
+        if not day.items:
+            del self.days[key]
+
+    def add(self, key, start, end, reservation_id):
+        self.days.setdefault(key, _DayIntervals()).add(start, end, reservation_id)
+        self.entries[reservation_id] = (key, start, end)
+
+
+class IntervalIndex:
+    """(merkez, salon, gün) başına aktif rezervasyon aralıkları
+
+    İndeks merkez başına bölümlenmiştir: her merkezin kendi kilidi vardır ve
+    bir merkezdeki yazma başka merkezin çakışma kontrolünü bekletmez.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()  # sadece yeni merkez bölümü eklenirken
+        self._centers = {}              # merkez -> _CenterIntervals
+        self._owners = {}               # id -> merkez (kaydın hangi bölümde olduğu)
+
+    def __len__(self):
+        return len(self._owners)
+
+    @staticmethod
+    def _key(reservation):
+        date_value = getattr(reservation, 'date_value', None) or reservation['date']
+        return reservation.get('venue') or 'Tiyatro Salonu', str(date_value)
+
+    @staticmethod
+    def _span(reservation):
+        if reservation['status'] not in ACTIVE_STATUSES:
+            return None
+        return parse_time_range(reservation['time'])
+
+    def _partition(self, center):
+        partition = self._centers.get(center)
+        if partition is None:
+            with self._guard:
+                partition = self._centers.setdefault(center, _CenterIntervals())
+        return partition
+
+    def rebuild(self, reservations):
+        """Tüm bölümleri baştan kur ve tek atamayla yayımla"""
+        centers, owners = {}, {}
+        for reservation in reservations:
+            parsed = self._span(reservation)
+            if parsed is None:
+                continue
+            partition = centers.get(reservation['center'])
+            if partition is None:
+                partition = centers[reservation['center']] = _CenterIntervals()
+            partition.add(self._key(reservation), parsed[0], parsed[1], reservation['id'])
+            owners[reservation['id']] = reservation['center']
+        with self._guard:
+            self._centers, self._owners = centers, owners
+
+    def upsert(self, reservation):
+        """Kaydın güncel hali (aktif değilse indeksten çıkar)"""
+        reservation_id = reservation['id']
+        previous = self._owners.get(reservation_id)
+        if previous is not None and previous != reservation['center']:
+            self.remove(reservation_id)
+        parsed = self._span(reservation)
+        while True:
+            partition = self._partition(reservation['center'])
+            with partition.lock:
+                # Bu arada rebuild bölümleri değiştirdiyse yenisine yaz
+                if self._centers.get(reservation['center']) is not partition:
+                    continue
+                partition.remove(reservation_id)
+                if parsed is None:
+                    self._owners.pop(reservation_id, None)
+                else:
+                    partition.add(self._key(reservation), parsed[0], parsed[1], reservation_id)
+                    self._owners[reservation_id] = reservation['center']
+                return
+
+    def remove(self, reservation_id):
+        center = self._owners.get(reservation_id)
+        partition = self._centers.get(center) if center is not None else None
+        if partition is None:
+            return
+        with partition.lock:
+            partition.remove(reservation_id)
+            if self._owners.get(reservation_id) == center:
+                del self._owners[reservation_id]
+
+    def conflicts(self, center, venue, date, time, exclude_id=None):
+        """Aralık aynı yerde aktif bir kayıtla çakışıyor mu; aralık geçersizse None"""
+        parsed = parse_time_range(time)
+        if parsed is None:
+            return None
+        partition = self._centers.get(center)
+        if partition is None:
+            return False
+        with partition.lock:
+            day = partition.days.get((venue or 'Tiyatro Salonu', str(date)))
+            return bool(day) and day.conflicts(parsed[0], parsed[1], exclude_id)
+
+    def day_intervals(self, center, venue, date, exclude_id=None):
+        """Günün aktif aralıkları: [(başlangıç, bitiş, id)] başlangıca göre sıralı"""
+        partition = self._centers.get(center)
+        if partition is None:
+            return []
+        with partition.lock:
+            day = partition.days.get((venue or 'Tiyatro Salonu', str(date)))
+            return [item for item in day.items if item[2] != exclude_id] if day else []
+
+
+def intervals_from_times(times):
+    """Saat metinlerinden (başlangıç, bitiş) listesi (geçersizler atlanır)"""
+    return sorted(r for r in map(parse_time_range, times) if r)
+
+
+def any_overlap(intervals, time_range):
+    """Aralık listesindeki herhangi bir aralıkla çakışma var mı"""
+    parsed = parse_time_range(time_range) if isinstance(time_range, str) else time_range
+    return parsed is not None and any(overlaps(parsed, interval[:2]) for interval in intervals)
@@ -0,0 +1,227 @@
+"""Merkez ve salon başına iCalendar (.ics) takvim aboneliği
+
+Personel ve merkezlerin bilgi ekranları rezervasyonları takvim uygulamasından
+abone olarak izler. Takvim istemcileri aynı adresi birkaç dakikada bir yoklar;
+bu yüzden akış her istekte rezervasyon listesinden yeniden üretilmez.
+
+``CalendarFeeds`` her rezervasyonun ``VEVENT`` metnini bir kez üretir ve
+(merkez, salon) başına saklar. Yazmalar (ekleme, güncelleme, durum, silme)
+sadece değişen kaydın metnini yeniler ve o merkezin hazır akışlarını
+geçersiz kılar. Bellekteki liste baştan kurulduğunda da (``sync``) kayıtlar
+imzalarıyla karşılaştırılır; sadece değişenler yeniden üretilir.
+
+Akış gövdesi ilk istekte birleştirilip içerik özetiyle (ETag) saklanır.
+Gövde sadece kayıtlardaki değerlerden üretildiğinden aynı veride her worker
+aynı ETag'i verir; istemcilerin koşullu istekleri çoğunlukla 304 alır.
+
+Saatler ``CALENDAR_TIMEZONE`` saat diliminde (varsayılan Europe/Istanbul)
+kabul edilip UTC olarak yazılır. Takvimde sadece onaylı rezervasyonlar
+bulunur; ``pending=True`` ile bekleyenler de ``TENTATIVE`` olarak eklenir.
+"""
+import hashlib
+import logging
+import os
+import threading
+from collections import namedtuple
+from datetime import date, datetime, time as time_type, timedelta, timezone
+
+from booking_intervals import parse_time_range
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_TIMEZONE = os.getenv('CALENDAR_TIMEZONE', 'Europe/Istanbul')
+# Takvim istemcileri için paylaşılan erişim anahtarı (?token=...); boşsa sadece oturumla erişilir
+CALENDAR_FEED_TOKEN = os.getenv('CALENDAR_FEED_TOKEN', '')
+CALENDAR_UID_DOMAIN = os.getenv('CALENDAR_UID_DOMAIN', 'rezervasyon.local')
+
+MIMETYPE = 'text/calendar'
+
+EVENT_STATUSES = {'onay': 'CONFIRMED', 'bekle': 'TENTATIVE'}
+
+CalendarFeed = namedtuple('CalendarFeed', ['body', 'etag', 'last_modified', 'count'])
+
+
+def _load_timezone(name):
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception as err:
+        # tzdata yoksa saatler yerel saat olarak (saat dilimi belirtmeden) yazılır
+        logger.warning(f"Takvim saat dilimi yüklenemedi ({name}): {err}")
+        return None
+
+
+def escape_text(value):
+    """RFC 5545 TEXT değerindeki özel karakterleri kaçır"""
+    return (str(value or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n'))
+
+
+def fold_line(line):
+    """75 bayttan uzun satırları RFC 5545'e göre katla (UTF-8 karakterleri bölmeden)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts, current, size, limit = [], [], 0, 75
+    for char in line:
+        length = len(char.encode('utf-8'))
+        if size + length > limit:
+            parts.append(''.join(current))
+            current, size, limit = [], 0, 74  # devam satırları boşlukla başlar
+        current.append(char)
+        size += length
+    parts.append(''.join(current))
+    return '\r\n '.join(parts)
+
+
+class CalendarFeeds:
+    """(merkez, salon) başına hazır VEVENT metinleri ve birleştirilmiş akışlar"""
+
+    def __init__(self, tz_name=CALENDAR_TIMEZONE, uid_domain=CALENDAR_UID_DOMAIN):
+        self.tz = _load_timezone(tz_name)
+        self.uid_domain = uid_domain
+        self._lock = threading.Lock()
+        self._events = {}      # id -> (merkez, salon, sıralama anahtarı, durum, VEVENT metni)
+        self._signatures = {}  # id -> kaydın takvime yansıyan alanları
+        self._places = {}      # (merkez, salon) -> {id}
+        self._feeds = {}       # (merkez, salon veya None, pending) -> CalendarFeed
+        self._changed = {}     # merkez -> son değişiklik zamanı (UTC)
+        self.renders = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    @staticmethod
+    def _signature(reservation):
+        return (reservation['center'], reservation.get('venue') or 'Tiyatro Salonu', str(reservation['date']),
+                reservation['time'], reservation['status'], reservation.get('name_surname'),
+                reservation.get('description'), str(reservation.get('created_at') or ''))
+
+    def _stamp(self, day, minutes):
+        local = datetime.combine(day, time_type()) + timedelta(minutes=minutes)
+        if self.tz is None:
+            return local.strftime('%Y%m%dT%H%M%S')
+        return local.replace(tzinfo=self.tz).astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    def _render_event(self, reservation, signature):
+        center, venue, day_text, time_text, status, name, description, created_at = signature
+        parsed = parse_time_range(time_text)
+        try:
+            day = date.fromisoformat(day_text)
+        except ValueError:
+            return None
+        if parsed is None:
+            return None
+        start, end = parsed
+        # DTSTAMP oluşturma zamanından alınır: aynı kayıt her worker'da aynı metni üretir
+        try:
+            created = datetime.fromisoformat(created_at)
+            dtstamp = (created.replace(tzinfo=self.tz).astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+                       if self.tz else created.strftime('%Y%m%dT%H%M%S'))
+        except ValueError:
+            dtstamp = self._stamp(day, start)
+        lines = [
+            'BEGIN:VEVENT',
+            f"UID:reservation-{reservation['id']}@{self.uid_domain}",
+            f'DTSTAMP:{dtstamp}',
+            f'DTSTART:{self._stamp(day, start)}',
+            f'DTEND:{self._stamp(day, end)}',
+            f'SUMMARY:{escape_text(name)}',
+            f'LOCATION:{escape_text(f"{center} - {venue}")}',
+            f'STATUS:{EVENT_STATUSES[status]}',
+        ]
+        if description:
+            lines.append(f'DESCRIPTION:{escape_text(description)}')
+        lines.append('END:VEVENT')
+        return ''.join(fold_line(line) + '\r\n' for line in lines), (day, start, reservation['id'])
+
+    def _touch(self, center):
+        """Merkezin hazır akışlarını geçersiz kıl"""
+        self._changed[center] = datetime.now(timezone.utc).replace(microsecond=0)
+        for key in [key for key in self._feeds if key[0] == center]:
+            del self._feeds[key]
+
+    def _remove(self, reservation_id):
+        event = self._events.pop(reservation_id, None)
+        self._signatures.pop(reservation_id, None)
+        if event is None:
+            return
+        center, venue = event[0], event[1]
+        ids = self._places.get((center, venue))
+        if ids is not None:
+            ids.discard(reservation_id)
+            if not ids:
+                del self._places[(center, venue)]
+        self._touch(center)
+
+    def _upsert(self, reservation):
+        reservation_id = reservation['id']
+        signature = self._signature(reservation)
+        if self._signatures.get(reservation_id) == signature:
+            return
+        self._remove(reservation_id)
+        if signature[4] not in EVENT_STATUSES:
+            return
+        rendered = self._render_event(reservation, signature)
+        if rendered is None:
+            return
+        text, sort_key = rendered
+        center, venue = signature[0], signature[1]
+        self._events[reservation_id] = (center, venue, sort_key, signature[4], text)
+        self._signatures[reservation_id] = signature
+        self._places.setdefault((center, venue), set()).add(reservation_id)
+        self.renders += 1
+        self._touch(center)
+
+    def upsert(self, reservation):
+        """Kaydın güncel halini yansıt (takvime girmeyen durumdaysa çıkar)"""
+        with self._lock:
+            self._upsert(reservation)
+
+    def remove(self, reservation_id):
+        with self._lock:
+            self._remove(reservation_id)
+
+    def sync(self, reservations):
+        """Bellekteki listeyle eşitle: sadece değişen, eklenen ve çıkan kayıtlar işlenir"""
+        with self._lock:
+            seen = set()
+            for reservation in reservations:
+                seen.add(reservation['id'])
+                self._upsert(reservation)
+            for reservation_id in [rid for rid in self._events if rid not in seen]:
+                self._remove(reservation_id)
+
+    def feed(self, center, venue=None, pending=False):
+        """Merkezin (venue verilirse sadece o salonun) takvimi
+
+        Returns:
+            CalendarFeed: gövde (bayt), ETag, son değişiklik zamanı ve etkinlik sayısı
+        """
+        key = (center, venue, bool(pending))
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is not None:
+                return feed
+            ids = set()
+            for (place_center, place_venue), place_ids in self._places.items():
+                if place_center == center and (venue is None or place_venue == venue):
+                    ids.update(place_ids)
+            events = sorted((self._events[rid] for rid in ids
+                             if pending or self._events[rid][3] == 'onay'), key=lambda e: e[2])
+            name = f'{center} - {venue}' if venue else center
+            header = [
+                'BEGIN:VCALENDAR',
+                'VERSION:2.0',
+                'PRODID:-//Rezervasyon Sistemi//Takvim//TR',
+                'CALSCALE:GREGORIAN',
+                'METHOD:PUBLISH',
+                f'X-WR-CALNAME:{escape_text(name)}',
+            ]
+            body = (''.join(fold_line(line) + '\r\n' for line in header)
+                    + ''.join(event[4] for event in events) + 'END:VCALENDAR\r\n').encode('utf-8')
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            last_modified = self._changed.get(center) or datetime.now(timezone.utc).replace(microsecond=0)
+            feed = CalendarFeed(body, etag, last_modified, len(events))
+            self._feeds[key] = feed
+            return feed
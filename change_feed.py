@@ -0,0 +1,339 @@
+"""Rezervasyon değişiklik akışı (Server-Sent Events)
+
+``reservations`` tablosundaki her INSERT/UPDATE/DELETE trigger'larla aynı
+işlem içinde ``reservation_changes`` tablosuna bir olay olarak yazılır:
+oluşturma (``created``), durum değişikliği (``status``), diğer alanların
+değişmesi (``updated``) ve silme (``deleted``). Olay, rezervasyonun yerini
+(merkez, salon, gün, saat) ve durumunu; güncellemelerde önceki yerini ve
+durumunu da taşır. Böylece hangi worker'ın veya hangi uygulamanın yazdığından
+bağımsız olarak tüm değişiklikler tek bir sıralı günlükte toplanır.
+
+Her süreçte tek bir ``ChangeFeed`` thread'i günlüğü ``CHANGE_FEED_POLL_SECONDS``
+aralıkla son görülen ID'den sonrası için okur (birincil anahtar aralığı) ve
+olayları abonelerin filtrelerine göre kuyruklarına dağıtır. Açık bağlantı
+sayısı ne olursa olsun veritabanına süreç başına tek sorgu gider; abone
+yoksa sorgu yapılmaz. Yeniden bağlanan istemci ``Last-Event-ID`` ile
+aradaki olayları günlükten tamamlar. Günlük ``CHANGE_LOG_RETENTION_HOURS``
+saatten eski olayları siler.
+
+Akış bağlantıları uzun sürdüğü için sync worker'larda değil, thread'li
+worker'larda (``gunicorn_events.conf.py``) servis edilmelidir.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FEED_POLL_SECONDS = float(os.getenv('CHANGE_FEED_POLL_SECONDS', 1))
+CHANGE_LOG_RETENTION_HOURS = int(os.getenv('CHANGE_LOG_RETENTION_HOURS', 24))
+SSE_HEARTBEAT_SECONDS = int(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+# Bağlantı bu süreden sonra kapatılır; tarayıcı Last-Event-ID ile kaldığı yerden bağlanır
+SSE_MAX_SECONDS = int(os.getenv('SSE_MAX_SECONDS', 300))
+
+CHANGE_FEED_BATCH = 500
+REPLAY_LIMIT = 1000
+SUBSCRIBER_QUEUE_SIZE = 256
+PRUNE_INTERVAL_SECONDS = 3600
+SSE_RETRY_MS = 3000
+
+DEFAULT_VENUE = 'Tiyatro Salonu'
+
+# MySQL tanımları (SQLite karşılıkları sqlite_backend.SCHEMA içinde)
+MYSQL_CHANGE_TABLE = """
+CREATE TABLE IF NOT EXISTS reservation_changes (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    reservation_id INT NOT NULL,
+    action VARCHAR(10) NOT NULL,
+    center VARCHAR(255) NOT NULL,
+    venue VARCHAR(100) NOT NULL,
+    date DATE NOT NULL,
+    time VARCHAR(20) NOT NULL,
+    status VARCHAR(10) NOT NULL,
+    old_center VARCHAR(255),
+    old_venue VARCHAR(100),
+    old_date DATE,
+    old_time VARCHAR(20),
+    old_status VARCHAR(10),
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_changes_changed_at (changed_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+_CHANGE_COLUMNS = "reservation_id, action, center, venue, date, time, status"
+_PLACE_COLUMNS = "old_center, old_venue, old_date, old_time, old_status"
+
+# Sadece updated_at'in değiştiği güncellemeler olay üretmez
+_MYSQL_UNCHANGED = """
+    OLD.name_surname <=> NEW.name_surname AND OLD.description <=> NEW.description
+    AND OLD.center <=> NEW.center AND OLD.venue <=> NEW.venue AND OLD.date <=> NEW.date
+    AND OLD.time <=> NEW.time"""
+
+MYSQL_CHANGE_TRIGGERS = {
+    'trg_changes_insert': f"""
+        CREATE TRIGGER trg_changes_insert AFTER INSERT ON reservations
+        FOR EACH ROW INSERT INTO reservation_changes ({_CHANGE_COLUMNS})
+        VALUES (NEW.id, 'created', NEW.center, COALESCE(NEW.venue, '{DEFAULT_VENUE}'),
+                NEW.date, NEW.time, NEW.status)
+    """,
+    'trg_changes_update': f"""
+        CREATE TRIGGER trg_changes_update AFTER UPDATE ON reservations
+        FOR EACH ROW INSERT INTO reservation_changes ({_CHANGE_COLUMNS}, {_PLACE_COLUMNS})
+        SELECT NEW.id, IF({_MYSQL_UNCHANGED}, 'status', 'updated'),
+               NEW.center, COALESCE(NEW.venue, '{DEFAULT_VENUE}'), NEW.date, NEW.time, NEW.status,
+               OLD.center, COALESCE(OLD.venue, '{DEFAULT_VENUE}'), OLD.date, OLD.time, OLD.status
+        FROM DUAL
+        WHERE NOT ({_MYSQL_UNCHANGED} AND OLD.status <=> NEW.status)
+    """,
+    'trg_changes_delete': f"""
+        CREATE TRIGGER trg_changes_delete AFTER DELETE ON reservations
+        FOR EACH ROW INSERT INTO reservation_changes ({_CHANGE_COLUMNS})
+        VALUES (OLD.id, 'deleted', OLD.center, COALESCE(OLD.venue, '{DEFAULT_VENUE}'),
+                OLD.date, OLD.time, OLD.status)
+    """,
+}
+
+
+def create_mysql_change_log(cursor):
+    """Değişiklik günlüğü tablosunu ve eksik trigger'ları oluştur"""
+    cursor.execute(MYSQL_CHANGE_TABLE)
+    cursor.execute(
+        "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()"
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+    for name, ddl in MYSQL_CHANGE_TRIGGERS.items():
+        if name not in existing:
+            cursor.execute(ddl)
+
+
+def _iso(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value) if value is not None else None
+
+
+def to_event(row):
+    """Günlük satırını (dict) istemciye gidecek olaya çevir"""
+    event = {
+        'id': int(row['id']),
+        'action': row['action'],
+        'reservation_id': int(row['reservation_id']),
+        'center': row['center'],
+        'venue': row['venue'],
+        'date': _iso(row['date']),
+        'time': row['time'],
+        'status': row['status'],
+        'previous': None,
+        'changed_at': _iso(row.get('changed_at')),
+    }
+    if row.get('old_center') is not None:
+        event['previous'] = {
+            'center': row['old_center'],
+            'venue': row['old_venue'],
+            'date': _iso(row['old_date']),
+            'time': row['old_time'],
+            'status': row['old_status'],
+        }
+    return event
+
+
+def format_sse(event):
+    """Olayı SSE biçiminde yaz (id: satırı Last-Event-ID olarak geri gelir)"""
+    data = json.dumps(event, ensure_ascii=False, separators=(',', ':'))
+    return f"id: {event['id']}\nevent: {event['action']}\ndata: {data}\n\n"
+
+
+class EventFilter:
+    """Merkez / salon / gün filtresi; boş alan her değere uyar
+
+    Güncelleme olayı rezervasyonun yeni veya önceki yeri filtreye uyuyorsa
+    gönderilir (başka güne taşınan rezervasyon eski günü de boşaltır).
+    """
+
+    __slots__ = ('center', 'venue', 'date')
+
+    def __init__(self, center=None, venue=None, date=None):
+        self.center = center or None
+        self.venue = venue or None
+        self.date = date or None
+
+    def _place_matches(self, place):
+        return ((self.center is None or place['center'] == self.center)
+                and (self.venue is None or place['venue'] == self.venue)
+                and (self.date is None or place['date'] == self.date))
+
+    def matches(self, event):
+        if self._place_matches(event):
+            return True
+        return event['previous'] is not None and self._place_matches(event['previous'])
+
+
+class Subscription:
+    """Bir akış bağlantısının olay kuyruğu"""
+
+    def __init__(self, feed, event_filter):
+        self.feed = feed
+        self.filter = event_filter
+        self.overflowed = False
+        self._queue = queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+
+    def push(self, events):
+        matched = [event for event in events if self.filter.matches(event)]
+        if not matched:
+            return
+        try:
+            self._queue.put_nowait(matched)
+        except queue.Full:
+            # İstemci olayları tüketemiyor: akış kapatılır, istemci sayfayı yeniler
+            self.overflowed = True
+
+    def get(self, timeout):
+        """Sıradaki olay listesi; ``timeout`` içinde olay gelmezse None"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.feed.unsubscribe(self)
+
+
+class ChangeFeed:
+    """Değişiklik günlüğünü okuyup abonelere dağıtan süreç başına tek thread
+
+    Args:
+        fetch_after: (son ID, en fazla satır) -> ID sırasıyla günlük satırları (dict)
+        fetch_latest: () -> günlükteki en büyük ID (boşsa 0)
+        prune: (tarih) -> bu tarihten eski olayları sil (opsiyonel)
+    """
+
+    def __init__(self, fetch_after, fetch_latest, prune=None, poll_interval=CHANGE_FEED_POLL_SECONDS):
+        self._fetch_after = fetch_after
+        self._fetch_latest = fetch_latest
+        self._prune = prune
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        # Dağıtım ve yeniden bağlanma tamamlaması aynı anda yapılmaz (olay sırası korunur)
+        self._dispatch_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._subscribers = set()
+        self._last_id = None
+        self._thread_pid = None
+        self._last_prune = 0.0
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def subscribe(self, event_filter, last_event_id=None):
+        """Yeni abone; ``last_event_id`` verilirse aradaki olaylar önce kuyruğa eklenir
+
+        Returns:
+            Subscription; günlük okunamazsa None
+        """
+        subscription = Subscription(self, event_filter)
+        with self._dispatch_lock:
+            if self._last_id is None:
+                latest = self._fetch_latest()
+                if latest is None:
+                    return None
+                self._last_id = latest
+            if last_event_id is not None and last_event_id < self._last_id:
+                missed = self._fetch_after(last_event_id, REPLAY_LIMIT + 1)
+                if missed is None or len(missed) > REPLAY_LIMIT:
+                    # Aradaki olaylar çok fazla veya silinmiş: istemci sayfayı yenilemeli
+                    subscription.overflowed = True
+                else:
+                    subscription.push([to_event(row) for row in missed if row['id'] <= self._last_id])
+            with self._lock:
+                self._subscribers.add(subscription)
+        self._ensure_thread()
+        self._wakeup.set()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _ensure_thread(self):
+        # Gunicorn fork'undan sonra thread'ler kopyalanmaz: her süreç kendi thread'ini başlatır
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+        threading.Thread(target=self._run, name='change-feed', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            with self._lock:
+                subscribers = list(self._subscribers)
+            if not subscribers:
+                # Abone yokken günlük okunmaz; sonraki abone güncel ID'den başlar
+                with self._dispatch_lock:
+                    if not self._subscribers:
+                        self._last_id = None
+                self._wakeup.wait()
+                continue
+            try:
+                self.poll()
+                self._maybe_prune()
+            except Exception as e:
+                logger.error(f"Değişiklik günlüğü okunamadı: {e}")
+
+    def poll(self):
+        """Günlükteki yeni olayları abonelere dağıt; dağıtılan olay sayısını döndür"""
+        with self._dispatch_lock:
+            if self._last_id is None:
+                return 0
+            rows = self._fetch_after(self._last_id, CHANGE_FEED_BATCH)
+            if not rows:
+                return 0
+            events = [to_event(row) for row in rows]
+            self._last_id = events[-1]['id']
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for subscription in subscribers:
+                subscription.push(events)
+        if len(rows) == CHANGE_FEED_BATCH:
+            # Daha fazla olay var: beklemeden devam et
+            self._wakeup.set()
+        return len(events)
+
+    def _maybe_prune(self):
+        now = time.time()
+        if self._prune is None or now - self._last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_prune = now
+        removed = self._prune(datetime.now() - timedelta(hours=CHANGE_LOG_RETENTION_HOURS))
+        if removed:
+            logger.info(f"Değişiklik günlüğünden {removed} eski olay silindi")
+
+
+def stream_events(subscription, heartbeat=SSE_HEARTBEAT_SECONDS, max_seconds=SSE_MAX_SECONDS):
+    """Abonelik için SSE metin parçaları üret
+
+    Olay yokken ``heartbeat`` saniyede bir yorum satırı gönderilir; kopan
+    bağlantı bu yazmada fark edilir ve abonelik kapanır.
+    """
+    deadline = time.monotonic() + max_seconds
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while True:
+            if subscription.overflowed:
+                yield "event: reset\ndata: {}\n\n"
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            events = subscription.get(min(heartbeat, remaining))
+            if events is None:
+                yield ": ping\n\n"
+                continue
+            yield ''.join(format_sse(event) for event in events)
+    finally:
+        subscription.close()
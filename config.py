@@ -1,5 +1,8 @@
 import os
 from datetime import timedelta
+from dotenv import load_dotenv
+
+load_dotenv()
 
 class Config:
     """Base configuration class"""
@@ -7,9 +10,9 @@ class Config:
     # Flask settings
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     
-    # Database settings - SQLite için geçici
-    USE_SQLITE = True  # MySQL kurulana kadar
-    SQLITE_DB = 'rezervasyon.db'
+    # Database settings - tek sunuculu kurulumlar ve testler için SQLite (WAL)
+    USE_SQLITE = os.environ.get('USE_SQLITE', 'False').lower() == 'true'
+    SQLITE_DB = os.environ.get('SQLITE_DB') or 'rezervasyon.db'
     
     # MySQL settings (sonra kullanılacak)
     MYSQL_HOST = os.environ.get('MYSQL_HOST') or 'localhost'
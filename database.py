@@ -3,6 +3,8 @@ from mysql.connector import Error
 import os
 import json
 from dotenv import load_dotenv
+from query_profiler import profile_connection
+import statements
 
 load_dotenv()
 
@@ -14,7 +16,7 @@ class Database:
     def connect(self):
         """MySQL veritabanına bağlan"""
         try:
-            self.connection = mysql.connector.connect(
+            self.connection = profile_connection(mysql.connector.connect(
                 host=os.getenv('DB_HOST', 'localhost'),
                 port=int(os.getenv('DB_PORT', 3306)),
                 database=os.getenv('DB_NAME', 'rezervasyon_db'),
@@ -22,7 +24,7 @@ class Database:
                 password=os.getenv('DB_PASSWORD', ''),
                 charset='utf8mb4',
                 autocommit=True
-            )
+            ))
             print("✅ MySQL bağlantısı başarılı!")
         except Error as e:
             print(f"❌ MySQL bağlantı hatası: {e}")
@@ -50,6 +52,21 @@ class Database:
             print(f"❌ SQL Hatası: {e}")
             return None
     
+    def execute_statement(self, name, params=None):
+        """İsimli (prepared) SQL ifadesini çalıştır - execute_query ile aynı dönüş değerleri"""
+        if not self.connection or not self.connection.is_connected():
+            self.connect()
+        
+        try:
+            if statements.STATEMENTS[name].strip().upper().startswith('SELECT'):
+                return statements.fetch_all(self.connection, name, params or ())
+            result = statements.execute(self.connection, name, params or ())
+            self.connection.commit()
+            return result.lastrowid or result.rowcount
+        except Error as e:
+            print(f"❌ SQL Hatası: {e}")
+            return None
+    
     def close(self):
         """Bağlantıyı kapat"""
         if self.connection and self.connection.is_connected():
@@ -61,8 +78,7 @@ db = Database()
 # Database helper functions
 def get_users():
     """Tüm kullanıcıları getir"""
-    query = "SELECT * FROM users"
-    users_data = db.execute_query(query)
+    users_data = db.execute_statement('users_all_hashed')
     
     if not users_data:
         return {}
@@ -78,13 +94,7 @@ def get_users():
 
 def get_reservations():
     """Tüm rezervasyonları getir"""
-    query = """
-    SELECT id, name_surname, center, venue, date, time, description, 
-           status, created_by, created_at, updated_at
-    FROM reservations 
-    ORDER BY created_at DESC
-    """
-    result = db.execute_query(query)
+    result = db.execute_statement('reservations_all')
     
     if not result:
         return []
@@ -110,44 +120,32 @@ def get_reservations():
 
 def add_reservation(data):
     """Yeni rezervasyon ekle"""
-    query = """
-    INSERT INTO reservations (name_surname, center, venue, date, time, description, status, created_by)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-    """
     params = (
         data['name_surname'], data['center'], data['venue'],
         data['date'], data['time'], data['description'],
         data['status'], data['created_by']
     )
-    return db.execute_query(query, params)
+    return db.execute_statement('reservation_insert', params)
 
 def update_reservation(reservation_id, data):
     """Rezervasyon güncelle"""
-    query = """
-    UPDATE reservations 
-    SET name_surname=%s, center=%s, venue=%s, date=%s, time=%s, description=%s
-    WHERE id=%s
-    """
     params = (
         data['name_surname'], data['center'], data['venue'],
         data['date'], data['time'], data['description'], reservation_id
     )
-    return db.execute_query(query, params)
+    return db.execute_statement('reservation_update', params)
 
 def update_reservation_status(reservation_id, status):
     """Rezervasyon durumu güncelle"""
-    query = "UPDATE reservations SET status=%s WHERE id=%s"
-    return db.execute_query(query, (status, reservation_id))
+    return db.execute_statement('reservation_status_update', (status, reservation_id))
 
 def delete_reservation(reservation_id):
     """Rezervasyon sil"""
-    query = "DELETE FROM reservations WHERE id=%s"
-    return db.execute_query(query, (reservation_id,))
+    return db.execute_statement('reservation_delete', (reservation_id,))
 
 def get_reservation_by_id(reservation_id):
     """ID ile rezervasyon getir"""
-    query = "SELECT * FROM reservations WHERE id=%s"
-    result = db.execute_query(query, (reservation_id,))
+    result = db.execute_statement('reservation_by_id', (reservation_id,))
     
     if not result:
         return None
@@ -0,0 +1,83 @@
+"""Rezervasyon verisinin merkez başına sürüm sayaçları
+
+``reservation_center_version`` her merkez için bir sayaç tutar ve
+``reservations`` tablosundaki her INSERT/UPDATE/DELETE'te trigger'larla aynı
+işlem içinde o merkezin satırı artırılır (merkezi değişen kayıtta iki merkez
+de artar). Sayaç değişmediyse o merkezin verisi de değişmemiştir; bu yüzden
+türetilmiş çıktılar (export dosyaları, takvim akışları) sürümle anahtarlanıp
+tüm worker'lar ve diğer uygulamaların yazmaları için doğru şekilde
+önbelleklenebilir.
+
+Sayaç merkez başına olduğundan farklı merkezlerdeki yazmalar aynı satırın
+kilidini beklemez (merkez kilitleriyle aynı ayrım). Tüm verinin sürümü
+sayaçların toplamıdır; sayaçlar sadece arttığı için toplam da sadece artar.
+"""
+import logging
+
+import statements
+
+logger = logging.getLogger(__name__)
+
+# MySQL tanımları (SQLite karşılıkları sqlite_backend.SCHEMA içinde)
+MYSQL_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS reservation_center_version (
+    center VARCHAR(255) NOT NULL PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# Tek satırlık eski sayacın trigger'ları: tüm yazmaları aynı satırda sıraya sokuyordu
+LEGACY_VERSION_TRIGGERS = ('trg_version_insert', 'trg_version_update', 'trg_version_delete')
+
+
+def _bump(row):
+    return f"""
+        INSERT INTO reservation_center_version (center, version) VALUES ({row}.center, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1"""
+
+
+MYSQL_VERSION_TRIGGERS = {
+    'trg_center_version_insert': f"""
+        CREATE TRIGGER trg_center_version_insert AFTER INSERT ON reservations
+        FOR EACH ROW {_bump('NEW')}
+    """,
+    'trg_center_version_update': f"""
+        CREATE TRIGGER trg_center_version_update AFTER UPDATE ON reservations
+        FOR EACH ROW
+        BEGIN
+            {_bump('NEW')};
+            IF NOT (OLD.center <=> NEW.center) THEN
+                {_bump('OLD')};
+            END IF;
+        END
+    """,
+    'trg_center_version_delete': f"""
+        CREATE TRIGGER trg_center_version_delete AFTER DELETE ON reservations
+        FOR EACH ROW {_bump('OLD')}
+    """,
+}
+
+
+def create_mysql_version(cursor):
+    """Sürüm tablosunu ve eksik trigger'ları oluştur, eski tek satırlık sayacı kaldır"""
+    cursor.execute(MYSQL_VERSION_TABLE)
+    cursor.execute(
+        "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()"
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+    for name, ddl in MYSQL_VERSION_TRIGGERS.items():
+        if name not in existing:
+            cursor.execute(ddl)
+    # Yeni trigger'lar kurulduktan sonra eskiler kaldırılır; arada yapılan yazmalar da sayılır
+    for name in LEGACY_VERSION_TRIGGERS:
+        if name in existing:
+            cursor.execute(f"DROP TRIGGER {name}")
+    cursor.execute("DROP TABLE IF EXISTS reservation_version")
+
+
+def get_dataset_version(conn, center=None):
+    """Güncel veri sürümü: ``center`` verilirse o merkezin, yoksa tüm verinin"""
+    if center:
+        row = statements.fetch_one(conn, 'dataset_center_version', (center,))
+        return int(row[0]) if row else 0
+    return int(statements.fetch_one(conn, 'dataset_version')[0])
@@ -70,12 +70,24 @@ mysql -e "CREATE USER IF NOT EXISTS 'rezervasyon_user'@'localhost' IDENTIFIED BY
 mysql -e "GRANT ALL PRIVILEGES ON rezervasyon_sistemi_prod.* TO 'rezervasyon_user'@'localhost';"
 mysql -e "FLUSH PRIVILEGES;"
 
+# Run schema migration (workers no longer create tables on import)
+print_status "Running database migration..."
+cd $APP_DIR && sudo -u $USER $APP_DIR/venv/bin/flask --app app init-db
+
+# Build fingerprinted static bundles (vendor files are downloaded once into static/vendor)
+print_status "Building static assets..."
+cd $APP_DIR && sudo -u $USER $APP_DIR/venv/bin/flask --app app build-assets || print_warning "Static assets could not be built; pages will fall back to CDN links"
+
 # Setup systemd service
 print_status "Setting up systemd service..."
 cp $APP_DIR/rezervasyon.service /etc/systemd/system/
+cp $APP_DIR/rezervasyon-events.service /etc/systemd/system/
 systemctl daemon-reload
 systemctl enable $SERVICE_NAME
 systemctl start $SERVICE_NAME
+# Change feed (SSE) runs in its own threaded gunicorn instance
+systemctl enable rezervasyon-events
+systemctl start rezervasyon-events
 
 # Setup Nginx
 print_status "Setting up Nginx..."
@@ -0,0 +1,183 @@
+"""Rezervasyon listesinin Excel (xlsx) çıktısı
+
+İstek içinde (küçük export'lar) ve arka plan export işlerinde (process
+pool) aynı fonksiyon kullanılır; bu yüzden modül Flask uygulamasını import
+etmez.
+
+openpyxl import'u uygulama açılışının en pahalı kısmıydı (~150 ms); ilk
+export'a kadar ertelenir.
+"""
+import logging
+from datetime import datetime, date as date_type
+
+logger = logging.getLogger(__name__)
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def create_excel_file(reservations_data, filters):
+    """Excel dosyası oluştur - Güvenli hata yönetimi ile"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from openpyxl.utils import get_column_letter
+
+    try:
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Rezervasyonlar"
+        
+        # Başlık stilleri
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        header_alignment = Alignment(horizontal="center", vertical="center")
+        
+        # Kenarlık stili
+        thin_border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        
+        # Başlık bilgileri
+        ws.merge_cells('A1:I1')
+        ws['A1'] = "REZERVASYON LİSTESİ"
+        ws['A1'].font = Font(bold=True, size=16)
+        ws['A1'].alignment = Alignment(horizontal="center")
+        
+        # Filtre bilgileri - Güvenli erişim
+        filter_info = []
+        if filters.get('center', 'all') != 'all':
+            filter_info.append(f"Merkez: {filters.get('center', '')}")
+        if filters.get('venue', 'all') != 'all':
+            filter_info.append(f"Etkinlik Yeri: {filters.get('venue', '')}")
+        if filters.get('status', 'all') != 'all':
+            status_names = {'onay': 'Onaylı', 'bekle': 'Beklemede', 'iptal': 'İptal'}
+            status_value = filters.get('status', '')
+            filter_info.append(f"Durum: {status_names.get(status_value, status_value)}")
+        if filters.get('month', 'all') != 'all':
+            month_names = {
+                '01': 'Ocak', '02': 'Şubat', '03': 'Mart', '04': 'Nisan',
+                '05': 'Mayıs', '06': 'Haziran', '07': 'Temmuz', '08': 'Ağustos',
+                '09': 'Eylül', '10': 'Ekim', '11': 'Kasım', '12': 'Aralık'
+            }
+            month_value = filters.get('month', '')
+            if month_value and '-' in month_value:
+                try:
+                    year, month_num = month_value.split('-')
+                    filter_info.append(f"Ay: {month_names.get(month_num, month_num)} {year}")
+                except ValueError:
+                    filter_info.append(f"Ay: {month_value}")
+        if filters.get('year', 'all') != 'all':
+            filter_info.append(f"Yıl: {filters.get('year', '')}")
+        
+        if filter_info:
+            ws.merge_cells('A2:I2')
+            ws['A2'] = f"Filtreler: {' | '.join(filter_info)}"
+            ws['A2'].font = Font(italic=True)
+            ws['A2'].alignment = Alignment(horizontal="center")
+            start_row = 4
+        else:
+            start_row = 3
+        
+        # Tarih bilgisi
+        ws.merge_cells(f'A{start_row-1}:I{start_row-1}')
+        ws[f'A{start_row-1}'] = f"Oluşturulma Tarihi: {datetime.now().strftime('%d.%m.%Y %H:%M')}"
+        ws[f'A{start_row-1}'].font = Font(size=10)
+        ws[f'A{start_row-1}'].alignment = Alignment(horizontal="right")
+        
+        # Tablo başlıkları
+        headers = ['#', 'Ad Soyad', 'Merkez', 'Etkinlik Yeri', 'Tarih', 'Saat', 'Durum', 'Açıklama', 'Oluşturulma']
+        for col, header in enumerate(headers, 1):
+            cell = ws.cell(row=start_row, column=col)
+            cell.value = header
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            cell.border = thin_border
+        
+        # Veri satırları
+        status_colors = {
+            'onay': PatternFill(start_color="D4F4DD", end_color="D4F4DD", fill_type="solid"),
+            'bekle': PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid"),
+            'iptal': PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
+        }
+        
+        status_names = {'onay': 'Onaylı', 'bekle': 'Beklemede', 'iptal': 'İptal'}
+        
+        for row_idx, reservation in enumerate(reservations_data, start_row + 1):
+            # Güvenli veri erişimi
+            try:
+                # Tarih formatını düzenle
+                # Kayıtlar ham date değerini taşır; metin ayrıştırmaya gerek kalmaz
+                date_value = getattr(reservation, 'date_value', None) or reservation.get('date', '')
+                try:
+                    if isinstance(date_value, date_type):
+                        formatted_date = date_value.strftime('%d.%m.%Y')
+                    elif isinstance(date_value, str):
+                        date_obj = datetime.strptime(date_value, '%Y-%m-%d')
+                        formatted_date = date_obj.strftime('%d.%m.%Y')
+                    else:
+                        formatted_date = str(date_value)
+                except:
+                    formatted_date = str(date_value)
+                
+                # Oluşturulma tarihini formatla
+                created_value = getattr(reservation, 'created_at_value', None) or reservation.get('created_at', '')
+                try:
+                    if isinstance(created_value, datetime):
+                        formatted_created = created_value.strftime('%d.%m.%Y %H:%M')
+                    elif isinstance(created_value, str) and created_value:
+                        created_obj = datetime.strptime(created_value, '%Y-%m-%d %H:%M:%S')
+                        formatted_created = created_obj.strftime('%d.%m.%Y %H:%M')
+                    else:
+                        formatted_created = str(created_value) if created_value else '-'
+                except:
+                    formatted_created = str(created_value) if created_value else '-'
+                
+                data = [
+                    reservation.get('id', ''),
+                    reservation.get('name_surname', ''),
+                    reservation.get('center', ''),
+                    reservation.get('venue', 'Tiyatro Salonu'),
+                    formatted_date,
+                    reservation.get('time', ''),
+                    status_names.get(reservation.get('status', ''), reservation.get('status', '')),
+                    reservation.get('description', '') or '-',
+                    formatted_created
+                ]
+                
+                for col, value in enumerate(data, 1):
+                    cell = ws.cell(row=row_idx, column=col)
+                    cell.value = str(value) if value is not None else ''
+                    cell.border = thin_border
+                    cell.alignment = Alignment(vertical="center")
+                    
+                    # Durum sütunu için renk
+                    if col == 7:  # Durum sütunu
+                        reservation_status = reservation.get('status', '')
+                        if reservation_status in status_colors:
+                            cell.fill = status_colors[reservation_status]
+                            
+            except Exception as e:
+                logger.error(f"Excel satır hatası: {e}")
+                continue
+        
+        # Sütun genişliklerini ayarla
+        column_widths = [5, 20, 25, 15, 12, 15, 12, 30, 18]
+        for col, width in enumerate(column_widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        
+        # Satır yüksekliklerini ayarla
+        for row in range(1, ws.max_row + 1):
+            ws.row_dimensions[row].height = 20
+        
+        return wb
+        
+    except Exception as e:
+        logger.error(f"Excel dosyası oluşturma hatası: {e}")
+        # Hata durumunda basit bir Excel dosyası oluştur
+        wb = Workbook()
+        ws = wb.active
+        ws['A1'] = "Hata: Excel dosyası oluşturulamadı"
+        return wb
@@ -0,0 +1,129 @@
+"""Oluşturulan Excel export'ları için sürümlü disk önbelleği
+
+Aynı filtrelerle aynı veri sürümünde istenen export aynı dosyadır. Dosyalar
+``EXPORT_CACHE_DIR`` altında normalize edilmiş filtreler ve
+``dataset_version`` sayacından türetilen bir anahtarla saklanır. Tekrar eden
+indirmeler openpyxl'e hiç girmeden diskten gönderilir.
+
+Veri değiştiğinde sürüm artar ve eski anahtarlar bir daha istenmez; bu
+dosyalar boyut sınırı (``EXPORT_CACHE_MAX_MB``) aşıldığında en uzun süredir
+kullanılmayandan başlanarak silinir. Son kullanım zamanı dosyanın mtime
+değeridir, böylece LRU sırası tüm gunicorn worker'larında ortaktır.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CACHE_DIR = os.getenv('EXPORT_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'rezervasyon_export_cache')
+EXPORT_CACHE_MAX_MB = float(os.getenv('EXPORT_CACHE_MAX_MB', 256))
+
+SUFFIX = '.xlsx'
+FILTER_KEYS = ('center', 'status', 'month', 'year', 'venue')
+
+
+def normalize_filters(filters):
+    """Filtreleri anahtar için tek biçime getir (boş değer = 'all')"""
+    return {key: str(filters.get(key) or 'all').strip() or 'all' for key in FILTER_KEYS}
+
+
+def cache_key(filters, version):
+    """Normalize edilmiş filtreler + veri sürümü için dosya anahtarı"""
+    payload = json.dumps({'filters': normalize_filters(filters), 'version': version},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class ExportCache:
+    """Boyut sınırlı, LRU sırasıyla temizlenen export dosyası önbelleği"""
+
+    def __init__(self, directory=EXPORT_CACHE_DIR, max_bytes=int(EXPORT_CACHE_MAX_MB * 1024 * 1024)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        """Önbellekteki dosyanın yolu (yoksa None); kullanım zamanını günceller"""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key, workbook):
+        """openpyxl workbook'unu önbelleğe yaz ve yolunu döndür"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                workbook.save(f)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict()
+        return self.path(key)
+
+    def put_file(self, key, source_path):
+        """Hazır bir dosyayı (arka plan export işinin çıktısı) önbelleğe ekle"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict()
+        return self.path(key)
+
+    def evict(self):
+        """Toplam boyut sınırı aşıldıysa en eski kullanılan dosyaları sil"""
+        with self._evict_lock:
+            try:
+                entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(SUFFIX)]
+            except FileNotFoundError:
+                return 0
+            files = []
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in files)
+            removed = 0
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    # Başka bir worker aynı anda silmiş olabilir
+                    pass
+                total -= size
+                removed += 1
+            if removed:
+                logger.info(f"Export önbelleğinden {removed} dosya silindi")
+            return removed
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'directory': self.directory,
+                'max_bytes': self.max_bytes}
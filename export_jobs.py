@@ -0,0 +1,168 @@
+"""Büyük Excel export'ları için arka plan işleri
+
+Satır sayısı ``EXPORT_SYNC_MAX_ROWS`` eşiğini aşan export'lar istek içinde
+oluşturulmaz; bir process pool'a iş olarak verilir ve tarayıcı durum
+endpoint'ini yoklar. İş durumu dosya sistemi üzerinden tutulur, böylece
+isteği hangi gunicorn worker'ı karşılarsa karşılasın aynı sonucu görür:
+
+    {job_id}.json   iş bilgisi (sahibi, dosya adı, satır sayısı, zaman)
+    {job_id}.xlsx   tamamlanan dosya (geçici dosyadan atomik rename)
+    {job_id}.error  hata mesajı
+
+``EXPORT_TTL`` saniyeden eski dosyalar yeni iş ve durum isteklerinde silinir.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import re
+import secrets
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from excel_export import create_excel_file
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = os.getenv('EXPORT_DIR') or os.path.join(tempfile.gettempdir(), 'rezervasyon_exports')
+EXPORT_TTL = int(os.getenv('EXPORT_TTL', 3600))
+EXPORT_WORKERS = int(os.getenv('EXPORT_WORKERS', 2))
+EXPORT_SYNC_MAX_ROWS = int(os.getenv('EXPORT_SYNC_MAX_ROWS', 2000))
+
+PENDING = 'pending'
+DONE = 'done'
+ERROR = 'error'
+
+_JOB_ID_RE = re.compile(r'^[A-Za-z0-9_-]{16,64}$')
+
+_executor = None
+_executor_pid = None
+
+
+def _get_executor():
+    """Bu süreç için process pool (fork sonrası her worker kendi pool'unu açar)"""
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        # spawn: çocuk süreçler Flask uygulamasını ve açık bağlantıları devralmaz
+        _executor = ProcessPoolExecutor(max_workers=EXPORT_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        _executor_pid = os.getpid()
+    return _executor
+
+
+def _path(job_id, suffix):
+    return os.path.join(EXPORT_DIR, f"{job_id}.{suffix}")
+
+
+def _valid_job_id(job_id):
+    return bool(job_id and _JOB_ID_RE.match(job_id))
+
+
+def run_export_job(directory, job_id, reservations_data, filters):
+    """Process pool içinde çalışır: workbook'u oluştur ve atomik olarak yaz"""
+    target = os.path.join(directory, f"{job_id}.xlsx")
+    tmp_path = f"{target}.tmp"
+    try:
+        wb = create_excel_file(reservations_data, filters)
+        wb.save(tmp_path)
+        os.replace(tmp_path, target)
+        return len(reservations_data)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        with open(os.path.join(directory, f"{job_id}.error"), 'w', encoding='utf-8') as f:
+            f.write(str(e))
+        raise
+
+
+def _finish_job(job_id, future, on_complete):
+    error = future.exception()
+    if error:
+        logger.error(f"Export işi başarısız ({job_id}): {error}")
+        return
+    logger.info(f"Export işi tamamlandı ({job_id}): {future.result()} satır")
+    if on_complete:
+        try:
+            on_complete(job_file_path(job_id))
+        except Exception as e:
+            logger.error(f"Export işi sonrası hata ({job_id}): {e}")
+
+
+def submit_export(reservations_data, filters, owner, filename, on_complete=None):
+    """Export işini kuyruğa al ve iş ID'sini döndür
+
+    ``on_complete`` verilirse iş başarıyla bittiğinde dosya yoluyla çağrılır
+    (örn. dosyayı export önbelleğine eklemek için).
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    cleanup_expired()
+
+    job_id = secrets.token_urlsafe(16)
+    meta = {
+        'owner': owner,
+        'filename': filename,
+        'rows': len(reservations_data),
+        'created': time.time()
+    }
+    with open(_path(job_id, 'json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    future = _get_executor().submit(run_export_job, EXPORT_DIR, job_id, list(reservations_data), filters)
+    future.add_done_callback(lambda fut: _finish_job(job_id, fut, on_complete))
+    logger.info(f"Export işi kuyruğa alındı ({job_id}): {meta['rows']} satır")
+    return job_id
+
+
+def get_job(job_id):
+    """İş durumunu getir; iş yoksa veya süresi dolduysa None
+
+    Returns:
+        dict: owner, filename, rows, created ve status (pending/done/error)
+    """
+    if not _valid_job_id(job_id):
+        return None
+    cleanup_expired()
+    try:
+        with open(_path(job_id, 'json'), encoding='utf-8') as f:
+            job = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    job['id'] = job_id
+    if os.path.exists(_path(job_id, 'xlsx')):
+        job['status'] = DONE
+    elif os.path.exists(_path(job_id, 'error')):
+        job['status'] = ERROR
+        with open(_path(job_id, 'error'), encoding='utf-8') as f:
+            job['error'] = f.read()
+    else:
+        job['status'] = PENDING
+    return job
+
+
+def job_file_path(job_id):
+    """Tamamlanan işin dosya yolu"""
+    return _path(job_id, 'xlsx')
+
+
+def cleanup_expired(now=None):
+    """Süresi dolan iş dosyalarını sil"""
+    now = now or time.time()
+    try:
+        entries = os.scandir(EXPORT_DIR)
+    except FileNotFoundError:
+        return 0
+    removed = 0
+    with entries:
+        for entry in entries:
+            try:
+                if now - entry.stat().st_mtime > EXPORT_TTL:
+                    os.unlink(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                # Başka bir worker aynı anda silmiş olabilir
+                continue
+    if removed:
+        logger.info(f"Süresi dolan {removed} export dosyası silindi")
+    return removed
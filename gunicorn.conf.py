@@ -1,12 +1,18 @@
 # Gunicorn configuration file for production
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Paylaşılan doluluk tablosu bu gunicorn oturumunda bir kez oluşturulur;
+# master'da belirlenen anahtar tüm worker'lara environment ile aktarılır
+os.environ.setdefault('OCCUPANCY_BUILD_KEY', f"gunicorn-{os.getpid()}-{int(time.time())}")
+
 # Server socket
 bind = f"0.0.0.0:{os.getenv('FLASK_PORT', 5000)}"
-backlog = 2048
+# Aşırı yükte istekler uzun kuyrukta beklemek yerine uygulamanın kabul kontrolüyle hızlıca reddedilir
+backlog = int(os.getenv('GUNICORN_BACKLOG', 2048))
 
 # Worker processes
 workers = 4
@@ -19,6 +25,13 @@ keepalive = 2
 max_requests = 1000
 max_requests_jitter = 50
 
+# Uygulama master'da bir kez yüklenir, worker'lar veriyi copy-on-write paylaşır
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+if preload_app:
+    # Master veriyi tek kullanımlık bağlantılarla yükler; fork'a açık bağlantı taşınmaz,
+    # MySQL havuzları post_fork'ta her worker'da açılır
+    os.environ.setdefault('DB_POOL_AFTER_FORK', 'True')
+
 # Logging
 accesslog = "logs/access.log"
 errorlog = "logs/error.log"
@@ -38,3 +51,17 @@ tmp_upload_dir = None
 # SSL (for HTTPS)
 # keyfile = '/path/to/keyfile'
 # certfile = '/path/to/certfile'
+
+# Server hooks
+def when_ready(server):
+    """Master hazır: fork öncesi master'ın açık bağlantılarını kapat"""
+    if server.cfg.preload_app:
+        import app
+        app.release_connection_pool()
+        server.log.info(f"Uygulama master'da yüklendi ({app.STARTUP_TIME_MS:.1f} ms)")
+
+def post_fork(server, worker):
+    """Her worker kendi bağlantı havuzunu açar ve sadece veri farkını yükler"""
+    if server.cfg.preload_app:
+        import app
+        app.reinit_after_fork()
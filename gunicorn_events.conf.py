@@ -0,0 +1,36 @@
+# Değişiklik akışı (/events/) için ayrı gunicorn yapılandırması
+#
+# SSE bağlantıları dakikalarca açık kalır; sync worker'da her bağlantı bir
+# worker'ı tamamen meşgul ederdi. Bu örnek thread'li (gthread) worker'larla
+# ayrı bir portta çalışır, nginx /events/ isteklerini buraya yönlendirir.
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Bu örnek rezervasyon yazmaz; ana uygulamanın paylaşılan doluluk tablosuna dokunmaz.
+# Akış sadece değişiklik günlüğünü okur: rezervasyonlar, indeksler ve snapshot yüklenmez.
+os.environ['OCCUPANCY_PATH'] = ''
+os.environ['LOAD_RESERVATIONS'] = 'False'
+os.environ['SNAPSHOT_PATH'] = ''
+
+bind = f"127.0.0.1:{os.getenv('EVENTS_PORT', 5001)}"
+
+# Akış abonelikleri süreç başına tek günlük sorgusunu paylaşır; az süreç, çok thread
+workers = int(os.getenv('EVENTS_WORKERS', 1))
+worker_class = "gthread"
+threads = int(os.getenv('EVENTS_THREADS', 64))
+# Açık akış bağlantısı worker'ı canlı tutar; zaman aşımı sadece takılan worker içindir
+timeout = 60
+graceful_timeout = 10
+keepalive = 75
+
+preload_app = False
+
+# Logging
+accesslog = "logs/events_access.log"
+errorlog = "logs/events_error.log"
+loglevel = "info"
+
+proc_name = 'rezervasyon_events'
+pidfile = 'logs/gunicorn_events.pid'
@@ -0,0 +1,73 @@
+"""Worker belleğinde tutulan rezervasyonların tarih penceresi
+
+Bellekte sadece aktif rezervasyon ufku tutulur: bugünden ``HOT_WINDOW_DAYS_BACK``
+gün öncesinden ``HOT_WINDOW_DAYS_AHEAD`` gün sonrasına kadar. Çakışma kontrolü,
+müsaitlik ve liste görünümünün neredeyse tamamı bu aralıktadır. Pencere
+dışına düşen sorgular (eski yıllar, uzak gelecek) veritabanına gider; pencere
+her gün bir gün ileri kayar. Böylece worker belleği biriken geçmişle değil,
+pencere genişliğiyle sınırlıdır.
+"""
+import os
+from datetime import date, timedelta
+
+HOT_WINDOW_ENABLED = os.getenv('HOT_WINDOW_ENABLED', 'True').lower() == 'true'
+HOT_WINDOW_DAYS_BACK = int(os.getenv('HOT_WINDOW_DAYS_BACK', 90))
+HOT_WINDOW_DAYS_AHEAD = int(os.getenv('HOT_WINDOW_DAYS_AHEAD', 730))
+
+
+class HotWindow:
+    """[start, end) tarih aralığı (end hariç)"""
+
+    __slots__ = ('start', 'end')
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def for_day(cls, today=None, days_back=HOT_WINDOW_DAYS_BACK, days_ahead=HOT_WINDOW_DAYS_AHEAD):
+        today = today or date.today()
+        return cls(today - timedelta(days=days_back), today + timedelta(days=days_ahead + 1))
+
+    def __eq__(self, other):
+        return isinstance(other, HotWindow) and (self.start, self.end) == (other.start, other.end)
+
+    def __repr__(self):
+        return f"HotWindow({self.start.isoformat()}, {self.end.isoformat()})"
+
+    @property
+    def params(self):
+        """SQL ``date >= %s AND date < %s`` parametreleri"""
+        return (self.start, self.end)
+
+    def contains(self, value):
+        """Tarih (date veya YYYY-MM-DD metni) pencerede mi"""
+        if isinstance(value, str):
+            try:
+                value = date.fromisoformat(value)
+            except ValueError:
+                return False
+        return value is not None and self.start <= value < self.end
+
+    def outside(self, start=None, end=None):
+        """[start, end) aralığının pencere dışında kalan parçaları
+
+        ``None`` sınırsız demektir. Sonuç en fazla iki aralıktır (önce ve sonra).
+        """
+        parts = []
+        if start is None or start < self.start:
+            before_end = self.start if end is None else min(end, self.start)
+            if start is None or start < before_end:
+                parts.append((start, before_end))
+        if end is None or end > self.end:
+            after_start = self.end if start is None else max(start, self.end)
+            if end is None or after_start < end:
+                parts.append((after_start, end))
+        return parts
+
+
+def current_window(today=None):
+    """Ayarlara göre bugünün penceresi; kapalıysa None"""
+    if not HOT_WINDOW_ENABLED:
+        return None
+    return HotWindow.for_day(today)
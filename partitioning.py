@@ -0,0 +1,234 @@
+"""Rezervasyon tablosunun yıllara göre bölümlenmesi ve arşivleme
+
+MySQL'de ``reservations`` tablosu ``RANGE (YEAR(date))`` ile her yıl için
+ayrı bir partition'a bölünür::
+
+    p_old     ilk yıldan önceki tarihler
+    p2024     2024
+    p2025     2025
+    ...
+    p_future  tanımlı son yıldan sonraki tarihler (MAXVALUE)
+
+Tarih aralığı içeren sorgular (export akışı, takvim, doluluk) sadece ilgili
+partition'ları okur. MySQL'de her unique anahtar bölümleme sütununu içermek
+zorunda olduğundan birincil anahtar ``(id, date)`` olur; ``id`` yine
+AUTO_INCREMENT ile tekildir.
+
+Kapanmış geçmiş yıllar ``reservations_archive`` tablosuna taşınır. Yılın
+partition'ı önce ``EXCHANGE PARTITION`` ile boş bir staging tablosuyla yer
+değiştirir: tek bir metadata işlemidir, satırlar canlı tablodan bir anda
+çıkar. Kopyalama ile silme arasında yapılan bir güncelleme veya ekleme bu
+yüzden kaybolamaz; devirden sonra gelen yazmalar canlı tabloda kalır.
+Staging'deki satırlar tek işlemde arşive yazılır (önceki yarım denemeden
+kalan kopyalar silinip yenisi yazılır), sayı doğrulanır ve staging tablosu
+silinir. İşlem yarıda kalırsa satırlar staging tablosunda durur ve sonraki
+çalıştırma oradan devam eder.
+
+Exchange trigger çalıştırmaz: ``reservation_rollup`` geçmiş yılların
+sayılarını korur (pano geçmişi göstermeye devam eder), değişiklik günlüğüne
+olay yazılmaz ve worker'lar silmeleri görmez. Bu yüzden bellek penceresiyle
+(``HOT_WINDOW_DAYS_BACK``) örtüşen yıllar arşivlenmez; veri sürümü ise açıkça
+artırılır. Böylece canlı tablo, bellek yüklemeleri ve ``SELECT DISTINCT``
+sorguları sadece güncel yılları tarar.
+
+SQLite'ta bölümleme yoktur; arşiv tablosu şemada bulunur ama taşıma
+sadece MySQL'de yapılır.
+"""
+import logging
+import os
+from datetime import date, datetime, timedelta
+
+import statements
+from hot_window import HOT_WINDOW_DAYS_BACK
+
+logger = logging.getLogger(__name__)
+
+# Yeni kurulumda ilk yıl partition'ı (boşsa içinde bulunulan yıl)
+PARTITION_FIRST_YEAR = int(os.getenv('PARTITION_FIRST_YEAR') or datetime.now().year)
+# Bugünden itibaren kaç yıl için önceden partition açılır
+PARTITION_YEARS_AHEAD = int(os.getenv('PARTITION_YEARS_AHEAD', 2))
+
+TABLE = 'reservations'
+ARCHIVE_TABLE = 'reservations_archive'
+STAGING_TABLE = 'reservations_archive_staging'
+
+MYSQL_ARCHIVE_TABLE = """
+CREATE TABLE IF NOT EXISTS reservations_archive (
+    id INT NOT NULL,
+    name_surname VARCHAR(255) NOT NULL,
+    center VARCHAR(255) NOT NULL,
+    venue VARCHAR(100) DEFAULT 'Tiyatro Salonu',
+    date DATE NOT NULL,
+    time VARCHAR(20) NOT NULL,
+    description TEXT,
+    status ENUM('onay', 'bekle', 'iptal') DEFAULT 'bekle',
+    created_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NULL,
+    created_by VARCHAR(100),
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, date),
+    INDEX idx_archive_center_date (center, date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+
+class ArchiveError(Exception):
+    """Arşivleme ön koşulları sağlanmadığında"""
+
+
+def partition_name(year):
+    return f"p{year}"
+
+
+def partition_clause(first_year, last_year):
+    """``first_year``..``last_year`` için PARTITION BY RANGE tanımı"""
+    parts = [f"PARTITION p_old VALUES LESS THAN ({first_year})"]
+    parts += [f"PARTITION {partition_name(year)} VALUES LESS THAN ({year + 1})"
+              for year in range(first_year, last_year + 1)]
+    parts.append("PARTITION p_future VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (YEAR(date)) (\n    " + ",\n    ".join(parts) + "\n)"
+
+
+def initial_partition_clause():
+    """Yeni kurulumdaki CREATE TABLE için bölümleme tanımı"""
+    return partition_clause(PARTITION_FIRST_YEAR, datetime.now().year + PARTITION_YEARS_AHEAD)
+
+
+def get_year_partitions(cursor):
+    """Tablodaki yıl partition'ları {yıl: satır tahmini}; bölümlenmemişse None"""
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """, (TABLE,))
+    rows = cursor.fetchall()
+    if not rows:
+        return None
+    years = {}
+    for name, _, table_rows in rows:
+        if name.startswith('p') and name[1:].isdigit():
+            years[int(name[1:])] = int(table_rows or 0)
+    return years
+
+
+def partition_existing_table(cursor, years_ahead=PARTITION_YEARS_AHEAD):
+    """Bölümlenmemiş mevcut tabloyu yıllara böl
+
+    Tablo yeniden yazıldığı için büyük tablolarda uzun sürer; bakım
+    penceresinde ``flask --app app partition-reservations`` ile çalıştırılır.
+
+    Returns:
+        bool: Tablo bu çağrıda bölümlendiyse True
+    """
+    if get_year_partitions(cursor) is not None:
+        return False
+    cursor.execute(f"SELECT MIN(YEAR(date)) FROM {TABLE}")
+    first_year = cursor.fetchone()[0] or PARTITION_FIRST_YEAR
+    last_year = max(first_year, datetime.now().year + years_ahead)
+    cursor.execute(
+        f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id, date) "
+        + partition_clause(first_year, last_year)
+    )
+    logger.info(f"Rezervasyon tablosu {first_year}-{last_year} yıllarına bölümlendi")
+    return True
+
+
+def ensure_year_partitions(cursor, through_year=None):
+    """``through_year``'a kadar eksik yıl partition'larını p_future'dan ayır
+
+    Returns:
+        list: Eklenen yıllar (tablo bölümlenmemişse boş)
+    """
+    through_year = through_year or datetime.now().year + PARTITION_YEARS_AHEAD
+    existing = get_year_partitions(cursor)
+    if not existing:
+        return []
+    missing = list(range(max(existing) + 1, through_year + 1))
+    if not missing:
+        return []
+    parts = [f"PARTITION {partition_name(year)} VALUES LESS THAN ({year + 1})" for year in missing]
+    parts.append("PARTITION p_future VALUES LESS THAN MAXVALUE")
+    cursor.execute(
+        f"ALTER TABLE {TABLE} REORGANIZE PARTITION p_future INTO ({', '.join(parts)})"
+    )
+    logger.info(f"Yeni yıl partition'ları eklendi: {missing}")
+    return missing
+
+
+def _staging_exists(cursor):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (STAGING_TABLE,))
+    return cursor.fetchone()[0] > 0
+
+
+def earliest_archivable_day(year, keep_days=HOT_WINDOW_DAYS_BACK):
+    """Yılın bellek penceresinden tamamen çıktığı gün"""
+    return date(year + 1, 1, 1) + timedelta(days=keep_days)
+
+
+def archive_year(conn, year, today=None, keep_days=HOT_WINDOW_DAYS_BACK):
+    """Kapanmış bir yılın rezervasyonlarını arşiv tablosuna taşı
+
+    Args:
+        conn: MySQL bağlantısı
+        year: Arşivlenecek yıl; son günü bellek penceresinin (``keep_days``) dışında olmalı
+
+    Returns:
+        int: Taşınan satır sayısı
+
+    Raises:
+        ArchiveError: Yıl pencereden çıkmamışsa, tablo bölümlenmemişse veya kopya eksikse
+    """
+    today = today or date.today()
+    if today < earliest_archivable_day(year, keep_days):
+        raise ArchiveError(f"{year} yılı henüz bellek penceresinde ({keep_days} gün); "
+                           f"{earliest_archivable_day(year, keep_days).isoformat()} tarihinden sonra arşivlenebilir")
+
+    cursor = conn.cursor()
+    try:
+        staged_year = None
+        if _staging_exists(cursor):
+            count, first, last = statements.fetch_one(conn, 'archive_staged_summary')
+            if count and (first, last) != (year, year):
+                raise ArchiveError(f"{STAGING_TABLE} tablosunda önceki arşivlemeden kalan {first}-{last} "
+                                   f"satırları var; önce o yılı arşivleyin")
+            if count:
+                staged_year = year
+                logger.warning(f"Yarım kalan arşivleme bulundu: {count} satır {STAGING_TABLE} tablosundan devam ediyor")
+            else:
+                cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+
+        if staged_year is None:
+            partitions = get_year_partitions(cursor)
+            if partitions is None:
+                raise ArchiveError("Rezervasyon tablosu bölümlenmemiş; önce partition-reservations çalıştırın")
+            if year not in partitions:
+                raise ArchiveError(f"{year} yılı için partition yok ({partition_name(year)})")
+            cursor.execute(f"CREATE TABLE {STAGING_TABLE} LIKE {TABLE}")
+            cursor.execute(f"ALTER TABLE {STAGING_TABLE} REMOVE PARTITIONING")
+            # Satırlar tek metadata işlemiyle staging tablosuna geçer, partition boş kalır
+            cursor.execute(f"ALTER TABLE {TABLE} EXCHANGE PARTITION {partition_name(year)} WITH TABLE {STAGING_TABLE}")
+            statements.execute(conn, 'dataset_version_bump')
+
+        # Önceki yarım denemeden kalan kopyalar silinip güncel satırlar yazılır (tek işlem)
+        conn.start_transaction()
+        try:
+            statements.execute(conn, 'archive_clear_staged')
+            copied = statements.execute(conn, 'archive_copy_staged').rowcount
+            staged = statements.fetch_one(conn, 'archive_staged_summary')[0]
+            if copied != staged:
+                raise ArchiveError(f"{year} yılında {staged} satırdan {copied} tanesi arşive yazıldı; "
+                                   f"satırlar {STAGING_TABLE} tablosunda duruyor, tekrar deneyin")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+    finally:
+        cursor.close()
+
+    logger.info(f"{year} yılı arşivlendi: {copied} satır {ARCHIVE_TABLE} tablosuna taşındı")
+    return copied
@@ -0,0 +1,142 @@
+"""Okuma sorguları için süreli, boyut sınırlı sonuç önbelleği (app_mysql.py)
+
+Rezervasyon listesi her açılışta filtreli SELECT'i, ay listesini ve yıl
+listesini yeniden çalıştırır; aynı sayfayı aynı saniyede açan planlamacılar
+aynı üç sorguyu tekrar tekrar gönderir. ``QueryCache`` sonucu sorgu adı ve
+parametreleriyle anahtarlayıp ``QUERY_CACHE_TTL_SECONDS`` saniye tutar; en
+fazla ``QUERY_CACHE_MAX_ENTRIES`` anahtar saklanır, fazlası en uzun süredir
+kullanılmayandan başlanarak atılır (LRU).
+
+Aynı anahtar için eşzamanlı ıskalamalarda sorguyu sadece ilk istek çalıştırır
+(single-flight); diğerleri onun sonucunu bekleyip paylaşır. Sorgu hata
+verirse hata bekleyenlere de iletilir ve önbelleğe bir şey yazılmaz.
+
+Bu worker'daki her yazma önbelleği temizler (``invalidate``). Temizlemeden
+önce başlamış bir sorgunun sonucu önbelleğe yazılmaz, sonradan gelen istekler
+ona katılmaz. Diğer worker'ların yazmaları en fazla TTL kadar gecikmeyle
+görünür; yazma yapan oturum TTL süresince önbelleği atlar ve kendi
+değişikliğini hemen görür.
+
+Önbellekteki sonuçlar çağıranlar arasında paylaşılır, değiştirilmemelidir.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_TTL_SECONDS = float(os.getenv('QUERY_CACHE_TTL_SECONDS', 5))
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', 256))
+
+SESSION_KEY = '_query_cache_bypass_until'
+
+
+class _Flight:
+    """Çalışmakta olan tek bir sorgu; bekleyenler sonucunu paylaşır"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class QueryCache:
+    """TTL ve LRU sınırlı, eşzamanlı ıskalamaları birleştiren sonuç önbelleği"""
+
+    def __init__(self, ttl=QUERY_CACHE_TTL_SECONDS, max_entries=QUERY_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # anahtar -> (son geçerlilik zamanı, sonuç)
+        self._flights = {}             # anahtar -> _Flight
+        self._generation = 0
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'invalidations': 0}
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get_or_load(self, key, loader, bypass=False):
+        """Önbellekteki sonucu döndür; yoksa ``loader()`` ile yükle
+
+        Args:
+            key: Sorgu adı ve parametreleri (hashable)
+            loader: Sonucu üreten fonksiyon; hata fırlatırsa sonuç saklanmaz
+            bypass: Önbelleği atla (ör. kendi yazmasını görmesi gereken oturum)
+        """
+        if bypass or not self.enabled:
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return entry[1]
+                del self._entries[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+                self.stats['misses'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = loader()
+        except BaseException as err:
+            flight.error = err
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                # Sorgu sürerken yazma olduysa sonuç eski olabilir; saklanmaz
+                if flight.error is None and generation == self._generation:
+                    self._entries[key] = (time.monotonic() + self.ttl, flight.result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+        return flight.result
+
+    def invalidate(self):
+        """Tüm sonuçları geçersiz kıl (yazmadan sonra çağrılır)"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            # Süren sorgular bekleyenlerine sonuç verir ama yeni istekler onlara katılmaz
+            self._flights.clear()
+            self.stats['invalidations'] += 1
+
+
+def remember_session_write(ttl=QUERY_CACHE_TTL_SECONDS):
+    """Oturum TTL süresince önbelleği atlasın (diğer worker'ların önbelleğinde eski sonuç olabilir)"""
+    from flask import has_request_context, session
+    if has_request_context() and ttl > 0:
+        session[SESSION_KEY] = time.time() + ttl
+
+
+def session_wrote_recently():
+    from flask import has_request_context, session
+    if not has_request_context():
+        return False
+    until = session.get(SESSION_KEY)
+    if until is None:
+        return False
+    if until > time.time():
+        return True
+    session.pop(SESSION_KEY, None)
+    return False
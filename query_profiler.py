@@ -0,0 +1,315 @@
+"""SQL sorgu profilleme ve istek bazlı cProfile kancaları
+
+Tüm veritabanı yardımcıları bağlantılarını ``ProfilingConnection`` ile sarar;
+bu sayede her SQL ifadesinin normalize edilmiş metni, parametre sayısı, süresi
+ve satır sayısı kaydedilir. Eşik değerini aşan sorgular ``EXPLAIN`` çıktısıyla
+birlikte loglanır.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Yavaş sorgu eşiği (milisaniye) - Environment Variables'dan
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 500))
+PROFILE_TOP_N = int(os.getenv('PROFILE_TOP_N', 30))
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')
+
+EXPLAINABLE_PREFIXES = ('SELECT', 'UPDATE', 'DELETE', 'INSERT', 'REPLACE')
+
+_COMMENT_RE = re.compile(r'(--[^\n]*|/\*.*?\*/)', re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%\([^)]+\)s|%s')
+_IN_LIST_RE = re.compile(r'IN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.I)
+_SPACE_RE = re.compile(r'\s+')
+
+# Sorgu istatistikleri: normalize SQL -> toplamlar
+_stats_lock = threading.Lock()
+_query_stats = {}
+
+# Aktif istek profili için thread-local sorgu kaydı
+_local = threading.local()
+
+
+def normalize_sql(sql):
+    """SQL metnini literal ve boşluklardan arındırarak gruplanabilir hale getir"""
+    if isinstance(sql, (bytes, bytearray)):
+        sql = sql.decode('utf-8', 'replace')
+    text = _COMMENT_RE.sub(' ', sql)
+    text = _STRING_RE.sub('?', text)
+    text = _PLACEHOLDER_RE.sub('?', text)
+    text = _NUMBER_RE.sub('?', text)
+    text = _IN_LIST_RE.sub('IN (...)', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def _param_count(params):
+    if not params:
+        return 0
+    try:
+        return len(params)
+    except TypeError:
+        return 1
+
+
+def record_query(normalized, param_count, duration_ms, row_count):
+    """Sorgu ölçümünü genel istatistiklere ve aktif istek kaydına ekle"""
+    with _stats_lock:
+        entry = _query_stats.get(normalized)
+        if entry is None:
+            entry = _query_stats[normalized] = {
+                'sql': normalized,
+                'params': param_count,
+                'count': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'rows': 0
+            }
+        entry['count'] += 1
+        entry['total_ms'] += duration_ms
+        entry['max_ms'] = max(entry['max_ms'], duration_ms)
+        entry['rows'] += max(row_count, 0)
+
+    request_log = getattr(_local, 'queries', None)
+    if request_log is not None:
+        request_log.append({
+            'sql': normalized,
+            'params': param_count,
+            'duration_ms': duration_ms,
+            'rows': row_count
+        })
+
+
+def get_query_stats(limit=None):
+    """Toplam süreye göre sıralanmış sorgu istatistiklerini getir"""
+    with _stats_lock:
+        stats = [dict(entry) for entry in _query_stats.values()]
+    stats.sort(key=lambda s: s['total_ms'], reverse=True)
+    return stats[:limit] if limit else stats
+
+
+def reset_query_stats():
+    """Sorgu istatistiklerini sıfırla"""
+    with _stats_lock:
+        _query_stats.clear()
+
+
+class ProfilingCursor:
+    """Cursor sarmalayıcı - süre, satır sayısı ve yavaş sorgu EXPLAIN kaydı"""
+
+    def __init__(self, cursor, connection):
+        self._cursor = cursor
+        self._connection = connection
+        self._pending = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            self._pending = {
+                'operation': operation,
+                'params': params,
+                'elapsed': time.perf_counter() - start,
+                'fetched': 0
+            }
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            # executemany için EXPLAIN çalıştırılmaz
+            self._pending = {
+                'operation': operation,
+                'params': None,
+                'elapsed': time.perf_counter() - start,
+                'fetched': 0,
+                'many': True
+            }
+
+    def _timed_fetch(self, method, *args):
+        start = time.perf_counter()
+        try:
+            result = getattr(self._cursor, method)(*args)
+        finally:
+            if self._pending:
+                self._pending['elapsed'] += time.perf_counter() - start
+        if self._pending:
+            if method == 'fetchone':
+                self._pending['fetched'] += 1 if result is not None else 0
+            else:
+                self._pending['fetched'] += len(result or [])
+        return result
+
+    def fetchone(self):
+        return self._timed_fetch('fetchone')
+
+    def fetchmany(self, size=1):
+        return self._timed_fetch('fetchmany', size)
+
+    def fetchall(self):
+        return self._timed_fetch('fetchall')
+
+    def close(self):
+        try:
+            return self._cursor.close()
+        finally:
+            self._finish()
+
+    def record(self):
+        """Bekleyen ölçümü şimdi kaydet (açık tutulan, tekrar kullanılan cursor'lar için)"""
+        self._finish()
+
+    def _finish(self):
+        """Bekleyen sorgunun ölçümünü kaydet, gerekiyorsa EXPLAIN al"""
+        pending, self._pending = self._pending, None
+        if not pending:
+            return
+
+        operation = pending['operation']
+        normalized = normalize_sql(operation)
+        duration_ms = pending['elapsed'] * 1000
+        row_count = pending['fetched'] or getattr(self._cursor, 'rowcount', -1) or 0
+        record_query(normalized, _param_count(pending['params']), duration_ms, row_count)
+
+        if duration_ms >= SLOW_QUERY_MS:
+            plan = None if pending.get('many') else self._explain(operation, pending['params'])
+            logger.warning(
+                f"Yavaş sorgu ({duration_ms:.1f} ms, {row_count} satır): {normalized}"
+                + (f"\nEXPLAIN:\n{plan}" if plan else '')
+            )
+
+    def _explain(self, operation, params):
+        """Yavaş sorgu için EXPLAIN çıktısını metin olarak getir"""
+        if not normalize_sql(operation).upper().startswith(EXPLAINABLE_PREFIXES):
+            return None
+        try:
+            cursor = self._connection.cursor(buffered=True)
+            try:
+                cursor.execute(f"EXPLAIN {operation}", params or ())
+                columns = [col[0] for col in cursor.description or []]
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            logger.debug(f"EXPLAIN alınamadı: {e}")
+            return None
+
+        lines = [' | '.join(columns)]
+        for row in rows:
+            lines.append(' | '.join('' if v is None else str(v) for v in row))
+        return '\n'.join(lines)
+
+
+class ProfilingConnection:
+    """Bağlantı sarmalayıcı - tüm cursor'ları ProfilingCursor ile döndürür"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return ProfilingCursor(self._connection.cursor(*args, **kwargs), self._connection)
+
+    @property
+    def raw_connection(self):
+        return self._connection
+
+
+def profile_connection(connection):
+    """Bağlantıyı profilleme sarmalayıcısı ile döndür (None güvenli)"""
+    if connection is None or isinstance(connection, ProfilingConnection):
+        return connection
+    return ProfilingConnection(connection)
+
+
+def _profile_requested(request):
+    flag = request.headers.get('X-Profile') or request.args.get('_profile')
+    return bool(flag) and flag.lower() not in ('0', 'false', 'no')
+
+
+def _token_allowed(request):
+    return bool(PROFILE_TOKEN) and request.headers.get('X-Profile-Token') == PROFILE_TOKEN
+
+
+def format_profile_report(profiler, queries, top_n=None):
+    """cProfile ve sorgu kayıtlarından metin raporu üret"""
+    top_n = top_n or PROFILE_TOP_N
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.strip_dirs().sort_stats('cumulative').print_stats(top_n)
+
+    total_ms = sum(q['duration_ms'] for q in queries)
+    lines = [f"SQL: {len(queries)} sorgu, toplam {total_ms:.1f} ms"]
+    for q in sorted(queries, key=lambda q: q['duration_ms'], reverse=True)[:top_n]:
+        lines.append(f"{q['duration_ms']:9.2f} ms  {q['rows']:6} satır  {q['params']} param  {q['sql']}")
+
+    return '\n'.join(lines) + '\n\n' + buffer.getvalue()
+
+
+def register_request_profiler(app, is_allowed=None):
+    """Flask uygulamasına istek bazlı profilleme kancalarını ekle
+
+    ``X-Profile: 1`` header'ı veya ``?_profile=1`` parametresi gönderen yetkili
+    kullanıcılar için istek cProfile ile çalıştırılır ve yanıt yerine en çok
+    zaman harcayan fonksiyonlar ile SQL özeti döndürülür.
+    """
+    from flask import g, request, make_response
+
+    @app.before_request
+    def _start_request_profile():
+        if not _profile_requested(request):
+            return
+        allowed = is_allowed() if is_allowed else False
+        if not (allowed or _token_allowed(request)):
+            return
+        g._profiler = cProfile.Profile()
+        _local.queries = []
+        g._profiler.enable()
+
+    @app.after_request
+    def _finish_request_profile(response):
+        profiler = g.pop('_profiler', None)
+        if profiler is None:
+            return response
+        profiler.disable()
+        queries = getattr(_local, 'queries', None) or []
+        _local.queries = None
+
+        report = format_profile_report(profiler, queries)
+        logger.info(f"İstek profili: {request.method} {request.full_path}\n{report}")
+
+        profiled = make_response(report, 200)
+        profiled.headers['Content-Type'] = 'text/plain; charset=utf-8'
+        profiled.headers['X-Profiled-Status'] = str(response.status_code)
+        return profiled
+
+    @app.teardown_request
+    def _cleanup_request_profile(exc):
+        _local.queries = None
+
+    return app
@@ -0,0 +1,146 @@
+"""Okuma kopyası (read replica) yönlendirmesi ve kendi yazmasını okuma tutarlılığı
+
+``DB_REPLICA_HOST`` tanımlıysa ikinci bir bağlantı havuzu açılır. Liste,
+export, saat durumu ve bellek senkronizasyonu gibi okumalar bu havuza,
+yazmalar ve çakışma kontrolleri birincil sunucuya gider.
+
+Kopya birincil sunucunun gerisinde kalabilir. Kullanıcı bir yazma yaptıktan
+sonra kendi değişikliğini görmelidir; bu yüzden yazmadan sonra oturuma bir
+işaret konur:
+
+* GTID açıksa birincil sunucunun ``gtid_executed`` kümesi. Okumadan önce
+  kopyada ``GTID_SUBSET`` ile bu kümenin uygulanıp uygulanmadığına bakılır.
+* GTID kapalıysa yazma zamanı. Okumalar ``REPLICA_PIN_SECONDS`` boyunca
+  birincil sunucuda kalır.
+
+İşaret kopyaya ulaşmadıysa okuma birincil sunucuya gider; ulaştıysa işaret
+oturumdan silinir ve sonraki okumalar kontrol yapmadan kopyaya gider. Kopyaya
+bağlanılamazsa okumalar birincil sunucuya düşer.
+"""
+import logging
+import os
+import sqlite3
+import time
+
+import mysql.connector
+
+import statements
+
+logger = logging.getLogger(__name__)
+
+REPLICA_PIN_SECONDS = float(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+SESSION_KEY = '_write_marker'
+# Çok kaynaklı kurulumlarda GTID kümesi uzayabilir; oturum çerezine sığmazsa zaman kullanılır
+MAX_GTID_LENGTH = 1024
+
+DB_ERRORS = (mysql.connector.Error, sqlite3.Error)
+
+
+def replica_config(primary_config):
+    """Okuma kopyası bağlantı ayarları (``DB_REPLICA_HOST`` yoksa None)
+
+    Tanımlanmayan ayarlar (kullanıcı, şifre, veritabanı) birincil sunucudan alınır.
+    """
+    host = os.getenv('DB_REPLICA_HOST')
+    if not host:
+        return None
+    config = dict(primary_config)
+    config['host'] = host
+    config['port'] = int(os.getenv('DB_REPLICA_PORT', primary_config.get('port', 3306)))
+    config['user'] = os.getenv('DB_REPLICA_USER', primary_config.get('user'))
+    config['password'] = os.getenv('DB_REPLICA_PASSWORD', primary_config.get('password'))
+    if 'pool_name' in config:
+        config['pool_name'] = f"{config['pool_name']}_replica"
+        config['pool_size'] = int(os.getenv('DB_REPLICA_POOL_SIZE', config.get('pool_size', 5)))
+    return config
+
+
+def write_marker(conn):
+    """Bağlantıdaki son yazmayı gösteren işaret: GTID kümesi, yoksa zaman"""
+    try:
+        row = statements.fetch_one(conn, 'gtid_executed')
+        gtid = (row[0] or '').replace('\n', '') if row else ''
+    except DB_ERRORS:
+        # GTID desteklemeyen sunucu (veya SQLite)
+        gtid = ''
+    if gtid and len(gtid) <= MAX_GTID_LENGTH:
+        return {'gtid': gtid}
+    return {'at': time.time()}
+
+
+class ReadRouter:
+    """Okuma bağlantısını işarete göre kopyadan veya birincil sunucudan al"""
+
+    def __init__(self, replica_pool, pin_seconds=REPLICA_PIN_SECONDS):
+        self.replica_pool = replica_pool
+        self.pin_seconds = pin_seconds
+        self.stats = {'replica': 0, 'primary': 0, 'replica_errors': 0}
+
+    def connection(self, get_primary, marker=None):
+        """Okuma bağlantısı
+
+        Args:
+            get_primary: Birincil sunucudan bağlantı alan fonksiyon
+            marker: Okumanın görmesi gereken yazma; verilmezse oturumdaki işaret
+        """
+        from_session = marker is None
+        if from_session:
+            marker = session_marker()
+        if marker and 'gtid' not in marker:
+            # Zaman işareti: süre dolana kadar kopyaya sormadan birincil sunucuda kal
+            if time.time() - marker.get('at', 0) < self.pin_seconds:
+                self.stats['primary'] += 1
+                return get_primary()
+            marker = None
+            if from_session:
+                clear_session_marker()
+
+        conn = None
+        try:
+            conn = self.replica_pool.get_connection()
+            if marker:
+                row = statements.fetch_one(conn, 'gtid_subset', (marker['gtid'],))
+                if not (row and row[0]):
+                    conn.close()
+                    self.stats['primary'] += 1
+                    return get_primary()
+                if from_session:
+                    clear_session_marker()
+        except DB_ERRORS as err:
+            if conn is not None:
+                conn.close()
+            self.stats['replica_errors'] += 1
+            logger.warning(f"Okuma kopyasına bağlanılamadı, birincil sunucu kullanılıyor: {err}")
+            return get_primary()
+
+        self.stats['replica'] += 1
+        return conn
+
+
+def session_marker():
+    """İstekteki oturumun son yazma işareti (istek dışında None)"""
+    from flask import has_request_context, session
+    if not has_request_context():
+        return None
+    return session.get(SESSION_KEY)
+
+
+def clear_session_marker():
+    from flask import session
+    session.pop(SESSION_KEY, None)
+
+
+def remember_write(conn, replicated):
+    """Yazmanın işaretini oturuma koy; sonraki okumalar kopya yetişene kadar birincil sunucuya gider
+
+    Args:
+        replicated: Okuma kopyası kullanılıyor mu; kullanılmıyorsa işaret
+            gereksizdir, GTID sorgusu yapılmaz ve oturum çerezine yazılmaz
+    """
+    if not replicated:
+        return
+    from flask import has_request_context, session
+    if not has_request_context():
+        return
+    session[SESSION_KEY] = write_marker(conn)
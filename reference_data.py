@@ -0,0 +1,287 @@
+"""Merkez, salon ve saat dilimi tanımları (referans verisi)
+
+Merkezler, salonlar ve saat dilimleri ``centers``, ``venues`` ve
+``time_slots`` tablolarında tutulur; sıralama ``position`` sütunuyla yapılır,
+kaldırılan kayıt silinmez ``active = 0`` yapılır (eski rezervasyonlar adına
+bağlı kalır). Bu tablolardaki her değişiklik trigger'larla aynı işlem içinde
+``reference_version`` sayacını artırır.
+
+Her worker tanımları değişmez bir ``Registry`` (tuple'lar) olarak bellekte
+tutar. Sayaç en fazla ``REFERENCE_CHECK_SECONDS`` saniyede bir tek satırlık
+sorguyla okunur; sürüm değiştiyse tanımlar yeniden yüklenir ve registry tek
+atamayla değiştirilir. İstek sırasında okunan registry hep tutarlı bir anlık
+görüntüdür. Veritabanına ulaşılamazsa varsayılan tanımlar kullanılır.
+
+Rezervasyon yazmaları merkez başına ayrı kilitlerle korunur (``CenterLocks``);
+farklı merkezlerdeki yazmalar birbirini beklemez. Kilitler bir kilit dosyası
+üzerinden worker süreçleri arasında da geçerlidir (``CENTER_LOCK_PATH``).
+"""
+import fcntl
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import namedtuple
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+
+import mysql.connector
+
+import statements
+from booking_intervals import BookingHours
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_CHECK_SECONDS = float(os.getenv('REFERENCE_CHECK_SECONDS', 30))
+
+DB_ERRORS = (mysql.connector.Error, sqlite3.Error)
+
+# Yeni kurulumda tablolara yazılan ve veritabanı yokken kullanılan tanımlar
+DEFAULT_CENTERS = ('Sefaköy Kültür Merkezi', 'Cennet Kültür Merkezi', 'Atakent Kültür Merkezi', 'Kemalpaşa Semt Konağı')
+DEFAULT_VENUES = ('Tiyatro Salonu', 'Seminer Salonu')
+DEFAULT_TIME_SLOTS = (
+    "09:00-10:00", "10:00-11:00", "11:00-12:00", "12:00-13:00",
+    "13:00-14:00", "14:00-15:00", "15:00-16:00", "16:00-17:00",
+    "17:00-18:00", "18:00-19:00", "19:00-20:00", "20:00-21:00", "21:00-22:00"
+)
+
+Registry = namedtuple('Registry', ['version', 'centers', 'venues', 'time_slots'])
+
+DEFAULT_REGISTRY = Registry(None, DEFAULT_CENTERS, DEFAULT_VENUES, DEFAULT_TIME_SLOTS)
+
+# MySQL tanımları (SQLite karşılıkları sqlite_backend.SCHEMA içinde)
+MYSQL_REFERENCE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS centers (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL UNIQUE,
+        position INT NOT NULL DEFAULT 0,
+        active TINYINT(1) NOT NULL DEFAULT 1
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS venues (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL UNIQUE,
+        position INT NOT NULL DEFAULT 0,
+        active TINYINT(1) NOT NULL DEFAULT 1
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS time_slots (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        label VARCHAR(20) NOT NULL UNIQUE,
+        position INT NOT NULL DEFAULT 0,
+        active TINYINT(1) NOT NULL DEFAULT 1
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS reference_version (
+        id TINYINT PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0
+    ) ENGINE=InnoDB
+    """,
+]
+
+_REFERENCE_BUMP = "UPDATE reference_version SET version = version + 1 WHERE id = 1"
+
+MYSQL_REFERENCE_TRIGGERS = {
+    f'trg_{table}_{event.lower()}': f"""
+        CREATE TRIGGER trg_{table}_{event.lower()} AFTER {event} ON {table}
+        FOR EACH ROW {_REFERENCE_BUMP}
+    """
+    for table in ('centers', 'venues', 'time_slots')
+    for event in ('INSERT', 'UPDATE', 'DELETE')
+}
+
+
+def create_mysql_reference_data(cursor):
+    """Referans tablolarını, sürüm satırını ve eksik trigger'ları oluştur"""
+    for ddl in MYSQL_REFERENCE_TABLES:
+        cursor.execute(ddl)
+    cursor.execute("INSERT IGNORE INTO reference_version (id, version) VALUES (1, 0)")
+    cursor.execute(
+        "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()"
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+    for name, ddl in MYSQL_REFERENCE_TRIGGERS.items():
+        if name not in existing:
+            cursor.execute(ddl)
+
+
+def insert_default_reference_data(conn):
+    """Varsayılan merkez, salon ve saat dilimlerini ekle (var olanlara dokunmaz)"""
+    for name, rows in (('center_insert_default', DEFAULT_CENTERS),
+                       ('venue_insert_default', DEFAULT_VENUES),
+                       ('time_slot_insert_default', DEFAULT_TIME_SLOTS)):
+        for position, value in enumerate(rows):
+            statements.execute(conn, name, (value, position))
+
+
+def load_registry(conn):
+    """Aktif tanımları oku; tablolardan biri boşsa None"""
+    # Sürüm önce okunur: arada değişiklik olursa sonraki kontrol yeniden yükler
+    row = statements.fetch_one(conn, 'reference_version')
+    centers = tuple(r['name'] for r in statements.fetch_all(conn, 'centers_active'))
+    venues = tuple(r['name'] for r in statements.fetch_all(conn, 'venues_active'))
+    time_slots = tuple(r['label'] for r in statements.fetch_all(conn, 'time_slots_active'))
+    if not (centers and venues and time_slots):
+        return None
+    return Registry(int(row[0]) if row else 0, centers, venues, time_slots)
+
+
+@lru_cache(maxsize=8)
+def booking_hours(time_slots):
+    """Saat dilimlerinden türetilen açılış/kapanış saati ve rezervasyon adımı"""
+    return BookingHours(time_slots)
+
+
+class RegistryCache:
+    """Worker'ın güncel registry'si; sürüm değişince yeniden yüklenir"""
+
+    def __init__(self, registry=DEFAULT_REGISTRY, check_seconds=REFERENCE_CHECK_SECONDS):
+        self.registry = registry
+        self.check_seconds = check_seconds
+        self._checked = None
+        self._lock = threading.Lock()
+
+    def refresh(self, connect, force=False):
+        """Sürüm değiştiyse tanımları yeniden yükle
+
+        Args:
+            connect: Bağlantı döndüren fonksiyon (None dönebilir)
+            force: Kontrol aralığını beklemeden oku
+
+        Returns:
+            bool: Tanımlar değiştiyse True
+        """
+        now = time.monotonic()
+        if not force and self._checked is not None and now - self._checked < self.check_seconds:
+            return False
+        # Aynı anda tek thread kontrol eder; diğerleri mevcut registry ile devam eder
+        if not self._lock.acquire(blocking=force):
+            return False
+        try:
+            self._checked = now
+            conn = connect()
+            if not conn:
+                return False
+            try:
+                row = statements.fetch_one(conn, 'reference_version')
+                if row and int(row[0]) == self.registry.version:
+                    return False
+                registry = load_registry(conn)
+            finally:
+                conn.close()
+        except DB_ERRORS as err:
+            logger.error(f"Referans verisi yüklenemedi: {err}")
+            return False
+        finally:
+            self._lock.release()
+
+        if registry is None:
+            logger.warning("Referans tabloları boş, varsayılan merkez/salon/saat tanımları kullanılıyor")
+            return False
+        changed = registry[1:] != self.registry[1:]
+        self.registry = registry
+        if changed:
+            logger.info(f"Referans verisi yüklendi (sürüm {registry.version}): "
+                        f"{len(registry.centers)} merkez, {len(registry.venues)} salon, "
+                        f"{len(registry.time_slots)} saat dilimi")
+        return changed
+
+
+def default_center_lock_path():
+    """Paylaşımlı bellek dizini varsa orayı, yoksa geçici dizini kullan"""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'rezervasyon_center_locks')
+
+
+class CenterLocks:
+    """Merkez başına yazma kilidi (kilit bölümleme)
+
+    ``path`` verilirse kilit worker süreçleri arasında da geçerlidir: her merkez
+    kilit dosyasında bir baytlık ``lockf`` aralığına karşılık gelir. Sync
+    worker'larla (süreç başına tek thread) thread kilidi tek başına yetmez.
+    İsmi aynı bayta düşen merkezler aynı kilidi paylaşır; bu sadece gereksiz
+    beklemeye yol açar.
+    """
+
+    def __init__(self, path=None):
+        self._locks = {}
+        self._depth = {}
+        self._guard = threading.Lock()
+        self._file = None
+        if path:
+            try:
+                self._file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), 'r+b')
+            except OSError as e:
+                logger.warning(f"Merkez kilit dosyası açılamadı, kilitler sadece süreç içinde: {e}")
+
+    @staticmethod
+    def _slot(center):
+        return zlib.crc32(center.encode('utf-8')) & 0x7FFFFFFF
+
+    def _lock(self, slot):
+        lock = self._locks.get(slot)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(slot, threading.RLock())
+        return lock
+
+    @contextmanager
+    def _hold(self, slot):
+        # lockf süreç bazlıdır ve iç içe alınmaz (ilk UN hepsini bırakır); dosya
+        # kilidi sadece bu thread'in ilk girişinde alınıp son çıkışında bırakılır.
+        with self._lock(slot):
+            depth = self._depth.get(slot, 0)
+            if depth == 0 and self._file is not None:
+                fcntl.lockf(self._file, fcntl.LOCK_EX, 1, slot)
+            self._depth[slot] = depth + 1
+            try:
+                yield
+            finally:
+                self._depth[slot] = depth
+                if depth == 0 and self._file is not None:
+                    fcntl.lockf(self._file, fcntl.LOCK_UN, 1, slot)
+
+    @contextmanager
+    def __call__(self, *centers):
+        """Verilen merkezlerin kilitlerini al (ör. merkez değiştiren güncellemede iki merkez)
+
+        Kilitler her zaman aynı sırayla alınır; iki merkezi kilitleyen yazmalar
+        birbirini kilitlenmeye (deadlock) sokmaz.
+        """
+        with ExitStack() as stack:
+            for slot in sorted({self._slot(center) for center in centers}):
+                stack.enter_context(self._hold(slot))
+            yield
+
+
+def register_reference_data(app, cache, connect, on_change=None):
+    """Flask uygulamasına referans verisi kancalarını ekle
+
+    Her istekten önce (en fazla ``check_seconds`` aralıkla) sürüm kontrol edilir;
+    şablonlar ``centers``, ``venues``, ``time_slots`` ve ``booking_hours``
+    değişkenlerini alır.
+
+    Args:
+        cache: ``RegistryCache``
+        connect: Bağlantı döndüren fonksiyon
+        on_change: Tanımlar değiştiğinde çağrılır (bağımlı indeksleri yenilemek için)
+    """
+    @app.before_request
+    def _refresh_reference_data():
+        if cache.refresh(connect) and on_change is not None:
+            on_change(cache.registry)
+
+    @app.context_processor
+    def _inject_reference_data():
+        registry = cache.registry
+        return {'centers': registry.centers, 'venues': registry.venues, 'time_slots': registry.time_slots,
+                'booking_hours': booking_hours(registry.time_slots)}
+
+    return app
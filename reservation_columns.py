@@ -0,0 +1,260 @@
+"""Rezervasyonlar için NumPy tabanlı sütunlu filtre ve istatistik motoru
+
+Bellekteki rezervasyon listesi sütunlara ayrılır: merkez, salon ve durum
+sözlük kodlamalı (küçük tamsayı kodlar), tarih ordinal, yıl/ay ve saat dilimi
+indeksi. Filtreler vektörel boolean maskelerle, sayımlar ve gruplamalar
+``np.bincount`` ile hesaplanır. Sütun sırası listedeki sırayla aynıdır; bu
+nedenle seçilen satırlar listedeki sırayla döner.
+
+NumPy opsiyoneldir: yüklü değilse ``AVAILABLE`` False olur ve uygulama liste
+üzerinde filtrelemeye devam eder.
+"""
+import logging
+import threading
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    np = None
+
+logger = logging.getLogger(__name__)
+
+AVAILABLE = np is not None
+
+# Sözlük kodlamalı sütunlar ve kayıttaki alan adları
+CODED_FIELDS = ('center', 'venue', 'status', 'time')
+
+INITIAL_CAPACITY = 1024
+NO_CODE = -1
+
+
+def _field_value(reservation, field):
+    if field == 'venue':
+        # Eski kayıtlarda salon boş olabilir
+        return reservation.get('venue') or 'Tiyatro Salonu'
+    return reservation[field]
+
+
+class _ColumnState:
+    """Yayımlanmış sütun dizileri, kayıt listesi ve boyut
+
+    Alanları yayımlandıktan sonra yeniden atanmaz; okuyucular durumu bir kez
+    alıp tüm işlemi onunla yapar. Yazıcı dizilere sadece ``size`` sonrasına
+    (henüz görünmeyen satırlar) veya tek bir satırın yerine yazar; boyut,
+    büyüme ve yeniden kurulum yeni bir durum nesnesiyle yayımlanır.
+    """
+
+    __slots__ = ('capacity', 'columns', 'ordinal', 'month_key', 'alive', 'size', 'records', 'positions')
+
+    def __init__(self, capacity, size=0, records=None, positions=None):
+        self.capacity = capacity
+        self.columns = {field: np.full(capacity, NO_CODE, dtype=np.int16) for field in CODED_FIELDS}
+        self.ordinal = np.zeros(capacity, dtype=np.int32)
+        # Yıl*12 + (ay-1): ay ve yıl filtreleri tek karşılaştırma
+        self.month_key = np.full(capacity, NO_CODE, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.size = size
+        self.records = [] if records is None else records
+        self.positions = {} if positions is None else positions
+
+    def resized(self, size):
+        """Aynı dizilerle yeni boyutlu durum"""
+        state = object.__new__(_ColumnState)
+        for name in self.__slots__:
+            setattr(state, name, getattr(self, name))
+        state.size = size
+        return state
+
+    def grown(self, capacity):
+        """Diziler kopyalanmış daha büyük kapasiteli durum"""
+        state = _ColumnState(capacity, self.size, self.records, self.positions)
+        size = self.size
+        for field in CODED_FIELDS:
+            state.columns[field][:size] = self.columns[field][:size]
+        state.ordinal[:size] = self.ordinal[:size]
+        state.month_key[:size] = self.month_key[:size]
+        state.alive[:size] = self.alive[:size]
+        return state
+
+
+class ReservationColumns:
+    """Rezervasyon listesinin sütunlu kopyası
+
+    Listeye yapılan değişiklikler ``upsert``/``remove`` ile yansıtılır; liste
+    baştan değiştiğinde ``rebuild`` çağrılır. Yazmalar kilit altındadır.
+    Diziler, kayıtlar ve boyut tek bir ``_ColumnState`` nesnesinde tutulur ve
+    tek atamayla yayımlanır; okumalar kilitsiz çalışır ve durumu bir kez alır,
+    böylece yeniden kurulum sırasında yeni dizileri eski boyut veya kayıtlarla
+    karıştırmaz.
+    """
+
+    def __init__(self, centers=(), venues=(), statuses=(), slots=()):
+        if np is None:
+            raise RuntimeError("ReservationColumns için numpy gerekli")
+        self._lock = threading.Lock()
+        seeds = {'center': centers, 'venue': venues, 'status': statuses, 'time': slots}
+        self._codes = {field: {} for field in CODED_FIELDS}
+        self._names = {field: [] for field in CODED_FIELDS}
+        for field in CODED_FIELDS:
+            for value in seeds[field]:
+                self._encode(field, value)
+        self._state = _ColumnState(INITIAL_CAPACITY)
+
+    def _encode(self, field, value):
+        codes = self._codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._names[field])
+            self._names[field].append(value)
+        return code
+
+    def _write(self, state, position, reservation):
+        for field in CODED_FIELDS:
+            state.columns[field][position] = self._encode(field, _field_value(reservation, field))
+        date_value = getattr(reservation, 'date_value', None)
+        if date_value is None:
+            state.ordinal[position] = 0
+            state.month_key[position] = NO_CODE
+        else:
+            state.ordinal[position] = date_value.toordinal()
+            state.month_key[position] = date_value.year * 12 + date_value.month - 1
+        state.alive[position] = True
+
+    def rebuild(self, reservations):
+        """Sütunları rezervasyon listesinden baştan oluştur"""
+        records = list(reservations)
+        size = len(records)
+        with self._lock:
+            capacity = INITIAL_CAPACITY
+            while capacity < size:
+                capacity *= 2
+            state = _ColumnState(capacity, size, records,
+                                 {r['id']: position for position, r in enumerate(records)})
+
+            # Satır satır numpy ataması yerine sütun başına tek dönüşüm
+            for field in CODED_FIELDS:
+                encode = self._encode
+                state.columns[field][:size] = [encode(field, _field_value(r, field)) for r in records]
+
+            dates = [getattr(r, 'date_value', None) for r in records]
+            ordinals = {}
+            for value in dates:
+                if value is not None and value not in ordinals:
+                    ordinals[value] = value.toordinal()
+            state.ordinal[:size] = [ordinals[d] if d is not None else 0 for d in dates]
+            month_keys = {d: d.year * 12 + d.month - 1 for d in ordinals}
+            state.month_key[:size] = [month_keys[d] if d is not None else NO_CODE for d in dates]
+            state.alive[:size] = True
+
+            self._state = state
+        logger.debug(f"Sütunlu rezervasyon indeksi oluşturuldu: {size} kayıt")
+
+    def upsert(self, reservation):
+        """Kaydı ekle veya mevcut konumunu güncelle"""
+        with self._lock:
+            state = self._state
+            position = state.positions.get(reservation['id'])
+            if position is not None:
+                state.records[position] = reservation
+                self._write(state, position, reservation)
+                return
+            position = state.size
+            if position >= state.capacity:
+                state = state.grown(state.capacity * 2)
+            # Satır yeni boyut yayımlanana kadar okuyuculara görünmez
+            self._write(state, position, reservation)
+            state.records.append(reservation)
+            state.positions[reservation['id']] = position
+            self._state = state.resized(position + 1)
+
+    def remove(self, reservation_id):
+        """Kaydı sil (konum boş işaretlenir, sıra korunur)"""
+        with self._lock:
+            state = self._state
+            position = state.positions.pop(reservation_id, None)
+            if position is not None:
+                state.alive[position] = False
+
+    def get(self, reservation_id):
+        """ID ile kayıt (silinmişse veya yoksa None)"""
+        state = self._state
+        position = state.positions.get(reservation_id)
+        return None if position is None else state.records[position]
+
+    def __len__(self):
+        state = self._state
+        return int(np.count_nonzero(state.alive[:state.size]))
+
+    @staticmethod
+    def _mask(state, codes, center=None, status=None, venue=None, year=None, month=None, date=None):
+        size = state.size
+        result = state.alive[:size].copy()
+        for field, value in (('center', center), ('status', status), ('venue', venue)):
+            if value is None or value == 'all':
+                continue
+            code = codes[field].get(value)
+            if code is None:
+                result[:] = False
+                return result
+            result &= state.columns[field][:size] == code
+        if year is not None and month is not None:
+            result &= state.month_key[:size] == int(year) * 12 + int(month) - 1
+        elif year is not None:
+            start = int(year) * 12
+            month_key = state.month_key[:size]
+            result &= (month_key >= start) & (month_key < start + 12)
+        if date is not None:
+            result &= state.ordinal[:size] == date.toordinal()
+        return result
+
+    def mask(self, center=None, status=None, venue=None, year=None, month=None, date=None):
+        """Filtrelere uyan satırların boolean maskesi
+
+        ``None`` veya ``'all'`` filtre uygulanmaz; sözlükte olmayan bir değer
+        boş sonuç verir. ``month`` verilirse ``year`` ile birlikte yorumlanır.
+        """
+        return self._mask(self._state, self._codes, center, status, venue, year, month, date)
+
+    def select(self, **filters):
+        """Filtrelere uyan kayıtları liste sırasıyla döndür"""
+        state = self._state
+        positions = np.flatnonzero(self._mask(state, self._codes, **filters)).tolist()
+        return list(map(state.records.__getitem__, positions))
+
+    def count(self, **filters):
+        """Filtrelere uyan kayıt sayısı"""
+        return int(np.count_nonzero(self.mask(**filters)))
+
+    def count_by(self, field, **filters):
+        """Bir sütuna göre gruplanmış sayımlar: {değer: adet}"""
+        state = self._state
+        names = self._names[field]
+        codes = state.columns[field][:state.size][self._mask(state, self._codes, **filters)]
+        counts = np.bincount(codes[codes >= 0], minlength=len(names))
+        return {names[code]: int(n) for code, n in enumerate(counts) if n}
+
+    def months(self):
+        """Kayıtlardaki (yıl, ay) çiftleri, artan sırada"""
+        state = self._state
+        keys = state.month_key[:state.size][state.alive[:state.size]]
+        keys = keys[keys >= 0]
+        if not len(keys):
+            return []
+        # Sıralama yerine bincount: anahtar aralığı birkaç yüz ay
+        low = int(keys.min())
+        present = np.flatnonzero(np.bincount(keys - low)) + low
+        return [(int(key) // 12, int(key) % 12 + 1) for key in present]
+
+    def years(self):
+        """Kayıtlardaki yıllar, artan sırada"""
+        return sorted({year for year, _ in self.months()})
+
+
+def create_columns(reservations, centers=(), venues=(), statuses=(), slots=()):
+    """NumPy varsa sütunlu indeksi oluştur, yoksa None döndür"""
+    if not AVAILABLE:
+        logger.info("numpy bulunamadı, rezervasyon filtreleri liste üzerinde çalışacak")
+        return None
+    columns = ReservationColumns(centers, venues, statuses, slots)
+    columns.rebuild(reservations)
+    return columns
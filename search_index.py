@@ -0,0 +1,198 @@
+"""Rezervasyon ad soyad ve açıklamaları için bellek içi arama indeksi
+
+Her kelime Türkçe kurallarına göre küçük harfe çevrilir (``I`` → ``ı``,
+``İ`` → ``i``) ve aksanlardan arındırılır (``ç ğ ı ö ş ü`` → ``c g i o s u``);
+böylece "ayse yilmaz" araması "Ayşe YILMAZ" kaydını bulur. Kelimeler başına
+``$$`` eklenerek trigram'lara bölünür ve her trigram için rezervasyon ID
+kümesi (posting) tutulur. Sorgu kelimelerinin trigram kümelerinin kesişimi
+aday kümesini verir; adaylar kelime başı eşleşmesiyle doğrulanır. Tablo
+taranmaz, ``LIKE '%...%'`` kullanılmaz.
+
+Sıralama: ad soyad eşleşmesi açıklamadan ağır basar, tam kelime eşleşmesi
+önek eşleşmesinden önce gelir; eşitlikte tarihi bugüne yakın olan, sonra
+yeni oluşturulan kayıt öne çıkar.
+
+``reservations`` tablosu yıllara bölümlendiği için MySQL FULLTEXT indeksi
+kullanılamaz (bölümlenmiş InnoDB tablolarında desteklenmez). İndeks worker
+belleğindeki kayıtları (bellek penceresi) kapsar ve yazmalarla birlikte
+güncellenir. Pencere dışındaki kayıtlar (ör. seçilen eski bir yılın
+veritabanından okunan satırları) ``search(extra=...)`` ile indekslenmeden
+aynı sıralamaya katılır.
+"""
+import heapq
+import os
+import re
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+
+SEARCH_MIN_QUERY_LENGTH = int(os.getenv('SEARCH_MIN_QUERY_LENGTH', 2))
+SEARCH_PAGE_SIZE = int(os.getenv('SEARCH_PAGE_SIZE', 50))
+
+NAME_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+
+_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+_SPLIT = re.compile(r'[\W_]+')
+_PAD = '$$'
+
+
+def normalize(text):
+    """Metni Türkçe kurallarıyla küçük harfe çevirip aksansız kelimelere böl"""
+    if not text:
+        return ()
+    text = text.replace('I', 'ı').replace('İ', 'i').lower().translate(_FOLD)
+    return tuple(word for word in _SPLIT.split(text) if word)
+
+
+@lru_cache(maxsize=65536)
+def word_trigrams(word):
+    """Kelimenin başı işaretlenmiş trigram'ları (önek aramasına uygun)"""
+    padded = _PAD + word
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def searchable(query):
+    """Sorgu aramaya yetecek uzunlukta mı"""
+    return sum(len(token) for token in normalize(query)) >= SEARCH_MIN_QUERY_LENGTH
+
+
+def _token_score(token, words):
+    """Tam kelime 2, kelime başı eşleşmesi 1, yoksa 0"""
+    best = 0
+    for word in words:
+        if word == token:
+            return 2
+        if word.startswith(token):
+            best = 1
+    return best
+
+
+class SearchIndex:
+    """Trigram posting listeleri ile bellek içi rezervasyon araması"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = {}
+        # id -> (rezervasyon, ham ad, ham açıklama, ad kelimeleri, açıklama kelimeleri, trigram'lar)
+        self._docs = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _add(self, reservation, name, description):
+        name_words = normalize(name)
+        description_words = normalize(description)
+        grams = frozenset().union(*map(word_trigrams, name_words + description_words))
+        reservation_id = reservation['id']
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(reservation_id)
+        self._docs[reservation_id] = (reservation, name, description, name_words, description_words, grams)
+
+    def _remove(self, reservation_id):
+        doc = self._docs.pop(reservation_id, None)
+        if doc is None:
+            return
+        for gram in doc[5]:
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(reservation_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def _upsert(self, reservation):
+        name, description = reservation['name_surname'], reservation.get('description')
+        doc = self._docs.get(reservation['id'])
+        if doc is not None and doc[1] == name and doc[2] == description:
+            # Metin değişmedi: sadece kayıt nesnesini güncelle (durum, tarih vb.)
+            if doc[0] is not reservation:
+                self._docs[reservation['id']] = (reservation,) + doc[1:]
+            return
+        self._remove(reservation['id'])
+        self._add(reservation, name, description)
+
+    def upsert(self, reservation):
+        """Eklenen veya değişen rezervasyonu indekse yansıt"""
+        with self._lock:
+            self._upsert(reservation)
+
+    def remove(self, reservation_id):
+        with self._lock:
+            self._remove(reservation_id)
+
+    def rebuild(self, reservations):
+        """İndeksi listeyle eşitle; metni değişmeyen kayıtlar yeniden bölünmez"""
+        with self._lock:
+            current = {r['id'] for r in reservations}
+            for reservation_id in [i for i in self._docs if i not in current]:
+                self._remove(reservation_id)
+            for reservation in reservations:
+                self._upsert(reservation)
+
+    def _candidates(self, tokens):
+        gram_sets = set()
+        for token in tokens:
+            gram_sets |= word_trigrams(token)
+        postings = []
+        for gram in gram_sets:
+            ids = self._postings.get(gram)
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def search(self, query, page=1, per_page=SEARCH_PAGE_SIZE, predicate=None, today=None, extra=()):
+        """Sorguya uyan rezervasyonları sıralı ve sayfalı döndür
+
+        Args:
+            query: Arama metni; her kelime ad soyad veya açıklamada bir kelimenin başına uymalı
+            page: 1'den başlayan sayfa numarası
+            predicate: Ek filtre (rezervasyon -> bool), sadece eşleşenlere uygulanır
+            extra: İndekste olmayan, tek tek puanlanacak kayıtlar (bellek penceresi dışı)
+
+        Returns:
+            tuple: (sayfadaki rezervasyonlar, toplam eşleşme sayısı)
+        """
+        tokens = normalize(query)
+        if sum(len(token) for token in tokens) < SEARCH_MIN_QUERY_LENGTH:
+            return [], 0
+        today = today or date.today()
+        page = max(page, 1)
+
+        def rank(reservation, name_words, description_words):
+            score = 0
+            for token in tokens:
+                token_score = (NAME_WEIGHT * _token_score(token, name_words)
+                               + DESCRIPTION_WEIGHT * _token_score(token, description_words))
+                if not token_score:
+                    return
+                score += token_score
+            if predicate is not None and not predicate(reservation):
+                return
+            day = reservation.date_value
+            distance = abs((day - today).days) if isinstance(day, date) else float('inf')
+            created = reservation.created_at_value
+            created = created.timestamp() if isinstance(created, datetime) else 0
+            ranked.append((-score, distance, -created, reservation['id'], reservation))
+
+        ranked = []
+        with self._lock:
+            for reservation_id in self._candidates(tokens):
+                reservation, _, _, name_words, description_words, _ = self._docs[reservation_id]
+                rank(reservation, name_words, description_words)
+        for reservation in extra:
+            rank(reservation, normalize(reservation['name_surname']), normalize(reservation.get('description')))
+
+        total = len(ranked)
+        first = (page - 1) * per_page
+        top = heapq.nsmallest(first + per_page, ranked, key=lambda item: item[:4])
+        return [item[4] for item in top[first:]], total
+
+    def stats(self):
+        return {'documents': len(self._docs), 'trigrams': len(self._postings)}
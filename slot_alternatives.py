@@ -0,0 +1,111 @@
+"""Dolu bir saat dilimi için en yakın boş dilimlerin sıralı listesi
+
+İstenen dilim doluysa aday dilimler aynı gün ve salondan başlayarak sonraki
+``ALTERNATIVE_DAYS`` güne, diğer salonlara ve istenirse diğer merkezlere
+yayılır. Her aday için istekten "uzaklık" hesaplanır::
+
+    |saat farkı| * SLOT_COST + gün farkı * DAY_COST
+        + (salon farklıysa) VENUE_COST + (merkez farklıysa) CENTER_COST
+
+Adaylar istenen aralıkla aynı uzunluktadır. Aday başlangıçlar tanımlı saat
+dilimlerinin başları, istenen başlangıç ve o gün/yerdeki dolu aralıkların
+hemen öncesi ve sonrasıdır; saat farkı dakika cinsinden hesaplanıp saate
+çevrilir.
+
+Doluluk bilgisi çağırandan tek seferde alınan bir indeks ile gelir
+(``{(merkez, salon, gün): dolu (başlangıç, bitiş) aralıkları}``); aday başına
+ayrı çakışma sorgusu yapılmaz. Sonuç uzaklığa göre sıralı en fazla ``limit``
+adaydır.
+"""
+import heapq
+import os
+from datetime import date, timedelta
+
+from booking_intervals import format_time_range, overlaps, parse_time_range
+
+ALTERNATIVE_DAYS = int(os.getenv('ALTERNATIVE_DAYS', 7))
+ALTERNATIVE_LIMIT = int(os.getenv('ALTERNATIVE_LIMIT', 5))
+ALTERNATIVE_OTHER_CENTERS = os.getenv('ALTERNATIVE_OTHER_CENTERS', 'False').lower() == 'true'
+
+# Uzaklık ağırlıkları (bir saatlik kayma = 1)
+SLOT_COST = 1
+DAY_COST = 3
+VENUE_COST = 2
+CENTER_COST = 6
+
+
+def candidate_days(day, days=ALTERNATIVE_DAYS, today=None):
+    """İstenen gün ve sonraki ``days`` gün (geçmiş günler hariç)"""
+    today = today or date.today()
+    return [day + timedelta(days=offset) for offset in range(days + 1)
+            if day + timedelta(days=offset) >= today]
+
+
+def candidate_places(center, venue, centers, venues, other_centers=ALTERNATIVE_OTHER_CENTERS):
+    """Aranacak (merkez, salon) çiftleri: önce istenen merkez"""
+    places = [(center, v) for v in venues]
+    if other_centers:
+        places += [(c, v) for c in centers if c != center for v in venues]
+    return places
+
+
+def rank_alternatives(center, venue, day, time, hours, places, days, occupied, limit=ALTERNATIVE_LIMIT):
+    """Boş aralıkları istekten uzaklığa göre sırala
+
+    Args:
+        center, venue, day, time: İstenen (dolu) aralık; ``day`` bir ``date``
+        hours: ``BookingHours`` (açılış, kapanış, adım ve tanımlı dilimler)
+        places: ``candidate_places`` sonucu (merkez, salon) çiftleri
+        days: ``candidate_days`` sonucu günler
+        occupied: {(merkez, salon, gün): dolu (başlangıç, bitiş[, id]) aralıkları}
+
+    Returns:
+        list: En yakın ``limit`` aday; her biri center, venue, date, time, distance içerir
+    """
+    requested = parse_time_range(time)
+    if requested is None:
+        return []
+    start, end = requested
+    duration = end - start
+    latest = hours.closes - duration
+    base_starts = {parse_time_range(slot)[0] for slot in hours.slots} | {start}
+
+    candidates = []
+    for place_center, place_venue in places:
+        place_cost = (CENTER_COST if place_center != center else 0) + (VENUE_COST if place_venue != venue else 0)
+        for candidate_day in days:
+            taken = [interval[:2] for interval in occupied.get((place_center, place_venue, candidate_day), ())]
+            day_cost = place_cost + DAY_COST * abs((candidate_day - day).days)
+            # Dolu aralıkların hemen sonrası ve hemen öncesi de denenir
+            starts = base_starts.union(*((taken_end, taken_start - duration) for taken_start, taken_end in taken))
+            for candidate_start in starts:
+                if not hours.opens <= candidate_start <= latest or (candidate_start - hours.opens) % hours.step:
+                    continue
+                if place_cost == 0 and candidate_day == day and candidate_start == start:
+                    # İstenen aralığın kendisi (çağıran dolu olduğunu bildirdi)
+                    continue
+                candidate = (candidate_start, candidate_start + duration)
+                if any(overlaps(candidate, interval) for interval in taken):
+                    continue
+                slot_cost = SLOT_COST * abs(candidate_start - start) / 60
+                candidates.append((round(day_cost + slot_cost, 2), candidate_day, candidate_start,
+                                   place_center, place_venue))
+
+    return [{
+        'center': place_center,
+        'venue': place_venue,
+        'date': candidate_day.isoformat(),
+        'time': format_time_range(candidate_start, candidate_start + duration),
+        'distance': distance,
+    } for distance, candidate_day, candidate_start, place_center, place_venue in heapq.nsmallest(limit, candidates)]
+
+
+def format_alternative(alternative, center, venue, day):
+    """Flash mesajı için kısa metin: sadece istekten farklı kısımlar"""
+    parts = [alternative['time']]
+    if alternative['date'] != day:
+        parts.insert(0, alternative['date'])
+    if alternative['venue'] != venue or alternative['center'] != center:
+        place = alternative['venue'] if alternative['center'] == center else f"{alternative['center']} - {alternative['venue']}"
+        parts.append(f"({place})")
+    return ' '.join(parts)
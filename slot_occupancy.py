@@ -0,0 +1,311 @@
+"""Tüm gunicorn worker'larının paylaştığı saat dilimi doluluk tablosu
+
+Tablo mmap ile açılan bir dosyadadır (varsayılan olarak /dev/shm altında) ve
+(merkez, salon, gün offset'i, adım hücresi) ile indekslenir. Gün, açılıştan
+kapanışa ``BookingHours.step`` dakikalık hücrelere bölünür; bir rezervasyon
+``[başlangıç, bitiş)`` aralığının kapladığı bütün hücrelere yazılır. Her hücre
+onu tutan rezervasyonun ID'sini saklar (0 = boş). Okumalar kilitsizdir;
+4 byte'lık hizalı okuma/yazma atomiktir. Bir aralığın bütün hücreleri aynı
+merkez kilidi altında kontrol edilip yazılır; iki worker çakışan aralıkları
+aynı anda alamaz.
+
+Hücreler merkez sırasıyla dizilir; her merkez dosyada bitişik bir bölgedir.
+Yazmalar sadece o merkezin bölgesini kilitler (``lockf`` bayt aralığı kilidi ve
+merkez başına thread kilidi): farklı merkezlere yazan worker'lar birbirini
+beklemez. Tabloyu baştan kuran işlemler tüm dosyayı kilitler.
+"""
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'RZOC'
+VERSION = 2
+
+# magic, sürüm, ayrılmış, başlangıç günü (ordinal), gün sayısı, merkez, salon,
+# hücre sayısı, isim listesi crc32, build anahtarı
+HEADER = struct.Struct('<4sHHIIIIII32s')
+CELL = struct.Struct('<I')
+
+FREE = 0
+PENDING = 0xFFFFFFFF  # INSERT tamamlanana kadar aralığı tutan geçici işaret
+
+
+def default_occupancy_path():
+    """Paylaşımlı bellek dizini varsa orayı, yoksa geçici dizini kullan"""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'rezervasyon_occupancy')
+
+
+class SlotOccupancy:
+    """mmap üzerinde (merkez, salon, gün, hücre) doluluk tablosu"""
+
+    def __init__(self, path, centers, venues, hours, base_date, days):
+        """
+        Args:
+            hours: ``booking_intervals.BookingHours`` (açılış, kapanış ve hücre adımı)
+        """
+        slots = hours.cells
+        self.hours = hours
+        self.centers = {name: i for i, name in enumerate(centers)}
+        self.venues = {name: i for i, name in enumerate(venues)}
+        self.slots = {name: i for i, name in enumerate(slots)}
+        self.slot_names = list(slots)
+        self.days = days
+        self._thread_lock = threading.Lock()
+        # Merkez bölgesi kilitleri; tüm dosya kilidi bunların hepsini sırayla alır
+        self._center_thread_locks = [threading.Lock() for _ in self.centers]
+        self._center_cells = len(venues) * days * len(slots)
+        self._names_crc = zlib.crc32('\x1f'.join(list(centers) + ['|'] + list(venues) + ['|'] + list(slots)).encode('utf-8'))
+        self._size = HEADER.size + CELL.size * len(centers) * len(venues) * days * len(slots)
+
+        # Boyut veya isim listesi değişirse eski worker'ların mmap'i bozulmasın diye ayrı dosya
+        self.path = f"{path}-{self._names_crc:08x}-{days}"
+        self._file = os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600), 'r+b')
+        with self._file_lock():
+            header = self._read_header()
+            if header is None or header[5:9] != (len(centers), len(venues), len(slots), self._names_crc) \
+                    or header[4] != days:
+                self._initialize(base_date.toordinal(), b'')
+        self._mmap = mmap.mmap(self._file.fileno(), self._size)
+
+    @contextmanager
+    def _file_lock(self):
+        # lockf (POSIX kayıt kilidi) süreç bazlıdır ve fork ile paylaşılmaz;
+        # flock ise fork sonrası aynı dosya tanımını paylaştığından uygun değildir.
+        # lockf aynı süreçteki thread'leri ayırmadığı için merkez thread kilitleri de alınır.
+        with self._thread_lock:
+            for lock in self._center_thread_locks:
+                lock.acquire()
+            try:
+                fcntl.lockf(self._file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.lockf(self._file, fcntl.LOCK_UN)
+            finally:
+                for lock in reversed(self._center_thread_locks):
+                    lock.release()
+
+    @contextmanager
+    def _center_lock(self, center):
+        """Sadece merkezin hücre bölgesini kilitle"""
+        index = self.centers[center]
+        length = CELL.size * self._center_cells
+        start = HEADER.size + length * index
+        with self._center_thread_locks[index]:
+            fcntl.lockf(self._file, fcntl.LOCK_EX, length, start)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._file, fcntl.LOCK_UN, length, start)
+
+    def _read_header(self):
+        self._file.seek(0)
+        raw = self._file.read(HEADER.size)
+        if len(raw) < HEADER.size or os.fstat(self._file.fileno()).st_size != self._size:
+            return None
+        header = HEADER.unpack(raw)
+        if header[0] != MAGIC or header[1] != VERSION:
+            return None
+        return header
+
+    def _write_header(self, base_ordinal, build_key):
+        self._file.seek(0)
+        self._file.write(HEADER.pack(
+            MAGIC, VERSION, 0, base_ordinal, self.days,
+            len(self.centers), len(self.venues), len(self.slots), self._names_crc,
+            build_key[:32]
+        ))
+        self._file.flush()
+
+    def _initialize(self, base_ordinal, build_key):
+        self._file.truncate(0)
+        self._file.truncate(self._size)
+        self._write_header(base_ordinal, build_key)
+
+    def _day_offset(self, center, venue, date_value):
+        """Günün ilk hücresinin offset'i; pencere dışı veya bilinmeyen değerler için None"""
+        c = self.centers.get(center)
+        v = self.venues.get(venue)
+        if c is None or v is None:
+            return None
+        day = self._day(date_value)
+        if day is None:
+            return None
+        return HEADER.size + CELL.size * ((c * len(self.venues) + v) * self.days + day) * len(self.slots)
+
+    def _span(self, center, venue, date_value, time):
+        """Aralığın ilk hücre offset'i ve hücre sayısı; indekslenemiyorsa None"""
+        span = self.hours.cell_span(time)
+        if span is None:
+            return None
+        offset = self._day_offset(center, venue, date_value)
+        if offset is None:
+            return None
+        return offset + CELL.size * span[0], span[1]
+
+    def _cells(self, offset, count):
+        return struct.unpack_from(f'<{count}I', self._mmap, offset)
+
+    def _fill(self, offset, count, owner):
+        struct.pack_into(f'<{count}I', self._mmap, offset, *([owner] * count))
+
+    @property
+    def base_ordinal(self):
+        # Başlangıç günü rebuild ile kayabilir; her seferinde başlıktan okunur
+        return struct.unpack_from('<I', self._mmap, 8)[0]
+
+    def _day(self, date_value):
+        try:
+            if isinstance(date_value, str):
+                date_value = date.fromisoformat(date_value)
+        except ValueError:
+            return None
+        day = date_value.toordinal() - self.base_ordinal
+        if 0 <= day < self.days:
+            return day
+        return None
+
+    def covers(self, center, venue, date_value, time=None):
+        """Verilen değerler tabloda indekslenebiliyor mu"""
+        if time is None:
+            return self._day_offset(center, venue, date_value) is not None
+        return self._span(center, venue, date_value, time) is not None
+
+    def owners(self, center, venue, date_value, time):
+        """Aralığın hücrelerini tutan rezervasyon ID'leri (boşsa boş küme), indekslenemiyorsa None"""
+        span = self._span(center, venue, date_value, time)
+        if span is None:
+            return None
+        return set(self._cells(*span)) - {FREE}
+
+    def is_occupied(self, center, venue, date_value, time, exclude_id=None):
+        """Aralık dolu mu; indekslenemiyorsa None (çağıran eski yönteme düşer)"""
+        owners = self.owners(center, venue, date_value, time)
+        if owners is None:
+            return None
+        owners.discard(exclude_id)
+        return bool(owners)
+
+    def day_owners(self, center, venue, date_value):
+        """Bir günün tüm hücreleri için {hücre aralığı: sahip ID}; indekslenemiyorsa None"""
+        offset = self._day_offset(center, venue, date_value)
+        if offset is None:
+            return None
+        return dict(zip(self.slot_names, self._cells(offset, len(self.slot_names))))
+
+    def day_intervals(self, center, venue, date_value, exclude_id=None):
+        """Günün dolu aralıkları [(başlangıç, bitiş, sahip ID)] - ardışık hücreler birleştirilir"""
+        owners = self.day_owners(center, venue, date_value)
+        if owners is None:
+            return None
+        intervals = []
+        for index, owner in enumerate(owners.values()):
+            if owner == FREE or owner == exclude_id:
+                continue
+            start, end = self.hours.cell_range(index)
+            if intervals and intervals[-1][2] == owner and intervals[-1][1] == start:
+                intervals[-1] = (intervals[-1][0], end, owner)
+            else:
+                intervals.append((start, end, owner))
+        return intervals
+
+    def claim(self, center, venue, date_value, time, owner=PENDING):
+        """Aralığın bütün hücreleri boşsa atomik olarak al; doluysa False, indekslenemiyorsa None"""
+        span = self._span(center, venue, date_value, time)
+        if span is None:
+            return None
+        with self._center_lock(center):
+            for current in self._cells(*span):
+                # PENDING paylaşılan bir işarettir; iki bekleyen kayıt aynı hücreyi alamaz
+                if current != FREE and (current != owner or owner == PENDING):
+                    return False
+            self._fill(*span, owner)
+            return True
+
+    def transfer(self, center, venue, date_value, time, from_owner, to_owner):
+        """Aralığı ``from_owner``'dan ``to_owner``'a devret (ör. INSERT sonrası PENDING -> ID)
+
+        Hücrelerden biri başka bir rezervasyondaysa hiçbir hücre değişmez ve False döner;
+        başkasının hücresinin üzerine asla yazılmaz.
+        """
+        span = self._span(center, venue, date_value, time)
+        if span is None:
+            return None
+        with self._center_lock(center):
+            if any(current not in (from_owner, to_owner) for current in self._cells(*span)):
+                return False
+            self._fill(*span, to_owner)
+            return True
+
+    def release(self, center, venue, date_value, time, owner, keep=None):
+        """Aralığın bu rezervasyona ait hücrelerini boşalt
+
+        Args:
+            keep: (merkez, salon, gün, saat) - bu aralığa da düşen hücreler
+                boşaltılmaz (güncellemede eski ve yeni aralık örtüşebilir)
+        """
+        span = self._span(center, venue, date_value, time)
+        if span is None:
+            return None
+        kept = set()
+        if keep is not None:
+            keep_span = self._span(*keep)
+            if keep_span is not None:
+                kept = {keep_span[0] + CELL.size * i for i in range(keep_span[1])}
+        offset, count = span
+        released = False
+        with self._center_lock(center):
+            for index, current in enumerate(self._cells(offset, count)):
+                cell = offset + CELL.size * index
+                if current == owner and cell not in kept:
+                    CELL.pack_into(self._mmap, cell, FREE)
+                    released = True
+        return released
+
+    def build_key(self):
+        """Tabloyu en son oluşturan oturumun anahtarı"""
+        return HEADER.unpack_from(self._mmap, 0)[9].rstrip(b'\0')
+
+    def ensure_built(self, reservations, build_key, base_date):
+        """Tablo bu oturumda henüz oluşturulmadıysa rezervasyonlardan oluştur
+
+        Kontrol ve oluşturma aynı kilit altında yapılır; böylece aynı anda
+        başlayan worker'lardan sadece ilki tabloyu doldurur.
+        """
+        with self._file_lock():
+            if self.build_key() == build_key[:32]:
+                return False
+            self._rebuild_locked(reservations, build_key, base_date)
+        return True
+
+    def rebuild(self, reservations, build_key, base_date):
+        """Tabloyu rezervasyon listesinden baştan oluştur"""
+        with self._file_lock():
+            self._rebuild_locked(reservations, build_key, base_date)
+
+    def _rebuild_locked(self, reservations, build_key, base_date):
+        self._mmap[HEADER.size:self._size] = bytes(self._size - HEADER.size)
+        self._write_header(base_date.toordinal(), b'')
+        active = 0
+        for r in reservations:
+            if r['status'] not in ('onay', 'bekle'):
+                continue
+            # Reservation kayıtlarında ham date değeri metin ayrıştırmadan kullanılır
+            date_value = getattr(r, 'date_value', None) or r['date']
+            span = self._span(r['center'], r.get('venue', 'Tiyatro Salonu'), date_value, r['time'])
+            if span is not None:
+                self._fill(*span, r['id'])
+                active += 1
+        self._mmap.flush()
+        self._write_header(base_date.toordinal(), build_key)
+        logger.info(f"Doluluk tablosu oluşturuldu: {active} aktif rezervasyon")
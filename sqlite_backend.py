@@ -0,0 +1,453 @@
+"""SQLite (WAL) depolama katmanı
+
+MySQL bağlantı havuzu ile aynı arayüzü sunar (``get_connection()``,
+``cursor(dictionary=True)``, ``%s`` parametreleri). Böylece app.py'deki veri
+erişim fonksiyonları değişmeden SQLite üzerinde çalışır. Her thread kendi
+bağlantısını kullanır; SQL metinleri bir kez çevrilir ve sqlite3'ün bağlantı
+bazlı prepared statement önbelleğinden yararlanır.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_CACHE_SIZE = 256
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS reservations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name_surname VARCHAR(255) NOT NULL,
+        center VARCHAR(255) NOT NULL,
+        venue VARCHAR(100) DEFAULT 'Tiyatro Salonu',
+        date DATE NOT NULL,
+        time VARCHAR(20) NOT NULL,
+        description TEXT,
+        status VARCHAR(10) DEFAULT 'bekle' CHECK (status IN ('onay', 'bekle', 'iptal')),
+        created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+        updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+        created_by VARCHAR(100)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_center_date ON reservations (center, date)",
+    "CREATE INDEX IF NOT EXISTS idx_status ON reservations (status)",
+    "CREATE INDEX IF NOT EXISTS idx_created_at ON reservations (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_updated_at ON reservations (updated_at)",
+    # MySQL'deki ON UPDATE CURRENT_TIMESTAMP karşılığı
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_reservations_updated_at
+    AFTER UPDATE ON reservations
+    FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+    BEGIN
+        UPDATE reservations SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+    END
+    """,
+    # Kullanım özeti: (merkez, salon, gün, saat, durum) başına sayaç, trigger'larla güncellenir
+    """
+    CREATE TABLE IF NOT EXISTS reservation_rollup (
+        center VARCHAR(255) NOT NULL,
+        venue VARCHAR(100) NOT NULL,
+        date DATE NOT NULL,
+        time VARCHAR(20) NOT NULL,
+        status VARCHAR(10) NOT NULL,
+        reservation_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (center, venue, date, time, status)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_rollup_date ON reservation_rollup (date)",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_insert
+    AFTER INSERT ON reservations
+    BEGIN
+        INSERT INTO reservation_rollup (center, venue, date, time, status, reservation_count)
+        VALUES (NEW.center, COALESCE(NEW.venue, 'Tiyatro Salonu'), NEW.date, NEW.time, NEW.status, 1)
+        ON CONFLICT (center, venue, date, time, status)
+        DO UPDATE SET reservation_count = reservation_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_update
+    AFTER UPDATE ON reservations
+    FOR EACH ROW WHEN OLD.center IS NOT NEW.center OR OLD.venue IS NOT NEW.venue
+        OR OLD.date IS NOT NEW.date OR OLD.time IS NOT NEW.time OR OLD.status IS NOT NEW.status
+    BEGIN
+        UPDATE reservation_rollup SET reservation_count = reservation_count - 1
+        WHERE center = OLD.center AND venue = COALESCE(OLD.venue, 'Tiyatro Salonu')
+          AND date = OLD.date AND time = OLD.time AND status = OLD.status;
+        INSERT INTO reservation_rollup (center, venue, date, time, status, reservation_count)
+        VALUES (NEW.center, COALESCE(NEW.venue, 'Tiyatro Salonu'), NEW.date, NEW.time, NEW.status, 1)
+        ON CONFLICT (center, venue, date, time, status)
+        DO UPDATE SET reservation_count = reservation_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_delete
+    AFTER DELETE ON reservations
+    BEGIN
+        UPDATE reservation_rollup SET reservation_count = reservation_count - 1
+        WHERE center = OLD.center AND venue = COALESCE(OLD.venue, 'Tiyatro Salonu')
+          AND date = OLD.date AND time = OLD.time AND status = OLD.status;
+    END
+    """,
+    # Arşivlenmiş yıllar (taşıma sadece MySQL'de; özet yeniden hesaplanırken okunur)
+    """
+    CREATE TABLE IF NOT EXISTS reservations_archive (
+        id INTEGER NOT NULL,
+        name_surname VARCHAR(255) NOT NULL,
+        center VARCHAR(255) NOT NULL,
+        venue VARCHAR(100) DEFAULT 'Tiyatro Salonu',
+        date DATE NOT NULL,
+        time VARCHAR(20) NOT NULL,
+        description TEXT,
+        status VARCHAR(10) DEFAULT 'bekle',
+        created_at TIMESTAMP,
+        updated_at TIMESTAMP,
+        created_by VARCHAR(100),
+        archived_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+        PRIMARY KEY (id, date)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_archive_center_date ON reservations_archive (center, date)",
+    # Veri sürümü: merkez başına, reservations'daki her yazmada artan sayaç
+    "DROP TRIGGER IF EXISTS trg_version_insert",
+    "DROP TRIGGER IF EXISTS trg_version_update",
+    "DROP TRIGGER IF EXISTS trg_version_delete",
+    "DROP TABLE IF EXISTS reservation_version",
+    """
+    CREATE TABLE IF NOT EXISTS reservation_center_version (
+        center VARCHAR(255) NOT NULL PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_center_version_insert
+    AFTER INSERT ON reservations
+    BEGIN
+        INSERT OR IGNORE INTO reservation_center_version (center, version) VALUES (NEW.center, 0);
+        UPDATE reservation_center_version SET version = version + 1 WHERE center = NEW.center;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_center_version_update
+    AFTER UPDATE ON reservations
+    BEGIN
+        INSERT OR IGNORE INTO reservation_center_version (center, version) VALUES (NEW.center, 0);
+        UPDATE reservation_center_version SET version = version + 1 WHERE center = NEW.center;
+        INSERT OR IGNORE INTO reservation_center_version (center, version)
+        SELECT OLD.center, 0 WHERE OLD.center IS NOT NEW.center;
+        UPDATE reservation_center_version SET version = version + 1
+        WHERE center = OLD.center AND OLD.center IS NOT NEW.center;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_center_version_delete
+    AFTER DELETE ON reservations
+    BEGIN
+        INSERT OR IGNORE INTO reservation_center_version (center, version) VALUES (OLD.center, 0);
+        UPDATE reservation_center_version SET version = version + 1 WHERE center = OLD.center;
+    END
+    """,
+    # Değişiklik günlüğü: olay akışı (SSE) için her yazmada bir satır
+    """
+    CREATE TABLE IF NOT EXISTS reservation_changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        reservation_id INTEGER NOT NULL,
+        action VARCHAR(10) NOT NULL,
+        center VARCHAR(255) NOT NULL,
+        venue VARCHAR(100) NOT NULL,
+        date DATE NOT NULL,
+        time VARCHAR(20) NOT NULL,
+        status VARCHAR(10) NOT NULL,
+        old_center VARCHAR(255),
+        old_venue VARCHAR(100),
+        old_date DATE,
+        old_time VARCHAR(20),
+        old_status VARCHAR(10),
+        changed_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_changes_changed_at ON reservation_changes (changed_at)",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_changes_insert
+    AFTER INSERT ON reservations
+    BEGIN
+        INSERT INTO reservation_changes (reservation_id, action, center, venue, date, time, status)
+        VALUES (NEW.id, 'created', NEW.center, COALESCE(NEW.venue, 'Tiyatro Salonu'),
+                NEW.date, NEW.time, NEW.status);
+    END
+    """,
+    # Sadece updated_at'in değiştiği güncellemeler (trg_reservations_updated_at) olay üretmez
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_changes_update
+    AFTER UPDATE ON reservations
+    FOR EACH ROW WHEN OLD.name_surname IS NOT NEW.name_surname OR OLD.description IS NOT NEW.description
+        OR OLD.center IS NOT NEW.center OR OLD.venue IS NOT NEW.venue OR OLD.date IS NOT NEW.date
+        OR OLD.time IS NOT NEW.time OR OLD.status IS NOT NEW.status
+    BEGIN
+        INSERT INTO reservation_changes (reservation_id, action, center, venue, date, time, status,
+                                         old_center, old_venue, old_date, old_time, old_status)
+        VALUES (NEW.id,
+                CASE WHEN OLD.name_surname IS NEW.name_surname AND OLD.description IS NEW.description
+                      AND OLD.center IS NEW.center AND OLD.venue IS NEW.venue AND OLD.date IS NEW.date
+                      AND OLD.time IS NEW.time THEN 'status' ELSE 'updated' END,
+                NEW.center, COALESCE(NEW.venue, 'Tiyatro Salonu'), NEW.date, NEW.time, NEW.status,
+                OLD.center, COALESCE(OLD.venue, 'Tiyatro Salonu'), OLD.date, OLD.time, OLD.status);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_changes_delete
+    AFTER DELETE ON reservations
+    BEGIN
+        INSERT INTO reservation_changes (reservation_id, action, center, venue, date, time, status)
+        VALUES (OLD.id, 'deleted', OLD.center, COALESCE(OLD.venue, 'Tiyatro Salonu'),
+                OLD.date, OLD.time, OLD.status);
+    END
+    """,
+    # Merkez, salon ve saat dilimi tanımları; her değişiklik reference_version'ı artırır
+    """
+    CREATE TABLE IF NOT EXISTS centers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(255) NOT NULL UNIQUE,
+        position INTEGER NOT NULL DEFAULT 0,
+        active INTEGER NOT NULL DEFAULT 1
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS venues (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(100) NOT NULL UNIQUE,
+        position INTEGER NOT NULL DEFAULT 0,
+        active INTEGER NOT NULL DEFAULT 1
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS time_slots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        label VARCHAR(20) NOT NULL UNIQUE,
+        position INTEGER NOT NULL DEFAULT 0,
+        active INTEGER NOT NULL DEFAULT 1
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS reference_version (
+        id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "INSERT OR IGNORE INTO reference_version (id, version) VALUES (1, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_centers_insert
+    AFTER INSERT ON centers
+    BEGIN
+        UPDATE reference_version SET version = version + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_centers_update
+    AFTER UPDATE ON centers
+    BEGIN
+        UPDATE reference_version SET version = version + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_centers_delete
+    AFTER DELETE ON centers
+    BEGIN
+        UPDATE reference_version SET version = version + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_venues_insert
+    AFTER INSERT ON venues
+    BEGIN
+        UPDATE reference_version SET version = version + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_venues_update
+    AFTER UPDATE ON venues
+    BEGIN
+        UPDATE reference_version SET version = version + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_venues_delete
+    AFTER DELETE ON venues
+    BEGIN
+        UPDATE reference_version SET version = version + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_time_slots_insert
+    AFTER INSERT ON time_slots
+    BEGIN
+        UPDATE reference_version SET version = version + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_time_slots_update
+    AFTER UPDATE ON time_slots
+    BEGIN
+        UPDATE reference_version SET version = version + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_time_slots_delete
+    AFTER DELETE ON time_slots
+    BEGIN
+        UPDATE reference_version SET version = version + 1 WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username VARCHAR(100) UNIQUE NOT NULL,
+        password VARCHAR(255) NOT NULL,
+        role VARCHAR(50) DEFAULT 'user',
+        permissions TEXT,
+        created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+        updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_username ON users (username)",
+]
+
+# MySQL'e özgü ifadelerin SQLite karşılıkları
+_TRANSLATIONS = [
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\bNOW\(\)', re.I), "datetime('now', 'localtime')"),
+    (re.compile(r'\bINSERT\s+IGNORE\b', re.I), 'INSERT OR IGNORE'),
+    (re.compile(r'^\s*EXPLAIN\s+(?!QUERY\s+PLAN)', re.I), 'EXPLAIN QUERY PLAN '),
+    # Biçim belirteçleri (%Y, %m, %d) iki tarafta aynı
+    (re.compile(r"\bDATE_FORMAT\(\s*([\w.]+)\s*,\s*('[^']*')\s*\)", re.I), r'strftime(\2, \1)'),
+]
+
+
+def _convert_date(value):
+    return date.fromisoformat(value.decode())
+
+
+def _convert_timestamp(value):
+    return datetime.fromisoformat(value.decode())
+
+
+sqlite3.register_converter('DATE', _convert_date)
+sqlite3.register_converter('TIMESTAMP', _convert_timestamp)
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(sep=' ', timespec='seconds'))
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def translate_sql(sql):
+    """MySQL sorgu metnini SQLite sözdizimine çevir (sonuç önbelleklenir)"""
+    for pattern, replacement in _TRANSLATIONS:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+def _dict_factory(cursor, row):
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+class SQLiteCursor:
+    """mysql-connector cursor arayüzünü taklit eden sarmalayıcı"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, operation, params=None):
+        return self._cursor.execute(translate_sql(operation), params or ())
+
+    def executemany(self, operation, seq_params):
+        return self._cursor.executemany(translate_sql(operation), seq_params)
+
+
+class SQLiteConnection:
+    """Thread'e ait sqlite3 bağlantısı; close() bağlantıyı havuza bırakır"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, dictionary=False, **kwargs):
+        cursor = self._connection.cursor()
+        if dictionary:
+            cursor.row_factory = _dict_factory
+        return SQLiteCursor(cursor)
+
+    def commit(self):
+        # Bağlantı autocommit modunda (MySQL yapılandırmasıyla aynı)
+        if self._connection.in_transaction:
+            self._connection.commit()
+
+    def rollback(self):
+        if self._connection.in_transaction:
+            self._connection.rollback()
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+class SQLiteConnectionPool:
+    """Thread başına bir bağlantı tutan, MySQL havuzu ile uyumlu SQLite havuzu"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Bağlantıyı hemen aç: dosya veya WAL modu sorunları başlangıçta görünsün
+        self.get_connection()
+
+    def _connect(self):
+        connection = sqlite3.connect(
+            self.path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            timeout=5.0
+        )
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('PRAGMA busy_timeout=5000')
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def get_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return SQLiteConnection(connection)
+
+    def close_all(self):
+        """Tüm thread bağlantılarını kapat (fork öncesi)"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+
+def init_schema(connection):
+    """Tabloları, indeksleri ve trigger'ı oluştur"""
+    cursor = connection.cursor()
+    for statement in SCHEMA:
+        cursor.execute(statement)
+    cursor.close()
@@ -0,0 +1,273 @@
+"""İsimli SQL ifadeleri ve bağlantı bazlı prepared statement önbelleği
+
+Uygulamadaki tüm sabit sorgular burada isimlendirilir. MySQL bağlantılarında
+her isim için bir prepared cursor açılır ve fiziksel bağlantı havuza dönüp
+tekrar alındığında aynı cursor kullanılır; böylece parse ve plan maliyeti
+bağlantı başına bir kez ödenir. SQLite bağlantıları sqlite3'ün kendi
+statement önbelleğini kullanır.
+"""
+import logging
+import os
+import weakref
+from collections import namedtuple
+
+import mysql.connector
+
+from query_profiler import ProfilingCursor
+from sqlite_backend import SQLiteConnection
+
+logger = logging.getLogger(__name__)
+
+USE_PREPARED_STATEMENTS = os.getenv('USE_PREPARED_STATEMENTS', 'True').lower() == 'true'
+
+StatementResult = namedtuple('StatementResult', ['rowcount', 'lastrowid'])
+
+RESERVATION_COLUMNS = """id, name_surname, center, venue, date, time, description,
+                   status, created_at, updated_at, created_by"""
+
+STATEMENTS = {
+    # app.py ve database.py (etkinlik yeri içeren şema)
+    'db_now': "SELECT NOW()",
+    # Okuma kopyası: birincil sunucuda uygulanan işlemler ve kopyanın bunlara ulaşıp ulaşmadığı
+    'gtid_executed': "SELECT @@GLOBAL.gtid_executed",
+    'gtid_subset': "SELECT GTID_SUBSET(%s, @@GLOBAL.gtid_executed)",
+    'users_all': "SELECT username, password, role, permissions FROM users",
+    # Referans verisi (merkez, salon, saat dilimi)
+    'reference_version': "SELECT version FROM reference_version WHERE id = 1",
+    'centers_active': "SELECT name FROM centers WHERE active = 1 ORDER BY position, id",
+    'venues_active': "SELECT name FROM venues WHERE active = 1 ORDER BY position, id",
+    'time_slots_active': "SELECT label FROM time_slots WHERE active = 1 ORDER BY position, id",
+    'center_insert_default': "INSERT IGNORE INTO centers (name, position) VALUES (%s, %s)",
+    'venue_insert_default': "INSERT IGNORE INTO venues (name, position) VALUES (%s, %s)",
+    'time_slot_insert_default': "INSERT IGNORE INTO time_slots (label, position) VALUES (%s, %s)",
+    'users_all_hashed': "SELECT username, password_hash, role, permissions FROM users",
+    'user_insert_default': """
+        INSERT IGNORE INTO users (username, password, role, permissions)
+        VALUES (%s, %s, %s, %s)
+    """,
+    'reservations_all': f"""
+        SELECT {RESERVATION_COLUMNS}
+        FROM reservations
+        ORDER BY created_at DESC
+    """,
+    'reservations_changed_since': f"""
+        SELECT {RESERVATION_COLUMNS}
+        FROM reservations
+        WHERE updated_at >= %s
+    """,
+    'reservation_ids': "SELECT id FROM reservations",
+    # Bellek penceresi (hot_window) ve pencere dışı sorgular
+    'reservations_in_range': f"""
+        SELECT {RESERVATION_COLUMNS}
+        FROM reservations
+        WHERE date >= %s AND date < %s
+        ORDER BY created_at DESC
+    """,
+    'reservation_ids_in_range': "SELECT id FROM reservations WHERE date >= %s AND date < %s",
+    # Aralık çakışması (ör. 09:00-12:00 ile 11:00-13:00) günün aktif kayıtları üzerinden hesaplanır
+    'reservation_day_active_times': """
+        SELECT id, time FROM reservations
+        WHERE center = %s AND date = %s AND COALESCE(venue, 'Tiyatro Salonu') = %s
+          AND status IN ('onay', 'bekle') AND id <> %s
+    """,
+    'reservation_active_slots_range': """
+        SELECT center, COALESCE(venue, 'Tiyatro Salonu') AS venue, date, time FROM reservations
+        WHERE date >= %s AND date < %s AND status IN ('onay', 'bekle') AND id <> %s
+    """,
+    'reservation_by_id': f"""
+        SELECT {RESERVATION_COLUMNS}
+        FROM reservations
+        WHERE id = %s
+    """,
+    'reservation_insert': """
+        INSERT INTO reservations (name_surname, center, venue, date, time, description, status, created_by)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    'reservation_update': """
+        UPDATE reservations
+        SET name_surname=%s, center=%s, venue=%s, date=%s, time=%s, description=%s
+        WHERE id=%s
+    """,
+    'reservation_status_update': "UPDATE reservations SET status=%s WHERE id=%s",
+    'reservation_delete': "DELETE FROM reservations WHERE id=%s",
+
+    # Kullanım özeti (reservation_rollup trigger'larla güncel tutulur)
+    'rollup_row_count': "SELECT COUNT(*) FROM reservation_rollup",
+    'rollup_clear': "DELETE FROM reservation_rollup",
+    'rollup_rebuild': """
+        INSERT INTO reservation_rollup (center, venue, date, time, status, reservation_count)
+        SELECT center, COALESCE(venue, 'Tiyatro Salonu'), date, time, status, COUNT(*)
+        FROM (
+            SELECT center, venue, date, time, status FROM reservations
+            UNION ALL
+            SELECT center, venue, date, time, status FROM reservations_archive
+        ) AS all_reservations
+        GROUP BY center, COALESCE(venue, 'Tiyatro Salonu'), date, time, status
+    """,
+    'rollup_by_month': """
+        SELECT center, venue, DATE_FORMAT(date, '%Y-%m') AS month, time, status,
+               SUM(reservation_count) AS total
+        FROM reservation_rollup
+        WHERE date >= %s AND date < %s
+        GROUP BY center, venue, month, time, status
+    """,
+    'rollup_months_outside': """
+        SELECT DISTINCT DATE_FORMAT(date, '%Y-%m') AS month
+        FROM reservation_rollup
+        WHERE reservation_count > 0 AND (date < %s OR date >= %s)
+    """,
+
+    # Veri sürümü (reservation_center_version merkez başına, trigger'larla artırılır)
+    'dataset_version': "SELECT COALESCE(SUM(version), 0) FROM reservation_center_version",
+    'dataset_center_version': "SELECT version FROM reservation_center_version WHERE center = %s",
+    'dataset_version_bump': "UPDATE reservation_center_version SET version = version + 1",
+
+    # Değişiklik günlüğü (olay akışı; reservation_changes trigger'larla yazılır)
+    'change_log_after': """
+        SELECT id, reservation_id, action, center, venue, date, time, status,
+               old_center, old_venue, old_date, old_time, old_status, changed_at
+        FROM reservation_changes
+        WHERE id > %s
+        ORDER BY id
+        LIMIT %s
+    """,
+    'change_log_latest': "SELECT COALESCE(MAX(id), 0) FROM reservation_changes",
+    'change_log_prune': "DELETE FROM reservation_changes WHERE changed_at < %s",
+
+    # Yıl arşivleme (tarih aralığı tek bir yıl partition'ına budanır)
+    # Arşivleme: yılın partition'ı önce reservations_archive_staging tablosuna devredilir
+    'archive_staged_summary': """
+        SELECT COUNT(*), MIN(YEAR(date)), MAX(YEAR(date)) FROM reservations_archive_staging
+    """,
+    'archive_clear_staged': """
+        DELETE a FROM reservations_archive a
+        JOIN reservations_archive_staging s ON s.id = a.id
+    """,
+    'archive_copy_staged': f"""
+        INSERT INTO reservations_archive ({RESERVATION_COLUMNS})
+        SELECT {RESERVATION_COLUMNS}
+        FROM reservations_archive_staging
+    """,
+
+    # app_mysql.py (etkinlik yeri olmayan eski şema)
+    'legacy_day_active_times': """
+        SELECT time FROM reservations
+        WHERE center = %s AND date = %s
+        AND status IN ('onay', 'bekle') AND id != %s
+    """,
+    'legacy_active_times_range': """
+        SELECT date, time FROM reservations
+        WHERE center = %s AND date >= %s AND date < %s
+        AND status IN ('onay', 'bekle') AND id != %s
+    """,
+    'legacy_months': """
+        SELECT DISTINCT DATE_FORMAT(date, '%Y-%m') as month_year
+        FROM reservations
+        ORDER BY month_year DESC
+    """,
+    'legacy_years': "SELECT DISTINCT YEAR(date) as year FROM reservations",
+    'legacy_reservation_by_id': "SELECT * FROM reservations WHERE id = %s",
+    'legacy_reservation_insert': """
+        INSERT INTO reservations (name_surname, center, date, time, description, status)
+        VALUES (%s, %s, %s, %s, %s, 'bekle')
+    """,
+    'legacy_reservation_update': """
+        UPDATE reservations
+        SET name_surname = %s, center = %s, date = %s, time = %s, description = %s
+        WHERE id = %s
+    """,
+    'legacy_occupied_times': """
+        SELECT time FROM reservations
+        WHERE center = %s AND date = %s AND status IN ('onay', 'bekle')
+    """,
+}
+
+# Fiziksel bağlantı -> {'connection_id': ..., 'cursors': {(isim, dictionary): cursor}}
+_prepared_cache = weakref.WeakKeyDictionary()
+
+
+def register(name, sql):
+    """Çalışma zamanında oluşturulan bir sorguyu isimle kaydet"""
+    current = STATEMENTS.get(name)
+    if current is not None and current != sql:
+        raise ValueError(f"'{name}' farklı bir sorgu ile zaten kayıtlı")
+    STATEMENTS[name] = sql
+    return name
+
+
+def _physical_connection(conn):
+    """Profiling ve havuz sarmalayıcılarının altındaki gerçek bağlantı"""
+    conn = getattr(conn, 'raw_connection', conn)
+    return getattr(conn, '_cnx', conn)
+
+
+def _prepared_cursor(physical, name, dictionary):
+    entry = _prepared_cache.get(physical)
+    connection_id = getattr(physical, 'connection_id', None)
+    if entry is None or entry['connection_id'] != connection_id:
+        # Yeni veya yeniden bağlanmış oturum: eski prepared handle'lar geçersiz
+        entry = _prepared_cache[physical] = {'connection_id': connection_id, 'cursors': {}}
+
+    key = (name, dictionary)
+    cursor = entry['cursors'].get(key)
+    if cursor is None:
+        cursor = entry['cursors'][key] = physical.cursor(prepared=True, dictionary=dictionary)
+    return cursor
+
+
+def clear_statement_cache(conn):
+    """Bağlantının prepared cursor'larını kapat ve önbellekten çıkar"""
+    entry = _prepared_cache.pop(_physical_connection(conn), None)
+    if not entry:
+        return
+    for cursor in entry['cursors'].values():
+        try:
+            cursor.close()
+        except mysql.connector.Error:
+            pass
+
+
+def _run(conn, name, params, dictionary, consume):
+    sql = STATEMENTS[name]
+    physical = _physical_connection(conn)
+
+    if not USE_PREPARED_STATEMENTS or isinstance(physical, SQLiteConnection):
+        cursor = conn.cursor(dictionary=dictionary)
+        try:
+            cursor.execute(sql, params)
+            return consume(cursor)
+        finally:
+            cursor.close()
+
+    for attempt in range(2):
+        cursor = ProfilingCursor(_prepared_cursor(physical, name, dictionary), physical)
+        try:
+            cursor.execute(sql, params)
+            result = consume(cursor)
+            cursor.record()
+            return result
+        except mysql.connector.Error as err:
+            # Sunucu prepared statement'ı düşürdüyse (ör. yeniden bağlantı) bir kez yeniden hazırla
+            clear_statement_cache(physical)
+            if attempt or err.errno not in (1243, 2013, 2055):
+                raise
+            logger.warning(f"Prepared statement yeniden hazırlanıyor ({name}): {err}")
+
+
+def fetch_all(conn, name, params=(), dictionary=True):
+    """İsimli sorguyu çalıştır ve tüm satırları döndür"""
+    return _run(conn, name, params, dictionary, lambda cursor: cursor.fetchall())
+
+
+def fetch_one(conn, name, params=(), dictionary=False):
+    """İsimli sorguyu çalıştır ve ilk satırı döndür (None olabilir)"""
+    def consume(cursor):
+        rows = cursor.fetchall()
+        return rows[0] if rows else None
+    return _run(conn, name, params, dictionary, consume)
+
+
+def execute(conn, name, params=()):
+    """İsimli INSERT/UPDATE/DELETE ifadesini çalıştır"""
+    return _run(conn, name, params, False,
+                lambda cursor: StatementResult(cursor.rowcount, cursor.lastrowid))
@@ -0,0 +1,453 @@
+/*
+ * Rezervasyon Sistemi - ortak davranışlar
+ *
+ * Sayfalar davranışları sayfa içi <script> blokları yerine işaretlerle seçer:
+ *   <body data-alert-close="alert-success:3100 alert-danger:6000">
+ *       Verilen sınıftaki uyarılar belirtilen milisaniye sonra kapanır
+ *       (.alert-persistent hariç).
+ *   input[type=date][data-min-today]   En erken tarih bugün olur
+ *   form.needs-validation              Bootstrap form doğrulaması
+ *   .alternative-slot                  Önerilen boş dilimi forma aktarır
+ *   #availabilityForm                  Alanlar dolunca otomatik gönderim
+ *   #usersData                         Kullanıcı yönetimi (yetki modalı)
+ *   [data-status-url]                  Arka plan export durumunu yoklama
+ *   #reservationRows [data-row-action] Durum değişikliği/silme, satır yerinde güncellenir
+ */
+(function () {
+    'use strict';
+
+    function closeAlerts(className) {
+        document.querySelectorAll('.' + className).forEach(function (element) {
+            if (!element.parentNode || element.classList.contains('alert-persistent')) {
+                return;
+            }
+            try {
+                new bootstrap.Alert(element).close();
+            } catch (e) {
+                // Hata durumunda sessizce devam et
+            }
+        });
+    }
+
+    function setupAlertClose() {
+        var spec = document.body.dataset.alertClose;
+        if (!spec) {
+            return;
+        }
+        spec.split(/\s+/).forEach(function (item) {
+            var parts = item.split(':');
+            var delay = parseInt(parts[1], 10);
+            if (parts[0] && delay > 0) {
+                setTimeout(closeAlerts, delay, parts[0]);
+            }
+        });
+    }
+
+    function setupMinDate() {
+        var today = new Date().toISOString().split('T')[0];
+        document.querySelectorAll('input[type="date"][data-min-today]').forEach(function (input) {
+            input.min = today;
+        });
+    }
+
+    function setupValidation() {
+        document.querySelectorAll('form.needs-validation').forEach(function (form) {
+            form.addEventListener('submit', function (event) {
+                if (form.checkValidity() === false) {
+                    event.preventDefault();
+                    event.stopPropagation();
+                }
+                form.classList.add('was-validated');
+            }, false);
+        });
+    }
+
+    // "HH:MM-HH:MM" -> [başlangıç, bitiş] dakika (geçersizse null)
+    function parseTimeRange(value) {
+        var match = /^(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})$/.exec(value || '');
+        if (!match) {
+            return null;
+        }
+        return [match[1] * 60 + +match[2], match[3] * 60 + +match[4]];
+    }
+
+    // Önerilen boş aralığı forma aktar
+    function setupAlternatives() {
+        var buttons = document.querySelectorAll('.alternative-slot');
+        buttons.forEach(function (button) {
+            button.addEventListener('click', function () {
+                var parts = (button.dataset.time || '').split('-');
+                var values = { center: button.dataset.center, venue: button.dataset.venue, date: button.dataset.date,
+                               start_time: parts[0], end_time: parts[1] };
+                Object.keys(values).forEach(function (field) {
+                    var input = document.getElementById(field);
+                    if (input && values[field] !== undefined) {
+                        input.value = values[field];
+                    }
+                });
+                buttons.forEach(function (other) {
+                    other.classList.toggle('active', other === button);
+                });
+            });
+        });
+    }
+
+    // Saat durumu: tüm alanlar doluysa formu otomatik gönder
+    function setupAvailability() {
+        var form = document.getElementById('availabilityForm');
+        if (!form) {
+            return;
+        }
+        var fields = ['center', 'venue', 'date'].map(function (id) {
+            return document.getElementById(id);
+        }).filter(Boolean);
+        var spinner = document.getElementById('loadingSpinner');
+        var results = document.getElementById('availabilityResults');
+        var submitButton = document.getElementById('manualSubmitBtn');
+
+        function allFilled() {
+            return fields.every(function (field) { return field.value; });
+        }
+
+        fields.forEach(function (field) {
+            field.addEventListener('change', function () {
+                if (submitButton) {
+                    submitButton.innerHTML = allFilled()
+                        ? '<i class="fas fa-sync me-2"></i>Güncelle'
+                        : '<i class="fas fa-search me-2"></i>Saat Durumunu Görüntüle';
+                }
+                if (allFilled()) {
+                    if (spinner) { spinner.style.display = 'block'; }
+                    if (results) { results.style.opacity = '0.5'; }
+                    setTimeout(function () { form.submit(); }, 300);
+                }
+            });
+        });
+
+        // Geri tuşuyla dönüldüğünde yükleniyor göstergesini gizle
+        window.addEventListener('pageshow', function () {
+            if (spinner) { spinner.style.display = 'none'; }
+            if (results) { results.style.opacity = '1'; }
+        });
+    }
+
+    // Filtre seçimleri değişince formu gönder
+    function setupAutoSubmit() {
+        document.querySelectorAll('[data-auto-submit]').forEach(function (field) {
+            field.addEventListener('change', function () {
+                field.form.submit();
+            });
+        });
+    }
+
+    // Kullanıcı yönetimi: yetki düzenleme ve şifre sıfırlama
+    function setupUserAdmin() {
+        var data = document.getElementById('usersData');
+        if (!data) {
+            return;
+        }
+        var users = JSON.parse(data.textContent);
+
+        document.querySelectorAll('[data-edit-permissions]').forEach(function (button) {
+            button.addEventListener('click', function () {
+                var username = button.dataset.editPermissions;
+                var permissions = users[username].permissions;
+                document.getElementById('permissionsForm').action = '/admin/users/' + username + '/permissions';
+                document.querySelectorAll('input[name="permissions"]').forEach(function (checkbox) {
+                    checkbox.checked = permissions.includes(checkbox.value);
+                });
+                document.querySelector('#permissionsModal .modal-title').textContent = username + ' - Kullanıcı Yetkileri';
+                new bootstrap.Modal(document.getElementById('permissionsModal')).show();
+            });
+        });
+
+        document.querySelectorAll('[data-reset-password]').forEach(function (button) {
+            button.addEventListener('click', function () {
+                var username = button.dataset.resetPassword;
+                if (confirm(username + ' kullanıcısının şifresini varsayılan şifreye (123456) sıfırlamak istediğinizden emin misiniz?')) {
+                    window.location.href = '/admin/users/' + username + '/reset-password';
+                }
+            });
+        });
+    }
+
+    // Onay isteyen bağlantı ve butonlar (satır işlemleri onayı kendisi sorar)
+    function setupConfirm() {
+        document.querySelectorAll('[data-confirm]:not([data-row-action])').forEach(function (element) {
+            element.addEventListener('click', function (event) {
+                if (!confirm(element.dataset.confirm)) {
+                    event.preventDefault();
+                }
+            });
+        });
+    }
+
+    // Flash mesajı gibi görünen, kendiliğinden kapanan uyarı
+    function showMessage(message, category) {
+        var container = document.getElementById('actionMessages');
+        if (!container || !message) {
+            return;
+        }
+        var type = category === 'success' || category === 'warning' ? category : 'danger';
+        var icon = { success: 'check-circle', warning: 'exclamation-triangle', danger: 'exclamation-circle' }[type];
+        var alert = document.createElement('div');
+        alert.className = 'alert alert-' + type + ' alert-dismissible fade show';
+        alert.setAttribute('role', 'alert');
+        alert.innerHTML = '<i class="fas fa-' + icon + ' me-2"></i><span></span>' +
+            '<button type="button" class="btn-close" data-bs-dismiss="alert"></button>';
+        alert.querySelector('span').textContent = message;
+        container.appendChild(alert);
+        setTimeout(closeAlerts, 4000, 'alert-' + type);
+    }
+
+    // Rezervasyon listesi: durum değişikliği ve silme sayfayı yeniden yüklemeden yapılır.
+    // Sunucu güncel satırı döndürür; satır yerinde değiştirilir. İstek yapılamazsa
+    // buton kendi formuyla (yönlendiren POST rotası) gönderilir.
+    function setupRowActions() {
+        var rows = document.getElementById('reservationRows');
+        if (!rows) {
+            return;
+        }
+        rows.addEventListener('click', function (event) {
+            var button = event.target.closest('[data-row-action]');
+            if (!button) {
+                return;
+            }
+            event.preventDefault();
+            if (button.dataset.confirm && !confirm(button.dataset.confirm)) {
+                return;
+            }
+            var row = button.closest('tr');
+            var body = new FormData();
+            if (button.dataset.status) {
+                body.append('status', button.dataset.status);
+            }
+            row.classList.add('opacity-50');
+            fetch(button.dataset.rowAction, {
+                method: 'POST',
+                body: body,
+                headers: { 'Accept': 'application/json' },
+                credentials: 'same-origin'
+            })
+                .then(function (response) {
+                    return response.json().then(function (data) { return { ok: response.ok, data: data }; });
+                })
+                .then(function (result) {
+                    var data = result.data;
+                    row.classList.remove('opacity-50');
+                    if (!result.ok) {
+                        showMessage(data.error || 'İşlem yapılamadı', 'error');
+                        return;
+                    }
+                    // Durum filtresine artık uymayan satır listeden çıkar
+                    var statusFilter = document.getElementById('status');
+                    if (data.deleted || (statusFilter && statusFilter.value !== 'all' && statusFilter.value !== data.status)) {
+                        row.remove();
+                    } else {
+                        row.outerHTML = data.row;
+                    }
+                    showMessage(data.message, data.category);
+                })
+                .catch(function () {
+                    button.form.action = button.formAction;
+                    button.form.submit();
+                });
+        });
+    }
+
+    // Değişiklik akışı (SSE): başka kullanıcıların yaptığı değişiklikler açık sayfaya
+    // yansır. Uygunluk sayfasında saat dilimleri, listede satırlar yerinde güncellenir.
+    var ACTIVE_STATUSES = ['onay', 'bekle'];
+
+    function subscribe(url, handlers) {
+        if (!url || !window.EventSource) {
+            return;
+        }
+        var source = new EventSource(url);
+        Object.keys(handlers).forEach(function (name) {
+            source.addEventListener(name, function (message) {
+                handlers[name](JSON.parse(message.data || '{}'), source);
+            });
+        });
+        window.addEventListener('pagehide', function () { source.close(); });
+    }
+
+    function showReloadNotice(id, message) {
+        var container = document.getElementById('actionMessages') || document.querySelector('.card-body');
+        if (!container || document.getElementById(id)) {
+            return;
+        }
+        var notice = document.createElement('div');
+        notice.id = id;
+        notice.className = 'alert alert-info alert-persistent d-flex justify-content-between align-items-center';
+        notice.innerHTML = '<span><i class="fas fa-sync-alt me-2"></i><span></span></span>' +
+            '<a href="#" class="btn btn-sm btn-outline-primary">Yenile</a>';
+        notice.querySelector('span span').textContent = message;
+        notice.querySelector('a').addEventListener('click', function (event) {
+            event.preventDefault();
+            window.location.reload();
+        });
+        container.prepend(notice);
+    }
+
+    function setupAvailabilityFeed() {
+        var results = document.getElementById('availabilityResults');
+        if (!results || !results.dataset.eventsUrl) {
+            return;
+        }
+        var params = new URL(results.dataset.eventsUrl, window.location.href).searchParams;
+        var watched = { center: params.get('center'), venue: params.get('venue'), date: params.get('date') };
+        var atWatchedPlace = function (place) {
+            return place && place.center === watched.center && place.venue === watched.venue && place.date === watched.date;
+        };
+        // Her dilimde onu kaplayan rezervasyonların ID'leri; dilim boşsa küme boştur
+        var slots = Array.prototype.map.call(results.querySelectorAll('.time-slot[data-slot]'), function (element) {
+            return {
+                element: element,
+                range: parseTimeRange(element.dataset.slot),
+                owners: new Set((element.dataset.owners || '').split(' ').filter(Boolean))
+            };
+        });
+        var render = function (slot) {
+            var taken = slot.owners.size > 0;
+            slot.element.classList.toggle('dolu', taken);
+            slot.element.classList.toggle('bos', !taken);
+            slot.element.querySelector('i').className = 'fas fa-' + (taken ? 'times' : 'check') + ' me-2';
+            slot.element.querySelector('small').textContent = taken ? 'Dolu' : 'Rezervasyon Yapılabilir';
+        };
+        var recount = function () {
+            document.getElementById('freeCount').textContent = results.querySelectorAll('.time-slot.bos[data-slot]').length;
+            document.getElementById('takenCount').textContent = results.querySelectorAll('.time-slot.dolu[data-slot]').length;
+        };
+        var apply = function (event) {
+            var id = String(event.reservation_id);
+            var active = atWatchedPlace(event) && event.action !== 'deleted' && ACTIVE_STATUSES.indexOf(event.status) !== -1;
+            var range = active ? parseTimeRange(event.time) : null;
+            slots.forEach(function (slot) {
+                // Rezervasyonun eski aralığı bilinmese de tüm dilimlerden çıkarıp yenisine eklemek yeterli
+                slot.owners.delete(id);
+                if (range && slot.range && range[0] < slot.range[1] && slot.range[0] < range[1]) {
+                    slot.owners.add(id);
+                }
+                render(slot);
+            });
+            recount();
+        };
+        subscribe(results.dataset.eventsUrl, {
+            created: apply,
+            updated: apply,
+            status: apply,
+            deleted: apply,
+            reset: function (data, source) {
+                source.close();
+                showReloadNotice('feedReset', 'Saat durumları değişti. Güncel hali için sayfayı yenileyin.');
+            }
+        });
+    }
+
+    function setupReservationFeed() {
+        var rows = document.getElementById('reservationRows');
+        if (!rows || !rows.dataset.eventsUrl) {
+            return;
+        }
+        var statusFilter = document.getElementById('status');
+        var refreshRow = function (event) {
+            var row = document.getElementById('reservation-' + event.reservation_id);
+            if (!row) {
+                return;
+            }
+            if (statusFilter && statusFilter.value !== 'all' && statusFilter.value !== event.status) {
+                row.remove();
+                return;
+            }
+            if (event.action === 'status' && row.dataset.status === event.status) {
+                // Bu sayfadaki işlem: satır zaten güncel
+                return;
+            }
+            fetch(rows.dataset.rowUrl.replace(/\/0\/row$/, '/' + event.reservation_id + '/row'),
+                  { headers: { 'Accept': 'application/json' }, credentials: 'same-origin' })
+                .then(function (response) { return response.ok ? response.json() : null; })
+                .then(function (data) {
+                    var current = document.getElementById('reservation-' + event.reservation_id);
+                    if (data && current) {
+                        current.outerHTML = data.row;
+                    }
+                });
+        };
+        subscribe(rows.dataset.eventsUrl, {
+            created: function () {
+                showReloadNotice('feedCreated', 'Yeni rezervasyonlar eklendi.');
+            },
+            updated: refreshRow,
+            status: refreshRow,
+            deleted: function (event) {
+                var row = document.getElementById('reservation-' + event.reservation_id);
+                if (row) {
+                    row.remove();
+                }
+            },
+            reset: function (data, source) {
+                source.close();
+                showReloadNotice('feedReset', 'Liste değişti. Güncel hali için sayfayı yenileyin.');
+            }
+        });
+    }
+
+    // Arka plan export işi: hazır olana kadar durum adresini yokla
+    function setupExportStatus() {
+        var container = document.querySelector('[data-status-url]');
+        if (!container) {
+            return;
+        }
+        var statusUrl = container.dataset.statusUrl;
+        var show = function (id) {
+            ['export-pending', 'export-done', 'export-error'].forEach(function (name) {
+                document.getElementById(name).classList.toggle('d-none', name !== id);
+            });
+        };
+        var fail = function (message) {
+            document.getElementById('export-error').textContent = message;
+            show('export-error');
+        };
+
+        function poll(delay) {
+            fetch(statusUrl, { headers: { 'Accept': 'application/json' } })
+                .then(function (response) {
+                    return response.json().then(function (data) { return { ok: response.ok, data: data }; });
+                })
+                .then(function (result) {
+                    var data = result.data;
+                    if (!result.ok || data.status === 'error') {
+                        fail(data.error || 'Excel dosyası oluşturulurken hata oluştu');
+                    } else if (data.status === 'done') {
+                        document.getElementById('export-download').href = data.download_url;
+                        show('export-done');
+                        window.location.href = data.download_url;
+                    } else {
+                        // Uzun işlerde sunucuyu gereksiz yoklamamak için bekleme artar
+                        setTimeout(function () { poll(Math.min(delay * 1.5, 5000)); }, delay);
+                    }
+                })
+                .catch(function () {
+                    setTimeout(function () { poll(Math.min(delay * 2, 10000)); }, delay);
+                });
+        }
+
+        poll(1000);
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        setupMinDate();
+        setupValidation();
+        setupAlternatives();
+        setupAvailability();
+        setupAutoSubmit();
+        setupUserAdmin();
+        setupConfirm();
+        setupRowActions();
+        setupAvailabilityFeed();
+        setupReservationFeed();
+        setupExportStatus();
+        setupAlertClose();
+    });
+})();
@@ -0,0 +1,369 @@
+"""Kendi sunucumuzdan servis edilen, parmak izli statik dosya paketleri
+
+Sayfalar Bootstrap ve Font Awesome'ı CDN'den, kendi stillerini ise her
+sayfada tekrarlanan ``<style>`` bloklarından alıyordu: her sayfa açılışında
+üç farklı sunucuya bağlantı, önbelleğe alınamayan satır içi CSS ve ikon
+fontunun tamamı (yüzlerce kullanılmayan ikon) indiriliyordu.
+
+``flask --app app build-assets`` komutu:
+
+* Sabitlenmiş sürümdeki Bootstrap ve Font Awesome dosyalarını bir kez
+  ``static/vendor`` altına indirir (zaten varsa indirmez).
+* Font Awesome CSS'ini şablonlarda ve uygulama kodunda geçen ``fa-*``
+  ikonlarına indirger; sadece solid font bırakılır. ``fontTools`` kuruluysa
+  font dosyası da kullanılan karakterlere indirgenir.
+* Vendor dosyalarını ``static/css/app.css`` ve ``static/js/app.js`` ile
+  birleştirip içerik özetini adına ekleyerek ``static/dist`` altına yazar
+  (ör. ``app.3f2a9c1b0d4e.css``) ve ``manifest.json`` üretir.
+
+Dosya adı içerikle değiştiği için nginx ``/static`` altını ``immutable``
+olarak bir yıl önbelleğe alabilir; yeni sürümde sayfalar yeni adı ister.
+Şablonlar ``asset_urls('app.css')`` ile paket adreslerini alır. Manifest
+yoksa (geliştirme ortamı) kaynak dosyalar ayrı ayrı, içerik özeti sorgu
+parametresi olarak eklenerek verilir; vendor dosyaları da yoksa CDN
+adresleri kullanılır.
+"""
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+DOWNLOAD_TIMEOUT = 30
+
+BOOTSTRAP_CDN = 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist'
+FONTAWESOME_CDN = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0'
+
+# static altındaki yol -> sabitlenmiş sürümün adresi
+VENDOR = {
+    'vendor/css/bootstrap.min.css': f'{BOOTSTRAP_CDN}/css/bootstrap.min.css',
+    'vendor/js/bootstrap.bundle.min.js': f'{BOOTSTRAP_CDN}/js/bootstrap.bundle.min.js',
+    'vendor/css/fontawesome.min.css': f'{FONTAWESOME_CDN}/css/all.min.css',
+    'vendor/webfonts/fa-solid-900.woff2': f'{FONTAWESOME_CDN}/webfonts/fa-solid-900.woff2',
+    'vendor/webfonts/fa-solid-900.ttf': f'{FONTAWESOME_CDN}/webfonts/fa-solid-900.ttf',
+}
+FONTAWESOME_CSS = 'vendor/css/fontawesome.min.css'
+FONTAWESOME_FONTS = ('fa-solid-900.woff2', 'fa-solid-900.ttf')
+
+# Paket adı -> sırasıyla birleştirilen dosyalar (static altındaki yollar)
+BUNDLES = {
+    'app.css': ['vendor/css/bootstrap.min.css', FONTAWESOME_CSS, 'css/app.css'],
+    'app.js': ['vendor/js/bootstrap.bundle.min.js', 'js/app.js'],
+}
+
+_ICON_NAME = re.compile(r'\bfa-[a-z0-9]+(?:-[a-z0-9]+)*')
+_ICON_SELECTOR = re.compile(r'^\.(fa-[a-z0-9-]+)::?before$')
+_ICON_CONTENT = re.compile(r'content:\s*"\\([0-9a-f]+)"')
+_FONT_URL = re.compile(r'url\((?:\.\./webfonts/)?([^)"\']+)\)(?:\s*format\("[^"]*"\))?')
+_SOURCE_MAP = re.compile(r'/\*# sourceMappingURL=[^*]*\*/|//# sourceMappingURL=\S*')
+
+
+class AssetError(Exception):
+    """Statik paket oluşturulamadı (ör. vendor dosyası indirilemedi)"""
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def fingerprinted_name(name, data):
+    """``app.css`` -> ``app.<özet>.css``"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{content_hash(data)}{ext}"
+
+
+def _read(static_dir, path):
+    with open(os.path.join(static_dir, path), 'rb') as f:
+        return f.read()
+
+
+def _write(static_dir, path, data):
+    full = os.path.join(static_dir, path)
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    tmp = f"{full}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, full)
+
+
+def fetch_vendor(static_dir=STATIC_DIR, download=True):
+    """Eksik vendor dosyalarını indir
+
+    Returns:
+        list: İndirilen dosyalar
+    Raises:
+        AssetError: Dosya yok ve indirilemedi
+    """
+    fetched = []
+    for path, url in VENDOR.items():
+        if os.path.exists(os.path.join(static_dir, path)):
+            continue
+        if not download:
+            raise AssetError(f"{path} bulunamadı ({url} adresinden indirin)")
+        try:
+            with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+                data = response.read()
+        except OSError as e:
+            raise AssetError(f"{url} indirilemedi: {e}") from e
+        _write(static_dir, path, data)
+        fetched.append(path)
+        logger.info(f"Vendor dosyası indirildi: {path} ({len(data)} bayt)")
+    return fetched
+
+
+def used_icon_names(paths):
+    """Dosyalarda geçen ``fa-*`` sınıf adları"""
+    names = set()
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            names.update(_ICON_NAME.findall(f.read()))
+    return names
+
+
+def default_icon_sources(static_dir=STATIC_DIR, template_dir=TEMPLATE_DIR):
+    """İkon sınıfı kullanabilecek dosyalar: şablonlar, uygulama kodu ve app.js"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    paths = [os.path.join(template_dir, name) for name in sorted(os.listdir(template_dir))
+             if name.endswith('.html')]
+    paths += [os.path.join(root, name) for name in ('app.py', 'app_mysql.py')
+              if os.path.exists(os.path.join(root, name))]
+    paths.append(os.path.join(static_dir, 'js', 'app.js'))
+    return paths
+
+
+def split_css_rules(css):
+    """Üst seviye CSS kurallarını (seçici/at-rule, gövde) çiftleri olarak böl"""
+    rules = []
+    depth = 0
+    start = 0
+    body_start = None
+    quote = None
+    i = 0
+    while i < len(css):
+        char = css[i]
+        if quote:
+            if char == '\\':
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = len(css) if end < 0 else end + 1
+        elif char == '{':
+            if depth == 0:
+                body_start = i
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append((css[start:body_start].strip(), css[body_start + 1:i]))
+                start = i + 1
+        elif char == ';' and depth == 0:
+            # @charset / @import gibi gövdesiz kurallar
+            rules.append((css[start:i + 1].strip(), None))
+            start = i + 1
+        i += 1
+    return rules
+
+
+def subset_fontawesome(css, icon_names):
+    """Font Awesome CSS'ini kullanılan ikonlara ve solid fonta indirge
+
+    İkon kuralları (``.fa-x:before{content:"\\f000"}``) sadece kullanılan
+    adlar için tutulur; sadece solid fontu kullanan ``@font-face`` blokları
+    kalır. Diğer kurallar (``fa-spin``, ``fa-fw`` vb.) küçük olduğu için
+    olduğu gibi bırakılır.
+
+    Returns:
+        tuple: (indirgenmiş CSS, kullanılan karakter kodları)
+    """
+    out = []
+    codepoints = set()
+    for selector, body in split_css_rules(_SOURCE_MAP.sub('', css)):
+        if body is None:
+            out.append(selector)
+            continue
+        if selector.startswith('@font-face'):
+            sources = _FONT_URL.findall(body)
+            if not sources or any(not source.startswith('fa-solid-900') for source in sources):
+                continue
+            out.append(f"{selector}{{{body}}}")
+            continue
+        selectors = [s.strip() for s in selector.split(',')]
+        matches = [_ICON_SELECTOR.match(s) for s in selectors]
+        if all(matches) and _ICON_CONTENT.search(body):
+            kept = [s for s, m in zip(selectors, matches) if m.group(1) in icon_names]
+            if not kept:
+                continue
+            codepoints.add(int(_ICON_CONTENT.search(body).group(1), 16))
+            selector = ','.join(kept)
+        out.append(f"{selector}{{{body}}}")
+    return '\n'.join(out), codepoints
+
+
+def subset_font(data, codepoints, flavor):
+    """Font dosyasını verilen karakterlere indirge; fontTools yoksa None"""
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        return None
+    try:
+        font = TTFont(io.BytesIO(data))
+        options = subset.Options()
+        options.flavor = flavor
+        options.layout_features = ['*']
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        output = io.BytesIO()
+        subset.save_font(font, output, options)
+        return output.getvalue()
+    except Exception as e:
+        # woff2 için brotli gerekir; indirgenemeyen font olduğu gibi kullanılır
+        logger.warning(f"Font indirgenemedi ({flavor or 'ttf'}): {e}")
+        return None
+
+
+def _fontawesome_bundle_part(static_dir, icon_names, files):
+    """İndirgenmiş Font Awesome CSS'i; fontlar parmak izli adlarla ``files``'a eklenir"""
+    css = _read(static_dir, FONTAWESOME_CSS).decode('utf-8')
+    css, codepoints = subset_fontawesome(css, icon_names)
+    renamed = {}
+    for font in FONTAWESOME_FONTS:
+        data = _read(static_dir, f'vendor/webfonts/{font}')
+        flavor = 'woff2' if font.endswith('.woff2') else None
+        data = subset_font(data, codepoints, flavor) or data
+        name = fingerprinted_name(font, data)
+        files[name] = data
+        renamed[font] = name
+    css = re.sub(r'url\((?:\.\./webfonts/)?(fa-solid-900\.[a-z0-9]+)\)',
+                 lambda m: f'url({renamed.get(m.group(1), m.group(1))})', css)
+    return css, len(codepoints)
+
+
+def build_assets(static_dir=STATIC_DIR, icon_sources=None, download=True):
+    """Paketleri oluşturup ``static/dist`` altına yaz
+
+    Returns:
+        dict: Manifest ({paket adı: [static altındaki yollar]})
+    Raises:
+        AssetError: Vendor dosyası eksik ve indirilemedi
+    """
+    fetch_vendor(static_dir, download)
+    icon_names = used_icon_names(icon_sources or default_icon_sources(static_dir))
+
+    files = {}
+    manifest = {}
+    for bundle, sources in BUNDLES.items():
+        parts = []
+        for source in sources:
+            if source == FONTAWESOME_CSS:
+                css, icons = _fontawesome_bundle_part(static_dir, icon_names, files)
+                logger.info(f"Font Awesome: {icons} ikon tutuldu")
+                parts.append(css)
+            else:
+                parts.append(_SOURCE_MAP.sub('', _read(static_dir, source).decode('utf-8')).strip())
+        separator = '\n' if bundle.endswith('.css') else '\n;\n'
+        data = (separator.join(parts) + '\n').encode('utf-8')
+        name = fingerprinted_name(bundle, data)
+        files[name] = data
+        manifest[bundle] = [f'{DIST_DIR}/{name}']
+
+    previous = load_manifest(static_dir) or {}
+    for name, data in files.items():
+        _write(static_dir, f'{DIST_DIR}/{name}', data)
+        if not name.endswith(('.woff2', '.ttf')):
+            # nginx gzip_static için önceden sıkıştırılmış kopya
+            _write(static_dir, f'{DIST_DIR}/{name}.gz', gzip.compress(data, 9, mtime=0))
+    _write(static_dir, f'{DIST_DIR}/{MANIFEST_NAME}',
+           json.dumps({'bundles': manifest, 'files': sorted(files)}, indent=2).encode('utf-8'))
+    _prune_dist(static_dir, set(files) | set(previous.get('files', ())))
+    return manifest
+
+
+def _prune_dist(static_dir, keep):
+    """Bu ve bir önceki derlemeye ait olmayan dosyaları sil
+
+    Bir önceki derlemenin dosyaları, yeniden başlatma sırasında eski sayfayı
+    almış tarayıcılar için bırakılır.
+    """
+    dist = os.path.join(static_dir, DIST_DIR)
+    for name in os.listdir(dist):
+        base = name[:-3] if name.endswith('.gz') else name
+        if name == MANIFEST_NAME or base in keep:
+            continue
+        path = os.path.join(dist, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+def load_manifest(static_dir=STATIC_DIR):
+    """Derlenmiş paket manifestini oku; yoksa None"""
+    try:
+        with open(os.path.join(static_dir, DIST_DIR, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Statik paket manifesti okunamadı: {e}")
+        return None
+    manifest.setdefault('files', [])
+    return manifest
+
+
+def register_static_assets(app):
+    """Şablonlara ``asset_urls`` ve ``static_url`` yardımcılarını ekle
+
+    Manifest uygulama başlarken bir kez okunur; yeni derleme worker'lar
+    yeniden başlatılınca kullanılır.
+    """
+    from flask import url_for
+
+    static_dir = app.static_folder
+    manifest = load_manifest(static_dir)
+    if manifest is None:
+        logger.info("Derlenmiş statik paket yok; kaynak dosyalar ayrı ayrı servis edilecek "
+                    "(`flask --app app build-assets` ile derleyin)")
+    versions = {}
+
+    def static_url(filename):
+        """Dosyanın içerik özeti eklenmiş adresi (içerik değişince adres değişir)"""
+        path = os.path.join(static_dir, filename)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return url_for('static', filename=filename)
+        cached = versions.get(filename)
+        if cached is None or cached[0] != mtime:
+            cached = versions[filename] = (mtime, content_hash(_read(static_dir, filename)))
+        return url_for('static', filename=filename, v=cached[1])
+
+    def asset_urls(bundle):
+        """Paketin sayfaya eklenecek adresleri"""
+        if manifest is not None and bundle in manifest['bundles']:
+            return [url_for('static', filename=path) for path in manifest['bundles'][bundle]]
+        urls = []
+        for source in BUNDLES[bundle]:
+            if source in VENDOR and not os.path.exists(os.path.join(static_dir, source)):
+                urls.append(VENDOR[source])
+            else:
+                urls.append(static_url(source))
+        return urls
+
+    app.jinja_env.globals.update(asset_urls=asset_urls, static_url=static_url)
+    return app
@@ -0,0 +1,176 @@
+"""CSV ve NDJSON export'ları için sabit bellekli akış
+
+Excel export'undan farklı olarak satırlar bellekteki listeden değil,
+doğrudan veritabanından okunur: MySQL'de buffersız (unbuffered) bir cursor
+açılır ve satırlar ``fetchmany`` ile ``STREAM_CHUNK_SIZE``'lık parçalar
+halinde alınıp hemen yanıta yazılır. Tüm tablo export edilse bile bellekte
+en fazla bir parça tutulur ve ilk bayt sorgu başlar başlamaz gönderilir.
+
+Filtreler ``/export/excel`` ile aynıdır ve aynı sonucu verir; tarih
+filtreleri ``idx_center_date`` indeksini kullanabilmek için aralık
+karşılaştırmasına çevrilir.
+"""
+import csv
+import io
+import json
+import logging
+import os
+from datetime import date, datetime
+
+from statements import RESERVATION_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', 1000))
+
+DEFAULT_VENUE = 'Tiyatro Salonu'
+
+FIELDS = [column.strip() for column in RESERVATION_COLUMNS.split(',')]
+_VENUE_INDEX = FIELDS.index('venue')
+
+CSV_MIMETYPE = 'text/csv'
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def _month_range(year, month):
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def filter_date_range(month_filter=None, year_filter=None):
+    """Ay ve yıl filtrelerinin tarih aralığı: (başlangıç, bitiş), bitiş hariç
+
+    ``None`` sınırsız demektir; filtreler hiçbir tarihe uymuyorsa (geçersiz
+    yıl veya farklı yılları gösteren ay/yıl) None döner. Geçersiz ay filtresi
+    ``get_filtered_reservations``'da olduğu gibi yok sayılır.
+    """
+    start = end = None
+    if month_filter and month_filter != 'all':
+        try:
+            year, month = month_filter.split('-')
+            start, end = _month_range(int(year), int(month))
+        except ValueError:
+            pass
+
+    if year_filter and year_filter != 'all':
+        try:
+            year = int(year_filter)
+        except ValueError:
+            return None
+        year_start, year_end = date(year, 1, 1), date(year + 1, 1, 1)
+        start = year_start if start is None else max(start, year_start)
+        end = year_end if end is None else min(end, year_end)
+
+    if start is not None and end is not None and start >= end:
+        return None
+    return start, end
+
+
+def build_export_query(center_filter=None, status_filter=None, month_filter=None,
+                       year_filter=None, venue_filter=None, archive=False,
+                       date_from=None, date_to=None):
+    """Filtreler için (sql, params) üret
+
+    Anlam ``get_filtered_reservations`` ile aynıdır: geçersiz ay filtresi
+    yok sayılır, geçersiz yıl filtresi boş sonuç verir. ``date_from`` /
+    ``date_to`` aralığı ayrıca daraltır (bitiş hariç). ``archive`` True ise
+    arşivlenmiş yıllar (``reservations_archive``) okunur.
+    """
+    conditions, params = [], []
+
+    if center_filter and center_filter != 'all':
+        conditions.append("center = %s")
+        params.append(center_filter)
+
+    if status_filter and status_filter != 'all':
+        conditions.append("status = %s")
+        params.append(status_filter)
+
+    date_range = filter_date_range(month_filter, year_filter)
+    if date_range is None:
+        conditions.append("1 = 0")
+    else:
+        start, end = date_range
+        if date_from is not None:
+            start = date_from if start is None else max(start, date_from)
+        if date_to is not None:
+            end = date_to if end is None else min(end, date_to)
+        if start is not None:
+            conditions.append("date >= %s")
+            params.append(start)
+        if end is not None:
+            conditions.append("date < %s")
+            params.append(end)
+
+    if venue_filter and venue_filter != 'all':
+        # Eski kayıtlarda salon boş olabilir; bunlar varsayılan salon sayılır
+        if venue_filter == DEFAULT_VENUE:
+            conditions.append("(venue = %s OR venue IS NULL)")
+        else:
+            conditions.append("venue = %s")
+        params.append(venue_filter)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    table = 'reservations_archive' if archive else 'reservations'
+    sql = f"SELECT {RESERVATION_COLUMNS} FROM {table} {where} ORDER BY created_at DESC"
+    return sql, tuple(params)
+
+
+def iter_row_chunks(conn, sql, params, chunk_size=STREAM_CHUNK_SIZE):
+    """Sorgu sonucunu parça parça üret (buffersız cursor, sabit bellek)
+
+    Buffersız cursor açıkken bağlantı başka sorgu çalıştıramaz; bu yüzden
+    akış için ayrı bir bağlantı verilmeli ve üretici sonuna kadar tüketilmeli
+    veya kapatılmalıdır.
+    """
+    # Satırlar tuple olarak alınır (FIELDS sırasıyla); dict oluşturmak akışı yavaşlatır
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        try:
+            # Yarıda kalan akışta okunmamış satırlar atılır
+            cursor.close()
+        except Exception as e:
+            logger.debug(f"Akış cursor'ı kapatılamadı: {e}")
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _export_row(row):
+    values = [_export_value(value) for value in row]
+    if not values[_VENUE_INDEX]:
+        values[_VENUE_INDEX] = DEFAULT_VENUE
+    return values
+
+
+def generate_csv(chunks):
+    """Başlık satırı ve her parça için bir CSV metin bloğu üret"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\r\n')
+    writer.writerow(FIELDS)
+    yield buffer.getvalue()
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(map(_export_row, rows))
+        yield buffer.getvalue()
+
+
+def generate_ndjson(chunks):
+    """Her parça için satır başına bir JSON nesnesi içeren blok üret"""
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    for rows in chunks:
+        yield ''.join(dumps(dict(zip(FIELDS, _export_row(row)))) + '\n' for row in rows)
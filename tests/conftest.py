@@ -0,0 +1,47 @@
+"""Ortak test fixture'ları
+
+Uygulama testleri SQLite arka ucu ve geçici dizindeki paylaşılan doluluk
+tablosuyla çalışır; MySQL sunucusu gerekmez. ``app`` modülü yapılandırmayı
+import sırasında okuduğu için ortam değişkenleri import'tan önce ayarlanır.
+"""
+import itertools
+import os
+from datetime import date, timedelta
+
+import pytest
+
+_days = itertools.count()
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    base = tmp_path_factory.mktemp('app')
+    os.environ.update({
+        'USE_SQLITE': 'True',
+        'SQLITE_DB': str(base / 'rezervasyon.db'),
+        'SNAPSHOT_PATH': '',
+        'OCCUPANCY_PATH': str(base / 'occupancy.bin'),
+        'ADMISSION_PATH': '',
+        'CENTER_LOCK_PATH': str(base / 'center_locks'),
+        'EXPORT_CACHE_DIR': str(base / 'exports'),
+    })
+    import app
+    app.init_database()
+    app.users = app.load_users_from_db()
+    app.app.testing = True
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    """Admin olarak giriş yapmış test istemcisi"""
+    client = app_module.app.test_client()
+    response = client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    assert response.status_code == 302
+    return client
+
+
+@pytest.fixture
+def booking_day():
+    """Her teste ayrı bir gün: testler birbirinin dilimleriyle çakışmaz"""
+    return (date.today() + timedelta(days=30 + next(_days))).isoformat()
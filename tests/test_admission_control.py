@@ -0,0 +1,95 @@
+"""Kabul kontrolü: token bucket, eşzamanlı istek kayıtları ve Flask kancaları"""
+import subprocess
+import sys
+
+import pytest
+from flask import Flask
+
+import admission_control
+from admission_control import SLOT, AdmissionControl, parse_rate, register_admission_control
+
+
+@pytest.fixture
+def control(tmp_path):
+    return AdmissionControl(str(tmp_path / 'admission'), {'login': ('3/60', 2), 'export': ('', 1)}, buckets=64)
+
+
+@pytest.mark.parametrize('spec, expected', [
+    ('10/60', (10.0, 10 / 60)),
+    ('5', (5.0, 5.0)),
+    ('', None),
+    ('0', None),
+    ('-1/10', None),
+])
+def test_parse_rate(spec, expected):
+    assert parse_rate(spec) == expected
+
+
+def test_bucket_allows_burst_then_refills(control):
+    assert [control.take_token('login', 'ali', now=1000) for _ in range(3)] == [0, 0, 0]
+    wait = control.take_token('login', 'ali', now=1000)
+    assert wait == pytest.approx(20.0)
+    # Başka kullanıcının kovası ayrı
+    assert control.take_token('login', 'veli', now=1000) == 0
+    assert control.take_token('login', 'ali', now=1021) == 0
+    assert control.take_token('login', 'ali', now=1021) > 0
+
+
+def test_unlimited_classes_always_admit(control):
+    assert all(control.take_token('export', 'ali', now=1000) == 0 for _ in range(20))
+    assert control.take_token('yok', 'ali') == 0
+    assert control.acquire('yok') == -1
+
+
+def test_buckets_are_shared_between_processes_through_the_file(tmp_path):
+    classes = {'login': ('2/60', 0)}
+    first = AdmissionControl(str(tmp_path / 'shared'), classes, buckets=64)
+    second = AdmissionControl(str(tmp_path / 'shared'), classes, buckets=64)
+    assert first.take_token('login', 'ali', now=1000) == 0
+    assert second.take_token('login', 'ali', now=1000) == 0
+    assert first.take_token('login', 'ali', now=1000) > 0
+
+
+def test_inflight_limit_and_release(control):
+    first = control.acquire('login')
+    second = control.acquire('login')
+    assert {first, second} == {0, 1}
+    assert control.acquire('login') is None
+    assert control.in_flight('login') == 2
+    control.release('login', first)
+    assert control.acquire('login') == first
+
+
+def test_slots_of_dead_or_stale_processes_are_reclaimed(control, monkeypatch):
+    dead = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                          capture_output=True, text=True).stdout.strip()
+    route_class = control.classes['export']
+    SLOT.pack_into(control._mmap, control._slot_offset(route_class, 0), int(dead), 1e12)
+    assert control.acquire('export') == 0
+
+    monkeypatch.setattr(admission_control, 'ADMISSION_STALE_SECONDS', 10)
+    assert control.acquire('export', now=2e12) == 0
+
+
+def test_flask_hooks_reject_with_retry_after(control):
+    app = Flask(__name__)
+
+    @app.route('/api/login', methods=['POST'])
+    def login():
+        return 'ok'
+
+    @app.route('/export')
+    def export():
+        assert control.in_flight('export') == 1
+        return 'ok'
+
+    register_admission_control(app, control, {('POST', 'login'): 'login', ('GET', 'export'): 'export'})
+    client = app.test_client()
+    assert [client.post('/api/login').status_code for _ in range(3)] == [200, 200, 200]
+    rejected = client.post('/api/login')
+    assert rejected.status_code == 429
+    assert int(rejected.headers['Retry-After']) >= 1 and 'error' in rejected.get_json()
+
+    assert client.get('/export').status_code == 200
+    # Kayıt istek bitince bırakılır
+    assert control.in_flight('export') == 0
@@ -0,0 +1,131 @@
+"""Saat aralıkları, ``BookingHours`` ve aralık çakışma indeksi"""
+import random
+import threading
+
+import pytest
+
+from booking_intervals import (BookingHours, IntervalIndex, _DayIntervals, format_time_range, overlaps,
+                               parse_time_range)
+
+SLOTS = ['09:00-10:00', '10:00-11:00', '11:00-12:00', '13:00-14:00']
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('09:00-12:00', (540, 720)),
+    (' 9:15 - 10:15 ', (555, 615)),
+    ('00:00-24:00', (0, 1440)),
+    ('10:00-10:00', None),
+    ('11:00-10:00', None),
+    ('09:60-10:00', None),
+    ('', None),
+    (None, None),
+])
+def test_parse_time_range(text, expected):
+    assert parse_time_range(text) == expected
+
+
+def test_format_round_trip():
+    for start in range(0, 1440, 5):
+        for end in (start + 5, 1440):
+            assert parse_time_range(format_time_range(start, end)) == (start, end)
+
+
+def test_half_open_intervals_do_not_overlap_at_boundary():
+    assert not overlaps((540, 600), (600, 660))
+    assert overlaps((540, 601), (600, 660))
+
+
+def test_booking_hours_validation_and_cells():
+    hours = BookingHours(SLOTS, step=15)
+    assert (hours.opens, hours.closes, hours.step) == (540, 840, 15)
+    assert hours.normalize('9:00-12:00') == '09:00-12:00'
+    assert hours.cell_span('09:15-10:15') == (1, 4)
+    assert hours.cell_span('08:00-09:00') is None
+    assert hours.cell_span('09:05-10:00') is None
+    with pytest.raises(ValueError):
+        hours.validate('08:00-09:00')
+    with pytest.raises(ValueError):
+        hours.validate('09:05-10:00')
+    # Adıma hizalı olmayan dilim sınırı adımı küçültür
+    assert BookingHours(['09:00-09:50'], step=15).step == 5
+
+
+def brute_overlapping(items, start, end, exclude_id=None):
+    return {rid for s, e, rid in items if s < end and start < e and rid != exclude_id}
+
+
+def test_day_intervals_match_brute_force_under_random_changes():
+    rng = random.Random(7)
+    day, live = _DayIntervals(), []
+    for step in range(2000):
+        if live and rng.random() < 0.4:
+            item = live.pop(rng.randrange(len(live)))
+            day.remove(*item)
+        else:
+            start = rng.randrange(0, 1400, 5)
+            item = (start, start + rng.randrange(5, 240, 5), step)
+            day.add(*item)
+            live.append(item)
+        assert day.items == sorted(live)
+        start = rng.randrange(0, 1400, 5)
+        end = start + rng.randrange(5, 240, 5)
+        exclude = rng.choice(live)[2] if live and rng.random() < 0.3 else None
+        expected = brute_overlapping(live, start, end, exclude)
+        assert set(day.overlapping(start, end, exclude)) == expected
+        assert day.conflicts(start, end, exclude) == bool(expected)
+
+
+def test_day_intervals_remove_unknown_item_is_noop():
+    day = _DayIntervals()
+    day.add(540, 600, 1)
+    day.remove(540, 600, 2)
+    assert day.items == [(540, 600, 1)] and day.max_end == [600]
+
+
+def reservation(rid, time, status='onay', date='2025-03-10', venue='Salon'):
+    return {'id': rid, 'center': 'Merkez', 'venue': venue, 'date': date, 'time': time, 'status': status}
+
+
+def test_interval_index_tracks_updates_and_status():
+    index = IntervalIndex()
+    index.rebuild([reservation(1, '09:00-12:00'), reservation(2, '13:00-14:00', status='iptal')])
+    assert len(index) == 1
+    assert index.conflicts('Merkez', 'Salon', '2025-03-10', '11:45-12:15')
+    assert not index.conflicts('Merkez', 'Salon', '2025-03-10', '12:00-13:00')
+    assert not index.conflicts('Merkez', 'Salon', '2025-03-10', '10:00-11:00', exclude_id=1)
+    assert not index.conflicts('Merkez', 'Diğer', '2025-03-10', '10:00-11:00')
+    assert index.conflicts('Merkez', 'Salon', '2025-03-10', 'geçersiz') is None
+
+    # Kayıt taşındığında eski aralık serbest kalır
+    index.upsert(reservation(1, '10:00-11:00', date='2025-03-11'))
+    assert not index.conflicts('Merkez', 'Salon', '2025-03-10', '09:00-12:00')
+    assert index.day_intervals('Merkez', 'Salon', '2025-03-11') == [(600, 660, 1)]
+
+    index.upsert(reservation(1, '10:00-11:00', date='2025-03-11', status='iptal'))
+    assert len(index) == 0
+    index.upsert(reservation(3, '10:30-11:30', date='2025-03-11', status='bekle'))
+    index.remove(3)
+    assert index.day_intervals('Merkez', 'Salon', '2025-03-11') == []
+
+
+def test_interval_index_moves_reservation_between_centers():
+    index = IntervalIndex()
+    index.rebuild([reservation(1, '09:00-10:00')])
+    index.upsert(dict(reservation(1, '09:00-10:00'), center='Diğer Merkez'))
+    assert len(index) == 1
+    assert not index.conflicts('Merkez', 'Salon', '2025-03-10', '09:00-10:00')
+    assert index.conflicts('Diğer Merkez', 'Salon', '2025-03-10', '09:00-10:00')
+    index.remove(1)
+    assert len(index) == 0 and index.day_intervals('Diğer Merkez', 'Salon', '2025-03-10') == []
+
+
+def test_interval_index_centers_do_not_share_a_lock():
+    index = IntervalIndex()
+    index.rebuild([reservation(1, '09:00-10:00'), dict(reservation(2, '09:00-10:00'), center='Diğer Merkez')])
+    result = []
+    with index._centers['Merkez'].lock:
+        worker = threading.Thread(target=lambda: result.append(
+            index.conflicts('Diğer Merkez', 'Salon', '2025-03-10', '09:30-10:30')))
+        worker.start()
+        worker.join(timeout=2)
+        assert result == [True]
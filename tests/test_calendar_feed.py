@@ -0,0 +1,88 @@
+"""Merkez/salon takvim akışı: hazır VEVENT metinleri, ETag ve koşullu istekler"""
+from calendar_feed import CalendarFeeds, escape_text, fold_line
+
+
+def reservation(rid, status='onay', time='09:00-10:00', center='A', venue='Salon', **extra):
+    return dict({'id': rid, 'center': center, 'venue': venue, 'date': '2030-05-06', 'time': time,
+                 'status': status, 'name_surname': 'Prova', 'description': '',
+                 'created_at': '2030-05-01 12:00:00'}, **extra)
+
+
+def test_escape_and_fold():
+    assert escape_text('a;b,c\\d\ne') == 'a\\;b\\,c\\\\d\\ne'
+    line = 'DESCRIPTION:' + 'ğ' * 60
+    folded = fold_line(line)
+    parts = folded.split('\r\n ')
+    assert len(parts) > 1 and ''.join(parts) == line
+    assert all(len(part.encode('utf-8')) <= 75 for part in parts)
+
+
+def test_feed_contents_and_pending():
+    feeds = CalendarFeeds(tz_name='UTC')
+    feeds.sync([reservation(1), reservation(2, status='bekle', time='11:00-12:00'),
+                reservation(3, status='iptal'), reservation(4, venue='Sahne')])
+    assert feeds.feed('A', 'Salon').count == 1
+    assert feeds.feed('A', 'Salon', pending=True).count == 2
+    assert feeds.feed('A').count == 2
+    body = feeds.feed('A', 'Salon', pending=True).body.decode()
+    assert body.startswith('BEGIN:VCALENDAR\r\n') and body.endswith('END:VCALENDAR\r\n')
+    assert 'DTSTART:20300506T090000Z' in body and 'STATUS:TENTATIVE' in body
+    assert 'UID:reservation-1@' in body
+    assert body.index('reservation-1@') < body.index('reservation-2@')
+
+
+def test_same_data_gives_same_etag_in_every_worker():
+    rows = [reservation(1), reservation(2, time='11:00-12:00')]
+    first, second = CalendarFeeds(tz_name='UTC'), CalendarFeeds(tz_name='UTC')
+    first.sync(rows)
+    second.sync(list(reversed(rows)))
+    assert first.feed('A').etag == second.feed('A').etag
+
+
+def test_only_changed_reservations_are_rendered():
+    feeds = CalendarFeeds(tz_name='UTC')
+    rows = [reservation(1), reservation(2, time='11:00-12:00'), reservation(3, center='B')]
+    feeds.sync(rows)
+    assert feeds.renders == 3
+    cached = feeds.feed('A')
+    other = feeds.feed('B')
+    feeds.sync([dict(row) for row in rows])
+    assert feeds.renders == 3 and feeds.feed('A') is cached
+
+    feeds.upsert(reservation(2, time='13:00-14:00'))
+    assert feeds.renders == 4
+    changed = feeds.feed('A')
+    assert changed.etag != cached.etag
+    # Diğer merkezin akışı geçersiz kılınmaz
+    assert feeds.feed('B') is other
+
+    feeds.upsert(reservation(1, status='iptal'))
+    assert feeds.feed('A').count == 1 and len(feeds) == 2
+    feeds.remove(2)
+    assert feeds.feed('A').count == 0
+
+
+def test_calendar_endpoint_etag_and_304(app_module, client, booking_day):
+    center, venue = app_module.CENTERS[0], app_module.VENUES[0]
+    url = f'/calendar/{center}/{venue}.ics'
+    client.post('/', data={
+        'name_surname': 'Takvim', 'center': center, 'venue': venue,
+        'date': booking_day, 'start_time': '15:00', 'end_time': '16:00', 'description': '',
+    })
+    row = next(r for r in app_module.reservations if r['name_surname'] == 'Takvim' and r['date'] == booking_day)
+
+    response = client.get(url, query_string={'pending': 1})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/calendar'
+    assert f"reservation-{row['id']}@".encode() in response.data
+    etag = response.headers['ETag']
+    assert response.headers['Last-Modified']
+    assert client.get(url, query_string={'pending': 1}, headers={'If-None-Match': etag}).status_code == 304
+
+    client.post(f"/reservation/cancel/{row['id']}")
+    changed = client.get(url, query_string={'pending': 1}, headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert f"reservation-{row['id']}@".encode() not in changed.data
+
+    assert client.get('/calendar/Yok.ics').status_code == 404
+    assert app_module.app.test_client().get(url).status_code == 401
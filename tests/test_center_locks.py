@@ -0,0 +1,68 @@
+"""Merkez kilitleri: süreç içinde iç içe alınabilir, worker süreçleri arasında geçerlidir"""
+import multiprocessing
+import threading
+
+import pytest
+
+from reference_data import CenterLocks
+
+fork = multiprocessing.get_context('fork')
+
+
+def _take(path, center, done):
+    with CenterLocks(path)(center):
+        done.set()
+
+
+def _started(path, center):
+    done = fork.Event()
+    process = fork.Process(target=_take, args=(path, center, done))
+    process.start()
+    return process, done
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'center_locks')
+
+
+def test_center_lock_blocks_other_process_only_for_same_center(path):
+    locks = CenterLocks(path)
+    with locks('A Merkezi'):
+        same, same_done = _started(path, 'A Merkezi')
+        other, other_done = _started(path, 'B Merkezi')
+        assert other_done.wait(5)
+        assert not same_done.wait(0.3)
+    assert same_done.wait(5)
+    for process in (same, other):
+        process.join(5)
+        assert process.exitcode == 0
+
+
+def test_nested_center_lock_keeps_file_lock_until_outer_exit(path):
+    locks = CenterLocks(path)
+    with locks('A Merkezi'):
+        # Merkez değiştiren güncelleme: aynı thread A'yı tekrar alır
+        with locks('B Merkezi', 'A Merkezi'):
+            pass
+        process, done = _started(path, 'A Merkezi')
+        assert not done.wait(0.3)
+    assert done.wait(5)
+    process.join(5)
+
+
+def test_center_lock_serializes_threads_without_file():
+    locks, inside, overlaps = CenterLocks(), [], []
+
+    def write():
+        with locks('A Merkezi'):
+            inside.append(1)
+            overlaps.append(len(inside))
+            inside.pop()
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert overlaps == [1] * 8
@@ -0,0 +1,21 @@
+"""Gunicorn preload: master havuz açmaz, worker havuzu fork sonrası açılır"""
+
+
+def test_unpooled_connections_drop_pool_settings(app_module):
+    connections = app_module.UnpooledConnections(app_module.DB_CONFIG)
+    assert not any(key.startswith('pool_') for key in connections.config)
+    assert connections.config['database'] == app_module.DB_CONFIG['database']
+
+
+def test_release_and_reinit_after_fork(app_module):
+    before = app_module.connection_pool
+    app_module.release_connection_pool()
+    app_module.reinit_after_fork()
+    assert app_module.connection_pool is not before
+    conn = app_module.get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM reservations")
+        assert cursor.fetchone()[0] >= 0
+    finally:
+        conn.close()
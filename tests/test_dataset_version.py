@@ -0,0 +1,61 @@
+"""Merkez başına veri sürümü sayaçları (SQLite trigger'ları)"""
+import sqlite3
+
+import pytest
+
+import statements
+from dataset_version import get_dataset_version
+from sqlite_backend import SQLiteConnection, init_schema
+
+
+@pytest.fixture
+def conn():
+    raw = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES, isolation_level=None)
+    connection = SQLiteConnection(raw)
+    init_schema(connection)
+    yield connection
+    raw.close()
+
+
+def run(conn, sql, params=()):
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    return cursor.lastrowid
+
+
+def insert(conn, center):
+    return run(conn, "INSERT INTO reservations (name_surname, center, venue, date, time, status) "
+                     "VALUES ('Test', %s, 'Salon', '2026-03-10', '09:00-10:00', 'onay')", (center,))
+
+
+def versions(conn):
+    return get_dataset_version(conn, 'A'), get_dataset_version(conn, 'B'), get_dataset_version(conn)
+
+
+def test_writes_bump_only_their_center(conn):
+    assert versions(conn) == (0, 0, 0)
+    a = insert(conn, 'A')
+    assert versions(conn) == (1, 0, 1)
+    insert(conn, 'B')
+    before = versions(conn)
+    # SQLite'ta updated_at trigger'ı güncellemeyi tekrar tetikler; sayaç sadece artmalı
+    run(conn, "UPDATE reservations SET status = 'iptal' WHERE id = %s", (a,))
+    after = versions(conn)
+    assert after[0] > before[0] and after[1] == before[1] and after[2] > before[2]
+    run(conn, "DELETE FROM reservations WHERE id = %s", (a,))
+    assert versions(conn)[0] > after[0] and versions(conn)[1] == after[1]
+
+
+def test_moving_a_reservation_bumps_both_centers(conn):
+    a = insert(conn, 'A')
+    before = versions(conn)
+    run(conn, "UPDATE reservations SET center = 'B' WHERE id = %s", (a,))
+    after = versions(conn)
+    assert after[0] > before[0] and after[1] > before[1]
+
+
+def test_bump_advances_every_center(conn):
+    insert(conn, 'A')
+    insert(conn, 'B')
+    statements.execute(conn, 'dataset_version_bump')
+    assert versions(conn) == (2, 2, 4)
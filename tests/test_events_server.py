@@ -0,0 +1,27 @@
+"""Değişiklik akışı süreci (``LOAD_RESERVATIONS=False``) rezervasyonları belleğe yüklemez"""
+import os
+import subprocess
+import sys
+
+PROBE = ("import app; print(len(app.users), len(app.reservations), app.reservation_columns is None, "
+         "len(app.booking_index), app.slot_occupancy is None, app.refresh_reservations_from_db())")
+
+
+def run_app(**env):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=root, capture_output=True, text=True,
+                            env=dict(os.environ, **env), timeout=60, check=True)
+    return result.stdout.split()
+
+
+def test_events_process_skips_reservation_store(app_module, client, booking_day):
+    client.post('/', data={
+        'name_surname': 'Akış', 'center': app_module.CENTERS[0], 'venue': app_module.VENUES[0],
+        'date': booking_day, 'start_time': '15:00', 'end_time': '16:00', 'description': '',
+    })
+    users, loaded, no_columns, indexed, no_occupancy, refreshed = run_app(LOAD_RESERVATIONS='False', OCCUPANCY_PATH='')
+    assert int(users) > 0
+    assert (loaded, no_columns, indexed, no_occupancy, refreshed) == ('0', 'True', '0', 'True', 'False')
+
+    _, loaded, no_columns, indexed, _, _ = run_app(LOAD_RESERVATIONS='True', OCCUPANCY_PATH='')
+    assert int(loaded) > 0 and no_columns == 'False' and int(indexed) > 0
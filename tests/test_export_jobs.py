@@ -0,0 +1,90 @@
+"""Arka plan Excel export işleri: kuyruk, durum yoklama, indirme ve süresi dolan dosyalar"""
+import os
+import time
+
+import pytest
+
+import export_jobs
+
+ROWS = [{'id': i, 'name_surname': f'Kişi {i}', 'center': 'Merkez', 'venue': 'Salon', 'date': '2026-03-10',
+         'time': '09:00-10:00', 'description': '', 'status': 'onay', 'created_at': '2026-03-01 10:00:00',
+         'created_by': 'admin'} for i in range(1, 4)]
+FILTERS = {'center': 'all', 'status': 'all', 'month': 'all', 'year': 'all', 'venue': 'all'}
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_jobs, 'EXPORT_DIR', str(tmp_path))
+    return tmp_path
+
+
+def wait_for(job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = export_jobs.get_job(job_id)
+        if job['status'] != export_jobs.PENDING:
+            return job
+        time.sleep(0.05)
+    raise AssertionError('Export işi zamanında bitmedi')
+
+
+def test_job_runs_in_pool_and_reports_done():
+    completed = []
+    job_id = export_jobs.submit_export(ROWS, FILTERS, 'admin', 'liste.xlsx', on_complete=completed.append)
+    job = wait_for(job_id)
+    assert (job['status'], job['owner'], job['rows'], job['filename']) == (export_jobs.DONE, 'admin', 3, 'liste.xlsx')
+    path = export_jobs.job_file_path(job_id)
+    with open(path, 'rb') as f:
+        assert f.read(2) == b'PK'  # xlsx bir zip arşividir
+    deadline = time.time() + 5
+    while not completed and time.time() < deadline:
+        time.sleep(0.01)
+    assert completed == [path]
+
+
+def test_failed_job_reports_error(export_dir, monkeypatch):
+    def broken(reservations_data, filters):
+        raise ValueError('Workbook oluşturulamadı')
+
+    monkeypatch.setattr(export_jobs, 'create_excel_file', broken)
+    with pytest.raises(ValueError):
+        export_jobs.run_export_job(str(export_dir), 'a' * 22, ROWS, FILTERS)
+    (export_dir / f"{'a' * 22}.json").write_text('{"owner": "admin", "filename": "x.xlsx", "rows": 1}')
+    job = export_jobs.get_job('a' * 22)
+    assert job['status'] == export_jobs.ERROR and job['error'] == 'Workbook oluşturulamadı'
+    assert not os.path.exists(export_jobs.job_file_path('a' * 22) + '.tmp')
+
+
+def test_unknown_invalid_and_expired_jobs(export_dir, monkeypatch):
+    assert export_jobs.get_job('../../etc/passwd') is None
+    assert export_jobs.get_job('b' * 22) is None
+    meta = export_dir / f"{'c' * 22}.json"
+    meta.write_text('{"owner": "admin", "filename": "x.xlsx", "rows": 1}')
+    assert export_jobs.get_job('c' * 22)['status'] == export_jobs.PENDING
+    old = time.time() - export_jobs.EXPORT_TTL - 10
+    os.utime(meta, (old, old))
+    assert export_jobs.get_job('c' * 22) is None
+    assert not meta.exists()
+
+
+def test_large_export_goes_through_job_endpoints(app_module, client, booking_day, monkeypatch):
+    monkeypatch.setattr(app_module, 'EXPORT_SYNC_MAX_ROWS', 0)
+    monkeypatch.setattr(app_module, 'EXPORT_CACHE_ENABLED', False)
+    client.post('/', data={
+        'name_surname': 'Export', 'center': app_module.CENTERS[0], 'venue': app_module.VENUES[0],
+        'date': booking_day, 'start_time': '09:00', 'end_time': '10:00', 'description': '',
+    })
+    page = client.get('/export/excel', query_string={'year': booking_day[:4]}).get_data(as_text=True)
+    job_id = next(name[:-5] for name in os.listdir(export_jobs.EXPORT_DIR) if name.endswith('.json'))
+    assert job_id in page
+
+    wait_for(job_id)
+    status = client.get(f'/export/jobs/{job_id}').get_json()
+    assert status['status'] == 'done' and status['download_url'].endswith('/download')
+    download = client.get(status['download_url'])
+    assert download.status_code == 200 and download.data[:2] == b'PK'
+
+    # Başka kullanıcı işi göremez
+    other = app_module.app.test_client()
+    other.post('/login', data={'username': 'viewer1', 'password': 'viewer123'})
+    assert other.get(f'/export/jobs/{job_id}').status_code == 404
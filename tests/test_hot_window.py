@@ -0,0 +1,74 @@
+"""Bellek penceresi: pencere dışı aralıklar, liste filtrelerinin veritabanına düşmesi ve pencerenin kayması"""
+from datetime import date, timedelta
+
+import pytest
+
+import statements
+from hot_window import HotWindow
+
+WINDOW = HotWindow(date(2026, 1, 1), date(2027, 1, 1))
+
+
+@pytest.mark.parametrize('start, end, parts', [
+    (date(2026, 3, 1), date(2026, 4, 1), []),
+    (None, None, [(None, date(2026, 1, 1)), (date(2027, 1, 1), None)]),
+    (date(2025, 1, 1), date(2026, 1, 1), [(date(2025, 1, 1), date(2026, 1, 1))]),
+    (date(2025, 12, 1), date(2026, 2, 1), [(date(2025, 12, 1), date(2026, 1, 1))]),
+    (date(2026, 12, 1), date(2027, 2, 1), [(date(2027, 1, 1), date(2027, 2, 1))]),
+    (date(2025, 12, 1), date(2027, 2, 1), [(date(2025, 12, 1), date(2026, 1, 1)),
+                                           (date(2027, 1, 1), date(2027, 2, 1))]),
+])
+def test_outside_parts(start, end, parts):
+    assert WINDOW.outside(start, end) == parts
+
+
+def test_window_bounds():
+    window = HotWindow.for_day(date(2026, 3, 10), days_back=10, days_ahead=5)
+    assert window.contains('2026-02-28') and window.contains(date(2026, 3, 15))
+    assert not window.contains(date(2026, 2, 27)) and not window.contains(date(2026, 3, 16))
+    assert not window.contains('geçersiz')
+
+
+def insert(app_module, name, day):
+    conn = app_module.get_db_connection()
+    result = statements.execute(conn, 'reservation_insert', (name, app_module.CENTERS[2], app_module.VENUES[1],
+                                                             day, '09:00-10:00', '', 'onay', 'admin'))
+    conn.commit()
+    conn.close()
+    return result.lastrowid
+
+
+def listed(app_module, day):
+    rows = app_module.get_filtered_reservations(app_module.CENTERS[2], 'all', day.strftime('%Y-%m'), 'all', 'all')
+    return {r['id'] for r in rows}
+
+
+def test_filters_fall_through_to_database_outside_window(app_module):
+    old_day = app_module.hot_window.start - timedelta(days=400)
+    old_id = insert(app_module, 'Pencere Öncesi', old_day)
+    app_module.refresh_reservations_from_db()
+    assert not app_module.is_reservation_in_memory(old_id)
+    assert old_id in listed(app_module, old_day)
+
+
+def test_window_slides_and_swaps_records(app_module, monkeypatch):
+    today = date.today()
+    leaving_day = app_module.hot_window.start + timedelta(days=5)
+    entering_day = app_module.hot_window.end + timedelta(days=5)
+    leaving, entering = insert(app_module, 'Çıkan', leaving_day), insert(app_module, 'Giren', entering_day)
+    app_module.refresh_reservations_from_db()
+    assert app_module.is_reservation_in_memory(leaving) and not app_module.is_reservation_in_memory(entering)
+
+    later = HotWindow.for_day(today + timedelta(days=10))
+    monkeypatch.setattr(app_module, 'current_window', lambda: later)
+    try:
+        assert app_module.slide_hot_window()
+        assert app_module.hot_window == later
+        assert not app_module.is_reservation_in_memory(leaving)
+        assert app_module.is_reservation_in_memory(entering)
+        # Pencereden çıkan kayıt listede veritabanından gelmeye devam eder
+        assert leaving in listed(app_module, leaving_day)
+    finally:
+        monkeypatch.undo()
+        app_module.slide_hot_window()
+    assert app_module.is_reservation_in_memory(leaving)
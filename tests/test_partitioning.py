@@ -0,0 +1,30 @@
+from datetime import date
+
+import pytest
+
+import partitioning
+from partitioning import ArchiveError, archive_year, earliest_archivable_day
+
+
+class UnusedConnection:
+    def cursor(self):
+        raise AssertionError("pencere kontrolü bağlantıya dokunmadan yapılmalı")
+
+
+def test_refuses_year_inside_hot_window():
+    # 2025'in son günleri 1 Şubat 2026'da hâlâ 90 günlük pencerede
+    with pytest.raises(ArchiveError):
+        archive_year(UnusedConnection(), 2025, today=date(2026, 2, 1), keep_days=90)
+
+
+def test_refuses_current_and_future_years():
+    with pytest.raises(ArchiveError):
+        archive_year(UnusedConnection(), 2026, today=date(2026, 12, 31), keep_days=0)
+    with pytest.raises(ArchiveError):
+        archive_year(UnusedConnection(), 2027, today=date(2026, 6, 1), keep_days=0)
+
+
+def test_earliest_archivable_day_follows_window():
+    assert earliest_archivable_day(2025, keep_days=90) == date(2026, 4, 1)
+    assert earliest_archivable_day(2025, keep_days=0) == date(2026, 1, 1)
+    assert partitioning.HOT_WINDOW_DAYS_BACK >= 0
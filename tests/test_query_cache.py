@@ -0,0 +1,146 @@
+"""Sorgu sonucu önbelleği: TTL, LRU, single-flight ve geçersiz kılma"""
+import threading
+import time
+
+import pytest
+from flask import Flask, session
+
+from query_cache import QueryCache, remember_session_write, session_wrote_recently
+
+
+class Loader:
+    def __init__(self, value='sonuç'):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_hits_until_ttl_expires():
+    cache, loader = QueryCache(ttl=0.05, max_entries=8), Loader()
+    assert cache.get_or_load('k', loader) == 'sonuç'
+    assert cache.get_or_load('k', loader) == 'sonuç'
+    assert loader.calls == 1 and cache.stats['hits'] == 1
+    time.sleep(0.06)
+    cache.get_or_load('k', loader)
+    assert loader.calls == 2
+
+
+def test_least_recently_used_key_is_evicted():
+    cache = QueryCache(ttl=60, max_entries=2)
+    loaders = {key: Loader(key) for key in 'abc'}
+    cache.get_or_load('a', loaders['a'])
+    cache.get_or_load('b', loaders['b'])
+    cache.get_or_load('a', loaders['a'])
+    cache.get_or_load('c', loaders['c'])
+    cache.get_or_load('a', loaders['a'])
+    cache.get_or_load('b', loaders['b'])
+    assert loaders['a'].calls == 1 and loaders['b'].calls == 2
+
+
+def test_bypass_and_disabled_cache_always_load():
+    loader = Loader()
+    QueryCache(ttl=60).get_or_load('k', loader, bypass=True)
+    disabled = QueryCache(ttl=0)
+    disabled.get_or_load('k', loader)
+    disabled.get_or_load('k', loader)
+    assert loader.calls == 3
+
+
+def run_concurrently(cache, key, loader, count):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(cache.get_or_load(key, loader))
+        except Exception as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def wait_for_waiters(cache, count):
+    deadline = time.monotonic() + 2
+    while cache.stats['coalesced'] < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_concurrent_misses_run_the_query_once():
+    cache, release, calls = QueryCache(ttl=60), threading.Event(), []
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return ['satır']
+
+    threads, results, errors = run_concurrently(cache, 'k', slow, 8)
+    wait_for_waiters(cache, 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and errors == []
+    assert len(results) == 8 and all(result is results[0] for result in results)
+    assert cache.stats['misses'] == 1 and cache.stats['coalesced'] == 7
+
+
+def test_errors_reach_waiters_and_are_not_cached():
+    cache, release = QueryCache(ttl=60), threading.Event()
+
+    def failing():
+        release.wait(2)
+        raise RuntimeError('veritabanı yok')
+
+    threads, results, errors = run_concurrently(cache, 'k', failing, 4)
+    wait_for_waiters(cache, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == [] and len(errors) == 4
+    assert all(isinstance(err, RuntimeError) for err in errors)
+    assert cache.get_or_load('k', Loader('yeni')) == 'yeni'
+
+
+def test_result_of_query_started_before_invalidate_is_not_cached():
+    cache, started, release = QueryCache(ttl=60), threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(2)
+        return 'eski'
+
+    threads, results, _ = run_concurrently(cache, 'k', slow, 1)
+    started.wait(2)
+    cache.invalidate()
+    # Geçersiz kılmadan sonra gelen istek eski sorguya katılmaz
+    assert cache.get_or_load('k', Loader('yeni')) == 'yeni'
+    release.set()
+    threads[0].join()
+    assert results == ['eski']
+    assert cache.get_or_load('k', Loader('başka')) == 'yeni'
+
+
+def test_session_write_marker_expires():
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    with app.test_request_context():
+        assert not session_wrote_recently()
+        remember_session_write(ttl=60)
+        assert session_wrote_recently()
+        session['_query_cache_bypass_until'] = time.time() - 1
+        assert not session_wrote_recently()
+        assert '_query_cache_bypass_until' not in session
+    assert not session_wrote_recently()
+
+
+@pytest.mark.parametrize('ttl', [0, -1])
+def test_session_marker_not_set_without_ttl(ttl):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    with app.test_request_context():
+        remember_session_write(ttl=ttl)
+        assert not session_wrote_recently()
@@ -0,0 +1,37 @@
+import query_profiler
+from query_profiler import normalize_sql
+
+
+def test_normalize_sql_groups_literals_and_placeholders():
+    first = normalize_sql("SELECT * FROM reservations WHERE id = 5 AND center = 'Sefaköy'  -- not")
+    second = normalize_sql("SELECT *\n FROM reservations WHERE id = %s AND center = %s")
+    assert first == second == 'SELECT * FROM reservations WHERE id = ? AND center = ?'
+
+
+def test_normalize_sql_collapses_in_lists():
+    assert normalize_sql("SELECT 1 FROM t WHERE id IN (%s, %s, %s)") == 'SELECT ? FROM t WHERE id IN (...)'
+    assert normalize_sql(b"SELECT 1 FROM t WHERE id IN (1,2)") == 'SELECT ? FROM t WHERE id IN (...)'
+
+
+def test_record_query_accumulates_per_statement():
+    query_profiler.reset_query_stats()
+    query_profiler.record_query('SELECT ?', 1, 2.0, 3)
+    query_profiler.record_query('SELECT ?', 1, 5.0, 1)
+    query_profiler.record_query('DELETE FROM t', 0, 1.0, -1)
+    stats = query_profiler.get_query_stats()
+    assert [s['sql'] for s in stats] == ['SELECT ?', 'DELETE FROM t']
+    assert stats[0]['count'] == 2 and stats[0]['total_ms'] == 7.0 and stats[0]['max_ms'] == 5.0
+    assert stats[0]['rows'] == 4 and stats[1]['rows'] == 0
+    query_profiler.reset_query_stats()
+
+
+def test_profile_request_returns_report_for_admin(client):
+    response = client.get('/reservations?_profile=1')
+    assert response.status_code == 200
+    assert response.headers['X-Profiled-Status'] == '200'
+    assert b'SQL:' in response.data
+
+
+def test_profile_request_ignored_for_anonymous(app_module):
+    response = app_module.app.test_client().get('/?_profile=1')
+    assert 'X-Profiled-Status' not in response.headers
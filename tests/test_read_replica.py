@@ -0,0 +1,132 @@
+"""Okuma kopyası yönlendirmesi ve kendi yazmasını okuma tutarlılığı"""
+import sqlite3
+import time
+
+import pytest
+from flask import Flask, session
+
+import read_replica
+from read_replica import SESSION_KEY, ReadRouter, remember_write, replica_config
+
+
+class Connection:
+    def __init__(self, name, pool=None):
+        self.name = name
+        self.pool = pool
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ReplicaPool:
+    """GTID kümesinin bir kısmını uygulamış kopya"""
+
+    def __init__(self, applied=(), fail=False):
+        self.applied = set(applied)
+        self.fail = fail
+        self.opened = []
+
+    def get_connection(self):
+        if self.fail:
+            raise sqlite3.OperationalError('kopyaya ulaşılamıyor')
+        conn = Connection('replica', self)
+        self.opened.append(conn)
+        return conn
+
+
+@pytest.fixture(autouse=True)
+def gtid_queries(monkeypatch):
+    """GTID sorguları MySQL'e özgü; kopya havuzunun uyguladığı kümeye göre yanıtla"""
+    def fetch_one(conn, name, params=()):
+        if name == 'gtid_subset':
+            return (int(params[0] in conn.pool.applied),)
+        if name == 'gtid_executed':
+            return ('uuid:1-5',)
+        raise AssertionError(name)
+    monkeypatch.setattr(read_replica.statements, 'fetch_one', fetch_one)
+
+
+def make_router(**kwargs):
+    return ReadRouter(ReplicaPool(**kwargs), pin_seconds=5)
+
+
+def primary():
+    return Connection('primary')
+
+
+def test_reads_without_marker_go_to_replica():
+    router = make_router()
+    assert router.connection(primary).name == 'replica'
+    assert router.stats == {'replica': 1, 'primary': 0, 'replica_errors': 0}
+
+
+def test_time_marker_pins_reads_to_primary_until_it_expires():
+    router = make_router()
+    assert router.connection(primary, {'at': time.time()}).name == 'primary'
+    assert router.connection(primary, {'at': time.time() - 10}).name == 'replica'
+
+
+def test_gtid_marker_waits_for_replica_to_catch_up():
+    router = make_router(applied={'uuid:1-4'})
+    assert router.connection(primary, {'gtid': 'uuid:1-5'}).name == 'primary'
+    # Kopyadan alınan ama kullanılmayan bağlantı havuza geri verilir
+    assert router.replica_pool.opened[-1].closed
+    router.replica_pool.applied.add('uuid:1-5')
+    assert router.connection(primary, {'gtid': 'uuid:1-5'}).name == 'replica'
+
+
+def test_replica_errors_fall_back_to_primary():
+    router = make_router(fail=True)
+    assert router.connection(primary).name == 'primary'
+    assert router.stats['replica_errors'] == 1
+
+
+def test_session_marker_is_cleared_once_replica_caught_up():
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    router = make_router()
+    with app.test_request_context():
+        remember_write(Connection('primary'), True)
+        assert session[SESSION_KEY] == {'gtid': 'uuid:1-5'}
+        assert router.connection(primary).name == 'primary'
+        assert SESSION_KEY in session
+        router.replica_pool.applied.add('uuid:1-5')
+        assert router.connection(primary).name == 'replica'
+        assert SESSION_KEY not in session
+        # Sonraki okumalar kontrol yapmadan kopyaya gider
+        assert router.connection(primary).name == 'replica'
+
+
+def test_expired_time_marker_is_removed_from_session():
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    router = make_router()
+    with app.test_request_context():
+        session[SESSION_KEY] = {'at': time.time() - 60}
+        assert router.connection(primary).name == 'replica'
+        assert SESSION_KEY not in session
+
+
+def test_replica_config_inherits_primary_settings(monkeypatch):
+    primary_config = {'host': 'db', 'port': 3306, 'user': 'app', 'password': 'secret', 'database': 'rez',
+                      'pool_name': 'rez_pool', 'pool_size': 5}
+    monkeypatch.delenv('DB_REPLICA_HOST', raising=False)
+    assert replica_config(primary_config) is None
+    monkeypatch.setenv('DB_REPLICA_HOST', 'replica')
+    monkeypatch.setenv('DB_REPLICA_POOL_SIZE', '8')
+    config = replica_config(primary_config)
+    assert config['host'] == 'replica' and config['database'] == 'rez' and config['user'] == 'app'
+    assert config['pool_name'] == 'rez_pool_replica' and config['pool_size'] == 8
+    assert primary_config['host'] == 'db'
+
+
+def test_write_without_replica_sets_no_marker(monkeypatch):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    queries = []
+    monkeypatch.setattr(read_replica.statements, 'fetch_one', lambda conn, name: queries.append(name))
+    with app.test_request_context():
+        remember_write(Connection('primary'), False)
+        assert SESSION_KEY not in session
+    assert queries == []
@@ -0,0 +1,88 @@
+"""Sütunlu filtre motoru ve eşzamanlı yeniden kurulum"""
+import threading
+from datetime import date
+
+import pytest
+
+from reservation_record import Reservation
+
+np = pytest.importorskip('numpy')
+from reservation_columns import INITIAL_CAPACITY, ReservationColumns  # noqa: E402
+
+
+def reservation(rid, center='A', status='onay', day=date(2026, 3, 10), venue='Salon', time='09:00-10:00'):
+    return Reservation(id=rid, name_surname=f'Kişi {rid}', center=center, venue=venue, date=day, time=time,
+                       description='', status=status, created_at=None, updated_at=None, created_by=None)
+
+
+@pytest.fixture
+def columns():
+    columns = ReservationColumns(('A', 'B'), ('Salon',), ('onay', 'bekle', 'iptal'), ('09:00-10:00',))
+    columns.rebuild([
+        reservation(1),
+        reservation(2, center='B', status='bekle'),
+        reservation(3, status='iptal', day=date(2026, 4, 1)),
+        reservation(4, day=date(2025, 12, 31)),
+    ])
+    return columns
+
+
+def ids(records):
+    return [r['id'] for r in records]
+
+
+def test_filters_keep_list_order(columns):
+    assert ids(columns.select()) == [1, 2, 3, 4]
+    assert ids(columns.select(center='A')) == [1, 3, 4]
+    assert ids(columns.select(center='A', year=2026, month=3)) == [1]
+    assert ids(columns.select(year=2025)) == [4]
+    assert ids(columns.select(date=date(2026, 4, 1))) == [3]
+    assert columns.select(center='Yok') == []
+    assert columns.count(status='all') == 4
+    assert columns.count_by('status', center='A') == {'onay': 2, 'iptal': 1}
+    assert columns.months() == [(2025, 12), (2026, 3), (2026, 4)]
+    assert columns.years() == [2025, 2026]
+
+
+def test_upsert_remove_and_growth(columns):
+    columns.upsert(reservation(2, center='A', status='onay'))
+    assert columns.count_by('center') == {'A': 4}
+    columns.remove(1)
+    assert columns.get(1) is None and len(columns) == 3
+    for rid in range(10, 10 + INITIAL_CAPACITY + 5):
+        columns.upsert(reservation(rid, center='C'))
+    assert columns.count(center='C') == INITIAL_CAPACITY + 5
+    assert ids(columns.select(center='A')) == [2, 3, 4]
+    assert columns.get(10 + INITIAL_CAPACITY)['center'] == 'C'
+
+
+def test_readers_never_mix_arrays_from_different_rebuilds():
+    # Her liste tek merkezli: okuyucunun gördüğü kayıtlar tek merkezden olmalı
+    small = [reservation(rid, center='A') for rid in range(10)]
+    large = [reservation(rid, center='B') for rid in range(100, 100 + 3 * INITIAL_CAPACITY)]
+    columns = ReservationColumns(('A', 'B'))
+    columns.rebuild(small)
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                for name in ('A', 'B'):
+                    selected = columns.select(center=name)
+                    if selected and {r['center'] for r in selected} != {name}:
+                        errors.append(name)
+                    if len(selected) not in (0, len(small), len(large)):
+                        errors.append(len(selected))
+            except Exception as err:  # IndexError: yeni diziler eski kayıt listesiyle
+                errors.append(err)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for thread in readers:
+        thread.start()
+    for i in range(100):
+        columns.rebuild(large if i % 2 == 0 else small)
+    stop.set()
+    for thread in readers:
+        thread.join()
+    assert errors == []
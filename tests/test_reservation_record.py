@@ -0,0 +1,47 @@
+"""Kompakt rezervasyon kaydı: dict uyumu, intern ve paylaşılan tarihler"""
+from datetime import date, datetime
+
+from reservation_record import DATE_CACHE_SIZE, Reservation, _shared_date
+
+
+def make(**overrides):
+    data = dict(id=1, name_surname='Ayşe', center='Merkez', venue=None, date='2026-03-10', time='09:00-10:00',
+                description='', status='onay', created_at='2026-01-02 08:05:09.250000', updated_at=None,
+                created_by='admin')
+    data.update(overrides)
+    return Reservation(**data)
+
+
+def test_dict_interface_formats_values():
+    r = make()
+    assert r['venue'] == 'Tiyatro Salonu'
+    assert r['date'] == '2026-03-10' and r.date_value == date(2026, 3, 10)
+    assert r['created_at'] == '2026-01-02 08:05:09'
+    assert r.get('missing', 'x') == 'x' and 'status' in r
+    r.update(status='iptal', date=date(2026, 4, 1))
+    assert r['status'] == 'iptal' and r['date'] == '2026-04-01'
+    assert Reservation.from_dict(r.to_dict()).to_dict() == r.to_dict()
+
+
+def test_invalid_date_is_kept_as_text():
+    r = make(date='2026-13-40')
+    assert r['date'] == '2026-13-40' and r.date_value is None
+
+
+def test_repeated_values_are_interned_but_description_is_not():
+    first = make(center=''.join(['Mer', 'kez']), description=''.join(['Uzun ', 'açıklama']))
+    second = make(center=''.join(['Merk', 'ez']), description=''.join(['Uzun a', 'çıklama']))
+    assert first.center is second.center
+    assert first.description == second.description
+    assert first.description is not second.description
+    second['description'] = ''.join(['Uzun ', 'açıklama'])
+    assert second.description is not first.description
+
+
+def test_same_day_shares_one_date_and_cache_is_bounded():
+    assert make(date='2026-05-05').date_value is make(date='2026-05-05').date_value
+    assert make(date=datetime(2026, 5, 5, 10)).date_value == date(2026, 5, 5)
+    assert _shared_date.cache_info().maxsize == DATE_CACHE_SIZE
+    for day in range(DATE_CACHE_SIZE + 100):
+        make(date=date.fromordinal(700000 + day))
+    assert _shared_date.cache_info().currsize <= DATE_CACHE_SIZE
@@ -0,0 +1,83 @@
+"""Snapshot kodlama/çözme ve dosya okuma/yazma"""
+import struct
+from datetime import date, datetime
+
+import pytest
+
+from reservation_record import Reservation
+from reservation_snapshot import (HEADER, SnapshotError, decode_snapshot, encode_snapshot, read_snapshot,
+                                  write_snapshot)
+
+WATERMARK = datetime(2026, 5, 1, 12, 30, 15, 123456)
+
+
+def sample():
+    return [
+        Reservation(id=1, name_surname='Ayşe Yılmaz', center='Cennet Kültür Merkezi', venue='Tiyatro Salonu',
+                    date=date(2026, 3, 10), time='09:00-12:00', description='Prova; ışık, ses\nikinci satır',
+                    status='onay', created_at=datetime(2026, 1, 2, 8, 5, 9), updated_at=None, created_by='admin'),
+        Reservation(id=2, name_surname='Ayşe Yılmaz', center='Cennet Kültür Merkezi', venue='Seminer Salonu',
+                    date=date(2026, 3, 11), time='09:15-10:15', description='', status='bekle',
+                    created_at=datetime(2026, 1, 3), updated_at=datetime(2026, 1, 4, 10, 0, 1),
+                    created_by=None),
+        Reservation(id=3, name_surname='Ömer Çağ', center='Sefaköy Kültür Merkezi', venue=None,
+                    date=date(2026, 12, 31), time='16:00-17:00', description=None, status='iptal',
+                    created_at=None, updated_at=None, created_by='planlama'),
+    ]
+
+
+def as_dicts(reservations):
+    return [dict(r) for r in reservations]
+
+
+def test_round_trip_preserves_records_and_watermark():
+    decoded, watermark = decode_snapshot(encode_snapshot(sample(), WATERMARK))
+    assert watermark == WATERMARK
+    expected = as_dicts(sample())
+    # Salonu olmayan eski kayıtlar varsayılan salonla yazılır, boş açıklama '' olur
+    expected[2]['venue'] = 'Tiyatro Salonu'
+    expected[2]['description'] = ''
+    assert as_dicts(decoded) == expected
+    assert decoded[0].date_value == date(2026, 3, 10)
+
+
+def test_round_trip_of_empty_list():
+    decoded, watermark = decode_snapshot(encode_snapshot([], WATERMARK))
+    assert decoded == [] and watermark == WATERMARK
+
+
+def test_plain_dict_records_are_accepted():
+    record = {'id': 7, 'name_surname': 'Ali', 'center': 'Merkez', 'venue': 'Salon', 'date': '2026-02-01',
+              'time': '10:00-11:00', 'description': 'x', 'status': 'onay',
+              'created_at': '2026-01-01 09:00:00', 'updated_at': None, 'created_by': 'admin'}
+    decoded, _ = decode_snapshot(encode_snapshot([record], WATERMARK))
+    assert decoded[0]['id'] == 7 and decoded[0].date_value == date(2026, 2, 1)
+    assert decoded[0].created_at_value == datetime(2026, 1, 1, 9)
+
+
+def test_corrupted_or_foreign_data_is_rejected():
+    data = bytearray(encode_snapshot(sample(), WATERMARK))
+    data[-1] ^= 0xFF
+    with pytest.raises(SnapshotError):
+        decode_snapshot(bytes(data))
+    with pytest.raises(SnapshotError):
+        decode_snapshot(b'XXXX' + bytes(data[4:]))
+    with pytest.raises(SnapshotError):
+        decode_snapshot(bytes(data[:HEADER.size - 1]))
+    newer = bytearray(encode_snapshot(sample(), WATERMARK))
+    struct.pack_into('<H', newer, 4, 99)
+    with pytest.raises(SnapshotError):
+        decode_snapshot(bytes(newer))
+
+
+def test_write_and_read_file(tmp_path):
+    path = str(tmp_path / 'snap' / 'reservations.snap')
+    assert read_snapshot(path) is None
+    assert write_snapshot(path, sample(), WATERMARK)
+    decoded, watermark = read_snapshot(path)
+    assert watermark == WATERMARK and [r['id'] for r in decoded] == [1, 2, 3]
+
+    with open(path, 'r+b') as f:
+        f.seek(HEADER.size)
+        f.write(b'\xff')
+    assert read_snapshot(path) is None
@@ -0,0 +1,140 @@
+"""Durum değişikliği ve iptal -> yeni kayıt -> yeniden etkinleştirme sırası"""
+
+
+def book(app_module, client, day, time, name):
+    start, end = time.split('-')
+    response = client.post('/', data={
+        'name_surname': name, 'center': app_module.CENTERS[0], 'venue': app_module.VENUES[0],
+        'date': day, 'start_time': start, 'end_time': end, 'description': '',
+    })
+    matches = [r for r in app_module.reservations if r['name_surname'] == name and r['date'] == day]
+    return response, (matches[0] if matches else None)
+
+
+def active_at(app_module, day, time):
+    return sorted(r['name_surname'] for r in app_module.reservations
+                  if r['date'] == day and r['time'] == time and r['status'] in ('onay', 'bekle'))
+
+
+def test_reactivating_cancelled_booking_does_not_double_book(app_module, client, booking_day):
+    _, a = book(app_module, client, booking_day, '10:00-11:00', 'A')
+    assert client.post(f"/reservation/cancel/{a['id']}").status_code == 302
+    _, b = book(app_module, client, booking_day, '10:00-11:00', 'B')
+    assert b is not None
+
+    client.post(f"/reservation/approve/{a['id']}")
+    assert app_module.find_reservation(a['id'])['status'] == 'iptal'
+
+    client.post(f"/reservation/cancel/{a['id']}")
+    _, c = book(app_module, client, booking_day, '10:00-11:00', 'C')
+    assert c is None
+    assert active_at(app_module, booking_day, '10:00-11:00') == ['B']
+    slot = (app_module.CENTERS[0], app_module.VENUES[0], booking_day, '10:00-11:00')
+    assert app_module.slot_occupancy.owners(*slot) == {b['id']}
+
+
+def test_status_api_returns_updated_row(app_module, client, booking_day):
+    _, a = book(app_module, client, booking_day, '09:00-10:00', 'Satır')
+    response = client.post(f"/api/reservations/{a['id']}/status", data={'status': 'onay'})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['status'] == 'onay' and f"reservation-{a['id']}" in data['row']
+    assert client.post(f"/api/reservations/{a['id']}/status", data={'status': 'x'}).status_code == 400
+    assert client.post('/api/reservations/999999/status', data={'status': 'onay'}).status_code == 404
+
+
+def test_status_api_rejects_reactivation_into_taken_slot(app_module, client, booking_day):
+    _, a = book(app_module, client, booking_day, '13:00-15:00', 'A')
+    client.post(f"/api/reservations/{a['id']}/status", data={'status': 'iptal'})
+    _, b = book(app_module, client, booking_day, '14:00-15:00', 'B')
+    assert b is not None
+
+    response = client.post(f"/api/reservations/{a['id']}/status", data={'status': 'onay'})
+    assert response.status_code == 409
+    assert 'başka bir rezervasyon' in response.get_json()['error']
+    assert app_module.find_reservation(a['id'])['status'] == 'iptal'
+    assert app_module.slot_occupancy.owners(app_module.CENTERS[0], app_module.VENUES[0],
+                                            booking_day, '13:00-15:00') == {b['id']}
+
+    # Aralık boşalınca yeniden etkinleştirme yapılabilir
+    client.post(f"/api/reservations/{b['id']}/delete")
+    response = client.post(f"/api/reservations/{a['id']}/status", data={'status': 'bekle'})
+    assert response.status_code == 200
+    assert app_module.find_reservation(a['id'])['status'] == 'bekle'
+
+
+def test_get_route_flashes_conflict(app_module, client, booking_day):
+    _, a = book(app_module, client, booking_day, '16:00-17:00', 'A')
+    client.post(f"/reservation/cancel/{a['id']}")
+    book(app_module, client, booking_day, '16:00-17:00', 'B')
+    response = client.post(f"/reservation/pending/{a['id']}", follow_redirects=True)
+    assert 'etkinleştirilemedi' in response.get_data(as_text=True)
+    assert app_module.find_reservation(a['id'])['status'] == 'iptal'
+
+
+def test_reactivation_checked_without_occupancy_table(app_module, client, booking_day, monkeypatch):
+    monkeypatch.setattr(app_module, 'slot_occupancy', None)
+    _, a = book(app_module, client, booking_day, '18:00-19:00', 'A')
+    client.post(f"/api/reservations/{a['id']}/status", data={'status': 'iptal'})
+    _, b = book(app_module, client, booking_day, '18:30-19:30', 'B')
+    assert b is not None
+    response = client.post(f"/api/reservations/{a['id']}/status", data={'status': 'onay'})
+    assert response.status_code == 409
+    assert active_at(app_module, booking_day, '18:00-19:00') == []
+
+
+def test_concurrent_bookings_without_occupancy_table_do_not_double_book(app_module, booking_day, monkeypatch):
+    import threading
+    import time as time_module
+
+    # Doluluk tablosu kapalı (ör. gunicorn_events) veya gün tablonun dışında: sadece çakışma kontrolü korur
+    monkeypatch.setattr(app_module, 'slot_occupancy', None)
+    original = app_module.check_reservation_conflict
+
+    def slow_check(*args, **kwargs):
+        result = original(*args, **kwargs)
+        time_module.sleep(0.05)  # kontrol ile kayıt arasındaki pencereyi genişlet
+        return result
+
+    monkeypatch.setattr(app_module, 'check_reservation_conflict', slow_check)
+
+    def post(name):
+        client = app_module.app.test_client()
+        client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+        book(app_module, client, booking_day, '16:00-17:00', name)
+
+    threads = [threading.Thread(target=post, args=(f'Yarış {i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(active_at(app_module, booking_day, '16:00-17:00')) == 1
+
+
+def test_booking_without_replica_leaves_no_write_marker(app_module, client, booking_day):
+    assert app_module.read_router is None
+    _, a = book(app_module, client, booking_day, '12:00-13:00', 'İşaretsiz')
+    assert a is not None
+    with client.session_transaction() as session:
+        assert '_write_marker' not in session
+
+
+WRITE_ENDPOINTS = ('approve_reservation', 'pending_reservation', 'cancel_reservation', 'delete_reservation',
+                   'reservation_status_api', 'reservation_delete_api')
+
+
+def test_state_changing_routes_are_post_only_and_admission_controlled(app_module, client, booking_day):
+    for endpoint in WRITE_ENDPOINTS:
+        rules = [r for r in app_module.app.url_map.iter_rules() if r.endpoint == endpoint]
+        assert rules and all('GET' not in r.methods for r in rules), endpoint
+        assert app_module.ADMISSION_ROUTES[('POST', endpoint)] == 'booking'
+
+    _, a = book(app_module, client, booking_day, '13:00-14:00', 'GET')
+    # Bağlantı önizlemesi veya tarayıcı ön yüklemesi durumu değiştirmemeli
+    assert client.get(f"/reservation/cancel/{a['id']}").status_code == 405
+    assert client.get(f"/reservation/delete/{a['id']}").status_code == 405
+    assert app_module.find_reservation(a['id'])['status'] == 'bekle'
+
+    page = client.get('/reservations').get_data(as_text=True)
+    assert f'formaction="/reservation/cancel/{a["id"]}"' in page
+    assert f'href="/reservation/cancel/{a["id"]}"' not in page
@@ -0,0 +1,41 @@
+"""Arama: bellek penceresi dışındaki yıllar veritabanından (arşiv dahil) okunur"""
+from datetime import date
+
+import statements
+
+
+def insert_outside_window(app_module, name, year):
+    conn = app_module.get_db_connection()
+    center, venue = app_module.CENTERS[0], app_module.VENUES[0]
+    result = statements.execute(conn, 'reservation_insert',
+                                (name, center, venue, date(year, 3, 10), '09:00-10:00', 'Eski kayıt', 'onay', 'admin'))
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO reservations_archive (id, name_surname, center, venue, date, time, description, status, "
+        "created_at, created_by) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+        (result.lastrowid + 100000, name, center, venue, date(year, 5, 1), '10:00-11:00', 'Arşiv', 'onay',
+         '2000-01-01 00:00:00', 'admin'))
+    cursor.close()
+    conn.commit()
+    conn.close()
+
+
+def test_search_reads_years_outside_the_window(app_module, client):
+    year = date.today().year - 6
+    assert not app_module.hot_window.contains(date(year, 3, 10))
+    insert_outside_window(app_module, 'Zeynep Geçmişyıl', year)
+
+    data = client.get('/api/search', query_string={'q': 'zeynep gecmisyil', 'year': year}).get_json()
+    assert data['total'] == 2 and data['window'] is None
+    assert {r['date'] for r in data['results']} == {f'{year}-03-10', f'{year}-05-01'}
+    assert not any(app_module.is_reservation_in_memory(r['id']) for r in data['results'])  # belleğe alınmaz
+
+
+def test_search_without_date_filter_reports_the_window(app_module, client):
+    insert_outside_window(app_module, 'Kemal Pencereötesi', date.today().year - 7)
+    data = client.get('/api/search', query_string={'q': 'kemal pencereotesi', 'year': 'all'}).get_json()
+    assert data['total'] == 0
+    assert data['window'] == [app_module.hot_window.start.isoformat(), data['window'][1]]
+
+    page = client.get('/reservations', query_string={'q': 'kemal pencereotesi', 'year': 'all'})
+    assert 'daha eski kayıtlar için yıl seçin' in page.get_data(as_text=True)
@@ -0,0 +1,83 @@
+"""Dolu dilim için en yakın boş dilim önerileri"""
+from datetime import date
+
+from booking_intervals import BookingHours, parse_time_range
+from slot_alternatives import candidate_days, candidate_places, format_alternative, rank_alternatives
+
+HOURS = BookingHours(['09:00-10:00', '10:00-11:00', '11:00-12:00', '13:00-14:00'])
+DAY = date(2030, 5, 6)
+
+
+def rank(occupied, places=(('A', 'Salon'),), days=(DAY,), time='10:00-11:00', limit=5):
+    return rank_alternatives('A', 'Salon', DAY, time, HOURS, list(places), list(days), occupied, limit)
+
+
+def test_candidate_days_skip_past():
+    today = date(2030, 5, 8)
+    assert candidate_days(DAY, 3, today=today) == [date(2030, 5, 8), date(2030, 5, 9)]
+
+
+def test_candidate_places_other_centers_optional():
+    assert candidate_places('A', 'X', ['A', 'B'], ['X', 'Y'], False) == [('A', 'X'), ('A', 'Y')]
+    assert candidate_places('A', 'X', ['A', 'B'], ['X', 'Y'], True)[2:] == [('B', 'X'), ('B', 'Y')]
+
+
+def test_nearest_free_slot_on_same_day_first():
+    occupied = {('A', 'Salon', DAY): [parse_time_range('10:00-11:00')]}
+    result = rank(occupied)
+    assert [(r['time'], r['distance']) for r in result[:2]] == [('09:00-10:00', 1), ('11:00-12:00', 1)]
+    assert all(r['time'] != '10:00-11:00' for r in result)
+    assert [r['distance'] for r in result] == sorted(r['distance'] for r in result)
+
+
+def test_candidates_never_overlap_taken_intervals():
+    occupied = {('A', 'Salon', DAY): [parse_time_range('09:00-10:30'), parse_time_range('11:00-14:00') + (7,)]}
+    result = rank(occupied, time='09:30-10:30', limit=50)
+    # 10:30-11:00 arası yalnızca 30 dk boş; bir saatlik aday o gün sığmaz
+    assert result == []
+
+
+def test_next_day_and_other_venue_are_weighted():
+    taken = [parse_time_range('09:00-14:00')]
+    next_day = date(2030, 5, 7)
+    occupied = {('A', 'Salon', DAY): taken, ('A', 'Sahne', DAY): taken}
+    result = rank(occupied, places=[('A', 'Salon'), ('A', 'Sahne'), ('B', 'Salon')], days=[DAY, next_day], limit=50)
+    assert result[0] == {'center': 'A', 'venue': 'Salon', 'date': next_day.isoformat(),
+                         'time': '10:00-11:00', 'distance': 3}
+    best = {}
+    for alt in result:
+        best.setdefault((alt['center'], alt['venue'], alt['date']), alt['distance'])
+    # Ertesi gün 3, diğer salon 2 + gün 3, diğer merkez 6
+    assert best == {('A', 'Salon', next_day.isoformat()): 3, ('A', 'Sahne', next_day.isoformat()): 5,
+                    ('B', 'Salon', DAY.isoformat()): 6, ('B', 'Salon', next_day.isoformat()): 9}
+
+
+def test_limit_and_invalid_time():
+    assert len(rank({}, limit=2)) == 2
+    assert rank({}, time='geçersiz') == []
+
+
+def test_format_alternative_shows_only_differences():
+    alt = {'center': 'B', 'venue': 'Sahne', 'date': '2030-05-07', 'time': '10:00-11:00'}
+    assert format_alternative(alt, 'A', 'Sahne', '2030-05-06') == '2030-05-07 10:00-11:00 (B - Sahne)'
+    assert format_alternative(dict(alt, center='A'), 'A', 'Salon', '2030-05-07') == '10:00-11:00 (Sahne)'
+
+
+def test_alternatives_api(app_module, client, booking_day):
+    center, venue = app_module.CENTERS[0], app_module.VENUES[0]
+    client.post('/', data={
+        'name_surname': 'Dolu', 'center': center, 'venue': venue,
+        'date': booking_day, 'start_time': '10:00', 'end_time': '11:00', 'description': '',
+    })
+    query = {'center': center, 'venue': venue, 'date': booking_day, 'start_time': '10:00', 'end_time': '11:00',
+             'days': 0, 'limit': 3}
+    data = client.get('/api/alternatives', query_string=query).get_json()
+    assert data['available'] is False
+    assert len(data['alternatives']) == 3
+    assert all(alt['date'] == booking_day and alt['time'] != '10:00-11:00' for alt in data['alternatives']
+               if alt['venue'] == venue)
+    assert data['alternatives'][0]['distance'] <= data['alternatives'][-1]['distance']
+
+    assert client.get('/api/alternatives', query_string=dict(query, center='Yok')).status_code == 400
+    assert client.get('/api/alternatives', query_string=dict(query, date='dün')).status_code == 400
+    assert app_module.app.test_client().get('/api/alternatives', query_string=query).status_code == 401
@@ -0,0 +1,113 @@
+import threading
+from datetime import date
+
+import pytest
+
+from booking_intervals import BookingHours
+from slot_occupancy import FREE, PENDING, SlotOccupancy
+
+CENTERS = ('A Merkezi', 'B Merkezi')
+VENUES = ('Tiyatro Salonu', 'Seminer Salonu')
+SLOTS = ('09:00-10:00', '10:00-11:00', '11:00-12:00', '12:00-13:00')
+DAY = date(2030, 1, 2)
+
+
+@pytest.fixture
+def table(tmp_path):
+    return SlotOccupancy(str(tmp_path / 'occ'), CENTERS, VENUES, BookingHours(SLOTS, 15), date(2030, 1, 1), 10)
+
+
+def key(time, center='A Merkezi', venue='Tiyatro Salonu'):
+    return center, venue, DAY, time
+
+
+def test_claim_takes_all_cells_or_none(table):
+    assert table.claim(*key('09:00-11:00'), 1) is True
+    assert table.claim(*key('10:30-12:00'), 2) is False
+    # Reddedilen istek hiçbir hücreye yazmamış olmalı
+    assert table.owners(*key('11:00-12:00')) == set()
+    assert table.claim(*key('11:00-12:00'), 2) is True
+    assert table.day_intervals('A Merkezi', 'Tiyatro Salonu', DAY) == [(540, 660, 1), (660, 720, 2)]
+
+
+def test_claim_is_idempotent_for_owner_and_exclusive_for_pending(table):
+    assert table.claim(*key('09:00-10:00'), 1) is True
+    assert table.claim(*key('09:00-10:00'), 1) is True
+    assert table.claim(*key('12:00-13:00')) is True
+    assert table.claim(*key('12:00-13:00')) is False
+
+
+def test_places_are_independent(table):
+    assert table.claim(*key('09:00-10:00'), 1) is True
+    assert table.claim(*key('09:00-10:00', venue='Seminer Salonu'), 2) is True
+    assert table.claim(*key('09:00-10:00', center='B Merkezi'), 3) is True
+
+
+def test_uncovered_values_return_none(table):
+    assert table.claim('Yok', 'Tiyatro Salonu', DAY, '09:00-10:00', 1) is None
+    assert table.claim(*key('08:00-09:00'), 1) is None
+    assert table.claim('A Merkezi', 'Tiyatro Salonu', date(2031, 1, 1), '09:00-10:00', 1) is None
+    assert table.is_occupied(*key('09:07-10:00')) is None
+
+
+def test_transfer_never_overwrites_other_owner(table):
+    assert table.claim(*key('09:00-10:00')) is True
+    assert table.transfer(*key('09:00-10:00'), PENDING, 7) is True
+    assert table.owners(*key('09:00-10:00')) == {7}
+    assert table.transfer(*key('09:00-10:00'), PENDING, 8) is False
+    assert table.owners(*key('09:00-10:00')) == {7}
+
+
+def test_release_only_frees_own_cells_and_keeps_overlap(table):
+    assert table.claim(*key('09:00-11:00'), 1) is True
+    assert table.release(*key('09:00-11:00'), 2) is False
+    assert table.is_occupied(*key('09:00-11:00')) is True
+    # Güncelleme: 09-11 -> 10-12; yeni aralık alınmış, eskisinden sadece örtüşmeyen kısım bırakılır
+    assert table.claim(*key('10:00-12:00'), 1) is True
+    assert table.release(*key('09:00-11:00'), 1, keep=key('10:00-12:00')) is True
+    assert table.day_intervals('A Merkezi', 'Tiyatro Salonu', DAY) == [(600, 720, 1)]
+
+
+def test_reactivation_cannot_take_cells_of_new_booking(table):
+    """İptal edilen A'nın aralığını B aldıktan sonra A yeniden etkinleşemez"""
+    assert table.claim(*key('10:00-11:00'), 1) is True     # A
+    table.release(*key('10:00-11:00'), 1)                   # A iptal
+    assert table.claim(*key('10:00-11:00'), 2) is True     # B
+    assert table.claim(*key('10:00-11:00'), 1) is False    # A yeniden onay
+    table.release(*key('10:00-11:00'), 1)                   # A tekrar iptal: B'nin hücreleri kalır
+    assert table.claim(*key('10:00-11:00'), 3) is False    # C
+    assert table.owners(*key('10:00-11:00')) == {2}
+
+
+def test_concurrent_claims_have_single_winner(table):
+    results = []
+    barrier = threading.Barrier(8)
+
+    def claim(owner):
+        barrier.wait()
+        results.append((owner, table.claim(*key('09:00-12:00'), owner)))
+
+    threads = [threading.Thread(target=claim, args=(owner,)) for owner in range(1, 9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    winners = [owner for owner, won in results if won]
+    assert len(winners) == 1
+    assert table.owners(*key('09:00-12:00')) == set(winners)
+
+
+def test_rebuild_from_reservations(table, tmp_path):
+    reservations = [
+        {'id': 1, 'center': 'A Merkezi', 'venue': 'Tiyatro Salonu', 'date': DAY.isoformat(), 'time': '09:00-10:30', 'status': 'onay'},
+        {'id': 2, 'center': 'A Merkezi', 'venue': 'Tiyatro Salonu', 'date': DAY.isoformat(), 'time': '11:00-12:00', 'status': 'iptal'},
+    ]
+    table.claim(*key('12:00-13:00'), 99)
+    table.rebuild(reservations, b'test', date(2030, 1, 1))
+    assert table.day_intervals('A Merkezi', 'Tiyatro Salonu', DAY) == [(540, 630, 1)]
+    assert table.build_key() == b'test'
+    assert table.ensure_built(reservations, b'test', date(2030, 1, 1)) is False
+    # Aynı dosyayı açan ikinci süreç (worker) aynı hücreleri görür
+    other = SlotOccupancy(str(tmp_path / 'occ'), CENTERS, VENUES, BookingHours(SLOTS, 15), date(2030, 1, 1), 10)
+    assert other.owners(*key('09:00-10:00')) == {1}
+    assert other.owners(*key('12:00-13:00')) == {FREE} - {FREE}
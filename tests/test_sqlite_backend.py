@@ -0,0 +1,59 @@
+"""SQLite arka ucu: MySQL sözdizimi çevirisi, tür dönüşümleri ve thread başına bağlantı havuzu"""
+import threading
+from datetime import date, datetime
+
+import pytest
+
+import statements
+from sqlite_backend import SQLiteConnectionPool, init_schema, translate_sql
+
+
+@pytest.mark.parametrize('mysql, sqlite', [
+    ("SELECT * FROM t WHERE a = %s AND b = %s", "SELECT * FROM t WHERE a = ? AND b = ?"),
+    ("SELECT NOW()", "SELECT datetime('now', 'localtime')"),
+    ("INSERT IGNORE INTO centers (name) VALUES (%s)", "INSERT OR IGNORE INTO centers (name) VALUES (?)"),
+    ("SELECT DATE_FORMAT(r.date, '%Y-%m') AS month", "SELECT strftime('%Y-%m', r.date) AS month"),
+    ("EXPLAIN SELECT 1", "EXPLAIN QUERY PLAN SELECT 1"),
+    ("EXPLAIN QUERY PLAN SELECT 1", "EXPLAIN QUERY PLAN SELECT 1"),
+])
+def test_translate_sql(mysql, sqlite):
+    assert translate_sql(mysql) == sqlite
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / 'db' / 'rezervasyon.db'))
+    conn = pool.get_connection()
+    init_schema(conn)
+    yield pool
+    pool.close_all()
+
+
+def test_named_statements_run_on_sqlite_with_native_types(pool):
+    conn = pool.get_connection()
+    for day in (date(2026, 3, 10), date(2026, 3, 11), date(2026, 4, 1)):
+        statements.execute(conn, 'reservation_insert',
+                           ('Ayşe', 'Merkez', 'Salon', day, '09:00-10:00', '', 'onay', 'admin'))
+    conn.commit()
+
+    row = statements.fetch_all(conn, 'reservations_in_range', (date(2026, 3, 1), date(2026, 3, 11)))[0]
+    assert row['date'] == date(2026, 3, 10) and isinstance(row['created_at'], datetime)
+    # DATE_FORMAT -> strftime
+    months = statements.fetch_all(conn, 'legacy_months')
+    assert [m['month_year'] for m in months] == ['2026-04', '2026-03']
+    # NOW() metin döner; uygulama ISO biçiminden okur
+    assert datetime.fromisoformat(statements.fetch_one(conn, 'db_now')[0]).date() == date.today()
+
+
+def test_pool_uses_wal_and_one_connection_per_thread(pool):
+    conn = pool.get_connection()
+    cursor = conn.cursor()
+    cursor.execute('PRAGMA journal_mode')
+    assert cursor.fetchone()[0] == 'wal'
+    assert pool.get_connection()._connection is conn._connection
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.get_connection()._connection))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn._connection
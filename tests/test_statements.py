@@ -0,0 +1,88 @@
+"""İsimli sorgular: bağlantı başına prepared cursor önbelleği ve düşen statement'ın yeniden hazırlanması"""
+import mysql.connector
+import pytest
+
+import statements
+
+
+class Cursor:
+    def __init__(self, connection, dictionary):
+        self.connection = connection
+        self.dictionary = dictionary
+        self.closed = False
+        self.rowcount = 1
+        self.lastrowid = None
+
+    def execute(self, operation, params=None):
+        self.connection.executed.append(operation)
+        if self.connection.failures:
+            raise mysql.connector.Error(msg='Lost connection', errno=self.connection.failures.pop(0))
+
+    def fetchall(self):
+        return [{'version': 7}] if self.dictionary else [(7,)]
+
+    def close(self):
+        self.closed = True
+
+
+class Connection:
+    """mysql-connector bağlantısının prepared cursor açan kısmı"""
+
+    def __init__(self, connection_id=1, failures=()):
+        self.connection_id = connection_id
+        self.failures = list(failures)
+        self.executed = []
+        self.cursors = []
+
+    def cursor(self, prepared=False, dictionary=False, **kwargs):
+        assert prepared
+        cursor = Cursor(self, dictionary)
+        self.cursors.append(cursor)
+        return cursor
+
+
+@pytest.fixture(autouse=True)
+def prepared(monkeypatch):
+    monkeypatch.setattr(statements, 'USE_PREPARED_STATEMENTS', True)
+
+
+def test_prepared_cursor_is_reused_per_statement_until_reconnect():
+    conn = Connection()
+    assert statements.fetch_one(conn, 'reference_version') == (7,)
+    assert statements.fetch_one(conn, 'reference_version') == (7,)
+    assert statements.fetch_all(conn, 'reference_version') == [{'version': 7}]
+    # Aynı isim ve satır tipi için tek cursor; dict satırlar ayrı cursor
+    assert len(conn.cursors) == 2
+
+    # Yeniden bağlanan oturumda eski prepared handle'lar kullanılmaz
+    conn.connection_id = 2
+    statements.fetch_one(conn, 'reference_version')
+    assert len(conn.cursors) == 3
+
+
+@pytest.mark.parametrize('errno', [1243, 2013, 2055])
+def test_dropped_statement_is_prepared_again_once(errno):
+    conn = Connection(failures=[errno])
+    assert statements.fetch_one(conn, 'reference_version') == (7,)
+    assert len(conn.executed) == 2
+    first, second = conn.cursors
+    assert first.closed and not second.closed
+
+
+def test_second_failure_and_other_errors_are_raised():
+    conn = Connection(failures=[2055, 2055])
+    with pytest.raises(mysql.connector.Error):
+        statements.fetch_one(conn, 'reference_version')
+    assert len(conn.executed) == 2
+
+    conn = Connection(failures=[1064])
+    with pytest.raises(mysql.connector.Error):
+        statements.fetch_one(conn, 'reference_version')
+    assert len(conn.executed) == 1
+
+
+def test_register_rejects_a_different_query_under_the_same_name():
+    name = statements.register('test_register_once', "SELECT 1")
+    assert statements.register(name, "SELECT 1") == name
+    with pytest.raises(ValueError):
+        statements.register(name, "SELECT 2")
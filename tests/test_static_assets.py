@@ -0,0 +1,120 @@
+"""Parmak izli statik paketler ve şablon yardımcıları"""
+import gzip
+import json
+import os
+import shutil
+
+import pytest
+from flask import Flask, render_template_string
+
+import static_assets
+from static_assets import (BUNDLES, DIST_DIR, VENDOR, AssetError, build_assets, content_hash, fingerprinted_name,
+                           register_static_assets, subset_fontawesome)
+
+FA_CSS = ('.fa-solid{font-weight:900}'
+          '.fa-house:before{content:"\\f015"}'
+          '.fa-trash:before,.fa-trash-can:before{content:"\\f1f8"}'
+          '.fa-user:before{content:"\\f007"}'
+          '@font-face{font-family:"FA";src:url(../webfonts/fa-solid-900.woff2) format("woff2"),'
+          'url(../webfonts/fa-solid-900.ttf) format("truetype")}'
+          '@font-face{font-family:"FA Brands";src:url(../webfonts/fa-brands-400.woff2)}'
+          '/*# sourceMappingURL=all.min.css.map */')
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    """Vendor dosyaları sahte içerikle hazır bir static dizini"""
+    root = tmp_path / 'static'
+    for path in VENDOR:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_bytes(b'/* ' + path.encode() + b' */')
+    (root / 'vendor/css/fontawesome.min.css').write_text(FA_CSS)
+    (root / 'css').mkdir()
+    (root / 'css/app.css').write_text('body{color:red}')
+    (root / 'js').mkdir()
+    (root / 'js/app.js').write_text('console.log(1)')
+    (tmp_path / 'page.html').write_text('<i class="fas fa-house"></i>')
+    return root
+
+
+def test_fingerprinted_name():
+    assert fingerprinted_name('app.css', b'x') == f"app.{content_hash(b'x')}.css"
+    assert fingerprinted_name('app.css', b'x') != fingerprinted_name('app.css', b'y')
+
+
+def test_subset_fontawesome_keeps_used_icons_and_solid_font():
+    css, codepoints = subset_fontawesome(FA_CSS, {'fa-house', 'fa-trash-can'})
+    assert '.fa-house:before' in css and '.fa-trash-can:before' in css
+    assert '.fa-trash:before' not in css and 'fa-user' not in css
+    assert '.fa-solid{' in css
+    assert 'fa-solid-900.woff2' in css and 'fa-brands-400' not in css
+    assert 'sourceMappingURL' not in css
+    assert codepoints == {0xf015, 0xf1f8}
+
+
+def test_fetch_vendor_without_download_raises(tmp_path):
+    with pytest.raises(AssetError):
+        build_assets(str(tmp_path), icon_sources=[], download=False)
+
+
+def test_build_assets_writes_fingerprinted_bundles(static_dir, tmp_path):
+    manifest = build_assets(str(static_dir), icon_sources=[str(tmp_path / 'page.html')], download=False)
+    assert set(manifest) == set(BUNDLES)
+    dist = static_dir / DIST_DIR
+    css_path = static_dir / manifest['app.css'][0]
+    css = css_path.read_bytes()
+    assert css_path.name == fingerprinted_name('app.css', css)
+    assert gzip.decompress((dist / f'{css_path.name}.gz').read_bytes()) == css
+    assert b'.fa-house:before' in css and b'fa-user' not in css and b'body{color:red}' in css
+    # Font dosyası da parmak izli adla yazılır ve CSS yeni adı kullanır
+    written = json.loads((dist / 'manifest.json').read_text())
+    fonts = [name for name in written['files'] if name.startswith('fa-solid-900.')]
+    assert len(fonts) == 2 and all(name.encode() in css for name in fonts)
+    assert b'../webfonts/' not in css
+
+    # Kaynak değişince yeni ad; bir önceki derleme tutulur, daha eskisi silinir
+    (static_dir / 'css/app.css').write_text('body{color:blue}')
+    second = build_assets(str(static_dir), icon_sources=[], download=False)
+    (static_dir / 'css/app.css').write_text('body{color:green}')
+    third = build_assets(str(static_dir), icon_sources=[], download=False)
+    names = os.listdir(dist)
+    assert os.path.basename(second['app.css'][0]) in names
+    assert os.path.basename(third['app.css'][0]) in names
+    assert css_path.name not in names and f'{css_path.name}.gz' not in names
+
+
+def make_app(static_dir):
+    app = Flask(__name__, static_folder=str(static_dir))
+    return register_static_assets(app)
+
+
+def render(app, bundle):
+    with app.test_request_context():
+        return render_template_string('{{ asset_urls(bundle)|join(" ") }}', bundle=bundle).split()
+
+
+def test_asset_urls_use_manifest(static_dir):
+    manifest = build_assets(str(static_dir), icon_sources=[], download=False)
+    assert render(make_app(static_dir), 'app.js') == [f'/static/{manifest["app.js"][0]}']
+
+
+def test_asset_urls_fall_back_to_sources_then_cdn(static_dir):
+    urls = render(make_app(static_dir), 'app.css')
+    source = (static_dir / 'css/app.css').read_bytes()
+    assert urls[-1] == f'/static/css/app.css?v={content_hash(source)}'
+    assert urls[0].startswith('/static/vendor/css/bootstrap.min.css?v=')
+
+    shutil.rmtree(static_dir / 'vendor')
+    urls = render(make_app(static_dir), 'app.css')
+    assert urls[:2] == [VENDOR['vendor/css/bootstrap.min.css'], VENDOR[static_assets.FONTAWESOME_CSS]]
+
+
+def test_static_url_changes_with_content(static_dir):
+    app = make_app(static_dir)
+    first = render(app, 'app.js')[-1]
+    path = static_dir / 'js/app.js'
+    path.write_text('console.log(2)')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = render(app, 'app.js')[-1]
+    assert first != second and second.endswith(content_hash(b'console.log(2)'))
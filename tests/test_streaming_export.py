@@ -0,0 +1,93 @@
+"""CSV / NDJSON export: filtre sorgusu, parça parça okuma ve çıktı biçimleri"""
+import csv
+import io
+import json
+import sqlite3
+from datetime import date
+
+import pytest
+
+from sqlite_backend import SQLiteConnection, init_schema
+from streaming_export import (FIELDS, build_export_query, filter_date_range, generate_csv, generate_ndjson,
+                              iter_row_chunks)
+
+
+@pytest.mark.parametrize('month, year, expected', [
+    ('all', 'all', (None, None)),
+    ('2026-02', 'all', (date(2026, 2, 1), date(2026, 3, 1))),
+    ('2026-12', '2026', (date(2026, 12, 1), date(2027, 1, 1))),
+    ('all', '2026', (date(2026, 1, 1), date(2027, 1, 1))),
+    ('bozuk', '2026', (date(2026, 1, 1), date(2027, 1, 1))),
+    ('2025-05', '2026', None),
+    ('all', 'yıl', None),
+])
+def test_filter_date_range(month, year, expected):
+    assert filter_date_range(month, year) == expected
+
+
+def test_build_export_query():
+    sql, params = build_export_query('Merkez', 'onay', 'all', '2026', 'Tiyatro Salonu')
+    assert 'FROM reservations WHERE' in sql and sql.endswith('ORDER BY created_at DESC')
+    assert '(venue = %s OR venue IS NULL)' in sql
+    assert params == ('Merkez', 'onay', date(2026, 1, 1), date(2027, 1, 1), 'Tiyatro Salonu')
+
+    sql, params = build_export_query(year_filter='2026', date_from=date(2026, 6, 1), archive=True)
+    assert 'FROM reservations_archive' in sql and params == (date(2026, 6, 1), date(2027, 1, 1))
+
+    sql, params = build_export_query(year_filter='yıl')
+    assert '1 = 0' in sql and params == ()
+
+
+@pytest.fixture
+def conn():
+    raw = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES, isolation_level=None)
+    connection = SQLiteConnection(raw)
+    init_schema(connection)
+    cursor = connection.cursor()
+    for i, venue in enumerate(['Seminer Salonu', None, 'Tiyatro Salonu', None, 'Seminer Salonu']):
+        cursor.execute("INSERT INTO reservations (name_surname, center, venue, date, time, description, status) "
+                       "VALUES (%s, 'Merkez', %s, %s, '09:00-10:00', %s, 'onay')",
+                       (f'Kişi {i}', venue, date(2026, 3, 1 + i), 'virgül, "tırnak"'))
+    yield connection
+    raw.close()
+
+
+def test_rows_are_streamed_in_chunks(conn):
+    sql, params = build_export_query(year_filter='2026')
+    assert [len(rows) for rows in iter_row_chunks(conn, sql, params, chunk_size=2)] == [2, 2, 1]
+
+
+def test_csv_output(conn):
+    sql, params = build_export_query(venue_filter='Tiyatro Salonu')
+    text = ''.join(generate_csv(iter_row_chunks(conn, sql, params, chunk_size=2)))
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[0] == FIELDS and len(rows) == 4
+    record = dict(zip(FIELDS, rows[1]))
+    # Boş salon varsayılan salon olarak yazılır; virgül ve tırnak kaçışlanır
+    assert record['venue'] == 'Tiyatro Salonu' and record['description'] == 'virgül, "tırnak"'
+    assert text.endswith('\r\n')
+
+
+def test_ndjson_output(conn):
+    sql, params = build_export_query(month_filter='2026-03')
+    lines = ''.join(generate_ndjson(iter_row_chunks(conn, sql, params, chunk_size=3))).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len(records) == 5 and set(records[0]) == set(FIELDS)
+    assert {r['venue'] for r in records} == {'Seminer Salonu', 'Tiyatro Salonu'}
+    assert sorted(r['date'] for r in records)[0] == '2026-03-01'
+
+
+def test_export_endpoints(app_module, client, booking_day):
+    client.post('/', data={
+        'name_surname': 'Akış Export', 'center': app_module.CENTERS[1], 'venue': app_module.VENUES[0],
+        'date': booking_day, 'start_time': '09:00', 'end_time': '10:00', 'description': '',
+    })
+    query = {'center': app_module.CENTERS[1], 'month': booking_day[:7]}
+    response = client.get('/export/csv', query_string=query)
+    assert response.mimetype == 'text/csv' and 'Akış Export' in response.get_data(as_text=True)
+
+    response = client.get('/export/ndjson', query_string=query)
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert response.mimetype == 'application/x-ndjson'
+    assert any(r['name_surname'] == 'Akış Export' and r['date'] == booking_day for r in records)
+    assert all(r['center'] == app_module.CENTERS[1] for r in records)
@@ -0,0 +1,122 @@
+"""Dakika tabanlı doluluk özeti (değişken uzunluklu rezervasyonlar)"""
+import sqlite3
+
+import pytest
+
+from booking_intervals import BookingHours
+from sqlite_backend import SQLiteConnection, init_schema
+from utilization import get_utilization, rebuild_rollup
+
+SLOTS = ['09:00-10:00', '10:00-11:00', '11:00-12:00', '12:00-13:00']
+CENTER, VENUE = 'Merkez', 'Salon'
+
+
+@pytest.fixture
+def conn():
+    raw = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES, isolation_level=None)
+    connection = SQLiteConnection(raw)
+    init_schema(connection)
+    yield connection
+    raw.close()
+
+
+def insert(conn, day, time, status='onay'):
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO reservations (name_surname, center, venue, date, time, status) VALUES (%s, %s, %s, %s, %s, %s)",
+        ('Test', CENTER, VENUE, day, time, status))
+
+
+def utilization(conn, year=2025):
+    return get_utilization(conn, year, [CENTER], [VENUE], BookingHours(SLOTS, step=15))
+
+
+def slot(data, time):
+    return next(s for s in data['slots'] if s['time'] == time)
+
+
+def test_long_booking_counts_every_overlapped_slot(conn):
+    insert(conn, '2025-03-10', '09:00-12:00')
+    data = utilization(conn)
+    assert data['totals']['active'] == 1
+    assert data['totals']['booked_minutes'] == 180
+    assert data['totals']['capacity_minutes'] == 365 * 240
+    assert [slot(data, s)['active'] for s in SLOTS] == [1, 1, 1, 0]
+    assert slot(data, '10:00-11:00')['booked_minutes'] == 60
+
+
+def test_unaligned_booking_splits_minutes_across_slots(conn):
+    insert(conn, '2025-03-10', '09:15-10:15')
+    data = utilization(conn)
+    assert slot(data, '09:00-10:00')['booked_minutes'] == 45
+    assert slot(data, '10:00-11:00')['booked_minutes'] == 15
+    assert slot(data, '09:00-10:00')['active'] == slot(data, '10:00-11:00')['active'] == 1
+    assert data['totals']['booked_minutes'] == 60
+
+
+def test_occupancy_rate_uses_minutes(conn):
+    insert(conn, '2025-03-10', '09:00-12:00')
+    insert(conn, '2025-03-11', '09:00-10:00', status='iptal')
+    data = utilization(conn)
+    march = next(m for m in data['months'] if m['month'] == '2025-03')
+    assert march['total'] == 2 and march['iptal'] == 1
+    assert march['booked_minutes'] == 180
+    assert march['occupancy_rate'] == round(180 / (31 * 240), 4)
+    assert data['places'][0]['occupancy_rate'] == round(180 / (365 * 240), 4)
+
+
+def test_day_full_of_long_bookings_is_fully_occupied(conn):
+    insert(conn, '2025-03-10', '09:00-11:00')
+    insert(conn, '2025-03-10', '11:00-13:00')
+    data = utilization(conn)
+    assert data['totals']['booked_minutes'] == 240
+    assert all(slot(data, s)['booked_minutes'] == 60 for s in SLOTS)
+
+
+def test_minutes_outside_opening_hours_are_not_counted(conn):
+    insert(conn, '2025-03-10', '08:00-10:00')
+    insert(conn, '2025-03-10', 'geçersiz')
+    data = utilization(conn)
+    assert data['totals']['active'] == 2
+    assert data['totals']['booked_minutes'] == 60
+
+
+def rollup(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT center, venue, date, time, status, reservation_count FROM reservation_rollup "
+                   "WHERE reservation_count != 0 ORDER BY date, time, status")
+    return cursor.fetchall()
+
+
+def test_triggers_keep_rollup_equal_to_rebuild(conn):
+    insert(conn, '2025-03-10', '09:00-10:00')
+    insert(conn, '2025-03-10', '09:00-10:00', status='bekle')
+    insert(conn, '2025-03-11', '10:00-12:00')
+    cursor = conn.cursor()
+    cursor.execute("UPDATE reservations SET status = 'iptal' WHERE time = '10:00-12:00'")
+    cursor.execute("UPDATE reservations SET date = '2025-04-01' WHERE status = 'bekle'")
+    cursor.execute("DELETE FROM reservations WHERE status = 'onay'")
+    maintained = rollup(conn)
+    assert [(str(row[2]), row[4], row[5]) for row in maintained] == [('2025-03-11', 'iptal', 1),
+                                                                     ('2025-04-01', 'bekle', 1)]
+
+    assert rebuild_rollup(conn) == 2
+    assert rollup(conn) == maintained
+
+
+def test_utilization_api_and_dashboard(app_module, client, booking_day):
+    year = int(booking_day[:4])
+    before = client.get('/api/utilization', query_string={'year': year, 'center': app_module.CENTERS[0]}).get_json()
+    client.post('/', data={
+        'name_surname': 'Pano', 'center': app_module.CENTERS[0], 'venue': app_module.VENUES[0],
+        'date': booking_day, 'start_time': '09:00', 'end_time': '11:00', 'description': '',
+    })
+    data = client.get('/api/utilization', query_string={'year': year, 'center': app_module.CENTERS[0]}).get_json()
+    assert data['filters']['center'] == app_module.CENTERS[0]
+    assert data['totals']['bekle'] >= 1
+    assert data['totals']['booked_minutes'] - before['totals']['booked_minutes'] >= 120
+    assert all(place['center'] == app_module.CENTERS[0] for place in data['places'])
+
+    assert client.get('/dashboard', query_string={'year': year}).status_code == 200
+    anonymous = app_module.app.test_client()
+    assert anonymous.get('/api/utilization').status_code == 302
@@ -0,0 +1,221 @@
+"""Kullanım (doluluk) özeti - reservation_rollup tablosundan
+
+``reservation_rollup`` her (merkez, salon, gün, saat dilimi, durum) için
+rezervasyon sayısını tutar ve ``reservations`` tablosundaki trigger'larla
+her yazmada artımlı olarak güncellenir. Pano ve JSON API rezervasyon
+tablosunu taramaz; bir yıl için (merkez, salon, ay, saat aralığı, durum)
+gruplamasını okur ve doluluk oranlarını burada hesaplar.
+
+Rezervasyonların uzunluğu sabit olmadığından doluluk rezervasyon sayısıyla
+değil dakikayla hesaplanır: dolu dakika, aktif rezervasyonların açılış
+saatleri içinde kalan süresidir; kapasite ise her gün açılıştan kapanışa
+kadarki süredir (``BookingHours``). Saat dilimi kırılımında bir rezervasyon
+çakıştığı her dilime sayılır ve dilime sadece çakışan dakikaları eklenir
+(``09:00-12:00`` üç dilimi doldurur, ``09:15-10:15`` iki dilimi kısmen).
+"""
+import calendar
+import logging
+from datetime import date
+
+import statements
+from booking_intervals import parse_time_range
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('onay', 'bekle')
+STATUSES = ('onay', 'bekle', 'iptal')
+
+# MySQL trigger tanımları (SQLite karşılıkları sqlite_backend.SCHEMA içinde)
+MYSQL_ROLLUP_TABLE = """
+CREATE TABLE IF NOT EXISTS reservation_rollup (
+    center VARCHAR(255) NOT NULL,
+    venue VARCHAR(100) NOT NULL,
+    date DATE NOT NULL,
+    time VARCHAR(20) NOT NULL,
+    status ENUM('onay', 'bekle', 'iptal') NOT NULL,
+    reservation_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (center, venue, date, time, status),
+    INDEX idx_rollup_date (date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+_ROLLUP_INCREMENT = """
+    INSERT INTO reservation_rollup (center, venue, date, time, status, reservation_count)
+    VALUES (NEW.center, COALESCE(NEW.venue, 'Tiyatro Salonu'), NEW.date, NEW.time, NEW.status, 1)
+    ON DUPLICATE KEY UPDATE reservation_count = reservation_count + 1"""
+
+_ROLLUP_DECREMENT = """
+    UPDATE reservation_rollup SET reservation_count = reservation_count - 1
+    WHERE center = OLD.center AND venue = COALESCE(OLD.venue, 'Tiyatro Salonu')
+      AND date = OLD.date AND time = OLD.time AND status = OLD.status"""
+
+MYSQL_ROLLUP_TRIGGERS = {
+    'trg_rollup_insert': f"""
+        CREATE TRIGGER trg_rollup_insert AFTER INSERT ON reservations
+        FOR EACH ROW {_ROLLUP_INCREMENT}
+    """,
+    'trg_rollup_update': f"""
+        CREATE TRIGGER trg_rollup_update AFTER UPDATE ON reservations
+        FOR EACH ROW
+        BEGIN
+            IF NOT (OLD.center <=> NEW.center AND OLD.venue <=> NEW.venue AND OLD.date <=> NEW.date
+                    AND OLD.time <=> NEW.time AND OLD.status <=> NEW.status) THEN
+                {_ROLLUP_DECREMENT};
+                {_ROLLUP_INCREMENT};
+            END IF;
+        END
+    """,
+    'trg_rollup_delete': f"""
+        CREATE TRIGGER trg_rollup_delete AFTER DELETE ON reservations
+        FOR EACH ROW {_ROLLUP_DECREMENT}
+    """,
+}
+
+
+def create_mysql_rollup(cursor):
+    """Özet tablosunu ve eksik trigger'ları oluştur
+
+    Trigger'lar silinip yeniden oluşturulmaz; aksi halde deploy sırasında
+    yapılan yazmalar özete yansımazdı.
+    """
+    cursor.execute(MYSQL_ROLLUP_TABLE)
+    cursor.execute(
+        "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()"
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+    for name, ddl in MYSQL_ROLLUP_TRIGGERS.items():
+        if name not in existing:
+            cursor.execute(ddl)
+
+
+def ensure_rollup_populated(conn):
+    """Özet boşsa mevcut rezervasyonlardan doldur (ilk kurulum)"""
+    if statements.fetch_one(conn, 'rollup_row_count')[0] == 0:
+        rebuild_rollup(conn)
+
+
+def rebuild_rollup(conn):
+    """Özeti rezervasyon tablosundan baştan hesapla"""
+    statements.execute(conn, 'rollup_clear')
+    rows = statements.execute(conn, 'rollup_rebuild').rowcount
+    conn.commit()
+    logger.info(f"Kullanım özeti yeniden oluşturuldu: {rows} satır")
+    return rows
+
+
+def _rate(part, whole):
+    return round(part / whole, 4) if whole else 0.0
+
+
+def _status_counts(counts):
+    result = {status: counts.get(status, 0) for status in STATUSES}
+    result['total'] = sum(result.values())
+    result['active'] = sum(result[status] for status in ACTIVE_STATUSES)
+    result['approval_rate'] = _rate(result['onay'], result['total'])
+    result['cancellation_rate'] = _rate(result['iptal'], result['total'])
+    return result
+
+
+def _add(groups, key, status, total, minutes=0):
+    counts = groups.setdefault(key, {})
+    counts[status] = counts.get(status, 0) + int(total)
+    if status in ACTIVE_STATUSES and minutes:
+        counts['minutes'] = counts.get('minutes', 0) + minutes
+
+
+def _with_occupancy(summary, counts, capacity_minutes):
+    summary['booked_minutes'] = counts.get('minutes', 0)
+    summary['capacity_minutes'] = capacity_minutes
+    summary['booked_hours'] = round(summary['booked_minutes'] / 60, 1)
+    summary['capacity'] = round(capacity_minutes / 60, 1)
+    summary['occupancy_rate'] = _rate(summary['booked_minutes'], capacity_minutes)
+    return summary
+
+
+def get_utilization(conn, year, centers, venues, hours, center=None, venue=None):
+    """Bir yıl için doluluk ve durum oranlarını hesapla
+
+    Args:
+        conn: Veritabanı bağlantısı
+        year: Yıl (int)
+        centers, venues: Tanımlı merkezler ve salonlar (kapasite hesabı için)
+        hours: ``BookingHours``; açılış/kapanış saati ve saat dilimleri
+        center, venue: Opsiyonel filtreler (None = hepsi)
+
+    Returns:
+        JSON'a çevrilebilir dict: genel toplamlar, merkez/salon, ay ve saat
+        dilimi kırılımları. ``capacity`` ve ``booked_hours`` saat, doluluk
+        oranı dolu dakikanın kapasite dakikasına oranıdır.
+    """
+    start, end = date(year, 1, 1), date(year + 1, 1, 1)
+    rows = statements.fetch_all(conn, 'rollup_by_month', (start, end))
+    slot_ranges = [(slot, parse_time_range(slot)) for slot in hours.slots]
+
+    def included(row):
+        return (not center or row['center'] == center) and (not venue or row['venue'] == venue)
+
+    totals, by_place, by_month, by_slot = {}, {}, {}, {}
+    spans = {}  # saat metni -> açılış saatleri içindeki (başlangıç, bitiş); geçersizse None
+    for row in rows:
+        if not included(row) or not row['total']:
+            continue
+        time_text, status, total = row['time'], row['status'], int(row['total'])
+        if time_text not in spans:
+            parsed = parse_time_range(time_text)
+            span = parsed and (max(parsed[0], hours.opens), min(parsed[1], hours.closes))
+            spans[time_text] = span if span and span[0] < span[1] else None
+        span = spans[time_text]
+        minutes = (span[1] - span[0]) * total if span else 0
+        _add(totals, 'all', status, total, minutes)
+        _add(by_place, (row['center'], row['venue']), status, total, minutes)
+        _add(by_month, row['month'], status, total, minutes)
+        if span is None:
+            continue
+        for slot, (slot_start, slot_end) in slot_ranges:
+            overlap = min(span[1], slot_end) - max(span[0], slot_start)
+            if overlap > 0:
+                _add(by_slot, slot, status, total, overlap * total)
+
+    # Kapasite: seçili her (merkez, salon) için her gün açılıştan kapanışa kadar
+    configured = [(c, v) for c in ([center] if center else centers) for v in ([venue] if venue else venues)]
+    place_keys = list(dict.fromkeys(configured + sorted(by_place)))
+    days_in_year = (end - start).days
+    day_minutes = hours.closes - hours.opens
+    place_count = len(configured)
+
+    places = []
+    for place_center, place_venue in place_keys:
+        counts = by_place.get((place_center, place_venue), {})
+        summary = _status_counts(counts)
+        summary.update(center=place_center, venue=place_venue)
+        places.append(_with_occupancy(summary, counts, days_in_year * day_minutes))
+
+    months = []
+    for month in range(1, 13):
+        key = f"{year:04d}-{month:02d}"
+        counts = by_month.get(key, {})
+        summary = _status_counts(counts)
+        summary['month'] = key
+        month_days = calendar.monthrange(year, month)[1]
+        months.append(_with_occupancy(summary, counts, month_days * day_minutes * place_count))
+
+    slot_summaries = []
+    for slot, (slot_start, slot_end) in slot_ranges:
+        counts = by_slot.get(slot, {})
+        summary = _status_counts(counts)
+        summary['time'] = slot
+        slot_summaries.append(_with_occupancy(summary, counts,
+                                              days_in_year * place_count * (slot_end - slot_start)))
+
+    counts = totals.get('all', {})
+    overall = _with_occupancy(_status_counts(counts), counts, days_in_year * day_minutes * place_count)
+
+    return {
+        'year': year,
+        'filters': {'center': center, 'venue': venue},
+        'totals': overall,
+        'places': places,
+        'months': months,
+        'slots': slot_summaries,
+        'source_rows': len(rows)
+    }